@@ -2,6 +2,7 @@ import {
   Stack,
   StackProps,
   Duration,
+  Size,
   RemovalPolicy,
   SecretValue,
   aws_iam as iam,
@@ -27,6 +28,16 @@ export class DeepCopyStack extends Stack {
       enforceSSL: true,
       removalPolicy: RemovalPolicy.RETAIN,
       versioned: false,
+      // Browsers follow the result handlers' presigned-URL redirects cross-origin
+      cors: [
+        {
+          allowedMethods: [s3.HttpMethods.GET, s3.HttpMethods.HEAD],
+          allowedOrigins: ['*'],
+          allowedHeaders: ['*'],
+          exposedHeaders: ['ETag'],
+          maxAge: 3600,
+        },
+      ],
     });
 
     // DynamoDB Jobs table
@@ -37,6 +48,22 @@ export class DeepCopyStack extends Stack {
       tableClass: dynamodb.TableClass.STANDARD,
     });
 
+    // DynamoDB table for single-flight research leases (one item per research cache key)
+    const researchLeasesTable = new dynamodb.Table(this, 'ResearchLeasesTable', {
+      partitionKey: { name: 'leaseKey', type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'ttl',
+    });
+
+    // DynamoDB table for the shared per-minute LLM rate budget (one item per provider/model/minute)
+    const llmRateBudgetTable = new dynamodb.Table(this, 'LlmRateBudgetTable', {
+      partitionKey: { name: 'budgetKey', type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: RemovalPolicy.DESTROY,
+      timeToLiveAttribute: 'ttl',
+    });
+
     // Secret ARN for API keys (used by multiple Lambdas)
     const secretArn = `arn:aws:secretsmanager:${Stack.of(this).region}:${Stack.of(this).account}:secret:deepcopy-secret-dev*`;
 
@@ -79,6 +106,8 @@ export class DeepCopyStack extends Stack {
       environment: {
         PLAYWRIGHT_BROWSERS_PATH: '/var/task/.playwright',
         JOBS_TABLE_NAME: jobsTable.tableName,
+        RESEARCH_LEASES_TABLE_NAME: researchLeasesTable.tableName,
+        LLM_RATE_BUDGET_TABLE_NAME: llmRateBudgetTable.tableName,
         RESULTS_BUCKET: resultsBucket.bucketName,
         LLM_USAGE_EVENTS_PREFIX: 'llm_usage_events',
         ENVIRONMENT: 'prod',
@@ -95,6 +124,8 @@ export class DeepCopyStack extends Stack {
       }),
     );
     jobsTable.grantReadWriteData(processJobLambdaV2);
+    researchLeasesTable.grantReadWriteData(processJobLambdaV2);
+    llmRateBudgetTable.grantReadWriteData(processJobLambdaV2);
     resultsBucket.grantPut(processJobLambdaV2);
     resultsBucket.grantPutAcl(processJobLambdaV2);
     resultsBucket.grantRead(processJobLambdaV2, 'content_library/*');
@@ -179,6 +210,7 @@ export class DeepCopyStack extends Stack {
         JOBS_TABLE_NAME: jobsTable.tableName,
         RESULTS_BUCKET: resultsBucket.bucketName,
         LLM_USAGE_EVENTS_PREFIX: 'llm_usage_events',
+        LLM_RATE_BUDGET_TABLE_NAME: llmRateBudgetTable.tableName,
         SENTRY_DSN: 'https://f51ef0bfc242618e5b298aa60661e753@o4510738689425408.ingest.de.sentry.io/4510738713346128',
       },
     });
@@ -191,6 +223,7 @@ export class DeepCopyStack extends Stack {
       }),
     );
     jobsTable.grantReadWriteData(processSwipeFileLambda);
+    llmRateBudgetTable.grantReadWriteData(processSwipeFileLambda);
     resultsBucket.grantPut(processSwipeFileLambda);
     resultsBucket.grantRead(processSwipeFileLambda, 'content_library/*');
     resultsBucket.grantRead(processSwipeFileLambda, 'results/*');
@@ -236,6 +269,7 @@ export class DeepCopyStack extends Stack {
         JOBS_TABLE_NAME: jobsTable.tableName,
         RESULTS_BUCKET: resultsBucket.bucketName,
         LLM_USAGE_EVENTS_PREFIX: 'llm_usage_events',
+        LLM_RATE_BUDGET_TABLE_NAME: llmRateBudgetTable.tableName,
         IMAGE_LIBRARY_PREFIX: 'image_library',
         IMAGE_DESCRIPTIONS_KEY: 'image_library/static-library-descriptions.json',
         SECRET_ID: 'deepcopy-secret-dev',
@@ -249,6 +283,7 @@ export class DeepCopyStack extends Stack {
       }),
     );
     jobsTable.grantReadWriteData(processImageGenLambda);
+    llmRateBudgetTable.grantReadWriteData(processImageGenLambda);
     resultsBucket.grantPut(processImageGenLambda);
     resultsBucket.grantPutAcl(processImageGenLambda);
     resultsBucket.grantRead(processImageGenLambda, 'image_library/*');
@@ -295,6 +330,7 @@ export class DeepCopyStack extends Stack {
         JOBS_TABLE_NAME: jobsTable.tableName,
         RESULTS_BUCKET: resultsBucket.bucketName,
         LLM_USAGE_EVENTS_PREFIX: 'llm_usage_events',
+        LLM_RATE_BUDGET_TABLE_NAME: llmRateBudgetTable.tableName,
         SECRET_ID: 'deepcopy-secret-dev',
         SENTRY_DSN: 'https://f51ef0bfc242618e5b298aa60661e753@o4510738689425408.ingest.de.sentry.io/4510738713346128',
       },
@@ -306,6 +342,7 @@ export class DeepCopyStack extends Stack {
       }),
     );
     jobsTable.grantReadWriteData(processPrelanderImagesLambda);
+    llmRateBudgetTable.grantReadWriteData(processPrelanderImagesLambda);
     resultsBucket.grantPut(processPrelanderImagesLambda);
     resultsBucket.grantPutAcl(processPrelanderImagesLambda);
     resultsBucket.grantRead(processPrelanderImagesLambda);
@@ -397,6 +434,8 @@ export class DeepCopyStack extends Stack {
     // API Gateway
     const api = new apigw.RestApi(this, 'Api', {
       restApiName: 'DeepCopy API',
+      // gzip responses over 1 KB for clients sending Accept-Encoding: gzip (large result payloads)
+      minCompressionSize: Size.kibibytes(1),
       deployOptions: {
         stageName: 'prod',
       },
@@ -1,21 +1,79 @@
+import base64
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
+from result_response import response as _response, s3_json_response
+
 
 _s3 = boto3.client("s3")
 _RESULTS_BUCKET = os.environ.get("RESULTS_BUCKET")
 
 
-def _response(status_code: int, body: dict | str):
-    if isinstance(body, dict):
-        body = json.dumps(body)
-        headers = {"content-type": "application/json", "Access-Control-Allow-Origin": "*"}
+def _read(key: str) -> bytes:
+    return _s3.get_object(Bucket=_RESULTS_BUCKET, Key=key)["Body"].read()
+
+
+def _assemble_from_shards(job_id: str) -> Tuple[dict, Optional[str]]:
+    """
+    Rebuild the comprehensive_results.json payload from a job's result shards.
+
+    Mirrors process_job_v2/services/result_layout.py (assemble_results), for
+    jobs saved without the compatibility view. The manifest is rewritten on
+    every save, so its ETag versions the assembled payload.
+
+    Returns:
+        Tuple of (payload, manifest ETag).
+    """
+    prefix = f"results/{job_id}/"
+    manifest_obj = _s3.get_object(Bucket=_RESULTS_BUCKET, Key=f"{prefix}manifest.json")
+    manifest = json.loads(manifest_obj["Body"].read())
+    sections = manifest.get("sections", {})
+    avatars = manifest.get("avatars", [])
+    image = manifest.get("product_image")
+
+    keys = [sections["research"], sections.get("offer_brief"), sections.get("other")]
+    keys += [a["key"] for a in avatars]
+    if image and "key" in image:
+        keys.append(image["key"])
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        bodies = dict(zip(keys, executor.map(lambda k: _read(prefix + k) if k else None, keys)))
+
+    results = json.loads(bodies[sections["research"]])
+    if sections.get("offer_brief"):
+        results["offer_brief"] = json.loads(bodies[sections["offer_brief"]])
+    results["marketing_avatars"] = [json.loads(bodies[a["key"]]) for a in avatars]
+    if image is None:
+        results["product_image"] = None
+    elif "url" in image:
+        results["product_image"] = image["url"]
+    elif image.get("encoding") == "binary":
+        results["product_image"] = base64.b64encode(bodies[image["key"]]).decode("ascii")
     else:
-        headers = {"content-type": "text/plain", "Access-Control-Allow-Origin": "*"}
-    return {"statusCode": status_code, "headers": headers, "body": body}
+        results["product_image"] = bodies[image["key"]].decode("utf-8")
+    if sections.get("other"):
+        results.update(json.loads(bodies[sections["other"]]))
+
+    return {
+        "project_name": manifest.get("project_name"),
+        "timestamp_iso": manifest.get("timestamp_iso"),
+        "results": results,
+        "job_id": manifest.get("job_id"),
+    }, manifest_obj.get("ETag")
+
+
+def _shards_payload(job_id: str):
+    """Assembled payload and manifest ETag, or None when the job has no manifest either."""
+    try:
+        return _assemble_from_shards(job_id)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None
+        raise
 
 
 def handler(event, _context):
@@ -28,19 +86,7 @@ def handler(event, _context):
 
     key = f"results/{job_id}/comprehensive_results.json"
 
-    try:
-        obj = _s3.get_object(Bucket=_RESULTS_BUCKET, Key=key)
-        data = obj["Body"].read()
-        try:
-            payload = json.loads(data)
-            return _response(200, payload)
-        except json.JSONDecodeError:
-            # Return raw text if not valid JSON
-            return _response(200, data.decode("utf-8"))
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code")
-        if error_code in ("NoSuchKey", "404"):
-            return _response(404, "Result not available")
-        return _response(500, f"S3 error: {e.response['Error'].get('Message', str(e))}")
-
-
+    # ?fields= paths may omit the "results." prefix, e.g. marketing_avatars[].avatar.overview
+    return s3_json_response(
+        event, _s3, _RESULTS_BUCKET, key, on_missing=lambda: _shards_payload(job_id), fields_base="results"
+    )
@@ -1,23 +1,14 @@
-import json
 import os
 
 import boto3
-from botocore.exceptions import ClientError
+
+from result_response import response as _response, s3_json_response
 
 
 _s3 = boto3.client("s3")
 _RESULTS_BUCKET = os.environ.get("RESULTS_BUCKET")
 
 
-def _response(status_code: int, body: dict | str):
-    if isinstance(body, dict):
-        body = json.dumps(body)
-        headers = {"content-type": "application/json", "Access-Control-Allow-Origin": "*"}
-    else:
-        headers = {"content-type": "text/plain", "Access-Control-Allow-Origin": "*"}
-    return {"statusCode": status_code, "headers": headers, "body": body}
-
-
 def handler(event, _context):
     job_id = (event.get("pathParameters") or {}).get("id")
     if not job_id:
@@ -28,17 +19,5 @@ def handler(event, _context):
 
     # Keep in sync with prelander_image_gen output location
     key = f"results/prelander-images/{job_id}/results.json"
-    try:
-        obj = _s3.get_object(Bucket=_RESULTS_BUCKET, Key=key)
-        data = obj["Body"].read()
-        try:
-            payload = json.loads(data)
-            return _response(200, payload)
-        except json.JSONDecodeError:
-            return _response(200, data.decode("utf-8"))
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code")
-        if error_code in ("NoSuchKey", "404"):
-            return _response(404, "Result not available")
-        return _response(500, f"S3 error: {e.response['Error'].get('Message', str(e))}")
+    return s3_json_response(event, _s3, _RESULTS_BUCKET, key)
 
@@ -14,6 +14,7 @@ from sentry_sdk.integrations.aws_lambda import AwsLambdaIntegration
 
 from utils.logging_config import setup_logging
 from pipeline.orchestrator import ImageGenOrchestrator
+from llm_usage import flushes_llm_usage_events
 
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN", ""),
@@ -25,6 +26,7 @@ sentry_sdk.init(
 # Initialize logging on module load
 logger = setup_logging()
 
+@flushes_llm_usage_events
 def lambda_handler(event: dict, context) -> dict:
     """
     Lambda entry point for image generation process.
@@ -9,12 +9,14 @@ import io
 import time
 from typing import Any, List, Optional
 
+from utils.codec import fit_jpeg
 from utils.logging_config import setup_logging
 from llm_usage import (
     UsageContext,
     emit_llm_usage_event,
     normalize_gemini_usage,
 )
+from rate_limit import Permit, call_with_limits, estimate_tokens
 
 logger = setup_logging(__name__)
 
@@ -72,43 +74,51 @@ class GeminiService:
         model_name = "gemini-3-pro-image-preview"
         # Image size must use uppercase 'K' (e.g., 1K, 2K, 4K). Lowercase is rejected.
         image_size = "1K"
-        t0 = time.time()
+        ctx = UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN")
         
-        try:
-            resp = self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    response_modalities=["IMAGE"],
-                    image_config=types.ImageConfig(
-                        image_size=image_size,
+        def _attempt(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                resp = self.client.models.generate_content(
+                    model=model_name,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        response_modalities=["IMAGE"],
+                        image_config=types.ImageConfig(
+                            image_size=image_size,
+                        ),
                     ),
-                ),
-            )
+                )
+            except Exception as e:
+                emit_llm_usage_event(
+                    ctx=ctx,
+                    provider="google",
+                    model=model_name,
+                    operation="models.generate_content",
+                    subtask="image_gen.generate_image_nano_banana",
+                    latency_ms=int((time.time() - t0) * 1000),
+                    success=False,
+                    retry_attempt=permit.attempt,
+                    throttle_ms=permit.throttle_ms,
+                    error_type=type(e).__name__,
+                )
+                raise
             emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
+                ctx=ctx,
                 provider="google",
                 model=model_name,
                 operation="models.generate_content",
                 subtask="image_gen.generate_image_nano_banana",
                 latency_ms=int((time.time() - t0) * 1000),
                 success=True,
-                retry_attempt=1,
+                retry_attempt=permit.attempt,
+                throttle_ms=permit.throttle_ms,
                 usage={**normalize_gemini_usage(resp), "imagesGenerated": 1},
             )
-        except Exception as e:
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="google",
-                model=model_name,
-                operation="models.generate_content",
-                subtask="image_gen.generate_image_nano_banana",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=False,
-                retry_attempt=1,
-                error_type=type(e).__name__,
-            )
-            raise
+            return resp
+        
+        # Shared per-model limiter: spaces requests and retries 429 / RESOURCE_EXHAUSTED
+        resp = call_with_limits("google", model_name, _attempt, estimated_tokens=estimate_tokens(prompt))
         
         data_bytes = self._extract_first_image_bytes(resp)
         if not data_bytes:
@@ -120,43 +130,12 @@ class GeminiService:
     def _enforce_max_size(data: bytes, max_bytes: int = 1_000_000) -> bytes:
         """Compress image to fit within *max_bytes* (default 1 MB).
 
-        Strategy: re-encode as JPEG with progressively lower quality.
+        Strategy: re-encode as JPEG via fit_jpeg (a few encodes, scale and
+        quality chosen from the first one).
         """
         if len(data) <= max_bytes:
             return data
-
-        import PIL.Image
-
-        img = PIL.Image.open(io.BytesIO(data))
-        if img.mode == "RGBA":
-            img = img.convert("RGB")
-
-        for quality in (90, 80, 70, 60, 50, 40, 30):
-            buf = io.BytesIO()
-            img.save(buf, format="JPEG", quality=quality)
-            if buf.tell() <= max_bytes:
-                logger.debug("Compressed image to %d bytes (quality=%d)", buf.tell(), quality)
-                return buf.getvalue()
-
-        # Last resort: scale down until it fits
-        scale = 0.9
-        while scale > 0.1:
-            resized = img.resize(
-                (int(img.width * scale), int(img.height * scale)),
-                PIL.Image.LANCZOS,
-            )
-            buf = io.BytesIO()
-            resized.save(buf, format="JPEG", quality=30)
-            if buf.tell() <= max_bytes:
-                logger.debug(
-                    "Resized image to %dx%d (%d bytes)",
-                    resized.width, resized.height, buf.tell(),
-                )
-                return buf.getvalue()
-            scale -= 0.1
-
-        logger.warning("Could not compress image below %d bytes", max_bytes)
-        return buf.getvalue()
+        return fit_jpeg(data, max_bytes, quality=90).data
 
     def _extract_first_image_bytes(self, response: Any) -> Optional[bytes]:
         """
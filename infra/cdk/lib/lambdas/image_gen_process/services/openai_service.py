@@ -2,6 +2,7 @@
 OpenAI service wrapper for image_gen_process Lambda.
 
 Contains OpenAI API wrappers for vision detection and image generation with usage tracking.
+Every call goes through the shared per-model rate limiter (rate_limit.py).
 """
 
 import base64
@@ -19,6 +20,7 @@ from llm_usage import (
     emit_llm_usage_event,
     normalize_openai_usage,
 )
+from rate_limit import Permit, call_with_limits, estimate_tokens
 
 logger = setup_logging(__name__)
 
@@ -42,7 +44,73 @@ class OpenAIService:
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
         if not self.api_key:
             raise RuntimeError("OPENAI_API_KEY missing")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
+
+    def _limited_call(
+        self,
+        call,
+        *,
+        model: str,
+        operation: str,
+        subtask: str,
+        job_id: Optional[str],
+        estimated_tokens: int,
+        images_generated: int = 0,
+    ) -> Any:
+        """
+        Run one OpenAI request under the rate limiter with per-attempt usage events.
+
+        Args:
+            call: Zero-argument function performing the request.
+            model: Model name (limiter key and telemetry).
+            operation: API operation name for telemetry.
+            subtask: Subtask name for telemetry.
+            job_id: Job ID for usage tracking.
+            estimated_tokens: Token estimate reserved from the limiter.
+            images_generated: Images produced by a successful call.
+
+        Returns:
+            The API response.
+        """
+        ctx = UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN")
+
+        def _attempt(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                resp = call()
+            except Exception as e:
+                emit_llm_usage_event(
+                    ctx=ctx,
+                    provider="openai",
+                    model=model,
+                    operation=operation,
+                    subtask=subtask,
+                    latency_ms=int((time.time() - t0) * 1000),
+                    success=False,
+                    retry_attempt=permit.attempt,
+                    throttle_ms=permit.throttle_ms,
+                    error_type=type(e).__name__,
+                )
+                raise
+            usage = normalize_openai_usage(resp)
+            permit.record_usage(usage)
+            if images_generated:
+                usage = {**usage, "imagesGenerated": images_generated}
+            emit_llm_usage_event(
+                ctx=ctx,
+                provider="openai",
+                model=model,
+                operation=operation,
+                subtask=subtask,
+                latency_ms=int((time.time() - t0) * 1000),
+                success=True,
+                retry_attempt=permit.attempt,
+                throttle_ms=permit.throttle_ms,
+                usage=usage,
+            )
+            return resp
+
+        return call_with_limits("openai", model, _attempt, estimated_tokens=estimated_tokens)
     
     def detect_product_in_image(
         self,
@@ -73,39 +141,34 @@ class OpenAIService:
         prompt = prompt_service.get_prompt("get_detect_product_prompt")
 
         model = os.environ.get("OPENAI_TEXT_MODEL", "gpt-5-mini")
-        t0 = time.time()
-        
-        try:
-            resp = self.client.beta.chat.completions.parse(
-                model=model,
-                messages=[
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
                     {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{img_b64}",
-                                    "detail": "high"
-                                }
-                            }
-                        ]
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/png;base64,{img_b64}",
+                            "detail": "high"
+                        }
                     }
-                ],
-                response_format=ProductDetectionResponse,
-            )
-            
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
+                ]
+            }
+        ]
+        
+        try:
+            resp = self._limited_call(
+                lambda: self.client.beta.chat.completions.parse(
+                    model=model,
+                    messages=messages,
+                    response_format=ProductDetectionResponse,
+                ),
                 model=model,
                 operation="chat.completions.parse",
                 subtask="image_gen.detect_product_in_image",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=True,
-                retry_attempt=1,
-                usage=normalize_openai_usage(resp),
+                job_id=job_id,
+                estimated_tokens=estimate_tokens(messages),
             )
             
             result = resp.choices[0].message.parsed
@@ -119,17 +182,6 @@ class OpenAIService:
             return has_product
             
         except Exception as e:
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
-                model=model,
-                operation="chat.completions.parse",
-                subtask="image_gen.detect_product_in_image",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=False,
-                retry_attempt=1,
-                error_type=type(e).__name__,
-            )
             logger.error("Product detection failed: %s", e)
             # Default to True (support product) if detection fails - safer default
             return True
@@ -162,37 +214,17 @@ class OpenAIService:
         
         prompt = prompt_service.get_prompt("get_summarize_docs_prompt", language=language, text=text)
         model = os.environ.get("OPENAI_TEXT_MODEL", "gpt-5-mini")
-        t0 = time.time()
-        
-        try:
-            resp = self.client.chat.completions.create(
+        resp = self._limited_call(
+            lambda: self.client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
-            )
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
-                model=model,
-                operation="chat.completions.create",
-                subtask="image_gen.summarize_docs_if_needed",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=True,
-                retry_attempt=1,
-                usage=normalize_openai_usage(resp),
-            )
-        except Exception as e:
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
-                model=model,
-                operation="chat.completions.create",
-                subtask="image_gen.summarize_docs_if_needed",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=False,
-                retry_attempt=1,
-                error_type=type(e).__name__,
-            )
-            raise
+            ),
+            model=model,
+            operation="chat.completions.create",
+            subtask="image_gen.summarize_docs_if_needed",
+            job_id=job_id,
+            estimated_tokens=estimate_tokens(prompt),
+        )
         
         content = resp.choices[0].message.content or ""
         return content.strip()
@@ -215,26 +247,19 @@ class OpenAIService:
             LLM response content or None on failure.
         """
         model = os.environ.get("OPENAI_TEXT_MODEL", "gpt-5-mini")
-        t0 = time.time()
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
         
         try:
-            resp = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt}, 
-                    {"role": "user", "content": user_prompt}
-                ],
-            )
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
+            resp = self._limited_call(
+                lambda: self.client.chat.completions.create(model=model, messages=messages),
                 model=model,
                 operation="chat.completions.create",
                 subtask="image_gen.match_angles_to_images",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=True,
-                retry_attempt=1,
-                usage=normalize_openai_usage(resp),
+                job_id=job_id,
+                estimated_tokens=estimate_tokens(messages),
             )
             return resp.choices[0].message.content or ""
         except Exception as e:
@@ -288,39 +313,20 @@ class OpenAIService:
             logger.debug("No product image provided for OpenAI generation")
         
         model = os.environ.get("OPENAI_IMAGE_MODEL", "gpt-4o")
-        t0 = time.time()
-        
-        try:
-            resp = self.client.responses.create(
+        resp = self._limited_call(
+            lambda: self.client.responses.create(
                 model=model,
                 input=[{"role": "user", "content": content}],
                 tools=[{"type": "image_generation"}],
                 max_output_tokens=1000,
-            )
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
-                model=model,
-                operation="responses.create",
-                subtask="image_gen.generate_image_openai",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=True,
-                retry_attempt=1,
-                usage={**normalize_openai_usage(resp), "imagesGenerated": 1},
-            )
-        except Exception as e:
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /image-gen/generate", job_id=job_id, job_type="IMAGE_GEN"),
-                provider="openai",
-                model=model,
-                operation="responses.create",
-                subtask="image_gen.generate_image_openai",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=False,
-                retry_attempt=1,
-                error_type=type(e).__name__,
-            )
-            raise
+            ),
+            model=model,
+            operation="responses.create",
+            subtask="image_gen.generate_image_openai",
+            job_id=job_id,
+            estimated_tokens=estimate_tokens(content),
+            images_generated=1,
+        )
         
         img_b64 = self._extract_image_b64(resp)
         if not img_b64:
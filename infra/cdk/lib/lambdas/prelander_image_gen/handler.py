@@ -17,6 +17,7 @@ from services.aws import get_secrets, configure_from_secrets, update_job_status,
 from services.gemini_service import GeminiService
 from services.cloudflare_service import CloudflareService
 from services.klaviyo_service import KlaviyoEmailService
+from llm_usage import flushes_llm_usage_events
 
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN", ""),
@@ -28,6 +29,7 @@ sentry_sdk.init(
 logger = setup_logging(__name__)
 
 
+@flushes_llm_usage_events
 def lambda_handler(event: dict, context) -> dict:
     """
     Lambda entry point for prelander image generation.
@@ -4,18 +4,24 @@ Lightweight LLM usage event emitter (S3 JSONL).
 Design goals:
 - Best-effort: never raise on emission failures
 - No prompt/response content is written
-- One S3 object per event (single JSON line) to avoid S3 append complexity
+- Off the hot path: events are buffered and written in batches, one
+  compacted JSONL object per job and flush (optionally gzip)
 """
 
 from __future__ import annotations
 
+import atexit
+import functools
+import gzip
 import json
 import logging
 import os
+import queue
+import threading
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import boto3
 
@@ -66,6 +72,186 @@ class UsageContext:
     project_name: Optional[str] = None
 
 
+# Buffered emission: events are queued and written by a background thread as
+# one JSONL object per job and flush, instead of one PUT per LLM call.
+FLUSH_INTERVAL_SECONDS = 30.0
+FLUSH_BATCH_EVENTS = 500
+MAX_QUEUED_EVENTS = 10_000
+
+
+def _env_flag(name: str) -> bool:
+    return (os.environ.get(name) or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class UsageEventBuffer:
+    """
+    Bounded in-memory queue of usage events, flushed to S3 in batches.
+
+    A daemon thread flushes every flush_interval seconds, or sooner once
+    flush_batch events are queued; flush() drains synchronously and is
+    called when the handler exits. Events arriving while the queue is full
+    are dropped and counted rather than blocking the LLM call.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        *,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        flush_batch: int = FLUSH_BATCH_EVENTS,
+        max_queued: int = MAX_QUEUED_EVENTS,
+        compress: bool = False,
+        s3_client=None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.compress = compress
+        self.dropped = 0
+        self.objects_written = 0
+        self._dropped_reported = 0
+        self._s3_client = s3_client
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queued)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, event: Dict[str, Any]) -> bool:
+        """Queue an event without blocking; False if it was dropped."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._ensure_thread()
+        if self._queue.qsize() >= self.flush_batch:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write every queued event to S3.
+
+        Returns:
+            Number of events written.
+        """
+        with self._flush_lock:
+            events: List[Dict[str, Any]] = []
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not events:
+                return 0
+
+            written = 0
+            for (dt, hour, job_part), group in self._group(events).items():
+                try:
+                    self._write(dt, hour, job_part, group)
+                    written += len(group)
+                except Exception as e:
+                    self.dropped += len(group)
+                    logger.debug("Failed to write %d LLM usage events: %s", len(group), e)
+            if self.dropped > self._dropped_reported:
+                logger.warning("LLM usage events dropped so far: %d", self.dropped)
+                self._dropped_reported = self.dropped
+            return written
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="llm-usage-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug("LLM usage flush failed: %s", e)
+
+    @staticmethod
+    def _group(events: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], List[Dict[str, Any]]]:
+        """Group events by the dt/hour/jobId partition of their timestamp."""
+        groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for event in events:
+            ts = str(event.get("timestamp") or "")
+            key = (ts[:10], ts[11:13], event.get("jobId") or "no_job")
+            groups.setdefault(key, []).append(event)
+        return groups
+
+    def _write(self, dt: str, hour: str, job_part: str, events: List[Dict[str, Any]]) -> None:
+        body = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events).encode("utf-8")
+        key = f"{self.prefix}/dt={dt}/hour={hour}/jobId={job_part}/{uuid.uuid4()}.jsonl"
+        put_kwargs: Dict[str, Any] = {"ContentType": "application/x-ndjson"}
+        if self.compress:
+            body = gzip.compress(body)
+            key += ".gz"
+            put_kwargs["ContentEncoding"] = "gzip"
+        if self._s3_client is None:
+            self._s3_client = boto3.client("s3")
+        self._s3_client.put_object(Bucket=self.bucket, Key=key, Body=body, **put_kwargs)
+        self.objects_written += 1
+
+
+_buffer: Optional[UsageEventBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def _get_buffer(bucket: str, prefix: str) -> UsageEventBuffer:
+    """Process-wide buffer for the current bucket/prefix."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None or (_buffer.bucket, _buffer.prefix) != (bucket, prefix):
+            if _buffer is not None:
+                _buffer.flush()
+            _buffer = UsageEventBuffer(
+                bucket,
+                prefix,
+                flush_interval=float(os.environ.get("LLM_USAGE_FLUSH_SECONDS") or FLUSH_INTERVAL_SECONDS),
+                compress=_env_flag("LLM_USAGE_EVENTS_GZIP"),
+            )
+        return _buffer
+
+
+def flush_llm_usage_events() -> int:
+    """
+    Drain buffered usage events to S3 (best-effort).
+
+    Returns:
+        Number of events written.
+    """
+    buffer = _buffer
+    if buffer is None:
+        return 0
+    try:
+        return buffer.flush()
+    except Exception as e:
+        logger.debug("Failed to flush LLM usage events: %s", e)
+        return 0
+
+
+def flushes_llm_usage_events(handler: Callable) -> Callable:
+    """Decorator for Lambda handlers: drain usage events before returning."""
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            flush_llm_usage_events()
+
+    return wrapper
+
+
+# Local runs exit without a handler return
+atexit.register(flush_llm_usage_events)
+
+
 def emit_llm_usage_event(
     *,
     ctx: UsageContext,
@@ -81,6 +267,8 @@ def emit_llm_usage_event(
     error_type: Optional[str] = None,
     usage: Optional[Dict[str, Optional[int]]] = None,
     extra: Optional[Dict[str, Any]] = None,
+    throttle_ms: Optional[int] = None,
+    cache_hit: bool = False,
 ) -> None:
     try:
         bucket = (os.environ.get("RESULTS_BUCKET") or "").strip()
@@ -89,8 +277,6 @@ def emit_llm_usage_event(
         prefix = (os.environ.get("LLM_USAGE_EVENTS_PREFIX") or "llm_usage_events").strip().strip("/")
 
         now = _now_utc()
-        dt = now.strftime("%Y-%m-%d")
-        hour = now.strftime("%H")
         event_id = str(uuid.uuid4())
 
         event: Dict[str, Any] = {
@@ -108,6 +294,8 @@ def emit_llm_usage_event(
             "model": model,
             "operation": operation,
             "latencyMs": latency_ms,
+            "throttleMs": throttle_ms,
+            "cacheHit": bool(cache_hit),
             "success": bool(success),
             "retryAttempt": int(retry_attempt),
             "httpStatus": http_status,
@@ -118,16 +306,7 @@ def emit_llm_usage_event(
         if extra:
             event["extra"] = extra
 
-        job_part = ctx.job_id or "no_job"
-        key = f"{prefix}/dt={dt}/hour={hour}/jobId={job_part}/{event_id}.jsonl"
-        body = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
-
-        boto3.client("s3").put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=body,
-            ContentType="application/x-ndjson",
-        )
+        _get_buffer(bucket, prefix).put(event)
     except Exception as e:
         try:
             logger.debug("Failed to emit LLM usage event: %s", e)
@@ -13,6 +13,7 @@ from llm_usage import (
     emit_llm_usage_event,
     normalize_gemini_usage,
 )
+from rate_limit import Permit, call_with_limits, estimate_tokens
 
 logger = setup_logging(__name__)
 
@@ -64,43 +65,51 @@ class GeminiService:
         
         model_name = "gemini-3-pro-image-preview"
         image_size = "1K"
-        t0 = time.time()
+        ctx = UsageContext(endpoint="POST /prelander-images/generate", job_id=job_id, job_type="PRELANDER_IMAGE_GEN")
         
-        try:
-            resp = self.client.models.generate_content(
-                model=model_name,
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    response_modalities=["IMAGE"],
-                    image_config=types.ImageConfig(
-                        image_size=image_size,
+        def _attempt(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                resp = self.client.models.generate_content(
+                    model=model_name,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        response_modalities=["IMAGE"],
+                        image_config=types.ImageConfig(
+                            image_size=image_size,
+                        ),
                     ),
-                ),
-            )
+                )
+            except Exception as e:
+                emit_llm_usage_event(
+                    ctx=ctx,
+                    provider="google",
+                    model=model_name,
+                    operation="models.generate_content",
+                    subtask="prelander_image_gen.generate_image",
+                    latency_ms=int((time.time() - t0) * 1000),
+                    success=False,
+                    retry_attempt=permit.attempt,
+                    throttle_ms=permit.throttle_ms,
+                    error_type=type(e).__name__,
+                )
+                raise
             emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /prelander-images/generate", job_id=job_id, job_type="PRELANDER_IMAGE_GEN"),
+                ctx=ctx,
                 provider="google",
                 model=model_name,
                 operation="models.generate_content",
                 subtask="prelander_image_gen.generate_image",
                 latency_ms=int((time.time() - t0) * 1000),
                 success=True,
-                retry_attempt=1,
+                retry_attempt=permit.attempt,
+                throttle_ms=permit.throttle_ms,
                 usage={**normalize_gemini_usage(resp), "imagesGenerated": 1},
             )
-        except Exception as e:
-            emit_llm_usage_event(
-                ctx=UsageContext(endpoint="POST /prelander-images/generate", job_id=job_id, job_type="PRELANDER_IMAGE_GEN"),
-                provider="google",
-                model=model_name,
-                operation="models.generate_content",
-                subtask="prelander_image_gen.generate_image",
-                latency_ms=int((time.time() - t0) * 1000),
-                success=False,
-                retry_attempt=1,
-                error_type=type(e).__name__,
-            )
-            raise
+            return resp
+        
+        # Shared per-model limiter: spaces requests and retries 429 / RESOURCE_EXHAUSTED
+        resp = call_with_limits("google", model_name, _attempt, estimated_tokens=estimate_tokens(prompt))
         
         data_bytes = self._extract_first_image_bytes(resp)
         if not data_bytes:
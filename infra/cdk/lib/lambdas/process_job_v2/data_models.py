@@ -1209,6 +1209,39 @@ class CachedResearchData(BaseModel):
     )
 
 
+class CachedPageAnalysis(BaseModel):
+    """
+    Cached Step 1 output for a single sales page URL.
+
+    Lets multi-URL jobs reuse the capture and vision analysis of any URL
+    that an earlier job (single- or multi-URL) already analyzed.
+    """
+    url: str = Field(
+        ...,
+        description="The analyzed URL as originally submitted"
+    )
+    analysis: str = Field(
+        ...,
+        description="Analysis of the page (passed the quality gate)"
+    )
+    analysis_mode: str = Field(
+        default="vision",
+        description="Page analysis mode that produced the analysis ('vision' or 'text')"
+    )
+    product_image: str = Field(
+        ...,
+        description="Base64-encoded JPEG of the top of the page"
+    )
+    cached_at: str = Field(
+        ...,
+        description="ISO timestamp when this cache entry was created"
+    )
+    cache_version: str = Field(
+        default="2.0",
+        description="Version identifier for cache schema, used for invalidation"
+    )
+
+
 # =============================================================================
 # TEMPLATE PREDICTION DATA MODELS
 # =============================================================================
@@ -14,6 +14,7 @@ from sentry_sdk.integrations.aws_lambda import AwsLambdaIntegration
 
 from utils.logging_config import setup_logging
 from pipeline.orchestrator import PipelineOrchestrator, PipelineConfig, create_config_from_event
+from llm_usage import flushes_llm_usage_events
 
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN", ""),
@@ -57,7 +58,10 @@ def run_pipeline(event: dict, context) -> dict:
     aws_request_id = getattr(context, "aws_request_id", None) if context else None
     
     # Initialize the orchestrator
-    orchestrator = PipelineOrchestrator(aws_request_id=aws_request_id)
+    orchestrator = PipelineOrchestrator(
+        aws_request_id=aws_request_id,
+        get_remaining_time_ms=getattr(context, "get_remaining_time_in_millis", None),
+    )
     
     # Create config from event
     config = create_config_from_event(event, orchestrator.aws_services.s3_bucket)
@@ -71,6 +75,7 @@ def run_pipeline(event: dict, context) -> dict:
     }
 
 
+@flushes_llm_usage_events
 def lambda_handler(event: dict, context) -> dict:
     """
     Lambda entry point for processing AI pipeline jobs.
@@ -0,0 +1,279 @@
+"""
+Dependency-driven step executor for process_job_v2 Lambda.
+
+Runs pipeline nodes on one shared, bounded thread pool (DagExecutor) or as
+asyncio tasks under a semaphore (AsyncDagExecutor). Each node starts as soon
+as the nodes it declares as dependencies have finished, instead of waiting
+for a whole stage to complete.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 10
+
+# Coroutines are cheap, so the async executor can keep far more calls in flight
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+@dataclass
+class DagNode:
+    """A single unit of work in the DAG."""
+    name: str
+    func: Callable[..., Any]
+    deps: List[str] = field(default_factory=list)
+
+
+@dataclass
+class NodeTiming:
+    """Timing record for one executed node (seconds relative to run start)."""
+    name: str
+    ready_at: float
+    started_at: float
+    finished_at: float
+    success: bool
+
+    @property
+    def wait_ms(self) -> int:
+        """Time spent queued for a worker after dependencies were satisfied."""
+        return int((self.started_at - self.ready_at) * 1000)
+
+    @property
+    def duration_ms(self) -> int:
+        """Execution time of the node itself."""
+        return int((self.finished_at - self.started_at) * 1000)
+
+
+class DagExecutor:
+    """
+    Executes a set of named nodes respecting declared dependencies.
+
+    Each node's callable receives the results of its dependencies as
+    positional arguments, in the order the dependencies were declared.
+    The first node failure cancels all not-yet-started nodes and is
+    re-raised from run().
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, name: str = "pipeline"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Upper bound on concurrently running nodes.
+            name: Label used in log messages.
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._nodes: Dict[str, DagNode] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, NodeTiming] = {}
+
+    def add_node(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Register a node.
+
+        Args:
+            name: Unique node name.
+            func: Callable invoked with the results of ``deps``.
+            deps: Names of nodes that must finish before this one starts.
+
+        Raises:
+            ValueError: If a node with the same name already exists.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate DAG node: {name}")
+        self._nodes[name] = DagNode(name=name, func=func, deps=list(deps or []))
+
+    def _validate(self) -> None:
+        """
+        Check that all dependencies exist and the graph is acyclic.
+
+        Raises:
+            ValueError: On unknown dependencies or cycles.
+        """
+        for node in self._nodes.values():
+            for dep in node.deps:
+                if dep not in self._nodes:
+                    raise ValueError(f"DAG node '{node.name}' depends on unknown node '{dep}'")
+
+        remaining = {name: set(node.deps) for name, node in self._nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"DAG contains a cycle among: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute all nodes.
+
+        Returns:
+            Mapping of node name to node result.
+
+        Raises:
+            ValueError: If the graph is invalid.
+            Exception: The first exception raised by any node.
+        """
+        self._validate()
+        self.results = {}
+        self.timings = {}
+        if not self._nodes:
+            return self.results
+
+        t0 = time.time()
+        waiting = {name: set(node.deps) for name, node in self._nodes.items()}
+        ready_at: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+
+        def _invoke(node: DagNode, args: List[Any]) -> Any:
+            started = time.time() - t0
+            success = False
+            try:
+                result = node.func(*args)
+                success = True
+                return result
+            finally:
+                self.timings[node.name] = NodeTiming(
+                    name=node.name,
+                    ready_at=ready_at[node.name],
+                    started_at=started,
+                    finished_at=time.time() - t0,
+                    success=success,
+                )
+
+        workers = max(1, min(self.max_workers, len(self._nodes)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            def _submit_ready() -> None:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    node = self._nodes[name]
+                    ready_at[name] = time.time() - t0
+                    args = [self.results[d] for d in node.deps]
+                    running[executor.submit(_invoke, node, args)] = name
+
+            _submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"DAG '{self.name}' node '{name}' failed: {e}")
+                        for pending in running:
+                            pending.cancel()
+                        raise
+                    for deps in waiting.values():
+                        deps.discard(name)
+                _submit_ready()
+
+        self._log_timings(time.time() - t0)
+        return self.results
+
+    def _log_timings(self, total_seconds: float) -> None:
+        """Log a per-node timing summary, ordered by start time."""
+        lines = [
+            f"  {t.name}: start={t.started_at:.2f}s wait={t.wait_ms}ms duration={t.duration_ms}ms"
+            for t in sorted(self.timings.values(), key=lambda t: t.started_at)
+        ]
+        logger.info(
+            f"DAG '{self.name}' finished {len(self.timings)} nodes in {total_seconds:.2f}s\n"
+            + "\n".join(lines)
+        )
+
+
+class AsyncDagExecutor(DagExecutor):
+    """
+    Asyncio variant of DagExecutor.
+
+    Every node runs as a task on the current event loop and awaits the tasks
+    of its dependencies; a semaphore bounds how many node bodies run at once.
+    A node's callable may return an awaitable (awaited) or a plain value;
+    blocking work should be wrapped in asyncio.to_thread by the caller.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, name: str = "pipeline"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_concurrency: Upper bound on concurrently running nodes.
+            name: Label used in log messages.
+        """
+        super().__init__(max_workers=max_concurrency, name=name)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute all nodes.
+
+        Returns:
+            Mapping of node name to node result.
+
+        Raises:
+            ValueError: If the graph is invalid.
+            Exception: The first exception raised by any node.
+        """
+        self._validate()
+        self.results = {}
+        self.timings = {}
+        if not self._nodes:
+            return self.results
+
+        t0 = time.time()
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _invoke(node: DagNode) -> Any:
+            # A failed dependency re-raises here, so dependents never start
+            args = [await tasks[d] for d in node.deps]
+            ready_at = time.time() - t0
+            async with semaphore:
+                started = time.time() - t0
+                success = False
+                try:
+                    result = node.func(*args)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    success = True
+                    return result
+                except Exception as e:
+                    logger.error(f"DAG '{self.name}' node '{node.name}' failed: {e}")
+                    raise
+                finally:
+                    self.timings[node.name] = NodeTiming(
+                        name=node.name,
+                        ready_at=ready_at,
+                        started_at=started,
+                        finished_at=time.time() - t0,
+                        success=success,
+                    )
+
+        tasks = {name: asyncio.create_task(_invoke(node)) for name, node in self._nodes.items()}
+        try:
+            results = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        self.results = dict(zip(tasks, results))
+        self._log_timings(time.time() - t0)
+        return self.results
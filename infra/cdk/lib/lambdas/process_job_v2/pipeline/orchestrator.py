@@ -5,19 +5,34 @@ Coordinates the execution of all pipeline steps and manages
 parallel processing of avatars.
 """
 
+import asyncio
 import json
 import logging
 import os
+import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
+from pydantic import BaseModel
+
+from data_models import (
+    Avatar,
+    AvatarMarketingAngles,
+    CachedResearchData,
+    IdentifiedAvatarList,
+    OfferBrief,
+)
 from llm_usage import UsageContext
 from services.aws import AWSServices
-from services.openai_service import OpenAIService
+from services.openai_service import AsyncOpenAIService, OpenAIService
 from services.perplexity_service import PerplexityService
 from services.cache import ResearchCacheService
+from services.screenshot_cache import ScreenshotCacheService
+from services.response_cache import response_cache_from_env
+from services.checkpoint import CheckpointStore
+from services.lease import WAIT_ACQUIRED, WAIT_READY, ResearchLeaseService
+from pipeline.dag import AsyncDagExecutor, DagExecutor
 from pipeline.steps.analyze_page import AnalyzePageStep
 from pipeline.steps.deep_research import DeepResearchStep
 from pipeline.steps.avatars import AvatarStep
@@ -29,12 +44,34 @@ from services.prompt_service import PromptService
 from services.cloudflare_service import CloudflareService
 from services.klaviyo_service import KlaviyoEmailService
 from services.postgres_notifier import PostgresNotifier
+from utils.metrics import emit_metrics
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DEV_MODE_SOURCE_JOB_ID = "70c7ec82-0abb-4126-a32f-7f376103f00a"
 
+# Worker threads for the per-avatar fan-out (one DAG node each). Not a bound
+# on LLM calls: a templates node whose batched call falls back to per-angle
+# calls runs up to MAX_PARALLEL_PREDICTIONS of them on its own pool, and
+# rate_limit.py is what caps in-flight requests per provider.
+DAG_MAX_WORKERS = 10
+
+# How the per-avatar fan-out runs (PIPELINE_CONCURRENCY):
+#   threads - blocking LLM clients on a DAG_MAX_WORKERS thread pool
+#   async   - async LLM clients on one event loop, bounded by ASYNC_MAX_CONCURRENCY
+CONCURRENCY_THREADS = "threads"
+CONCURRENCY_ASYNC = "async"
+CONCURRENCY_MODES = (CONCURRENCY_THREADS, CONCURRENCY_ASYNC)
+ASYNC_MAX_CONCURRENCY = 100
+
+# Time a job waiting on another job's research must keep for Steps 4-6
+RESEARCH_WAIT_RESERVE_SECONDS = 300
+# Wait cap when the Lambda remaining time is unknown (local runs)
+RESEARCH_WAIT_MAX_SECONDS = 600
+
 
 @dataclass
 class PipelineConfig:
@@ -79,33 +116,70 @@ class PipelineOrchestrator:
     and result aggregation.
     """
     
-    def __init__(self, aws_request_id: Optional[str] = None):
+    def __init__(
+        self,
+        aws_request_id: Optional[str] = None,
+        get_remaining_time_ms: Optional[Callable[[], int]] = None,
+        concurrency_mode: Optional[str] = None,
+    ):
         """
         Initialize the pipeline orchestrator.
         
         Args:
             aws_request_id: AWS Lambda request ID for telemetry.
+            get_remaining_time_ms: Lambda context's remaining-time callback,
+                used to bound how long a job waits on another job's research.
+            concurrency_mode: "threads" or "async" for the per-avatar fan-out;
+                defaults to the PIPELINE_CONCURRENCY env var, then "threads".
         """
         self.aws_request_id = aws_request_id
+        self._get_remaining_time_ms = get_remaining_time_ms
+        self.concurrency_mode = (
+            concurrency_mode or os.environ.get("PIPELINE_CONCURRENCY") or CONCURRENCY_THREADS
+        ).lower()
+        if self.concurrency_mode not in CONCURRENCY_MODES:
+            logger.warning(f"Unknown concurrency mode '{self.concurrency_mode}', using '{CONCURRENCY_THREADS}'")
+            self.concurrency_mode = CONCURRENCY_THREADS
+        # Per-job step checkpoints, set in run()
+        self.checkpoints: Optional[CheckpointStore] = None
         
         # Initialize AWS services
         self.aws_services = AWSServices()
         
-        # Initialize LLM services
+        # Initialize LLM services (response cache is opt-in via LLM_RESPONSE_CACHE)
+        self.response_cache = response_cache_from_env(
+            s3_client=self.aws_services.s3_client,
+            s3_bucket=self.aws_services.s3_bucket,
+        )
         self.openai_service = OpenAIService(
             api_key=self.aws_services.secrets["OPENAI_API_KEY"],
-            aws_request_id=aws_request_id
+            aws_request_id=aws_request_id,
+            response_cache=self.response_cache,
         )
         self.perplexity_service = PerplexityService(
             api_key=self.aws_services.secrets["PERPLEXITY_API_KEY"],
             aws_request_id=aws_request_id
         )
+        self.async_openai_service = AsyncOpenAIService(
+            api_key=self.aws_services.secrets["OPENAI_API_KEY"],
+            aws_request_id=aws_request_id,
+            response_cache=self.response_cache,
+        )
         
         # Initialize cache service
         self.cache_service = ResearchCacheService(
             s3_client=self.aws_services.s3_client,
             s3_bucket=self.aws_services.s3_bucket
         )
+        self.screenshot_cache = ScreenshotCacheService(
+            s3_client=self.aws_services.s3_client,
+            s3_bucket=self.aws_services.s3_bucket
+        )
+        self.lease_service = ResearchLeaseService(
+            ddb_client=self.aws_services.ddb_client,
+            table_name=os.environ.get("RESEARCH_LEASES_TABLE_NAME"),
+            owner_id=aws_request_id or str(uuid.uuid4()),
+        )
         
         # Initialize prompt service (DATABASE_URL is required)
         db_url = self.aws_services.secrets.get("DATABASE_URL")
@@ -118,11 +192,28 @@ class PipelineOrchestrator:
         self._webhook_secret = self.aws_services.secrets.get("WEBHOOK_SECRET", "")
 
         # Initialize pipeline steps
-        self.analyze_page_step = AnalyzePageStep(self.openai_service, prompt_service=self.prompt_service)
+        self.analyze_page_step = AnalyzePageStep(
+            self.openai_service,
+            prompt_service=self.prompt_service,
+            cache_service=self.cache_service,
+            screenshot_cache=self.screenshot_cache,
+        )
         self.deep_research_step = DeepResearchStep(self.perplexity_service, prompt_service=self.prompt_service)
-        self.avatar_step = AvatarStep(self.openai_service, prompt_service=self.prompt_service)
-        self.marketing_step = MarketingStep(self.openai_service, prompt_service=self.prompt_service)
-        self.offer_brief_step = OfferBriefStep(self.openai_service, prompt_service=self.prompt_service)
+        self.avatar_step = AvatarStep(
+            self.openai_service,
+            prompt_service=self.prompt_service,
+            async_openai_service=self.async_openai_service,
+        )
+        self.marketing_step = MarketingStep(
+            self.openai_service,
+            prompt_service=self.prompt_service,
+            async_openai_service=self.async_openai_service,
+        )
+        self.offer_brief_step = OfferBriefStep(
+            self.openai_service,
+            prompt_service=self.prompt_service,
+            async_openai_service=self.async_openai_service,
+        )
 
         # Initialize template prediction step
         self.library_cache = LibrarySummariesCache(
@@ -175,6 +266,7 @@ class PipelineOrchestrator:
         
         self.openai_service.set_usage_context(usage_ctx, self.aws_request_id)
         self.perplexity_service.set_usage_context(usage_ctx, self.aws_request_id)
+        self.async_openai_service.set_usage_context(usage_ctx, self.aws_request_id)
     
     def _handle_dev_mode(self, config: PipelineConfig) -> PipelineResult:
         """
@@ -190,13 +282,10 @@ class PipelineOrchestrator:
         
         try:
             # Load mock results from S3
-            mock_key = f"results/{DEV_MODE_SOURCE_JOB_ID}/comprehensive_results.json"
-            logger.info(f"Loading mock results from S3: {mock_key}")
-            
-            comprehensive_data = self.aws_services.get_object_from_s3(
-                config.s3_bucket, mock_key
+            logger.info(f"Loading mock results from S3 job: {DEV_MODE_SOURCE_JOB_ID}")
+            results = self.aws_services.load_results_from_s3(
+                config.s3_bucket, DEV_MODE_SOURCE_JOB_ID
             )
-            results = comprehensive_data.get("results", {})
             
             # Save as new result
             self.aws_services.save_results_to_s3(
@@ -245,11 +334,34 @@ class PipelineOrchestrator:
             self.aws_services.update_job_status(config.job_id, "FAILED", {"error": str(e)})
             raise
     
+    def _checkpointed(
+        self,
+        name: Optional[str],
+        compute: Callable[[], T],
+        model_cls: Optional[Type[BaseModel]] = None,
+    ) -> T:
+        """Run a step through the job's checkpoint store, if one is active and named."""
+        if self.checkpoints is None or name is None:
+            return compute()
+        return self.checkpoints.resume_or_run(name, compute, model_cls)
+
+    async def _checkpointed_async(
+        self,
+        name: Optional[str],
+        compute: Callable[[], Awaitable[T]],
+        model_cls: Optional[Type[BaseModel]] = None,
+    ) -> T:
+        """Async variant of _checkpointed for coroutine steps."""
+        if self.checkpoints is None or name is None:
+            return await compute()
+        return await self.checkpoints.resume_or_run_async(name, compute, model_cls)
+
     def _complete_avatar_with_beliefs(
         self,
         identified_avatar: Any,
         deep_research_output: str,
         target_product_name: Optional[str] = None,
+        checkpoint_name: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Complete both avatar details and necessary beliefs for a single avatar.
@@ -258,12 +370,17 @@ class PipelineOrchestrator:
             identified_avatar: The identified avatar object.
             deep_research_output: The deep research document.
             target_product_name: Optional product name for consistent naming.
+            checkpoint_name: Optional checkpoint for the avatar details.
 
         Returns:
             Dictionary with avatar details and beliefs.
         """
-        avatar_details = self.avatar_step.complete_avatar_details(
-            identified_avatar, deep_research_output, target_product_name=target_product_name
+        avatar_details = self._checkpointed(
+            checkpoint_name,
+            lambda: self.avatar_step.complete_avatar_details(
+                identified_avatar, deep_research_output, target_product_name=target_product_name
+            ),
+            Avatar,
         )
         # necessary_beliefs = self.avatar_step.complete_necessary_beliefs(
         #     identified_avatar, deep_research_output
@@ -278,6 +395,7 @@ class PipelineOrchestrator:
         result_entry: Dict[str, Any],
         deep_research_output: str,
         target_product_name: Optional[str] = None,
+        checkpoint_name: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Generate marketing angles for a single avatar.
@@ -286,70 +404,393 @@ class PipelineOrchestrator:
             result_entry: Dictionary with avatar details and beliefs.
             deep_research_output: The deep research document.
             target_product_name: Optional product name for consistent naming.
+            checkpoint_name: Optional checkpoint for the generated angles.
 
         Returns:
-            Dictionary with avatar, angles, and beliefs.
+            Dictionary with the avatar, its angles, and the parsed angles
+            object (under "angles_model") for template prediction.
         """
         avatar = result_entry["avatar_details"]
-        angles = self.marketing_step.generate_marketing_angles(avatar, deep_research_output, target_product_name=target_product_name)
-
-        # Step 5c: Generate template predictions for top angles
-        angles_dict = angles.dict()
-        for i, angle_data in enumerate(angles_dict.get("generated_angles", [])):
-            if i < len(angles.generated_angles):
-                angle = angles.generated_angles[i]
-                prediction = self.template_prediction_step.execute(avatar, angle)
-                if prediction:
-                    angles_dict["generated_angles"][i]["template_predictions"] = prediction.dict()
+        angles = self._checkpointed(
+            checkpoint_name,
+            lambda: self.marketing_step.generate_marketing_angles(
+                avatar, deep_research_output, target_product_name=target_product_name
+            ),
+            AvatarMarketingAngles,
+        )
+        logger.info(f"Completed marketing angles for: {avatar.overview.name}")
 
         return {
             "avatar": avatar.dict(),
-            "angles": angles_dict,
+            "angles": angles.dict(),
+            "avatar_model": avatar,
+            "angles_model": angles,
         }
-    
-    def run(self, config: PipelineConfig) -> PipelineResult:
+
+    def _predict_templates_for_avatar(
+        self,
+        angles_entry: Dict[str, Any],
+        checkpoint_name: Optional[str] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
         """
-        Execute the full pipeline.
-        
+        Generate template predictions for every angle of a single avatar.
+
+        All of the avatar's angles are scored in one batched call; a failed
+        prediction yields None and does not fail the avatar. When resuming
+        from a checkpoint, only the angles whose prediction failed are
+        predicted again.
+
         Args:
+            angles_entry: Output of _generate_angles_for_avatar.
+            checkpoint_name: Optional checkpoint for the predictions.
+
+        Returns:
+            List aligned with the avatar's generated angles; each item is the
+            prediction dict or None if prediction failed.
+        """
+        angles = angles_entry["angles_model"].generated_angles
+        checkpoints = self.checkpoints if checkpoint_name else None
+
+        predictions = checkpoints.load(checkpoint_name) if checkpoints else None
+        if not isinstance(predictions, list) or len(predictions) != len(angles):
+            predictions = [None] * len(angles)
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if len(missing) < len(angles):
+            logger.info(f"Resumed {checkpoint_name} from checkpoint; {len(missing)} failed angle(s) to retry")
+        if not missing:
+            return predictions
+
+        fresh = self.template_prediction_step.execute_many(
+            angles_entry["avatar_model"], [angles[i] for i in missing]
+        )
+        for i, prediction in zip(missing, fresh):
+            predictions[i] = prediction.dict() if prediction else None
+        if checkpoints:
+            checkpoints.save(checkpoint_name, predictions)
+        return predictions
+
+    @staticmethod
+    def _marketing_avatar_entry(angles_entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the serializable avatar/angles part of an angles node result."""
+        return {"avatar": angles_entry["avatar"], "angles": angles_entry["angles"]}
+
+    def _run_avatar_dag(
+        self,
+        identified_avatars: List[Any],
+        deep_research_output: str,
+        config: PipelineConfig,
+        product_image: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Run the per-avatar fan-out (Steps 4b-5c) as a dependency graph.
+
+        Each avatar flows through details -> angles -> template predictions
+        independently, so a slow avatar no longer holds back the others.
+        The offer brief waits only on the angle nodes, and the product image
+        upload runs alongside everything else. Every node is checkpointed,
+        so a retried job only reruns the nodes that had not finished.
+
+        Args:
+            identified_avatars: Avatars from Step 4a.
+            deep_research_output: The deep research document.
             config: Pipeline configuration.
-            
+            product_image: Base64 product image (or None).
+
         Returns:
-            PipelineResult with execution outcome.
+            Dictionary with "marketing_avatars", "offer_brief" and "product_image".
+        """
+        dag = DagExecutor(max_workers=DAG_MAX_WORKERS, name=f"job {config.job_id}")
+        target_product_name = config.target_product_name
+        angle_nodes: List[str] = []
+        template_nodes: List[str] = []
+
+        for i, ia in enumerate(identified_avatars):
+            avatar_node, angles_node, templates_node = f"avatar:{i}", f"angles:{i}", f"templates:{i}"
+            dag.add_node(
+                avatar_node,
+                lambda ia=ia, i=i: self._complete_avatar_with_beliefs(
+                    ia, deep_research_output, target_product_name, checkpoint_name=f"avatar_{i}"
+                ),
+            )
+            dag.add_node(
+                angles_node,
+                lambda entry, i=i: self._generate_angles_for_avatar(
+                    entry, deep_research_output, target_product_name, checkpoint_name=f"angles_{i}"
+                ),
+                deps=[avatar_node],
+            )
+            dag.add_node(
+                templates_node,
+                lambda entry, i=i: self._predict_templates_for_avatar(entry, checkpoint_name=f"templates_{i}"),
+                deps=[angles_node],
+            )
+            angle_nodes.append(angles_node)
+            template_nodes.append(templates_node)
+
+        dag.add_node(
+            "offer_brief",
+            lambda *entries: self._checkpointed(
+                "offer_brief",
+                lambda: self.offer_brief_step.create_offer_brief(
+                    [self._marketing_avatar_entry(e) for e in entries],
+                    deep_research_output,
+                    target_product_name=target_product_name,
+                ),
+                OfferBrief,
+            ),
+            deps=angle_nodes,
+        )
+        dag.add_node(
+            "product_image",
+            lambda: self._checkpointed(
+                "product_image", lambda: self._upload_product_image(product_image, config)
+            ),
+        )
+
+        results = dag.run()
+        return self._collect_avatar_results(results, angle_nodes, template_nodes)
+
+    async def _run_avatar_dag_async(
+        self,
+        identified_avatars: List[Any],
+        deep_research_output: str,
+        config: PipelineConfig,
+        product_image: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _run_avatar_dag (PIPELINE_CONCURRENCY=async).
+
+        Builds the same graph, but avatar details, angles and the offer brief
+        await the async OpenAI service on one event loop, so hundreds of calls
+        can be in flight without a thread each. Template prediction and the
+        Cloudflare upload have no async client and run on worker threads.
+
+        Args:
+            identified_avatars: Avatars from Step 4a.
+            deep_research_output: The deep research document.
+            config: Pipeline configuration.
+            product_image: Base64 product image (or None).
+
+        Returns:
+            Dictionary with "marketing_avatars", "offer_brief" and "product_image".
+        """
+        dag = AsyncDagExecutor(max_concurrency=ASYNC_MAX_CONCURRENCY, name=f"job {config.job_id}")
+        target_product_name = config.target_product_name
+        angle_nodes: List[str] = []
+        template_nodes: List[str] = []
+
+        async def _avatar(ia: Any, i: int) -> Dict[str, Any]:
+            avatar_details = await self._checkpointed_async(
+                f"avatar_{i}",
+                lambda: self.avatar_step.complete_avatar_details_async(
+                    ia, deep_research_output, target_product_name=target_product_name
+                ),
+                Avatar,
+            )
+            return {"identified_avatar": ia, "avatar_details": avatar_details}
+
+        async def _angles(entry: Dict[str, Any], i: int) -> Dict[str, Any]:
+            avatar = entry["avatar_details"]
+            angles = await self._checkpointed_async(
+                f"angles_{i}",
+                lambda: self.marketing_step.generate_marketing_angles_async(
+                    avatar, deep_research_output, target_product_name=target_product_name
+                ),
+                AvatarMarketingAngles,
+            )
+            logger.info(f"Completed marketing angles for: {avatar.overview.name}")
+            return {
+                "avatar": avatar.dict(),
+                "angles": angles.dict(),
+                "avatar_model": avatar,
+                "angles_model": angles,
+            }
+
+        for i, ia in enumerate(identified_avatars):
+            avatar_node, angles_node, templates_node = f"avatar:{i}", f"angles:{i}", f"templates:{i}"
+            dag.add_node(avatar_node, lambda ia=ia, i=i: _avatar(ia, i))
+            dag.add_node(angles_node, lambda entry, i=i: _angles(entry, i), deps=[avatar_node])
+            dag.add_node(
+                templates_node,
+                lambda entry, i=i: asyncio.to_thread(
+                    self._predict_templates_for_avatar, entry, checkpoint_name=f"templates_{i}"
+                ),
+                deps=[angles_node],
+            )
+            angle_nodes.append(angles_node)
+            template_nodes.append(templates_node)
+
+        dag.add_node(
+            "offer_brief",
+            lambda *entries: self._checkpointed_async(
+                "offer_brief",
+                lambda: self.offer_brief_step.create_offer_brief_async(
+                    [self._marketing_avatar_entry(e) for e in entries],
+                    deep_research_output,
+                    target_product_name=target_product_name,
+                ),
+                OfferBrief,
+            ),
+            deps=angle_nodes,
+        )
+        dag.add_node(
+            "product_image",
+            lambda: asyncio.to_thread(
+                self._checkpointed,
+                "product_image",
+                lambda: self._upload_product_image(product_image, config),
+            ),
+        )
+
+        results = await dag.run()
+        return self._collect_avatar_results(results, angle_nodes, template_nodes)
+
+    def _collect_avatar_results(
+        self,
+        results: Dict[str, Any],
+        angle_nodes: List[str],
+        template_nodes: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Assemble the avatar DAG's node results into the job result shape.
+
+        Args:
+            results: Node name to result mapping from the DAG run.
+            angle_nodes: Angle node names, in avatar order.
+            template_nodes: Template prediction node names, in avatar order.
+
+        Returns:
+            Dictionary with "marketing_avatars", "offer_brief" and "product_image".
+        """
+        marketing_avatars_list: List[Dict[str, Any]] = []
+        for angles_node, templates_node in zip(angle_nodes, template_nodes):
+            entry = self._marketing_avatar_entry(results[angles_node])
+            for angle_dict, prediction in zip(
+                entry["angles"].get("generated_angles", []), results[templates_node]
+            ):
+                if prediction:
+                    angle_dict["template_predictions"] = prediction
+            marketing_avatars_list.append(entry)
+
+        return {
+            "marketing_avatars": marketing_avatars_list,
+            "offer_brief": results["offer_brief"],
+            "product_image": results["product_image"],
+        }
+
+    def _upload_product_image(self, product_image: Optional[str], config: PipelineConfig) -> Optional[str]:
+        """
+        Upload the product image to Cloudflare CDN.
+
+        Args:
+            product_image: Base64 product image (or None).
+            config: Pipeline configuration.
+
+        Returns:
+            CDN URL on success, otherwise the original value.
         """
+        if not (self.cloudflare_service and product_image):
+            return product_image
         try:
-            logger.info("Starting Prelander Generator pipeline")
-            logger.info(f"Config: job_id={config.job_id}, project={config.project_name}")
-            
-            # Set up telemetry context
-            self._set_usage_context(config)
-            
-            # Update job status to RUNNING
-            self.aws_services.update_job_status(
-                config.job_id, "RUNNING", {"message": "Job started"}
+            return self.cloudflare_service.upload_base64_image(
+                product_image,
+                f"{config.job_id}_product.jpg",
+                {
+                    "source": "process_job_v2",
+                    "job_id": config.job_id,
+                    "project_name": config.project_name,
+                },
             )
-            
-            # Handle dev mode
-            if config.dev_mode:
-                return self._handle_dev_mode(config)
-            
-            # Check cache for deep research results (multi-URL aware)
-            cached_research = self.cache_service.get_cached_research_multi(
+        except Exception as e:
+            logger.warning("Cloudflare upload failed, keeping base64: %s", e)
+            return product_image
+
+    def _research_wait_deadline(self) -> float:
+        """Epoch seconds until which this job may wait on another job's research."""
+        if self._get_remaining_time_ms is None:
+            return time.time() + RESEARCH_WAIT_MAX_SECONDS
+        budget = self._get_remaining_time_ms() / 1000 - RESEARCH_WAIT_RESERVE_SECONDS
+        return time.time() + max(budget, 0)
+
+    def _await_or_lease_research(self, config: PipelineConfig) -> Tuple[Optional[CachedResearchData], Optional[str]]:
+        """
+        Single-flight guard for Steps 1-3 after a research cache miss.
+
+        Either takes the lease for the research cache key, or waits for the
+        job holding it to publish its research to the cache.
+
+        Args:
+            config: Pipeline configuration.
+
+        Returns:
+            Tuple of (cached research or None, lease key to release or None).
+            When no research is returned the caller computes it.
+        """
+        lease_key = ResearchCacheService.get_multi_url_cache_key(
+            config.sales_page_urls, target_product_name=config.target_product_name
+        )
+        if self.lease_service.try_acquire(lease_key):
+            return None, lease_key
+
+        logger.info("Identical research is already running in another job - waiting for its result")
+        started = time.time()
+        cached_research, outcome = self.lease_service.wait_for(
+            lease_key,
+            check=lambda: self.cache_service.get_cached_research_multi(
                 config.sales_page_urls, target_product_name=config.target_product_name
-            )
+            ),
+            deadline=self._research_wait_deadline(),
+        )
+        waited = time.time() - started
+        logger.info(f"Research single-flight wait ended after {waited:.1f}s: {outcome}")
+
+        emit_metrics(
+            {
+                "ResearchDuplicateAvoided": 1 if outcome == WAIT_READY else 0,
+                "ResearchLeaseTakeover": 1 if outcome == WAIT_ACQUIRED else 0,
+                "ResearchLeaseWaitTimeout": 0 if outcome in (WAIT_READY, WAIT_ACQUIRED) else 1,
+                "ResearchLeaseWaitSeconds": waited,
+            },
+            units={"ResearchLeaseWaitSeconds": "Seconds"},
+        )
+        return cached_research, lease_key if outcome == WAIT_ACQUIRED else None
 
-            if cached_research:
-                # Cache HIT - use cached data and skip Steps 1-3
-                logger.info("Using cached research data - skipping Steps 1-3")
-                research_page_analysis = cached_research.research_page_analysis
-                deep_research_prompt = cached_research.deep_research_prompt
-                deep_research_output = cached_research.deep_research_output
-                # Still capture product image (not cached — it's large base64 data)
-                logger.info("Capturing product image for cached research")
-                product_image = self.analyze_page_step.capture_product_image_only(config.primary_sales_page_url)
-            else:
-                # Cache MISS - execute Steps 1-3 and cache results
+    def _run_research(self, config: PipelineConfig) -> Dict[str, Any]:
+        """
+        Steps 1-3: page analysis, research prompt and deep research.
 
+        Served from the research cache when possible; otherwise computed
+        under a single-flight lease and cached.
+
+        Args:
+            config: Pipeline configuration.
+
+        Returns:
+            Dictionary with research_page_analysis, deep_research_prompt,
+            deep_research_output and product_image.
+        """
+        # Check cache for deep research results (multi-URL aware)
+        cached_research = self.cache_service.get_cached_research_multi(
+            config.sales_page_urls, target_product_name=config.target_product_name
+        )
+        logger.info(f"Research cache tier stats: {self.cache_service.stats()}")
+
+        lease_key = None
+        if not cached_research:
+            cached_research, lease_key = self._await_or_lease_research(config)
+
+        if cached_research:
+            # Cache HIT - use cached data and skip Steps 1-3
+            logger.info("Using cached research data - skipping Steps 1-3")
+            research_page_analysis = cached_research.research_page_analysis
+            deep_research_prompt = cached_research.deep_research_prompt
+            deep_research_output = cached_research.deep_research_output
+            # Product image comes from the screenshot cache when the page is unchanged
+            logger.info("Fetching product image for cached research")
+            product_image = self.analyze_page_step.capture_product_image_only(config.primary_sales_page_url)
+        else:
+            # Cache MISS - execute Steps 1-3 and cache results
+            try:
                 # Step 1: Analyze research page(s)
                 logger.info(f"Step 1: Analyzing {len(config.sales_page_urls)} research page(s)")
                 research_page_analysis, product_image = self.analyze_page_step.execute_multiple(
@@ -380,86 +821,79 @@ class PipelineOrchestrator:
                     deep_research_output=deep_research_output,
                     target_product_name=config.target_product_name,
                 )
+            finally:
+                if lease_key:
+                    self.lease_service.release(lease_key)
+
+        return {
+            "research_page_analysis": research_page_analysis,
+            "deep_research_prompt": deep_research_prompt,
+            "deep_research_output": deep_research_output,
+            "product_image": product_image,
+        }
+
+    def run(self, config: PipelineConfig) -> PipelineResult:
+        """
+        Execute the full pipeline.
+        
+        Args:
+            config: Pipeline configuration.
             
-            # Step 4: Identify and complete avatars
-            logger.info("Step 4a: Identifying avatars")
-            identified_avatars = self.avatar_step.identify_avatars(deep_research_output, target_product_name=config.target_product_name)
-            
-            logger.info(
-                f"Step 4b: Completing details AND necessary beliefs for "
-                f"{len(identified_avatars.avatars)} avatars in parallel"
-            )
-            
-            # Run avatar completions in parallel
-            avatar_results: List[Dict[str, Any]] = []
-            max_workers = min(10, len(identified_avatars.avatars))
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(
-                        self._complete_avatar_with_beliefs, ia, deep_research_output, config.target_product_name
-                    ): ia
-                    for ia in identified_avatars.avatars
-                }
-                for future in as_completed(futures):
-                    ia = futures[future]
-                    try:
-                        result = future.result()
-                        avatar_results.append(result)
-                        logger.info(f"Completed avatar details + beliefs for: {ia.name}")
-                    except Exception as e:
-                        logger.error(f"Failed to complete avatar for {ia.name}: {e}")
-                        raise
+        Returns:
+            PipelineResult with execution outcome.
+        """
+        try:
+            logger.info("Starting Prelander Generator pipeline")
+            logger.info(f"Config: job_id={config.job_id}, project={config.project_name}")
             
-            # Step 5: Generate marketing angles for each avatar
-            logger.info("Step 5: Generating marketing angles")
+            # Set up telemetry context
+            self._set_usage_context(config)
             
-            marketing_avatars_list: List[Dict[str, Any]] = []
-            max_workers = min(10, len(avatar_results))
+            # Update job status to RUNNING
+            self.aws_services.update_job_status(
+                config.job_id, "RUNNING", {"message": "Job started"}
+            )
             
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(
-                        self._generate_angles_for_avatar, result_entry, deep_research_output, config.target_product_name
-                    ): result_entry
-                    for result_entry in avatar_results
-                }
-                for future in as_completed(futures):
-                    result_entry = futures[future]
-                    try:
-                        result = future.result()
-                        marketing_avatars_list.append(result)
-                        logger.info(
-                            f"Completed marketing angles for: "
-                            f"{result_entry['avatar_details'].overview.name}"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to generate angles for "
-                            f"{result_entry['avatar_details'].overview.name}: {e}"
-                        )
-                        raise
+            # Handle dev mode
+            if config.dev_mode:
+                return self._handle_dev_mode(config)
             
-            # Step 5b: Generate Offer Brief
-            logger.info("Step 5b: Generating Offer Brief")
-            offer_brief = self.offer_brief_step.create_offer_brief(
-                marketing_avatars_list, deep_research_output, target_product_name=config.target_product_name
+            # Steps 1-3: page analysis and deep research (checkpointed)
+            self.checkpoints = CheckpointStore(
+                self.aws_services.s3_client, config.s3_bucket, config.job_id
+            )
+            research = self._checkpointed("research", lambda: self._run_research(config))
+            research_page_analysis = research["research_page_analysis"]
+            deep_research_prompt = research["deep_research_prompt"]
+            deep_research_output = research["deep_research_output"]
+            product_image = research["product_image"]
+
+            # Step 4: Identify and complete avatars
+            logger.info("Step 4a: Identifying avatars")
+            identified_avatars = self._checkpointed(
+                "identified_avatars",
+                lambda: self.avatar_step.identify_avatars(
+                    deep_research_output, target_product_name=config.target_product_name
+                ),
+                IdentifiedAvatarList,
             )
             
-            # Upload product image to Cloudflare CDN
-            if self.cloudflare_service and product_image:
-                try:
-                    product_image = self.cloudflare_service.upload_base64_image(
-                        product_image,
-                        f"{config.job_id}_product.jpg",
-                        {
-                            "source": "process_job_v2",
-                            "job_id": config.job_id,
-                            "project_name": config.project_name,
-                        },
-                    )
-                except Exception as e:
-                    logger.warning("Cloudflare upload failed, keeping base64: %s", e)
+            logger.info(
+                f"Steps 4b-5c: Completing {len(identified_avatars.avatars)} avatars, "
+                f"their marketing angles, template predictions and the Offer Brief "
+                f"({self.concurrency_mode})"
+            )
+            if self.concurrency_mode == CONCURRENCY_ASYNC:
+                dag_results = asyncio.run(self._run_avatar_dag_async(
+                    identified_avatars.avatars, deep_research_output, config, product_image
+                ))
+            else:
+                dag_results = self._run_avatar_dag(
+                    identified_avatars.avatars, deep_research_output, config, product_image
+                )
+            marketing_avatars_list = dag_results["marketing_avatars"]
+            offer_brief = dag_results["offer_brief"]
+            product_image = dag_results["product_image"]
 
             # Step 6: Save results
             logger.info("Step 6: Saving results")
@@ -476,6 +910,9 @@ class PipelineOrchestrator:
             self.aws_services.save_results_to_s3(
                 all_results, config.s3_bucket, config.project_name, config.job_id
             )
+            # The results are durable now; the checkpoints (including the
+            # research one with the product image) are no longer needed
+            self.checkpoints.clear()
             
             # Update job status to SUCCEEDED
             logger.info("Pipeline completed successfully")
@@ -1,26 +1,61 @@
 """
 Page analysis pipeline step.
 
-Captures and analyzes a sales page using vision AI.
+Captures and analyzes a sales page using vision AI, either from a full-page
+screenshot or from the page's DOM text plus a top-of-page image.
 """
 
+import base64
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
 from utils.image import (
     capture_page_screenshots,
-    compress_image_if_needed,
     compress_to_base64,
 )
 from services.openai_service import OpenAIService
 from services.prompt_service import PromptService
+from services.cache import ResearchCacheService
+from services.screenshot_cache import MISS, ScreenshotCacheService
 from data_models import PageAnalysisQualityCheck
 
 
 logger = logging.getLogger(__name__)
 
+# How the page is presented to the analysis model (PAGE_ANALYSIS_MODE):
+# "vision" sends the full-page screenshot, "text" sends the visible DOM text
+# in reading order plus a small top-of-page image.
+ANALYSIS_MODE_VISION = "vision"
+ANALYSIS_MODE_TEXT = "text"
+ANALYSIS_MODES = (ANALYSIS_MODE_VISION, ANALYSIS_MODE_TEXT)
+
+# Text mode falls back to vision below this much extracted text
+MIN_PAGE_TEXT_CHARS = 500
+
+# Budget for the top-of-page image sent alongside the page text
+TEXT_MODE_IMAGE_MAX_MB = 0.2
+
+PAGE_TEXT_INTRO = (
+    "The sales page is provided below as its visible text in reading order "
+    "(\"#\" marks headings, \"- \" list items, ~~text~~ struck-through prices, "
+    "[image: ...] image alt text), followed by a screenshot of the top of the page.\n\n"
+)
+
+
+def _screenshot_to_base64(image_bytes: bytes, max_size_mb: float) -> str:
+    """
+    Base64-encode a captured screenshot, re-encoding only if it is over budget.
+
+    Captures are JPEG already, so one that fits is encoded as-is without
+    being decoded; anything else goes through a single compress_to_base64 pass.
+    """
+    if image_bytes[:3] == b"\xff\xd8\xff" and len(image_bytes) <= int(max_size_mb * 1024 * 1024):
+        return base64.b64encode(image_bytes).decode("utf-8")
+    return compress_to_base64(image_bytes, max_size_mb=max_size_mb)
+
 
 class PageAnalysisQualityError(Exception):
     """Raised when the sales page analysis fails quality checks."""
@@ -41,25 +76,44 @@ class AnalyzePageStep:
     Captures a full-page screenshot and analyzes it using vision AI
     to extract product information, claims, and target customer insights.
     Also captures a product image (top portion of the page) for display.
+    Analyses are cached per URL, so only URLs not seen before are captured.
     """
 
-    def __init__(self, openai_service: OpenAIService, prompt_service: PromptService):
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        prompt_service: PromptService,
+        cache_service: Optional[ResearchCacheService] = None,
+        screenshot_cache: Optional[ScreenshotCacheService] = None,
+        analysis_mode: Optional[str] = None,
+    ):
         """
         Initialize the page analysis step.
 
         Args:
             openai_service: OpenAI service for vision analysis.
             prompt_service: PromptService for DB-stored prompts.
+            cache_service: Optional cache for per-URL analyses and product images.
+            screenshot_cache: Optional URL-keyed product image cache.
+            analysis_mode: "vision" or "text"; defaults to the PAGE_ANALYSIS_MODE
+                env var, then "vision".
         """
         self.openai_service = openai_service
         self.prompt_service = prompt_service
+        self.cache_service = cache_service
+        self.screenshot_cache = screenshot_cache
+        self.analysis_mode = (analysis_mode or os.environ.get("PAGE_ANALYSIS_MODE") or ANALYSIS_MODE_VISION).lower()
+        if self.analysis_mode not in ANALYSIS_MODES:
+            logger.warning(f"Unknown page analysis mode '{self.analysis_mode}', using '{ANALYSIS_MODE_VISION}'")
+            self.analysis_mode = ANALYSIS_MODE_VISION
 
     def execute(self, sales_page_url: str) -> PageAnalysisResult:
         """
         Analyze a sales page using GPT-5 Vision.
 
-        Captures both a full-page screenshot (for vision analysis) and a product
-        image (top 800px for display) in a single browser session.
+        Captures the page and a product image (top 800px for display) in a
+        single browser session. In vision mode the model reads a full-page
+        screenshot; in text mode it gets the extracted page text instead.
 
         Args:
             sales_page_url: URL of the sales page to analyze.
@@ -71,37 +125,14 @@ class AnalyzePageStep:
             Exception: If page capture or analysis fails.
         """
         try:
-            logger.info(f"Capturing page: {sales_page_url}")
-
-            # Capture both screenshots in one browser session
-            try:
-                screenshots = capture_page_screenshots(sales_page_url)
-                # Compress full-page for vision API (max 480KB)
-                compressed_bytes = compress_image_if_needed(screenshots.fullpage_bytes, max_size_mb=0.48)
-                logger.info(
-                    f"Images captured for {sales_page_url}. "
-                    f"Full-page original: {len(screenshots.fullpage_bytes)}, "
-                    f"Compressed: {len(compressed_bytes)}, "
-                    f"Product image: {len(screenshots.product_image_bytes)}"
-                )
-                base64_image = compress_to_base64(compressed_bytes, max_size_mb=0.48)
-                # Compress product image to base64 (max 0.5MB)
-                product_image_b64 = compress_to_base64(screenshots.product_image_bytes, max_size_mb=0.5)
-            except Exception as e:
-                logger.error(f"Failed to capture or encode image from {sales_page_url}: {e}")
-                raise
-
-            # Build content payload with text and image
-            prompt = self.prompt_service.get_prompt("get_analyze_research_page_prompt")
-            content_payload: List[Dict[str, Any]] = [
-                {"type": "input_text", "text": prompt},
-                {"type": "input_image", "image_url": f"data:image/jpeg;base64,{base64_image}"}
-            ]
+            logger.info(f"Capturing page: {sales_page_url} ({self.analysis_mode} mode)")
+            content_payload, screenshots, subtask = self._build_content(sales_page_url)
+            product_image_b64 = _screenshot_to_base64(screenshots.product_image_bytes, max_size_mb=0.5)
 
-            logger.info("Calling GPT-5 Vision API for research page analysis")
+            logger.info(f"Calling GPT-5 Vision API for research page analysis ({subtask})")
             analysis = self.openai_service.create_response(
                 content=content_payload,
-                subtask="process_job_v2.analyze_research_page"
+                subtask=subtask,
             )
             logger.info("GPT-5 Vision API call completed for research page analysis")
 
@@ -135,6 +166,8 @@ class AnalyzePageStep:
                 f"for {sales_page_url}"
             )
 
+            self._save_screenshot(sales_page_url, screenshots)
+
             return PageAnalysisResult(
                 analysis=analysis,
                 product_image=product_image_b64,
@@ -144,6 +177,68 @@ class AnalyzePageStep:
             logger.error(f"Error analyzing research page: {e}")
             raise
 
+    def _build_content(self, sales_page_url: str) -> Tuple[List[Dict[str, Any]], Any, str]:
+        """
+        Capture the page and build the analysis request for the current mode.
+
+        Vision mode sends the full-page screenshot. Text mode sends the DOM
+        text plus a smaller copy of the top-of-page image, and falls back to
+        vision mode when the page yields too little text (e.g. image-only
+        pages); the capture then takes the full-page screenshot in the same
+        browser session instead of loading the page again.
+
+        Args:
+            sales_page_url: URL of the sales page to analyze.
+
+        Returns:
+            Tuple of (content payload, PageScreenshots, usage subtask).
+        """
+        prompt = self.prompt_service.get_prompt("get_analyze_research_page_prompt")
+
+        if self.analysis_mode == ANALYSIS_MODE_TEXT:
+            screenshots = capture_page_screenshots(
+                sales_page_url, extract_text=True, fullpage=False, min_text_chars=MIN_PAGE_TEXT_CHARS
+            )
+            page_text = screenshots.page_text or ""
+            if len(page_text) >= MIN_PAGE_TEXT_CHARS:
+                hero_b64 = _screenshot_to_base64(screenshots.product_image_bytes, max_size_mb=TEXT_MODE_IMAGE_MAX_MB)
+                logger.info(
+                    f"Page captured for {sales_page_url}. Text: {len(page_text)} chars, "
+                    f"Product image: {len(screenshots.product_image_bytes)}"
+                )
+                return [
+                    {"type": "input_text", "text": prompt},
+                    {"type": "input_text", "text": PAGE_TEXT_INTRO + page_text},
+                    {"type": "input_image", "image_url": f"data:image/jpeg;base64,{hero_b64}"},
+                ], screenshots, "process_job_v2.analyze_research_page_text"
+            logger.warning(
+                f"Only {len(page_text)} chars of text on {sales_page_url}, falling back to the full-page screenshot"
+            )
+        else:
+            # Capture both screenshots in one browser session
+            try:
+                screenshots = capture_page_screenshots(sales_page_url)
+            except Exception as e:
+                logger.error(f"Failed to capture image from {sales_page_url}: {e}")
+                raise
+
+        logger.info(
+            f"Images captured for {sales_page_url}. "
+            f"Full-page: {len(screenshots.fullpage_bytes)}, "
+            f"Product image: {len(screenshots.product_image_bytes)}"
+        )
+        try:
+            # Captures are JPEG already; re-encoded at most once to fit the vision API (max 480KB)
+            base64_image = _screenshot_to_base64(screenshots.fullpage_bytes, max_size_mb=0.48)
+        except Exception as e:
+            logger.error(f"Failed to encode image from {sales_page_url}: {e}")
+            raise
+
+        return [
+            {"type": "input_text", "text": prompt},
+            {"type": "input_image", "image_url": f"data:image/jpeg;base64,{base64_image}"}
+        ], screenshots, "process_job_v2.analyze_research_page"
+
     def _check_analysis_quality(
         self, analysis_text: str, sales_page_url: str
     ) -> PageAnalysisQualityCheck:
@@ -174,11 +269,26 @@ class AnalyzePageStep:
             model="gpt-5-mini",
         )
 
+    def _save_screenshot(self, sales_page_url: str, screenshots: Any) -> None:
+        """Store a fresh capture in the screenshot cache; failures never fail the job."""
+        if not self.screenshot_cache:
+            return
+        try:
+            self.screenshot_cache.save(
+                sales_page_url, screenshots.product_image_bytes, screenshots.validators
+            )
+        except Exception as e:
+            logger.warning(f"Error saving screenshot cache for URL {sales_page_url}: {e}")
+
     def capture_product_image_only(self, sales_page_url: str) -> str:
         """
         Capture only the product image (top 800px) for cache-hit scenarios.
 
-        Used when research data is cached but we still need a fresh product image.
+        Used when research data is cached but we still need a product image.
+        Serves a fresh screenshot cache entry before falling back to a browser
+        capture. The image cached alongside the URL's page analysis carries no
+        validators, so it is only used when the screenshot cache has no entry
+        at all, never to override an expired or changed one.
 
         Args:
             sales_page_url: URL of the sales page to capture.
@@ -186,35 +296,43 @@ class AnalyzePageStep:
         Returns:
             Base64-encoded JPEG of the product image.
         """
-        logger.info(f"Capturing product image only for: {sales_page_url}")
-        screenshots = capture_page_screenshots(sales_page_url)
-        return compress_to_base64(screenshots.product_image_bytes, max_size_mb=0.5)
+        screenshot_state = MISS
+        if self.screenshot_cache:
+            cached_image, screenshot_state = self.screenshot_cache.lookup(sales_page_url)
+            if cached_image:
+                return _screenshot_to_base64(cached_image, max_size_mb=0.5)
 
-    def execute_multiple(self, sales_page_urls: List[str]) -> Tuple[str, str]:
-        """
-        Analyze one or more sales pages.
+        if self.cache_service and screenshot_state == MISS:
+            cached = self.cache_service.get_page_analysis(sales_page_url, self.analysis_mode)
+            if cached:
+                return cached.product_image
 
-        For a single URL, delegates to ``execute()``.
-        For multiple URLs, analyzes all in parallel using a thread pool,
-        then combines the analyses with labeled sections.
+        logger.info(f"Capturing product image only for: {sales_page_url}")
+        screenshots = capture_page_screenshots(sales_page_url)
+        self._save_screenshot(sales_page_url, screenshots)
+        return _screenshot_to_base64(screenshots.product_image_bytes, max_size_mb=0.5)
 
-        Args:
-            sales_page_urls: List of 1-3 URLs to analyze.
+    def _cached_results(self, sales_page_urls: List[str]) -> Dict[str, PageAnalysisResult]:
+        """Return cached analyses for whichever URLs have one."""
+        if not self.cache_service:
+            return {}
+        results: Dict[str, PageAnalysisResult] = {}
+        for url in dict.fromkeys(sales_page_urls):
+            cached = self.cache_service.get_page_analysis(url, self.analysis_mode)
+            if cached:
+                results[url] = PageAnalysisResult(
+                    analysis=cached.analysis,
+                    product_image=cached.product_image,
+                )
+        return results
 
-        Returns:
-            Tuple of (combined_analysis, product_image_base64).
-            The product image comes from the first (primary) URL.
+    def _analyze_uncached(self, sales_page_urls: List[str]) -> Dict[str, PageAnalysisResult]:
+        """
+        Capture and analyze URLs in parallel, caching each successful result.
 
         Raises:
-            PageAnalysisQualityError: If any URL fails the quality gate.
-            Exception: If any URL fails to be captured/analyzed.
+            Exception: The first failure, after all URLs have finished.
         """
-        if len(sales_page_urls) == 1:
-            result = self.execute(sales_page_urls[0])
-            return result.analysis, result.product_image
-
-        logger.info(f"Analyzing {len(sales_page_urls)} URLs in parallel")
-
         results: Dict[str, PageAnalysisResult] = {}
         errors: Dict[str, Exception] = {}
 
@@ -231,12 +349,51 @@ class AnalyzePageStep:
                 except Exception as e:
                     logger.error(f"Failed to analyze URL {url}: {e}")
                     errors[url] = e
+                    continue
+                if self.cache_service:
+                    self.cache_service.save_page_analysis(
+                        url, results[url].analysis, results[url].product_image, self.analysis_mode
+                    )
 
         # Fail-fast: if any URL failed, raise the first error
         if errors:
             first_url = next(iter(errors))
             raise errors[first_url]
 
+        return results
+
+    def execute_multiple(self, sales_page_urls: List[str]) -> Tuple[str, str]:
+        """
+        Analyze one or more sales pages.
+
+        URLs with a cached analysis are reused; the rest are captured and
+        analyzed in parallel using a thread pool. For multiple URLs the
+        analyses are combined with labeled sections.
+
+        Args:
+            sales_page_urls: List of 1-3 URLs to analyze.
+
+        Returns:
+            Tuple of (combined_analysis, product_image_base64).
+            The product image comes from the first (primary) URL.
+
+        Raises:
+            PageAnalysisQualityError: If any URL fails the quality gate.
+            Exception: If any URL fails to be captured/analyzed.
+        """
+        results = self._cached_results(sales_page_urls)
+        pending = [url for url in dict.fromkeys(sales_page_urls) if url not in results]
+        logger.info(
+            f"Analyzing {len(pending)} of {len(sales_page_urls)} URL(s) "
+            f"({len(results)} reused from cache)"
+        )
+        if pending:
+            results.update(self._analyze_uncached(pending))
+
+        if len(sales_page_urls) == 1:
+            result = results[sales_page_urls[0]]
+            return result.analysis, result.product_image
+
         # Combine analyses in original URL order with clear labels
         combined_parts: List[str] = []
         for i, url in enumerate(sales_page_urls, start=1):
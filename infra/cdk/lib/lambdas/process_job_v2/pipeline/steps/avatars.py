@@ -7,8 +7,8 @@ Identifies customer avatars from research and completes their profiles.
 import logging
 from typing import Any, Optional
 
-from services.openai_service import OpenAIService
-from services.prompt_service import PromptService
+from services.openai_service import AsyncOpenAIService, OpenAIService
+from services.prompt_service import PromptParts, PromptService
 from data_models import Avatar, IdentifiedAvatarList
 
 
@@ -23,16 +23,23 @@ class AvatarStep:
     then completes detailed profiles and necessary beliefs for each.
     """
 
-    def __init__(self, openai_service: OpenAIService, prompt_service: PromptService):
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        prompt_service: PromptService,
+        async_openai_service: Optional[AsyncOpenAIService] = None,
+    ):
         """
         Initialize the avatar step.
 
         Args:
             openai_service: OpenAI service for LLM operations.
             prompt_service: PromptService for DB-stored prompts.
+            async_openai_service: Async OpenAI service for the *_async methods.
         """
         self.openai_service = openai_service
         self.prompt_service = prompt_service
+        self.async_openai_service = async_openai_service
     
     def identify_avatars(self, deep_research_output: str, target_product_name: Optional[str] = None) -> IdentifiedAvatarList:
         """
@@ -48,17 +55,19 @@ class AvatarStep:
             Exception: If avatar identification fails.
         """
         try:
-            prompt = self.prompt_service.get_prompt(
+            prompt = self.prompt_service.get_prompt_parts(
                 "get_identify_avatars_prompt",
+                shared_context_key="deep_research_output",
                 deep_research_output=deep_research_output,
                 target_product_name=target_product_name if target_product_name else "Not specified",
             )
             
             logger.info("Calling GPT-5 API to identify avatars")
             result = self.openai_service.parse_structured(
-                prompt=prompt,
+                prompt=prompt.instructions,
                 response_format=IdentifiedAvatarList,
-                subtask="process_job_v2.identify_avatars"
+                subtask="process_job_v2.identify_avatars",
+                shared_context=prompt.shared_context,
             )
             logger.info("GPT-5 API call completed for avatar identification")
             
@@ -88,19 +97,14 @@ class AvatarStep:
             Exception: If avatar completion fails.
         """
         try:
-            kwargs = dict(
-                avatar_name=identified_avatar.name,
-                avatar_description=identified_avatar.description,
-                deep_research_output=deep_research_output,
-                target_product_name=target_product_name if target_product_name else "Not specified",
-            )
-            prompt = self.prompt_service.get_prompt("get_complete_avatar_details_prompt", **kwargs)
+            prompt = self._avatar_details_prompt(identified_avatar, deep_research_output, target_product_name)
             
             logger.info(f"Calling GPT-5 API to complete avatar details for {identified_avatar.name}")
             result = self.openai_service.parse_structured(
-                prompt=prompt,
+                prompt=prompt.instructions,
                 response_format=Avatar,
-                subtask=f"process_job_v2.complete_avatar_details.{identified_avatar.name}"
+                subtask=f"process_job_v2.complete_avatar_details.{identified_avatar.name}",
+                shared_context=prompt.shared_context,
             )
             logger.info(f"GPT-5 API call completed for avatar details: {identified_avatar.name}")
             
@@ -110,6 +114,60 @@ class AvatarStep:
             logger.error(f"Error completing avatar details for {identified_avatar.name}: {e}")
             raise
     
+    async def complete_avatar_details_async(
+        self,
+        identified_avatar: Any,
+        deep_research_output: str,
+        target_product_name: Optional[str] = None,
+    ) -> Avatar:
+        """
+        Async variant of complete_avatar_details using the async OpenAI service.
+
+        Args:
+            identified_avatar: The identified avatar object (with name and description).
+            deep_research_output: The raw deep research document.
+
+        Returns:
+            Complete Avatar object with all profile details.
+
+        Raises:
+            Exception: If avatar completion fails.
+        """
+        try:
+            prompt = self._avatar_details_prompt(identified_avatar, deep_research_output, target_product_name)
+
+            logger.info(f"Calling GPT-5 API to complete avatar details for {identified_avatar.name}")
+            result = await self.async_openai_service.parse_structured(
+                prompt=prompt.instructions,
+                response_format=Avatar,
+                subtask=f"process_job_v2.complete_avatar_details.{identified_avatar.name}",
+                shared_context=prompt.shared_context,
+            )
+            logger.info(f"GPT-5 API call completed for avatar details: {identified_avatar.name}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error completing avatar details for {identified_avatar.name}: {e}")
+            raise
+
+    def _avatar_details_prompt(
+        self,
+        identified_avatar: Any,
+        deep_research_output: str,
+        target_product_name: Optional[str],
+    ) -> PromptParts:
+        """Render the avatar details prompt (research as shared context when configured)."""
+        kwargs = dict(
+            avatar_name=identified_avatar.name,
+            avatar_description=identified_avatar.description,
+            deep_research_output=deep_research_output,
+            target_product_name=target_product_name if target_product_name else "Not specified",
+        )
+        return self.prompt_service.get_prompt_parts(
+            "get_complete_avatar_details_prompt", shared_context_key="deep_research_output", **kwargs
+        )
+
     def complete_necessary_beliefs(
         self,
         identified_avatar: Any,
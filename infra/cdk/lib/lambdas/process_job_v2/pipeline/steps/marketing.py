@@ -7,8 +7,8 @@ Generates marketing angles for customer avatars.
 import logging
 from typing import Optional
 
-from services.openai_service import OpenAIService
-from services.prompt_service import PromptService
+from services.openai_service import AsyncOpenAIService, OpenAIService
+from services.prompt_service import PromptParts, PromptService
 from data_models import Avatar, AvatarMarketingAngles
 
 
@@ -23,16 +23,23 @@ class MarketingStep:
     based on their profile and the research findings.
     """
 
-    def __init__(self, openai_service: OpenAIService, prompt_service: PromptService):
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        prompt_service: PromptService,
+        async_openai_service: Optional[AsyncOpenAIService] = None,
+    ):
         """
         Initialize the marketing step.
 
         Args:
             openai_service: OpenAI service for LLM operations.
             prompt_service: PromptService for DB-stored prompts.
+            async_openai_service: Async OpenAI service for the *_async methods.
         """
         self.openai_service = openai_service
         self.prompt_service = prompt_service
+        self.async_openai_service = async_openai_service
     
     def generate_marketing_angles(
         self,
@@ -58,20 +65,14 @@ class MarketingStep:
         """
         try:
             avatar_name = avatar.overview.name
-            
-            kwargs = dict(
-                avatar_name=avatar_name,
-                avatar_json=avatar.model_dump_json(indent=2),
-                deep_research_output=deep_research_output,
-                target_product_name=target_product_name if target_product_name else "Not specified",
-            )
-            prompt = self.prompt_service.get_prompt("get_marketing_angles_prompt", **kwargs)
+            prompt = self._marketing_angles_prompt(avatar, deep_research_output, target_product_name)
             
             logger.info(f"Calling GPT-5 API to generate marketing angles for {avatar_name}")
             result = self.openai_service.parse_structured(
-                prompt=prompt,
+                prompt=prompt.instructions,
                 response_format=AvatarMarketingAngles,
-                subtask=f"process_job_v2.generate_marketing_angles.{avatar_name}"
+                subtask=f"process_job_v2.generate_marketing_angles.{avatar_name}",
+                shared_context=prompt.shared_context,
             )
             logger.info(f"GPT-5 API call completed for marketing angles: {avatar_name}")
             
@@ -80,3 +81,58 @@ class MarketingStep:
         except Exception as e:
             logger.error(f"Error generating marketing angles for {avatar.overview.name}: {e}")
             raise
+
+    async def generate_marketing_angles_async(
+        self,
+        avatar: Avatar,
+        deep_research_output: str,
+        target_product_name: Optional[str] = None,
+    ) -> AvatarMarketingAngles:
+        """
+        Async variant of generate_marketing_angles using the async OpenAI service.
+
+        Args:
+            avatar: Complete Avatar object with profile details.
+            deep_research_output: The raw deep research document.
+
+        Returns:
+            AvatarMarketingAngles object with generated angles.
+
+        Raises:
+            Exception: If angle generation fails.
+        """
+        try:
+            avatar_name = avatar.overview.name
+            prompt = self._marketing_angles_prompt(avatar, deep_research_output, target_product_name)
+
+            logger.info(f"Calling GPT-5 API to generate marketing angles for {avatar_name}")
+            result = await self.async_openai_service.parse_structured(
+                prompt=prompt.instructions,
+                response_format=AvatarMarketingAngles,
+                subtask=f"process_job_v2.generate_marketing_angles.{avatar_name}",
+                shared_context=prompt.shared_context,
+            )
+            logger.info(f"GPT-5 API call completed for marketing angles: {avatar_name}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error generating marketing angles for {avatar.overview.name}: {e}")
+            raise
+
+    def _marketing_angles_prompt(
+        self,
+        avatar: Avatar,
+        deep_research_output: str,
+        target_product_name: Optional[str],
+    ) -> PromptParts:
+        """Render the marketing angles prompt (research as shared context when configured)."""
+        kwargs = dict(
+            avatar_name=avatar.overview.name,
+            avatar_json=avatar.model_dump_json(indent=2),
+            deep_research_output=deep_research_output,
+            target_product_name=target_product_name if target_product_name else "Not specified",
+        )
+        return self.prompt_service.get_prompt_parts(
+            "get_marketing_angles_prompt", shared_context_key="deep_research_output", **kwargs
+        )
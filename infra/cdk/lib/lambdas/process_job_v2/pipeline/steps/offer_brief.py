@@ -8,8 +8,8 @@ import json
 import logging
 from typing import List, Dict, Any, Optional
 
-from services.openai_service import OpenAIService
-from services.prompt_service import PromptService
+from services.openai_service import AsyncOpenAIService, OpenAIService
+from services.prompt_service import PromptParts, PromptService
 from data_models import OfferBrief
 
 
@@ -24,16 +24,23 @@ class OfferBriefStep:
     all avatars and research into actionable marketing strategy.
     """
 
-    def __init__(self, openai_service: OpenAIService, prompt_service: PromptService):
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        prompt_service: PromptService,
+        async_openai_service: Optional[AsyncOpenAIService] = None,
+    ):
         """
         Initialize the offer brief step.
 
         Args:
             openai_service: OpenAI service for LLM operations.
             prompt_service: PromptService for DB-stored prompts.
+            async_openai_service: Async OpenAI service for the *_async methods.
         """
         self.openai_service = openai_service
         self.prompt_service = prompt_service
+        self.async_openai_service = async_openai_service
     
     def create_offer_brief(
         self,
@@ -59,21 +66,14 @@ class OfferBriefStep:
             Exception: If offer brief creation fails.
         """
         try:
-            # Prepare inputs string
-            avatars_summary = json.dumps(marketing_avatars_list, ensure_ascii=False, indent=2)
-            
-            kwargs = dict(
-                avatars_summary=avatars_summary,
-                deep_research_output=deep_research_output,
-                target_product_name=target_product_name if target_product_name else "Not specified",
-            )
-            prompt = self.prompt_service.get_prompt("get_offer_brief_prompt", **kwargs)
+            prompt = self._offer_brief_prompt(marketing_avatars_list, deep_research_output, target_product_name)
             
             logger.info("Calling GPT-5 API to create strategic Offer Brief")
             result = self.openai_service.parse_structured(
-                prompt=prompt,
+                prompt=prompt.instructions,
                 response_format=OfferBrief,
-                subtask="process_job_v2.create_offer_brief"
+                subtask="process_job_v2.create_offer_brief",
+                shared_context=prompt.shared_context,
             )
             logger.info("GPT-5 API call completed for Offer Brief")
             
@@ -82,3 +82,60 @@ class OfferBriefStep:
         except Exception as e:
             logger.error(f"Error creating Offer Brief: {e}")
             raise
+
+    async def create_offer_brief_async(
+        self,
+        marketing_avatars_list: List[Dict[str, Any]],
+        deep_research_output: str,
+        target_product_name: Optional[str] = None,
+    ) -> OfferBrief:
+        """
+        Async variant of create_offer_brief using the async OpenAI service.
+
+        Args:
+            marketing_avatars_list: List of avatar dictionaries with
+                                    avatar details, angles, and beliefs.
+            deep_research_output: The raw deep research document.
+
+        Returns:
+            OfferBrief object with strategic positioning and messaging.
+
+        Raises:
+            Exception: If offer brief creation fails.
+        """
+        try:
+            prompt = self._offer_brief_prompt(marketing_avatars_list, deep_research_output, target_product_name)
+
+            logger.info("Calling GPT-5 API to create strategic Offer Brief")
+            result = await self.async_openai_service.parse_structured(
+                prompt=prompt.instructions,
+                response_format=OfferBrief,
+                subtask="process_job_v2.create_offer_brief",
+                shared_context=prompt.shared_context,
+            )
+            logger.info("GPT-5 API call completed for Offer Brief")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error creating Offer Brief: {e}")
+            raise
+
+    def _offer_brief_prompt(
+        self,
+        marketing_avatars_list: List[Dict[str, Any]],
+        deep_research_output: str,
+        target_product_name: Optional[str],
+    ) -> PromptParts:
+        """Render the offer brief prompt (research as shared context when configured)."""
+        # Prepare inputs string
+        avatars_summary = json.dumps(marketing_avatars_list, ensure_ascii=False, indent=2)
+
+        kwargs = dict(
+            avatars_summary=avatars_summary,
+            deep_research_output=deep_research_output,
+            target_product_name=target_product_name if target_product_name else "Not specified",
+        )
+        return self.prompt_service.get_prompt_parts(
+            "get_offer_brief_prompt", shared_context_key="deep_research_output", **kwargs
+        )
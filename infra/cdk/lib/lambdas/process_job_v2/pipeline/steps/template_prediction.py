@@ -5,7 +5,7 @@ Predicts which landing page templates best match avatar+angle combinations.
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from data_models import Avatar, MarketingAngle, TemplatePredictionResult
 from services.template_prediction_service import (
@@ -98,3 +98,44 @@ class TemplatePredictionStep:
             )
             # Return None instead of raising - predictions are optional
             return None
+
+    def execute_many(
+        self,
+        avatar: Avatar,
+        angles: List[MarketingAngle],
+        top_k: int = 5,
+    ) -> List[Optional[TemplatePredictionResult]]:
+        """
+        Predict templates for all angles of one avatar.
+
+        Uses a single batched LLM call for the avatar, falling back to
+        concurrent per-angle calls for anything the batch does not cover.
+
+        Args:
+            avatar: The marketing avatar.
+            angles: The avatar's marketing angles.
+            top_k: Number of top matches to return per angle.
+
+        Returns:
+            List aligned with ``angles``; failed predictions are None.
+        """
+        try:
+            logger.info(
+                f"Predicting templates for avatar '{avatar.overview.name}' "
+                f"across {len(angles)} angles"
+            )
+            results = self.prediction_service.predict_templates_batch(
+                avatar=avatar,
+                angles=angles,
+                top_k=top_k
+            )
+            logger.info(
+                f"Template prediction complete for avatar '{avatar.overview.name}': "
+                f"{sum(1 for r in results if r)}/{len(angles)} angles matched"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Error predicting templates for avatar {avatar.id}: {e}")
+            # Return None instead of raising - predictions are optional
+            return [None] * len(angles)
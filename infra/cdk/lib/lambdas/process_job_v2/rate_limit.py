@@ -0,0 +1,617 @@
+"""
+Provider-aware adaptive rate limiting for LLM calls.
+
+Design goals:
+- One limiter per (provider, model) shared by every service in the process
+- Token buckets on requests and tokens per minute, so bursts are smoothed
+  before the provider has to reject them
+- AIMD concurrency: halve the in-flight limit on 429 / overloaded responses,
+  grow it back by one per window of successes
+- Honor Retry-After: a throttled call pauses the whole (provider, model)
+- Retry only throttles and transient failures, never bad requests
+- Time spent waiting on the limiter is reported separately (throttle_ms)
+  from the provider latency in usage events
+- Optionally share the per-minute budget across Lambda invocations: with
+  LLM_RATE_BUDGET_TABLE_NAME set, each limiter leases batches of requests
+  and tokens from a DynamoDB atomic counter per (provider, model, minute),
+  so concurrent Lambdas stay under one org quota at about one DynamoDB
+  update per BUDGET_LEASE_REQUESTS calls
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    requests_per_minute: float
+    tokens_per_minute: float
+    max_concurrency: int
+    min_concurrency: int = 1
+
+
+# Conservative defaults per provider. They describe the org-wide quota: when
+# the shared budget table is configured they bound all Lambdas together,
+# otherwise each process on its own. Override with the LLM_RATE_LIMITS env var,
+# a JSON object keyed by "provider" or "provider/model", e.g.
+#   {"openai": {"requests_per_minute": 1000}, "openai/gpt-5": {"max_concurrency": 8}}
+PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    "openai": ProviderLimits(requests_per_minute=500, tokens_per_minute=800_000, max_concurrency=32),
+    "anthropic": ProviderLimits(requests_per_minute=400, tokens_per_minute=400_000, max_concurrency=16),
+    "perplexity": ProviderLimits(requests_per_minute=20, tokens_per_minute=float("inf"), max_concurrency=5),
+    "google": ProviderLimits(requests_per_minute=60, tokens_per_minute=float("inf"), max_concurrency=8),
+}
+DEFAULT_LIMITS = ProviderLimits(requests_per_minute=60, tokens_per_minute=float("inf"), max_concurrency=8)
+
+MAX_ATTEMPTS = 5
+BACKOFF_INITIAL_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+# Pause applied on a throttle that carries no Retry-After header
+THROTTLE_COOLDOWN_SECONDS = 2.0
+MAX_RETRY_AFTER_SECONDS = 60.0
+# Multiplicative decrease factor for the concurrency limit on a throttle
+AIMD_DECREASE = 0.5
+# Polling interval while waiting for a free concurrency slot
+SLOT_POLL_SECONDS = 0.05
+
+# Token estimate for one image part and the default output allowance
+IMAGE_TOKEN_ESTIMATE = 1_000
+OUTPUT_TOKEN_ESTIMATE = 1_000
+
+# Shared budget: counters are per fixed window of this many seconds
+BUDGET_WINDOW_SECONDS = 60
+# Requests claimed from the shared budget per DynamoDB update
+BUDGET_LEASE_REQUESTS = 10
+# One lease never takes more than this share of a window's budget
+BUDGET_LEASE_MAX_FRACTION = 0.05
+# Spread retries of an exhausted budget over the start of the next window
+BUDGET_RETRY_JITTER_SECONDS = 1.0
+
+THROTTLE_STATUSES = {429, 529}
+TRANSIENT_STATUSES = {408, 409, 500, 502, 503, 504}
+THROTTLE_ERROR_NAMES = {"RateLimitError", "OverloadedError", "ResourceExhausted"}
+TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+}
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for value in (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),  # google-genai APIError
+        getattr(getattr(error, "response", None), "status_code", None),
+    ):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """True for rate-limit and overloaded responses (429 / 529 / RESOURCE_EXHAUSTED)."""
+    return (
+        _status_code(error) in THROTTLE_STATUSES
+        or type(error).__name__ in THROTTLE_ERROR_NAMES
+        or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+    )
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """True for throttles and transient server / network failures."""
+    return (
+        is_throttle_error(error)
+        or _status_code(error) in TRANSIENT_STATUSES
+        or type(error).__name__ in TRANSIENT_ERROR_NAMES
+        or isinstance(error, (ConnectionError, TimeoutError))
+    )
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read Retry-After (seconds or HTTP date) or retry-after-ms from an error's response."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return min(float(ms) / 1000, MAX_RETRY_AFTER_SECONDS)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+    except Exception:
+        return None
+
+
+def estimate_tokens(payload: Any, output_tokens: int = OUTPUT_TOKEN_ESTIMATE) -> int:
+    """
+    Rough token estimate for a request payload (~4 characters per token).
+
+    Walks strings, lists and dicts; data: URLs count as one image.
+    """
+    def _walk(value: Any) -> int:
+        if isinstance(value, str):
+            return IMAGE_TOKEN_ESTIMATE if value.startswith("data:") else len(value) // 4
+        if isinstance(value, dict):
+            return sum(_walk(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(_walk(v) for v in value)
+        return 0
+
+    return _walk(payload) + output_tokens
+
+
+class _TokenBucket:
+    """Refilling bucket; not thread-safe on its own (guarded by the limiter lock)."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        if self.rate == float("inf"):
+            return 0.0
+        self._refill(now)
+        # A request larger than the bucket only needs a full bucket
+        needed = min(amount, self.capacity) - self.tokens
+        return max(needed, 0.0) / self.rate
+
+    def take(self, amount: float) -> None:
+        if self.rate != float("inf"):
+            self.tokens -= amount
+
+    def give(self, amount: float) -> None:
+        if self.rate != float("inf"):
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass
+class Permit:
+    """One admitted attempt: what it reserved and how long admission took."""
+    attempt: int
+    reserved_tokens: int
+    throttle_ms: int = 0
+    used_tokens: Optional[int] = None
+
+    def record_usage(self, usage: Optional[Dict[str, Optional[int]]]) -> None:
+        """Record actual token usage (normalized usage dict) for bucket reconciliation."""
+        if not usage:
+            return
+        total = (usage.get("inputTokens") or 0) + (usage.get("outputTokens") or 0)
+        if total:
+            self.used_tokens = total
+
+
+def _budget_window(now: float) -> int:
+    return int(now // BUDGET_WINDOW_SECONDS)
+
+
+class InMemoryBudgetStore:
+    """
+    Process-local stand-in for DynamoDBBudgetStore (tests and local runs).
+
+    Several limiters sharing one instance behave like Lambdas sharing the
+    DynamoDB table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, int], Tuple[float, float]] = {}
+        self.claims = 0
+
+    def claim(self, key: str, window: int, requests: int, tokens: int, limits: ProviderLimits) -> bool:
+        """Atomically add to the window's counters if they stay within limits."""
+        with self._lock:
+            self.claims += 1
+            used_requests, used_tokens = self.counters.get((key, window), (0, 0))
+            if used_requests + requests > limits.requests_per_minute:
+                return False
+            if used_tokens + tokens > limits.tokens_per_minute:
+                return False
+            self.counters[(key, window)] = (used_requests + requests, used_tokens + tokens)
+            return True
+
+
+class DynamoDBBudgetStore:
+    """
+    Shared per-minute budget in DynamoDB, one item per (provider/model, window).
+
+    A claim is a single conditional UpdateItem that ADDs to the request and
+    token counters only while the totals stay within the limits. Items
+    expire through DynamoDB TTL shortly after their window.
+    """
+
+    def __init__(self, ddb_client, table_name: str):
+        """
+        Initialize the budget store.
+
+        Args:
+            ddb_client: Boto3 DynamoDB client instance.
+            table_name: Budget table name (partition key ``budgetKey``).
+        """
+        self.ddb_client = ddb_client
+        self.table_name = table_name
+
+    def claim(self, key: str, window: int, requests: int, tokens: int, limits: ProviderLimits) -> bool:
+        """
+        Claim requests and tokens from a window's budget.
+
+        Args:
+            key: "provider/model".
+            window: Window number (epoch seconds // BUDGET_WINDOW_SECONDS).
+            requests: Requests to claim.
+            tokens: Tokens to claim (0 when tokens are unlimited).
+            limits: Limits the window's totals must stay within.
+
+        Returns:
+            True if granted. DynamoDB errors also return True: the shared
+            budget is a guard rail, and the local limiter still applies.
+        """
+        condition = "(attribute_not_exists(#r) OR #r <= :max_requests)"
+        values = {
+            ":requests": {"N": str(requests)},
+            ":tokens": {"N": str(tokens)},
+            ":max_requests": {"N": str(int(limits.requests_per_minute) - requests)},
+            ":ttl": {"N": str((window + 2) * BUDGET_WINDOW_SECONDS + 3600)},
+        }
+        if limits.tokens_per_minute != float("inf"):
+            condition += " AND (attribute_not_exists(#t) OR #t <= :max_tokens)"
+            values[":max_tokens"] = {"N": str(int(limits.tokens_per_minute) - tokens)}
+        try:
+            self.ddb_client.update_item(
+                TableName=self.table_name,
+                Key={"budgetKey": {"S": f"{key}#{window}"}},
+                UpdateExpression="ADD #r :requests, #t :tokens SET #ttl = :ttl",
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#r": "requests", "#t": "tokens", "#ttl": "ttl"},
+                ExpressionAttributeValues=values,
+            )
+        except self.ddb_client.exceptions.ConditionalCheckFailedException:
+            return False
+        except Exception as e:
+            logger.warning(f"Error claiming shared LLM budget for {key}: {e}")
+        return True
+
+
+@dataclass
+class _BudgetLease:
+    """Requests and tokens this process holds from the current window."""
+    window: int = -1
+    requests: float = 0.0
+    tokens: float = 0.0
+
+
+class RateLimiter:
+    """
+    Adaptive limiter for one (provider, model).
+
+    Thread-safe; the async methods share the same state so threads and
+    coroutines in one process are limited together. With a budget store,
+    every admission also draws from a lease on the shared budget.
+    """
+
+    def __init__(self, provider: str, model: str, limits: ProviderLimits, budget=None):
+        self.provider = provider
+        self.model = model
+        self.limits = limits
+        self.budget = budget
+        self._lease = _BudgetLease()
+        self._claim_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._requests = _TokenBucket(limits.requests_per_minute)
+        self._tokens = _TokenBucket(limits.tokens_per_minute)
+        self.concurrency_limit = float(limits.max_concurrency)
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.throttled = 0
+
+    def _token_cost(self, tokens: int) -> int:
+        """Tokens drawn from the shared budget (none when tokens are unlimited)."""
+        if self.limits.tokens_per_minute == float("inf"):
+            return 0
+        return min(tokens, int(self.limits.tokens_per_minute))
+
+    def _lease_covers(self, tokens: int) -> bool:
+        """True if the current window's lease has room for one call; caller holds the lock."""
+        window = _budget_window(time.time())
+        if self._lease.window != window:
+            self._lease = _BudgetLease(window=window)
+        return self._lease.requests >= 1 and self._lease.tokens >= self._token_cost(tokens)
+
+    def _try_acquire(self, tokens: int) -> Optional[float]:
+        """
+        Admit now and return 0, or return how long to wait before retrying.
+
+        Returns None when the local checks pass but the shared-budget lease
+        must be refilled first (see _claim_budget).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.cooldown_until:
+                return self.cooldown_until - now
+            if self.in_flight >= max(int(self.concurrency_limit), self.limits.min_concurrency):
+                return SLOT_POLL_SECONDS
+            wait = max(self._requests.wait_for(1, now), self._tokens.wait_for(tokens, now))
+            if wait > 0:
+                return wait
+            if self.budget is not None:
+                if not self._lease_covers(tokens):
+                    return None
+                self._lease.requests -= 1
+                self._lease.tokens -= self._token_cost(tokens)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def _claim_budget(self, tokens: int) -> None:
+        """
+        Refill the lease from the shared budget, one store update per batch.
+
+        Claims up to BUDGET_LEASE_REQUESTS calls' worth, falling back to a
+        single call's worth; if even that is refused the window is spent and
+        the limiter pauses until the next one.
+        """
+        with self._claim_lock:
+            with self._lock:
+                # Another thread may have refilled while this one waited
+                if self._lease_covers(tokens):
+                    return
+                window = self._lease.window
+                need_requests = 1 if self._lease.requests < 1 else 0
+                need_tokens = max(math.ceil(self._token_cost(tokens) - self._lease.tokens), 0)
+
+            key = f"{self.provider}/{self.model}"
+            batch = max(1, min(BUDGET_LEASE_REQUESTS, int(self.limits.requests_per_minute * BUDGET_LEASE_MAX_FRACTION)))
+            batch_requests = batch if need_requests else 0
+            batch_tokens = 0
+            if need_tokens:
+                batch_tokens = max(
+                    need_tokens,
+                    min(batch * self._token_cost(tokens), int(self.limits.tokens_per_minute * BUDGET_LEASE_MAX_FRACTION)),
+                )
+            claims = [(batch_requests, batch_tokens)]
+            if (need_requests, need_tokens) != claims[0]:
+                claims.append((need_requests, need_tokens))
+            claimed = next((c for c in claims if self.budget.claim(key, window, *c, self.limits)), None)
+
+            with self._lock:
+                if self._lease.window != window:
+                    return
+                if claimed is not None:
+                    self._lease.requests += claimed[0]
+                    self._lease.tokens += claimed[1]
+                    return
+                pause = (window + 1) * BUDGET_WINDOW_SECONDS - time.time() + random.random() * BUDGET_RETRY_JITTER_SECONDS
+                self.cooldown_until = max(self.cooldown_until, time.monotonic() + pause)
+                logger.warning(f"Shared LLM budget for {key} spent for this window; pausing {pause:.1f}s")
+
+    def acquire(self, tokens: int, attempt: int = 1) -> Permit:
+        """Block until the call may start."""
+        t0 = time.monotonic()
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait is None:
+                self._claim_budget(tokens)
+                continue
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        return Permit(attempt=attempt, reserved_tokens=tokens, throttle_ms=int((time.monotonic() - t0) * 1000))
+
+    async def acquire_async(self, tokens: int, attempt: int = 1) -> Permit:
+        """Wait (without blocking the event loop) until the call may start."""
+        t0 = time.monotonic()
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait is None:
+                await asyncio.to_thread(self._claim_budget, tokens)
+                continue
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+        return Permit(attempt=attempt, reserved_tokens=tokens, throttle_ms=int((time.monotonic() - t0) * 1000))
+
+    def release(self, permit: Permit, error: Optional[BaseException] = None) -> None:
+        """Return the slot and adapt: AIMD on the concurrency limit, Retry-After cooldown."""
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if permit.used_tokens is not None:
+                delta = permit.reserved_tokens - permit.used_tokens
+                if delta > 0:
+                    self._tokens.give(delta)
+                else:
+                    self._tokens.take(-delta)
+                # The shared counter keeps the estimate; the lease absorbs the difference
+                if self.budget is not None and self.limits.tokens_per_minute != float("inf"):
+                    self._lease.tokens += delta
+
+            if error is not None and is_throttle_error(error):
+                self.throttled += 1
+                self.concurrency_limit = max(
+                    float(self.limits.min_concurrency), self.concurrency_limit * AIMD_DECREASE
+                )
+                pause = retry_after_seconds(error)
+                if pause is None:
+                    pause = THROTTLE_COOLDOWN_SECONDS
+                self.cooldown_until = max(self.cooldown_until, time.monotonic() + pause)
+                logger.warning(
+                    f"{self.provider}/{self.model} throttled ({type(error).__name__}); "
+                    f"concurrency -> {self.concurrency_limit:.1f}, pausing {pause:.1f}s"
+                )
+            elif error is None:
+                self.concurrency_limit = min(
+                    float(self.limits.max_concurrency),
+                    self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0),
+                )
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+_UNSET = object()
+_budget_store: Any = _UNSET
+
+
+def _configured_limits(provider: str, model: str) -> ProviderLimits:
+    limits = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+    raw = os.environ.get("LLM_RATE_LIMITS")
+    if not raw:
+        return limits
+    try:
+        overrides = json.loads(raw)
+        for key in (provider, f"{provider}/{model}"):
+            if isinstance(overrides.get(key), dict):
+                limits = replace(limits, **overrides[key])
+    except Exception as e:
+        logger.warning(f"Ignoring invalid LLM_RATE_LIMITS: {e}")
+    return limits
+
+
+def get_budget_store():
+    """
+    Return the shared budget store, or None when sharing is disabled.
+
+    Uses DynamoDB when LLM_RATE_BUDGET_TABLE_NAME is set, unless a store
+    was installed with set_budget_store().
+    """
+    global _budget_store
+    with _limiters_lock:
+        if _budget_store is _UNSET:
+            table_name = os.environ.get("LLM_RATE_BUDGET_TABLE_NAME")
+            if table_name:
+                import boto3
+                _budget_store = DynamoDBBudgetStore(boto3.client("dynamodb"), table_name)
+            else:
+                _budget_store = None
+        return _budget_store
+
+
+def set_budget_store(store) -> None:
+    """Install a budget store (e.g. InMemoryBudgetStore) for limiters created afterwards."""
+    global _budget_store
+    with _limiters_lock:
+        _budget_store = store
+
+
+def get_limiter(provider: str, model: str) -> RateLimiter:
+    """Return the process-wide limiter for a provider and model."""
+    key = (provider, model)
+    budget = get_budget_store()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(provider, model, _configured_limits(provider, model), budget=budget)
+            _limiters[key] = limiter
+        return limiter
+
+
+def reset_limiters() -> None:
+    """Drop all limiter state and the resolved budget store (tests)."""
+    global _budget_store
+    with _limiters_lock:
+        _limiters.clear()
+        _budget_store = _UNSET
+
+
+def _backoff_seconds(attempt: int) -> float:
+    delay = min(BACKOFF_INITIAL_SECONDS * (2 ** (attempt - 1)), BACKOFF_MAX_SECONDS)
+    return delay * (1 + random.random())
+
+
+def call_with_limits(
+    provider: str,
+    model: str,
+    func: Callable[[Permit], T],
+    estimated_tokens: int = OUTPUT_TOKEN_ESTIMATE,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> T:
+    """
+    Run ``func`` under the (provider, model) limiter, retrying retryable errors.
+
+    ``func`` receives the attempt's Permit (attempt number and throttle_ms
+    for telemetry; record_usage() for token reconciliation). Throttles are
+    retried after the limiter's cooldown, transient errors after an
+    exponential backoff; any other error is raised immediately.
+    """
+    limiter = get_limiter(provider, model)
+    for attempt in range(1, max_attempts + 1):
+        permit = limiter.acquire(estimated_tokens, attempt)
+        try:
+            result = func(permit)
+        except Exception as e:
+            limiter.release(permit, error=e)
+            if attempt == max_attempts or not is_retryable_error(e):
+                raise
+            if not is_throttle_error(e):
+                delay = _backoff_seconds(attempt)
+                logger.warning(f"Retry {attempt}/{max_attempts} for {provider}/{model} after {e}; waiting {delay:.2f}s")
+                time.sleep(delay)
+            continue
+        except BaseException as e:
+            # Cancellation (e.g. a failed sibling DAG node) must still free the slot
+            limiter.release(permit, error=e)
+            raise
+        limiter.release(permit)
+        return result
+    raise RuntimeError("unreachable")
+
+
+async def call_with_limits_async(
+    provider: str,
+    model: str,
+    func: Callable[[Permit], Awaitable[T]],
+    estimated_tokens: int = OUTPUT_TOKEN_ESTIMATE,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> T:
+    """Async variant of call_with_limits; ``func`` is a coroutine function."""
+    limiter = get_limiter(provider, model)
+    for attempt in range(1, max_attempts + 1):
+        permit = await limiter.acquire_async(estimated_tokens, attempt)
+        try:
+            result = await func(permit)
+        except Exception as e:
+            limiter.release(permit, error=e)
+            if attempt == max_attempts or not is_retryable_error(e):
+                raise
+            if not is_throttle_error(e):
+                delay = _backoff_seconds(attempt)
+                logger.warning(f"Retry {attempt}/{max_attempts} for {provider}/{model} after {e}; waiting {delay:.2f}s")
+                await asyncio.sleep(delay)
+            continue
+        except BaseException as e:
+            # Cancellation (e.g. a failed sibling DAG node) must still free the slot
+            limiter.release(permit, error=e)
+            raise
+        limiter.release(permit)
+        return result
+    raise RuntimeError("unreachable")
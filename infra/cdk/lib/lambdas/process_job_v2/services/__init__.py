@@ -5,15 +5,20 @@ Provides wrappers for external services (AWS, OpenAI, Claude, Perplexity, Cache)
 """
 
 from .aws import AWSServices
-from .openai_service import OpenAIService
-from .claude_service import ClaudeService
-from .perplexity_service import PerplexityService
+from .openai_service import AsyncOpenAIService, OpenAIService
+from .claude_service import AsyncClaudeService, ClaudeService
+from .perplexity_service import AsyncPerplexityService, PerplexityService
 from .cache import ResearchCacheService
+from .response_cache import LLMResponseCache
 
 __all__ = [
     "AWSServices",
     "OpenAIService",
+    "AsyncOpenAIService",
     "ClaudeService",
+    "AsyncClaudeService",
     "PerplexityService",
+    "AsyncPerplexityService",
     "ResearchCacheService",
+    "LLMResponseCache",
 ]
@@ -7,14 +7,30 @@ Provides centralized access to AWS services (Secrets Manager, S3, DynamoDB).
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 import boto3
 
+from services.result_layout import MANIFEST_NAME, assemble_results, build_result_shards, result_prefix
+
 
 logger = logging.getLogger(__name__)
 
+RESULT_UPLOAD_WORKERS = 8
+
+
+def _compat_view_enabled() -> bool:
+    """
+    Whether to also write comprehensive_results.json (RESULTS_COMPAT_VIEW, default off).
+
+    Every reader (get_job_result, write_swipe, dev mode) assembles the legacy
+    payload from the shards, so the monolithic copy is only needed by
+    external consumers that read the object directly.
+    """
+    return (os.environ.get("RESULTS_COMPAT_VIEW") or "false").strip().lower() in ("1", "true", "yes", "on")
+
 
 class AWSServices:
     """
@@ -86,9 +102,11 @@ class AWSServices:
         """
         Save all results to S3.
         
-        Saves results in two locations:
-        1. projects/{project_name}/{timestamp}/comprehensive_results.json
-        2. results/{job_id}/comprehensive_results.json
+        Writes the sharded layout (see result_layout.py) under
+        results/{job_id}/ in parallel, then its manifest, and copies the
+        manifest server-side to projects/{project_name}/{timestamp}/. With
+        RESULTS_COMPAT_VIEW on, also writes the legacy
+        results/{job_id}/comprehensive_results.json and copies that instead.
         
         Args:
             results: The results dictionary to save.
@@ -100,36 +118,44 @@ class AWSServices:
             Exception: If S3 upload fails.
         """
         try:
-            # Build comprehensive results
-            comprehensive_results = {
-                "project_name": project_name,
-                "timestamp_iso": datetime.now(timezone.utc).isoformat(),
-                "results": results,
-                "job_id": job_id
-            }
-            
-            body = json.dumps(comprehensive_results, ensure_ascii=False, indent=4)
-            
-            # Save by project with timestamp
-            datetime_str = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-            project_key = f'projects/{project_name}/{datetime_str}/comprehensive_results.json'
-            self.s3_client.put_object(
+            now = datetime.now(timezone.utc)
+            prefix = result_prefix(job_id)
+            shards, manifest = build_result_shards(results, job_id, project_name, now.isoformat())
+
+            uploads = [(prefix + key, body, content_type) for key, body, content_type in shards]
+            job_key = f'{prefix}comprehensive_results.json'
+            if _compat_view_enabled():
+                comprehensive_results = {
+                    "project_name": project_name,
+                    "timestamp_iso": manifest["timestamp_iso"],
+                    "results": results,
+                    "job_id": job_id
+                }
+                body = json.dumps(comprehensive_results, ensure_ascii=False, separators=(",", ":"))
+                uploads.append((job_key, body.encode("utf-8"), 'application/json'))
+
+            def _put(upload):
+                key, body, content_type = upload
+                self.s3_client.put_object(Bucket=s3_bucket, Key=key, Body=body, ContentType=content_type)
+
+            with ThreadPoolExecutor(max_workers=RESULT_UPLOAD_WORKERS) as executor:
+                list(executor.map(_put, uploads))
+
+            # Manifest last: its presence means every shard is in place
+            manifest_key = prefix + MANIFEST_NAME
+            _put((manifest_key, json.dumps(manifest, ensure_ascii=False).encode("utf-8"), 'application/json'))
+
+            # Project copy without a second upload
+            source_key = job_key if _compat_view_enabled() else manifest_key
+            datetime_str = now.strftime("%Y%m%d_%H%M%S")
+            project_key = f'projects/{project_name}/{datetime_str}/{source_key[len(prefix):]}'
+            self.s3_client.copy_object(
                 Bucket=s3_bucket,
                 Key=project_key,
-                Body=body,
-                ContentType='application/json'
+                CopySource={"Bucket": s3_bucket, "Key": source_key},
             )
-            
-            # Save by job ID
-            job_key = f'results/{job_id}/comprehensive_results.json'
-            self.s3_client.put_object(
-                Bucket=s3_bucket,
-                Key=job_key,
-                Body=body,
-                ContentType='application/json'
-            )
-            
-            logger.info(f"Saved comprehensive results to S3: {job_key}")
+
+            logger.info(f"Saved {len(shards)} result shards and manifest to S3: {manifest_key}")
             
         except Exception as e:
             logger.error(f"Error saving results to S3: {e}")
@@ -173,6 +199,29 @@ class AWSServices:
         except Exception as e:
             logger.error(f"Failed to update job status for {job_id}: {e}")
     
+    def load_results_from_s3(self, bucket: str, job_id: str) -> Dict[str, Any]:
+        """
+        Load a saved job's results dict, from its shards when it has a manifest.
+
+        Args:
+            bucket: S3 bucket name.
+            job_id: Job whose results to load.
+
+        Returns:
+            Results dict in the comprehensive_results.json "results" shape.
+        """
+        prefix = result_prefix(job_id)
+        try:
+            manifest = self.get_object_from_s3(bucket, prefix + MANIFEST_NAME)
+        except self.s3_client.exceptions.NoSuchKey:
+            # Saved before the sharded layout
+            return self.get_object_from_s3(bucket, f"{prefix}comprehensive_results.json").get("results", {})
+
+        def _read(key: str) -> bytes:
+            return self.s3_client.get_object(Bucket=bucket, Key=prefix + key)["Body"].read()
+
+        return assemble_results(manifest, _read)
+
     def get_object_from_s3(self, bucket: str, key: str) -> Dict[str, Any]:
         """
         Get and parse a JSON object from S3.
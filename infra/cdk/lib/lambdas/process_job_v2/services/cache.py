@@ -3,16 +3,37 @@ Research cache service for process_job_v2 Lambda.
 
 Provides caching for expensive deep research operations to avoid
 redundant Perplexity API calls for the same sales page URL.
+
+Lookups go through three tiers, fastest first:
+
+1. In-process LRU (module-level, survives across warm invocations)
+2. /tmp disk tier with a byte budget (survives across warm invocations)
+3. S3, stored as gzip-compressed compact JSON with an expiry in metadata
+
+Hits in a lower tier are promoted into the tiers above it. Each tier keeps
+hit/miss/error counters and cumulative latency.
+
+Two kinds of entries share the tiers: combined research (Steps 1-3) per
+URL set, and Step 1 page analyses per individual URL.
 """
 
+import gzip
 import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Type
 from urllib.parse import urlparse
 
-from data_models import CachedResearchData
+from pydantic import BaseModel
+
+from data_models import CachedPageAnalysis, CachedResearchData
 
 
 logger = logging.getLogger(__name__)
@@ -20,26 +41,215 @@ logger = logging.getLogger(__name__)
 # Current cache schema version - increment this to invalidate old caches
 CACHE_VERSION = "2.0"
 
+# Entries older than this are treated as a miss
+CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+# In-process tier bounds
+MEMORY_CACHE_MAX_ENTRIES = 16
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# /tmp tier location and budget (Lambda /tmp is shared with screenshots)
+DISK_CACHE_DIR = "/tmp/research_cache"
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+TIERS = ("memory", "disk", "s3")
+
+
+@dataclass
+class CacheTierStats:
+    """Counters for one cache tier."""
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def record(self, outcome: str, elapsed_ms: float, nbytes: int = 0) -> None:
+        """Record a lookup outcome ("hit", "miss" or "error")."""
+        if outcome == "hit":
+            self.hits += 1
+            self.bytes_read += nbytes
+        elif outcome == "miss":
+            self.misses += 1
+        else:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+
+
+def _encode(data: BaseModel) -> Tuple[bytes, int]:
+    """Serialize an entry as gzip-compressed compact JSON; also returns the uncompressed size."""
+    body = json.dumps(data.model_dump(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(body, compresslevel=6), len(body)
+
+
+def _decode(payload: bytes, model_cls: Type[BaseModel]) -> Tuple[BaseModel, int]:
+    """Parse a gzip-compressed (or legacy plain) JSON entry; also returns the uncompressed size."""
+    if payload[:2] == b"\x1f\x8b":
+        payload = gzip.decompress(payload)
+    return model_cls(**json.loads(payload.decode("utf-8"))), len(payload)
+
+
+def _is_expired(expires_at: Optional[float]) -> bool:
+    return expires_at is not None and time.time() >= expires_at
+
+
+class _MemoryTier:
+    """
+    Bounded LRU of parsed entries, keyed by cache key.
+
+    Entries are sized by their uncompressed JSON length, a closer proxy for
+    the memory the parsed models hold than the gzip payload.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[BaseModel, Optional[float], int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[Tuple[BaseModel, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires_at, size = entry
+            if _is_expired(expires_at):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return data, size
+
+    def put(self, key: str, data: BaseModel, expires_at: Optional[float], size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (data, expires_at, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class _DiskTier:
+    """
+    Compressed entries under /tmp, evicted least-recently-used first.
+
+    Each file is a one-line JSON header ({"expires_at": ...}) followed by the
+    same gzip payload stored in S3; recency is tracked with mtime.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.cache"
+
+    @property
+    def size_bytes(self) -> int:
+        if not self.directory.is_dir():
+            return 0
+        return sum(p.stat().st_size for p in self.directory.glob("*.cache"))
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        header, _, payload = raw.partition(b"\n")
+        expires_at = json.loads(header).get("expires_at")
+        if _is_expired(expires_at):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return payload, expires_at
+
+    def put(self, key: str, payload: bytes, expires_at: Optional[float]) -> int:
+        header = json.dumps({"expires_at": expires_at}).encode("utf-8")
+        blob = header + b"\n" + payload
+        if len(blob) > self.max_bytes:
+            return 0
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+            tmp.write_bytes(blob)
+            os.replace(tmp, path)
+            self._evict()
+        return len(blob)
+
+    def _evict(self) -> None:
+        files = sorted(
+            ((p.stat().st_mtime, p.stat().st_size, p) for p in self.directory.glob("*.cache")),
+            key=lambda item: item[0],
+        )
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.directory.is_dir():
+                for path in self.directory.glob("*.cache"):
+                    path.unlink(missing_ok=True)
+
+
+# Module-level tiers and counters for warm Lambda reuse
+_memory_tier = _MemoryTier(MEMORY_CACHE_MAX_ENTRIES, MEMORY_CACHE_MAX_BYTES)
+_disk_tier = _DiskTier(DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES)
+_tier_stats: Dict[str, CacheTierStats] = {tier: CacheTierStats() for tier in TIERS}
+
+
+def reset_cache_tiers() -> None:
+    """Drop the in-process and /tmp tiers and zero all counters."""
+    _memory_tier.clear()
+    _disk_tier.clear()
+    for tier in TIERS:
+        _tier_stats[tier] = CacheTierStats()
+
 
 class ResearchCacheService:
     """
-    Service for caching deep research results in S3.
+    Service for caching deep research results in memory, /tmp and S3.
     
     Stores and retrieves cached research data keyed by a hash of the
     sales page URL. This allows skipping Steps 1-3 of the pipeline
     when the same URL has been processed before.
     """
     
-    def __init__(self, s3_client, s3_bucket: str):
+    def __init__(self, s3_client, s3_bucket: str, ttl_seconds: int = CACHE_TTL_SECONDS):
         """
         Initialize the cache service.
         
         Args:
             s3_client: Boto3 S3 client instance.
             s3_bucket: S3 bucket name for storing cache files.
+            ttl_seconds: Lifetime of newly written entries.
         """
         self.s3_client = s3_client
         self.s3_bucket = s3_bucket
+        self.ttl_seconds = ttl_seconds
     
     @staticmethod
     def normalize_url(url: str) -> str:
@@ -117,8 +327,169 @@ class ResearchCacheService:
         Returns:
             S3 key path string.
         """
+        return f"cache/research/{cache_key}/research_cache.json.gz"
+
+    def _get_legacy_cache_path(self, cache_key: str) -> str:
+        """S3 key of entries written before compression (read-only fallback)."""
         return f"cache/research/{cache_key}/research_cache.json"
-    
+
+    def _get_page_path(self, url_key: str, analysis_mode: str) -> str:
+        """S3 key of a single URL's page analysis in one analysis mode."""
+        return f"cache/pages/{url_key}/page_analysis.{analysis_mode}.json.gz"
+
+    @staticmethod
+    def stats() -> Dict[str, Dict[str, float]]:
+        """
+        Return per-tier counters and current sizes for this container.
+
+        Returns:
+            Dict of tier name to counters (hits, misses, errors, total_ms,
+            bytes_read, bytes_written, size_bytes).
+        """
+        sizes = {"memory": _memory_tier.size_bytes, "disk": _disk_tier.size_bytes, "s3": None}
+        return {
+            tier: {**asdict(_tier_stats[tier]), "size_bytes": sizes[tier]}
+            for tier in TIERS
+        }
+
+    def _read_s3(self, s3_paths: Sequence[str]) -> Optional[Tuple[bytes, Optional[float]]]:
+        """Fetch an entry's payload and expiry from the first S3 key that exists."""
+        for path in s3_paths:
+            try:
+                response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=path)
+            except self.s3_client.exceptions.NoSuchKey:
+                continue
+            expires_at = response.get("Metadata", {}).get("expires-at")
+            if expires_at:
+                expires_at = float(expires_at)
+            else:
+                # Legacy entries carry no expiry; they live ttl_seconds from their last write
+                last_modified = response.get("LastModified")
+                expires_at = last_modified.timestamp() + self.ttl_seconds if last_modified else 0.0
+            return response["Body"].read(), expires_at
+        return None
+
+    def _lookup(
+        self,
+        tier_key: str,
+        s3_paths: Sequence[str],
+        model_cls: Type[BaseModel],
+    ) -> Tuple[Optional[BaseModel], Optional[str]]:
+        """
+        Look an entry up tier by tier, promoting lower-tier hits upwards.
+
+        Args:
+            tier_key: Namespaced key used by the memory and disk tiers.
+            s3_paths: S3 keys to try, in order.
+            model_cls: Model the payload is parsed into.
+
+        Returns:
+            Tuple of (entry or None, name of the tier that served it).
+        """
+        t0 = time.perf_counter()
+        hit = _memory_tier.get(tier_key)
+        _tier_stats["memory"].record(
+            "hit" if hit else "miss", (time.perf_counter() - t0) * 1000, hit[1] if hit else 0
+        )
+        if hit:
+            return hit[0], "memory"
+
+        readers = (
+            ("disk", lambda: _disk_tier.get(tier_key)),
+            ("s3", lambda: self._read_s3(s3_paths)),
+        )
+        for tier, read in readers:
+            t0 = time.perf_counter()
+            try:
+                found = read()
+                data, size = _decode(found[0], model_cls) if found else (None, 0)
+            except Exception as e:
+                _tier_stats[tier].record("error", (time.perf_counter() - t0) * 1000)
+                logger.warning(f"Error reading {tier} research cache tier: {e}")
+                continue
+
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            if data is None or _is_expired(found[1]):
+                _tier_stats[tier].record("miss", elapsed_ms)
+                continue
+
+            payload, expires_at = found
+            _tier_stats[tier].record("hit", elapsed_ms, len(payload))
+            if tier == "s3":
+                self._write_disk(tier_key, payload, expires_at)
+            _memory_tier.put(tier_key, data, expires_at, size)
+            return data, tier
+
+        return None, None
+
+    def _write_disk(self, tier_key: str, payload: bytes, expires_at: Optional[float]) -> None:
+        """Write to the /tmp tier; failures only cost a future S3 read."""
+        try:
+            _tier_stats["disk"].bytes_written += _disk_tier.put(tier_key, payload, expires_at)
+        except OSError as e:
+            logger.warning(f"Error writing disk research cache tier: {e}")
+
+    def _store(self, tier_key: str, s3_path: str, cache_data: BaseModel) -> None:
+        """Write an entry to every tier."""
+        payload, size = _encode(cache_data)
+        expires_at = time.time() + self.ttl_seconds
+
+        self.s3_client.put_object(
+            Bucket=self.s3_bucket,
+            Key=s3_path,
+            Body=payload,
+            ContentType='application/json',
+            ContentEncoding='gzip',
+            Metadata={
+                "cache-version": CACHE_VERSION,
+                "expires-at": f"{expires_at:.0f}",
+            },
+        )
+        _tier_stats["s3"].bytes_written += len(payload)
+
+        self._write_disk(tier_key, payload, expires_at)
+        _memory_tier.put(tier_key, cache_data, expires_at, size)
+        _tier_stats["memory"].bytes_written += size
+
+    def _lookup_research(self, cache_key: str) -> Tuple[Optional[CachedResearchData], Optional[str]]:
+        """Look up a combined research entry, including the legacy S3 key."""
+        return self._lookup(
+            f"research-{cache_key}",
+            (self._get_cache_path(cache_key), self._get_legacy_cache_path(cache_key)),
+            CachedResearchData,
+        )
+
+    def _store_research(self, cache_key: str, cache_data: CachedResearchData) -> None:
+        """Write a combined research entry to every tier."""
+        self._store(f"research-{cache_key}", self._get_cache_path(cache_key), cache_data)
+
+    def _get(self, cache_key: str, label: str) -> Optional[CachedResearchData]:
+        """Shared lookup for single- and multi-URL entries."""
+        try:
+            cached_research, tier = self._lookup_research(cache_key)
+        except Exception as e:
+            # Log but don't fail - treat as cache miss
+            logger.warning(f"Error reading cache for {label}: {e}")
+            return None
+
+        if cached_research is None:
+            logger.info(f"Cache MISS for {label}")
+            return None
+
+        # Check cache version for compatibility
+        if cached_research.cache_version != CACHE_VERSION:
+            logger.info(
+                f"Cache version mismatch: {cached_research.cache_version} != {CACHE_VERSION}. "
+                "Treating as cache miss."
+            )
+            return None
+
+        logger.info(
+            f"Cache HIT ({tier}) for {label} "
+            f"(cached at: {cached_research.cached_at})"
+        )
+        return cached_research
+
     def get_cached_research(self, sales_page_url: str, target_product_name: Optional[str] = None) -> Optional[CachedResearchData]:
         """
         Retrieve cached research data for a sales page URL.
@@ -131,41 +502,9 @@ class ResearchCacheService:
             CachedResearchData if cache hit, None if cache miss.
         """
         cache_key = self.get_cache_key(sales_page_url, target_product_name=target_product_name)
-        cache_path = self._get_cache_path(cache_key)
-        
-        try:
-            logger.info(f"Checking cache for URL: {sales_page_url}")
-            logger.debug(f"Cache key: {cache_key}, path: {cache_path}")
-            
-            response = self.s3_client.get_object(
-                Bucket=self.s3_bucket,
-                Key=cache_path
-            )
-            
-            cache_data = json.loads(response['Body'].read().decode('utf-8'))
-            cached_research = CachedResearchData(**cache_data)
-            
-            # Check cache version for compatibility
-            if cached_research.cache_version != CACHE_VERSION:
-                logger.info(
-                    f"Cache version mismatch: {cached_research.cache_version} != {CACHE_VERSION}. "
-                    "Treating as cache miss."
-                )
-                return None
-            
-            logger.info(
-                f"Cache HIT for URL: {sales_page_url} "
-                f"(cached at: {cached_research.cached_at})"
-            )
-            return cached_research
-            
-        except self.s3_client.exceptions.NoSuchKey:
-            logger.info(f"Cache MISS for URL: {sales_page_url} (key not found)")
-            return None
-        except Exception as e:
-            # Log but don't fail - treat as cache miss
-            logger.warning(f"Error reading cache for URL {sales_page_url}: {e}")
-            return None
+        logger.info(f"Checking cache for URL: {sales_page_url}")
+        logger.debug(f"Cache key: {cache_key}")
+        return self._get(cache_key, f"URL: {sales_page_url}")
     
     def save_research_cache(
         self,
@@ -186,7 +525,6 @@ class ResearchCacheService:
             target_product_name: Optional product name included in cache key.
         """
         cache_key = self.get_cache_key(sales_page_url, target_product_name=target_product_name)
-        cache_path = self._get_cache_path(cache_key)
 
         try:
             cache_data = CachedResearchData(
@@ -198,15 +536,7 @@ class ResearchCacheService:
                 cached_at=datetime.now(timezone.utc).isoformat(),
                 cache_version=CACHE_VERSION
             )
-
-            body = json.dumps(cache_data.model_dump(), ensure_ascii=False, indent=2)
-
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket,
-                Key=cache_path,
-                Body=body,
-                ContentType='application/json'
-            )
+            self._store_research(cache_key, cache_data)
 
             logger.info(
                 f"Saved research cache for URL: {sales_page_url} "
@@ -231,32 +561,9 @@ class ResearchCacheService:
             CachedResearchData if cache hit, None if cache miss.
         """
         cache_key = self.get_multi_url_cache_key(sales_page_urls, target_product_name=target_product_name)
-        cache_path = self._get_cache_path(cache_key)
-
-        try:
-            logger.info(f"Checking multi-URL cache for {len(sales_page_urls)} URLs")
-            logger.debug(f"Cache key: {cache_key}, path: {cache_path}")
-
-            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=cache_path)
-            cache_data = json.loads(response['Body'].read().decode('utf-8'))
-            cached_research = CachedResearchData(**cache_data)
-
-            if cached_research.cache_version != CACHE_VERSION:
-                logger.info(
-                    f"Cache version mismatch: {cached_research.cache_version} != {CACHE_VERSION}. "
-                    "Treating as cache miss."
-                )
-                return None
-
-            logger.info(f"Cache HIT for multi-URL (cached at: {cached_research.cached_at})")
-            return cached_research
-
-        except self.s3_client.exceptions.NoSuchKey:
-            logger.info(f"Cache MISS for multi-URL (key not found)")
-            return None
-        except Exception as e:
-            logger.warning(f"Error reading multi-URL cache: {e}")
-            return None
+        logger.info(f"Checking multi-URL cache for {len(sales_page_urls)} URLs")
+        logger.debug(f"Cache key: {cache_key}")
+        return self._get(cache_key, "multi-URL")
 
     def save_research_cache_multi(
         self,
@@ -277,7 +584,6 @@ class ResearchCacheService:
             target_product_name: Optional product name included in cache key.
         """
         cache_key = self.get_multi_url_cache_key(sales_page_urls, target_product_name=target_product_name)
-        cache_path = self._get_cache_path(cache_key)
 
         try:
             cache_data = CachedResearchData(
@@ -289,14 +595,7 @@ class ResearchCacheService:
                 cached_at=datetime.now(timezone.utc).isoformat(),
                 cache_version=CACHE_VERSION,
             )
-
-            body = json.dumps(cache_data.model_dump(), ensure_ascii=False, indent=2)
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket,
-                Key=cache_path,
-                Body=body,
-                ContentType='application/json',
-            )
+            self._store_research(cache_key, cache_data)
 
             logger.info(
                 f"Saved multi-URL research cache for {len(sales_page_urls)} URLs "
@@ -304,3 +603,59 @@ class ResearchCacheService:
             )
         except Exception as e:
             logger.error(f"Error saving multi-URL cache: {e}")
+
+    def get_page_analysis(self, url: str, analysis_mode: str) -> Optional[CachedPageAnalysis]:
+        """
+        Retrieve the cached Step 1 analysis for a single URL.
+
+        Page analyses do not depend on the product name or the other URLs in
+        the job, so they are keyed by the normalized URL and the analysis
+        mode ("vision" or "text"); modes never serve each other's entries.
+
+        Args:
+            url: The sales page URL to look up.
+            analysis_mode: Page analysis mode of the caller.
+
+        Returns:
+            CachedPageAnalysis if cache hit, None if cache miss.
+        """
+        url_key = self.get_cache_key(url)
+        try:
+            cached, tier = self._lookup(
+                f"page-{analysis_mode}-{url_key}", (self._get_page_path(url_key, analysis_mode),), CachedPageAnalysis
+            )
+        except Exception as e:
+            logger.warning(f"Error reading page analysis cache for URL {url}: {e}")
+            return None
+
+        if cached is None or cached.cache_version != CACHE_VERSION or cached.analysis_mode != analysis_mode:
+            logger.info(f"Page analysis cache MISS for URL: {url} ({analysis_mode} mode)")
+            return None
+
+        logger.info(f"Page analysis cache HIT ({tier}) for URL: {url} (cached at: {cached.cached_at})")
+        return cached
+
+    def save_page_analysis(self, url: str, analysis: str, product_image: str, analysis_mode: str) -> None:
+        """
+        Save the Step 1 analysis and product image for a single URL.
+
+        Args:
+            url: The analyzed sales page URL.
+            analysis: Page analysis text that passed the quality gate.
+            product_image: Base64-encoded product image.
+            analysis_mode: Page analysis mode that produced the analysis.
+        """
+        url_key = self.get_cache_key(url)
+        try:
+            cache_data = CachedPageAnalysis(
+                url=url,
+                analysis=analysis,
+                analysis_mode=analysis_mode,
+                product_image=product_image,
+                cached_at=datetime.now(timezone.utc).isoformat(),
+                cache_version=CACHE_VERSION,
+            )
+            self._store(f"page-{analysis_mode}-{url_key}", self._get_page_path(url_key, analysis_mode), cache_data)
+            logger.info(f"Saved page analysis cache for URL: {url} (key: {url_key[:16]}...)")
+        except Exception as e:
+            logger.error(f"Error saving page analysis cache for URL {url}: {e}")
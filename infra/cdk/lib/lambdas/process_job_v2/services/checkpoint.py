@@ -0,0 +1,171 @@
+"""
+Step checkpoints for process_job_v2 Lambda.
+
+Each completed step (and each avatar's details, angles and template
+predictions) is written to ``results/{job_id}/checkpoints/{name}.json``.
+When Lambda retries an async invocation, or a job is re-run with the same
+job_id, the orchestrator resumes from these instead of recomputing them.
+They are deleted once the job's results have been saved.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional, Set, Type, TypeVar
+
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CheckpointStore:
+    """
+    Per-job checkpoint storage in S3.
+
+    Checkpointing is best-effort: read and write errors are logged and the
+    step is simply recomputed.
+    """
+
+    def __init__(self, s3_client, s3_bucket: str, job_id: str):
+        """
+        Initialize the checkpoint store and list existing checkpoints.
+
+        Args:
+            s3_client: Boto3 S3 client instance.
+            s3_bucket: S3 bucket holding job results.
+            job_id: Job whose checkpoints are stored.
+        """
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.prefix = f"results/{job_id}/checkpoints/"
+        self._lock = threading.Lock()
+        self.existing: Set[str] = self._list()
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}.json"
+
+    def _list(self) -> Set[str]:
+        """Return the names of checkpoints already saved for this job."""
+        names: Set[str] = set()
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=self.prefix):
+                for obj in page.get("Contents", []):
+                    key = obj["Key"]
+                    if key.endswith(".json"):
+                        names.add(key[len(self.prefix):-len(".json")])
+        except Exception as e:
+            logger.warning(f"Error listing checkpoints under {self.prefix}: {e}")
+        if names:
+            logger.info(f"Found {len(names)} checkpoint(s) to resume from: {sorted(names)}")
+        return names
+
+    def load(self, name: str, model_cls: Optional[Type[BaseModel]] = None) -> Optional[Any]:
+        """
+        Load a checkpoint.
+
+        Args:
+            name: Checkpoint name.
+            model_cls: Optional model to parse the checkpoint into.
+
+        Returns:
+            The checkpointed value, or None if absent or unreadable.
+        """
+        if name not in self.existing:
+            return None
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self._key(name))
+            data = json.loads(response["Body"].read().decode("utf-8"))
+            return model_cls(**data) if model_cls else data
+        except Exception as e:
+            logger.warning(f"Error loading checkpoint {name}, recomputing: {e}")
+            return None
+
+    def save(self, name: str, value: Any) -> None:
+        """
+        Save a checkpoint.
+
+        Args:
+            name: Checkpoint name.
+            value: A pydantic model or JSON-serializable value.
+        """
+        data = value.model_dump() if isinstance(value, BaseModel) else value
+        try:
+            self.s3_client.put_object(
+                Bucket=self.s3_bucket,
+                Key=self._key(name),
+                Body=json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                ContentType="application/json",
+            )
+            with self._lock:
+                self.existing.add(name)
+        except Exception as e:
+            logger.warning(f"Error saving checkpoint {name}: {e}")
+
+    def clear(self) -> None:
+        """Delete every checkpoint saved for this job, once its results are saved."""
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=self.prefix):
+                keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+                if keys:
+                    self.s3_client.delete_objects(Bucket=self.s3_bucket, Delete={"Objects": keys, "Quiet": True})
+        except Exception as e:
+            logger.warning(f"Error deleting checkpoints under {self.prefix}: {e}")
+        with self._lock:
+            self.existing.clear()
+
+    def resume_or_run(
+        self,
+        name: str,
+        compute: Callable[[], T],
+        model_cls: Optional[Type[BaseModel]] = None,
+    ) -> T:
+        """
+        Return a step's checkpointed output, or compute and checkpoint it.
+
+        Args:
+            name: Checkpoint name.
+            compute: Produces the step output when there is no checkpoint.
+            model_cls: Optional model the output is parsed back into.
+
+        Returns:
+            The step output.
+        """
+        value = self.load(name, model_cls)
+        if value is not None:
+            logger.info(f"Resumed {name} from checkpoint")
+            return value
+        value = compute()
+        self.save(name, value)
+        return value
+
+    async def resume_or_run_async(
+        self,
+        name: str,
+        compute: Callable[[], Awaitable[T]],
+        model_cls: Optional[Type[BaseModel]] = None,
+    ) -> T:
+        """
+        Async variant of resume_or_run; the S3 reads and writes run on a
+        worker thread so they do not block the event loop.
+
+        Args:
+            name: Checkpoint name.
+            compute: Coroutine function producing the step output.
+            model_cls: Optional model the output is parsed back into.
+
+        Returns:
+            The step output.
+        """
+        value = await asyncio.to_thread(self.load, name, model_cls)
+        if value is not None:
+            logger.info(f"Resumed {name} from checkpoint")
+            return value
+        value = await compute()
+        await asyncio.to_thread(self.save, name, value)
+        return value
@@ -3,6 +3,13 @@ Claude (Anthropic) service wrapper for process_job_v2 Lambda.
 
 Provides Claude API access with usage tracking and telemetry.
 Uses streaming for all requests as recommended for long-running jobs.
+ClaudeService is blocking; AsyncClaudeService is its asyncio variant. Calls
+go through the shared per-model rate limiter, which retries only throttled
+(429 / overloaded) and transient failures.
+
+Large stable blocks (the system prompt and an optional shared context sent
+ahead of the prompt) carry cache_control breakpoints, so repeated prefixes
+are billed at the prompt-cache read rate.
 """
 
 import json
@@ -13,11 +20,24 @@ from typing import Any, Dict, List, Optional, Tuple
 import anthropic
 
 from llm_usage import UsageContext, emit_llm_usage_event, normalize_anthropic_usage
-from utils.retry import retry_with_exponential_backoff
+from rate_limit import Permit, call_with_limits, call_with_limits_async, estimate_tokens
 
 
 logger = logging.getLogger(__name__)
 
+# Anthropic only caches prefixes of at least ~1024 tokens, and cache writes
+# cost extra, so shorter blocks get no breakpoint
+CACHE_BREAKPOINT_MIN_CHARS = 4096
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _text_block(text: str) -> Dict[str, Any]:
+    """Text content block, with a cache breakpoint when it is long enough to cache."""
+    block: Dict[str, Any] = {"type": "text", "text": text}
+    if len(text) >= CACHE_BREAKPOINT_MIN_CHARS:
+        block["cache_control"] = EPHEMERAL_CACHE_CONTROL
+    return block
+
 
 class ClaudeService:
     """
@@ -46,7 +66,7 @@ class ClaudeService:
             usage_ctx: Telemetry context for usage tracking.
             aws_request_id: AWS Lambda request ID for tracking.
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.Anthropic(api_key=api_key, max_retries=0)
         self.model = model
         self.usage_ctx = usage_ctx
         self.aws_request_id = aws_request_id
@@ -77,6 +97,7 @@ class ClaudeService:
         usage: Optional[Any] = None,
         error: Optional[Exception] = None,
         retry_attempt: int = 1,
+        permit: Optional[Permit] = None,
     ) -> None:
         """
         Emit usage telemetry event.
@@ -90,7 +111,13 @@ class ClaudeService:
             usage: Usage data from API response.
             error: Exception if request failed.
             retry_attempt: Current retry attempt number.
+            permit: Rate limiter permit (attempt number, throttle wait);
+                overrides retry_attempt when given.
         """
+        normalized = normalize_anthropic_usage(usage) if usage is not None else None
+        if permit is not None:
+            permit.record_usage(normalized)
+            retry_attempt = permit.attempt
         if not self.usage_ctx:
             return
         
@@ -105,9 +132,103 @@ class ClaudeService:
             retry_attempt=retry_attempt,
             aws_request_id=self.aws_request_id,
             error_type=type(error).__name__ if error else None,
-            usage=normalize_anthropic_usage(usage) if usage is not None else None,
+            usage=normalized,
+            throttle_ms=permit.throttle_ms if permit else None,
         )
     
+    @staticmethod
+    def _request_kwargs(
+        model: str,
+        max_tokens: int,
+        content: Any,
+        system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the messages.stream kwargs shared by every request.
+
+        The shared context, if any, becomes the first content block so that
+        calls on the same document share a cacheable prefix.
+        """
+        if shared_context:
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            content = [_text_block(shared_context), *content]
+        request_kwargs = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": content}],
+        }
+        if system_prompt:
+            request_kwargs["system"] = [_text_block(system_prompt)]
+        return request_kwargs
+
+    @staticmethod
+    def _structured_tool(response_format: type) -> Dict[str, Any]:
+        """
+        Convert a Pydantic model to a forced tool definition.
+
+        Args:
+            response_format: Pydantic model class for structured output.
+
+        Returns:
+            Request kwargs with "tools" and "tool_choice".
+        """
+        tool_name = "structured_output"
+        tool_schema = response_format.model_json_schema()
+
+        # Clean up schema for tool use (remove metadata fields)
+        tool_input_schema = {
+            k: v for k, v in tool_schema.items()
+            if k not in ["$schema", "title", "description", "$defs"]
+        }
+        # Add $defs back if present (needed for nested models)
+        if "$defs" in tool_schema:
+            tool_input_schema["$defs"] = tool_schema["$defs"]
+
+        return {
+            "tools": [{
+                "name": tool_name,
+                "description": f"Generate structured output matching the {response_format.__name__} schema.",
+                "input_schema": tool_input_schema
+            }],
+            "tool_choice": {"type": "tool", "name": tool_name},
+        }
+
+    @staticmethod
+    def _parse_tool_response(response: Any, response_format: type) -> Any:
+        """
+        Extract the structured output from a forced tool_use response.
+
+        Args:
+            response: Final message from the stream.
+            response_format: Pydantic model class for structured output.
+
+        Returns:
+            Parsed response as the specified Pydantic model.
+
+        Raises:
+            ValueError: If the response holds no tool_use block.
+        """
+        if response.stop_reason != "tool_use" or len(response.content) == 0:
+            raise ValueError(
+                f"Expected tool_use response, got stop_reason: {response.stop_reason}"
+            )
+
+        # Find the ToolUseBlock in content
+        found_tool = None
+        for block in response.content:
+            if block.type == "tool_use":
+                found_tool = block
+                break
+        if not found_tool:
+            raise ValueError("No ToolUseBlock found in response content")
+
+        input_data = found_tool.input
+        if isinstance(input_data, str):
+            return response_format.model_validate_json(input_data)
+        return response_format.model_validate(input_data)
+
     def create_response(
         self,
         content: List[Dict[str, Any]],
@@ -115,6 +236,7 @@ class ClaudeService:
         model: Optional[str] = None,
         max_tokens: int = 4096,
         system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
     ) -> str:
         """
         Create a response using Claude's streaming API.
@@ -125,31 +247,23 @@ class ClaudeService:
             model: Model to use (defaults to instance model).
             max_tokens: Maximum tokens in response.
             system_prompt: Optional system prompt.
+            shared_context: Optional document sent ahead of the prompt
+                (see PromptService.get_prompt_parts).
             
         Returns:
             The response output text.
             
         Raises:
-            Exception: If API call fails after retries.
+            Exception: If API call fails after retrying throttles and transient errors.
         """
         model = model or self.model
-        response_text = ""
-        usage_data = None
+        request_kwargs = self._request_kwargs(model, max_tokens, content, system_prompt, shared_context)
+        estimated = estimate_tokens([shared_context, content, system_prompt], output_tokens=max_tokens)
         
-        def _execute():
-            nonlocal response_text, usage_data
+        def _execute(permit: Permit):
             t0 = time.time()
             
             try:
-                # Build request kwargs
-                request_kwargs = {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "messages": [{"role": "user", "content": content}],
-                }
-                if system_prompt:
-                    request_kwargs["system"] = system_prompt
-                
                 # Use streaming as recommended for long-running jobs
                 with self.client.messages.stream(**request_kwargs) as stream:
                     response_text = ""
@@ -157,7 +271,6 @@ class ClaudeService:
                         response_text += text
                     
                     message = stream.get_final_message()
-                    usage_data = message.usage
                 
                 self._emit_usage(
                     operation="messages.stream",
@@ -165,7 +278,8 @@ class ClaudeService:
                     model=model,
                     t0=t0,
                     success=True,
-                    usage=usage_data,
+                    usage=message.usage,
+                    permit=permit,
                 )
                 return response_text
                 
@@ -177,10 +291,11 @@ class ClaudeService:
                     t0=t0,
                     success=False,
                     error=e,
+                    permit=permit,
                 )
                 raise
         
-        return retry_with_exponential_backoff(_execute)
+        return call_with_limits("anthropic", model, _execute, estimated_tokens=estimated)
     
     def parse_structured(
         self,
@@ -190,6 +305,7 @@ class ClaudeService:
         model: Optional[str] = None,
         max_tokens: int = 4096,
         system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
     ) -> Any:
         """
         Parse structured output using Claude's tool use with streaming.
@@ -203,51 +319,26 @@ class ClaudeService:
             model: Model to use (defaults to instance model).
             max_tokens: Maximum tokens in response.
             system_prompt: Optional system prompt.
+            shared_context: Optional document sent ahead of the prompt
+                (see PromptService.get_prompt_parts).
             
         Returns:
             Parsed response as the specified Pydantic model.
             
         Raises:
-            Exception: If API call fails after retries.
+            Exception: If API call fails after retrying throttles and transient errors.
         """
         model = model or self.model
-        structured_result = None
-        usage_data = None
-        
-        # Convert Pydantic model to tool schema
-        tool_name = "structured_output"
-        tool_description = f"Generate structured output matching the {response_format.__name__} schema."
-        tool_schema = response_format.model_json_schema()
-        
-        # Clean up schema for tool use (remove metadata fields)
-        tool_input_schema = {
-            k: v for k, v in tool_schema.items() 
-            if k not in ["$schema", "title", "description", "$defs"]
+        request_kwargs = {
+            **self._request_kwargs(model, max_tokens, prompt, system_prompt, shared_context),
+            **self._structured_tool(response_format),
         }
-        # Add $defs back if present (needed for nested models)
-        if "$defs" in tool_schema:
-            tool_input_schema["$defs"] = tool_schema["$defs"]
+        estimated = estimate_tokens([shared_context, prompt, system_prompt], output_tokens=max_tokens)
         
-        def _execute():
-            nonlocal structured_result, usage_data
+        def _execute(permit: Permit):
             t0 = time.time()
             
             try:
-                # Build request kwargs
-                request_kwargs = {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "tools": [{
-                        "name": tool_name,
-                        "description": tool_description,
-                        "input_schema": tool_input_schema
-                    }],
-                    "tool_choice": {"type": "tool", "name": tool_name}
-                }
-                if system_prompt:
-                    request_kwargs["system"] = system_prompt
-                
                 # Use streaming with tool use
                 with self.client.messages.stream(**request_kwargs) as stream:
                     # Consume the stream (required for streaming to work)
@@ -256,38 +347,15 @@ class ClaudeService:
                     
                     response = stream.get_final_message()
                 
-                # Extract structured output from tool use
-                if response.stop_reason == "tool_use" and len(response.content) > 0:
-                    # Find the ToolUseBlock in content
-                    found_tool = None
-                    for block in response.content:
-                        if block.type == "tool_use":
-                            found_tool = block
-                            break
-                    
-                    if found_tool:
-                        input_data = found_tool.input
-                        if isinstance(input_data, dict):
-                            structured_result = response_format.model_validate(input_data)
-                        elif isinstance(input_data, str):
-                            structured_result = response_format.model_validate_json(input_data)
-                        else:
-                            structured_result = response_format.model_validate(input_data)
-                    else:
-                        raise ValueError("No ToolUseBlock found in response content")
-                else:
-                    raise ValueError(
-                        f"Expected tool_use response, got stop_reason: {response.stop_reason}"
-                    )
-                
-                usage_data = response.usage
+                structured_result = self._parse_tool_response(response, response_format)
                 self._emit_usage(
                     operation="messages.stream.tool_use",
                     subtask=subtask,
                     model=model,
                     t0=t0,
                     success=True,
-                    usage=usage_data,
+                    usage=response.usage,
+                    permit=permit,
                 )
                 return structured_result
                 
@@ -299,7 +367,178 @@ class ClaudeService:
                     t0=t0,
                     success=False,
                     error=e,
+                    permit=permit,
                 )
                 raise
         
-        return retry_with_exponential_backoff(_execute)
+        return call_with_limits("anthropic", model, _execute, estimated_tokens=estimated)
+
+
+class AsyncClaudeService(ClaudeService):
+    """
+    Asyncio variant of ClaudeService built on AsyncAnthropic.
+
+    Same method signatures, streaming, retries and usage telemetry, but
+    create_response and parse_structured are coroutines.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = ClaudeService.DEFAULT_MODEL,
+        usage_ctx: Optional[UsageContext] = None,
+        aws_request_id: Optional[str] = None
+    ):
+        """
+        Initialize async Claude service.
+
+        Args:
+            api_key: Anthropic API key.
+            model: Default model to use for requests.
+            usage_ctx: Telemetry context for usage tracking.
+            aws_request_id: AWS Lambda request ID for tracking.
+        """
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+        self.model = model
+        self.usage_ctx = usage_ctx
+        self.aws_request_id = aws_request_id
+
+    async def create_response(
+        self,
+        content: List[Dict[str, Any]],
+        subtask: str,
+        model: Optional[str] = None,
+        max_tokens: int = 4096,
+        system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
+    ) -> str:
+        """
+        Create a response using Claude's streaming API.
+
+        Args:
+            content: List of content items (text, images, etc.).
+            subtask: Subtask name for telemetry.
+            model: Model to use (defaults to instance model).
+            max_tokens: Maximum tokens in response.
+            system_prompt: Optional system prompt.
+            shared_context: Optional document sent ahead of the prompt
+                (see PromptService.get_prompt_parts).
+
+        Returns:
+            The response output text.
+
+        Raises:
+            Exception: If API call fails after retrying throttles and transient errors.
+        """
+        model = model or self.model
+        request_kwargs = self._request_kwargs(model, max_tokens, content, system_prompt, shared_context)
+        estimated = estimate_tokens([shared_context, content, system_prompt], output_tokens=max_tokens)
+
+        async def _execute(permit: Permit):
+            t0 = time.time()
+
+            try:
+                async with self.client.messages.stream(**request_kwargs) as stream:
+                    response_text = ""
+                    async for text in stream.text_stream:
+                        response_text += text
+
+                    message = await stream.get_final_message()
+
+                self._emit_usage(
+                    operation="messages.stream",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    usage=message.usage,
+                    permit=permit,
+                )
+                return response_text
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="messages.stream",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        return await call_with_limits_async("anthropic", model, _execute, estimated_tokens=estimated)
+
+    async def parse_structured(
+        self,
+        prompt: str,
+        response_format: type,
+        subtask: str,
+        model: Optional[str] = None,
+        max_tokens: int = 4096,
+        system_prompt: Optional[str] = None,
+        shared_context: Optional[str] = None,
+    ) -> Any:
+        """
+        Parse structured output using Claude's tool use with streaming.
+
+        Args:
+            prompt: The prompt text.
+            response_format: Pydantic model class for structured output.
+            subtask: Subtask name for telemetry.
+            model: Model to use (defaults to instance model).
+            max_tokens: Maximum tokens in response.
+            system_prompt: Optional system prompt.
+            shared_context: Optional document sent ahead of the prompt
+                (see PromptService.get_prompt_parts).
+
+        Returns:
+            Parsed response as the specified Pydantic model.
+
+        Raises:
+            Exception: If API call fails after retrying throttles and transient errors.
+        """
+        model = model or self.model
+        request_kwargs = {
+            **self._request_kwargs(model, max_tokens, prompt, system_prompt, shared_context),
+            **self._structured_tool(response_format),
+        }
+        estimated = estimate_tokens([shared_context, prompt, system_prompt], output_tokens=max_tokens)
+
+        async def _execute(permit: Permit):
+            t0 = time.time()
+
+            try:
+                async with self.client.messages.stream(**request_kwargs) as stream:
+                    # Consume the stream (required for streaming to work)
+                    async for _ in stream.text_stream:
+                        pass
+
+                    response = await stream.get_final_message()
+
+                structured_result = self._parse_tool_response(response, response_format)
+                self._emit_usage(
+                    operation="messages.stream.tool_use",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    usage=response.usage,
+                    permit=permit,
+                )
+                return structured_result
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="messages.stream.tool_use",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        return await call_with_limits_async("anthropic", model, _execute, estimated_tokens=estimated)
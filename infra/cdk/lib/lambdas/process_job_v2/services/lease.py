@@ -0,0 +1,164 @@
+"""
+Single-flight leases for process_job_v2 Lambda.
+
+When several jobs need the same expensive research at once, only the job
+holding the lease computes it; the others poll the research cache until
+the result appears. Leases live in a DynamoDB table keyed by the research
+cache key and expire on their own, so a crashed owner is taken over.
+"""
+
+import logging
+import random
+import time
+from typing import Callable, Optional, Tuple, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deep research plus Steps 1-2 fit well within the Lambda timeout (15 min)
+DEFAULT_LEASE_SECONDS = 900
+
+# Polling backoff while waiting on another job's lease
+POLL_INITIAL_SECONDS = 2.0
+POLL_MAX_SECONDS = 20.0
+
+# Outcomes of wait_for()
+WAIT_READY = "ready"
+WAIT_ACQUIRED = "acquired"
+WAIT_TIMEOUT = "timeout"
+
+
+class ResearchLeaseService:
+    """
+    DynamoDB-backed lease, one item per research cache key.
+
+    A lease is acquired with a conditional put that only succeeds when no
+    lease exists or the existing one has expired. Without a table name the
+    service is disabled and every acquire succeeds.
+    """
+
+    def __init__(
+        self,
+        ddb_client,
+        table_name: Optional[str],
+        owner_id: str,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the lease service.
+
+        Args:
+            ddb_client: Boto3 DynamoDB client instance.
+            table_name: Lease table name; None disables leasing.
+            owner_id: Identifier of this job (e.g. the AWS request ID).
+            lease_seconds: How long an acquired lease is valid.
+            sleep: Sleep function, injectable for tests.
+        """
+        self.ddb_client = ddb_client
+        self.table_name = table_name
+        self.owner_id = owner_id
+        self.lease_seconds = lease_seconds
+        self._sleep = sleep
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.table_name)
+
+    def try_acquire(self, lease_key: str) -> bool:
+        """
+        Acquire the lease if it is free or expired.
+
+        Args:
+            lease_key: Research cache key to lease.
+
+        Returns:
+            True if this job now holds the lease.
+        """
+        if not self.enabled:
+            return True
+
+        now = int(time.time())
+        expires_at = now + self.lease_seconds
+        try:
+            self.ddb_client.put_item(
+                TableName=self.table_name,
+                Item={
+                    "leaseKey": {"S": lease_key},
+                    "ownerId": {"S": self.owner_id},
+                    "acquiredAt": {"N": str(now)},
+                    "expiresAt": {"N": str(expires_at)},
+                    # DynamoDB TTL removes abandoned leases eventually
+                    "ttl": {"N": str(expires_at + 3600)},
+                },
+                ConditionExpression="attribute_not_exists(leaseKey) OR expiresAt < :now",
+                ExpressionAttributeValues={":now": {"N": str(now)}},
+            )
+        except self.ddb_client.exceptions.ConditionalCheckFailedException:
+            return False
+        except Exception as e:
+            # Leasing is an optimization: on errors, compute rather than wait
+            logger.warning(f"Error acquiring research lease {lease_key[:16]}...: {e}")
+            return True
+
+        logger.info(f"Acquired research lease {lease_key[:16]}... for {self.lease_seconds}s")
+        return True
+
+    def release(self, lease_key: str) -> None:
+        """
+        Release the lease if this job still holds it.
+
+        Args:
+            lease_key: Research cache key that was leased.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.ddb_client.delete_item(
+                TableName=self.table_name,
+                Key={"leaseKey": {"S": lease_key}},
+                ConditionExpression="ownerId = :owner",
+                ExpressionAttributeValues={":owner": {"S": self.owner_id}},
+            )
+            logger.info(f"Released research lease {lease_key[:16]}...")
+        except self.ddb_client.exceptions.ConditionalCheckFailedException:
+            logger.warning(f"Research lease {lease_key[:16]}... was taken over before release")
+        except Exception as e:
+            logger.warning(f"Error releasing research lease {lease_key[:16]}...: {e}")
+
+    def wait_for(
+        self,
+        lease_key: str,
+        check: Callable[[], Optional[T]],
+        deadline: float,
+    ) -> Tuple[Optional[T], str]:
+        """
+        Wait for another job's result, taking over if its lease expires.
+
+        Polls ``check`` with jittered exponential backoff until it returns a
+        value, the lease can be acquired, or ``deadline`` would be passed.
+
+        Args:
+            lease_key: Research cache key held by another job.
+            check: Returns the result once available, else None.
+            deadline: Epoch seconds after which waiting stops.
+
+        Returns:
+            Tuple of (result or None, outcome): WAIT_READY with the result,
+            WAIT_ACQUIRED if this job now holds the lease, or WAIT_TIMEOUT.
+        """
+        delay = POLL_INITIAL_SECONDS
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None, WAIT_TIMEOUT
+            self._sleep(min(delay * (0.5 + random.random() / 2), remaining))
+            delay = min(delay * 2, POLL_MAX_SECONDS)
+
+            result = check()
+            if result is not None:
+                return result, WAIT_READY
+            if self.try_acquire(lease_key):
+                return None, WAIT_ACQUIRED
@@ -1,16 +1,27 @@
 """
 OpenAI service wrapper for process_job_v2 Lambda.
 
-Provides OpenAI API access with usage tracking and telemetry.
+Provides OpenAI API access with usage tracking and telemetry, with a
+blocking client (OpenAIService) and an asyncio one (AsyncOpenAIService).
+Calls go through the shared per-model rate limiter, which also retries
+throttled and transient failures (the SDK's own retries are disabled).
+With a response cache, identical calls are answered from the cache.
+
+parse_structured can send a shared context (e.g. the deep research) as its
+own first message, so calls that share it also share a cacheable prefix.
 """
 
+import asyncio
+import hashlib
 import logging
 import time
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from llm_usage import UsageContext, emit_llm_usage_event, normalize_openai_usage
+from rate_limit import Permit, call_with_limits, call_with_limits_async, estimate_tokens
+from services.response_cache import LLMResponseCache, make_cache_key
 
 
 logger = logging.getLogger(__name__)
@@ -31,7 +42,8 @@ class OpenAIService:
         api_key: str, 
         model: str = DEFAULT_MODEL,
         usage_ctx: Optional[UsageContext] = None,
-        aws_request_id: Optional[str] = None
+        aws_request_id: Optional[str] = None,
+        response_cache: Optional[LLMResponseCache] = None,
     ):
         """
         Initialize OpenAI service.
@@ -41,11 +53,13 @@ class OpenAIService:
             model: Default model to use for requests.
             usage_ctx: Telemetry context for usage tracking.
             aws_request_id: AWS Lambda request ID for tracking.
+            response_cache: Optional cache for identical calls (reruns).
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, max_retries=0)
         self.model = model
         self.usage_ctx = usage_ctx
         self.aws_request_id = aws_request_id
+        self.response_cache = response_cache
     
     def set_usage_context(
         self, 
@@ -72,6 +86,8 @@ class OpenAIService:
         success: bool,
         response: Optional[object] = None,
         error: Optional[Exception] = None,
+        permit: Optional[Permit] = None,
+        cache_hit: bool = False,
     ) -> None:
         """
         Emit usage telemetry event.
@@ -84,7 +100,12 @@ class OpenAIService:
             success: Whether the request succeeded.
             response: API response object (for usage extraction).
             error: Exception if request failed.
+            permit: Rate limiter permit (attempt number, throttle wait).
+            cache_hit: Whether the response was served from the response cache.
         """
+        usage = normalize_openai_usage(response) if response is not None else None
+        if permit is not None:
+            permit.record_usage(usage)
         if not self.usage_ctx:
             return
         
@@ -96,11 +117,77 @@ class OpenAIService:
             subtask=subtask,
             latency_ms=int((time.time() - t0) * 1000),
             success=success,
-            retry_attempt=1,
+            retry_attempt=permit.attempt if permit else 1,
             aws_request_id=self.aws_request_id,
             error_type=type(error).__name__ if error else None,
-            usage=normalize_openai_usage(response) if response is not None else None,
+            usage=usage,
+            throttle_ms=permit.throttle_ms if permit else None,
+            cache_hit=cache_hit,
         )
+
+    def _cache_key(
+        self,
+        operation: str,
+        subtask: str,
+        model: str,
+        prompt: Any,
+        response_format: Optional[type] = None,
+    ) -> Optional[str]:
+        """Response cache key for a call, or None if this call is not cached."""
+        if self.response_cache is None or self.response_cache.ttl_for(subtask) <= 0:
+            return None
+        return make_cache_key("openai", operation, model, prompt, response_format)
+
+    def _cache_get(self, cache_key: Optional[str], *, operation: str, subtask: str, model: str) -> Any:
+        """Cached value for a key (None on a miss), emitting a cache-hit usage event."""
+        if cache_key is None:
+            return None
+        t0 = time.time()
+        value = self.response_cache.get(cache_key)
+        if value is not None:
+            logger.info(f"LLM response cache HIT for {subtask}")
+            self._emit_usage(
+                operation=operation, subtask=subtask, model=model, t0=t0, success=True, cache_hit=True
+            )
+        return value
+
+    def _cache_put(self, cache_key: Optional[str], value: Any, subtask: str) -> None:
+        """Store output text or a parsed model's JSON dump."""
+        if cache_key is None or value is None:
+            return
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(mode="json")
+        self.response_cache.put(cache_key, value, subtask)
+
+    @staticmethod
+    def _parse_kwargs(prompt: str, shared_context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Input messages for responses.parse, shared context first.
+
+        The shared context goes in its own leading message and its hash in
+        prompt_cache_key, so every call on the same document starts with the
+        same prefix and is routed to the same prompt cache.
+        """
+        if not shared_context:
+            return {"input": [{"role": "user", "content": prompt}]}
+        return {
+            "input": [
+                {"role": "user", "content": shared_context},
+                {"role": "user", "content": prompt},
+            ],
+            "prompt_cache_key": hashlib.sha256(shared_context.encode("utf-8")).hexdigest()[:32],
+        }
+
+    @staticmethod
+    def _parse_cached(value: Any, response_format: type) -> Any:
+        """Rebuild a cached parse result; None if it no longer validates."""
+        if value is None:
+            return None
+        try:
+            return response_format.model_validate(value)
+        except Exception as e:
+            logger.warning(f"Ignoring cached {getattr(response_format, '__name__', response_format)}: {e}")
+            return None
     
     def create_response(
         self,
@@ -120,36 +207,47 @@ class OpenAIService:
             The response output text.
             
         Raises:
-            Exception: If API call fails.
+            Exception: If API call fails (after retrying throttles and transient errors).
         """
         model = model or self.model
-        t0 = time.time()
-        
-        try:
-            response = self.client.responses.create(
-                model=model,
-                input=[{"role": "user", "content": content}]
-            )
-            self._emit_usage(
-                operation="responses.create",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=True,
-                response=response,
-            )
-            return response.output_text
-            
-        except Exception as e:
-            self._emit_usage(
-                operation="responses.create",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=False,
-                error=e,
-            )
-            raise
+        cache_key = self._cache_key("responses.create", subtask, model, content)
+        cached = self._cache_get(cache_key, operation="responses.create", subtask=subtask, model=model)
+        if cached is not None:
+            return cached
+
+        def _call(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                response = self.client.responses.create(
+                    model=model,
+                    input=[{"role": "user", "content": content}]
+                )
+                self._emit_usage(
+                    operation="responses.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+                return response.output_text
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="responses.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        text = call_with_limits("openai", model, _call, estimated_tokens=estimate_tokens(content))
+        self._cache_put(cache_key, text, subtask)
+        return text
     
     def parse_structured(
         self,
@@ -157,6 +255,7 @@ class OpenAIService:
         response_format: type,
         subtask: str,
         model: Optional[str] = None,
+        shared_context: Optional[str] = None,
     ) -> Any:
         """
         Parse structured output using OpenAI's parse endpoint.
@@ -166,39 +265,233 @@ class OpenAIService:
             response_format: Pydantic model class for structured output.
             subtask: Subtask name for telemetry.
             model: Model to use (defaults to instance model).
+            shared_context: Optional document sent as the first message,
+                ahead of the prompt (see PromptService.get_prompt_parts).
             
         Returns:
             Parsed response as the specified Pydantic model.
             
         Raises:
-            Exception: If API call fails.
+            Exception: If API call fails (after retrying throttles and transient errors).
         """
         model = model or self.model
-        t0 = time.time()
-        
-        try:
-            response = self.client.responses.parse(
-                model=model,
-                input=[{"role": "user", "content": prompt}],
-                text_format=response_format,
-            )
-            self._emit_usage(
-                operation="responses.parse",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=True,
-                response=response,
+        cache_key = self._cache_key(
+            "responses.parse", subtask, model, [shared_context, prompt] if shared_context else prompt, response_format
+        )
+        request_kwargs = self._parse_kwargs(prompt, shared_context)
+        cached = self._parse_cached(
+            self._cache_get(cache_key, operation="responses.parse", subtask=subtask, model=model), response_format
+        )
+        if cached is not None:
+            return cached
+
+        def _call(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                response = self.client.responses.parse(
+                    model=model,
+                    text_format=response_format,
+                    **request_kwargs,
+                )
+                self._emit_usage(
+                    operation="responses.parse",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+                return response.output_parsed
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="responses.parse",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        estimated = estimate_tokens([shared_context, prompt])
+        parsed = call_with_limits("openai", model, _call, estimated_tokens=estimated)
+        self._cache_put(cache_key, parsed, subtask)
+        return parsed
+
+
+class AsyncOpenAIService(OpenAIService):
+    """
+    Asyncio variant of OpenAIService built on AsyncOpenAI.
+
+    Same method signatures and usage telemetry, but create_response and
+    parse_structured are coroutines, so many calls can be in flight on one
+    event loop without a thread each.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = OpenAIService.DEFAULT_MODEL,
+        usage_ctx: Optional[UsageContext] = None,
+        aws_request_id: Optional[str] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+    ):
+        """
+        Initialize async OpenAI service.
+
+        Args:
+            api_key: OpenAI API key.
+            model: Default model to use for requests.
+            usage_ctx: Telemetry context for usage tracking.
+            aws_request_id: AWS Lambda request ID for tracking.
+            response_cache: Optional cache for identical calls (reruns).
+        """
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+        self.model = model
+        self.usage_ctx = usage_ctx
+        self.aws_request_id = aws_request_id
+        self.response_cache = response_cache
+
+    async def create_response(
+        self,
+        content: List[Dict[str, Any]],
+        subtask: str,
+        model: Optional[str] = None,
+    ) -> str:
+        """
+        Create a response using OpenAI Responses API.
+
+        Args:
+            content: List of content items (text, images, etc.).
+            subtask: Subtask name for telemetry.
+            model: Model to use (defaults to instance model).
+
+        Returns:
+            The response output text.
+
+        Raises:
+            Exception: If API call fails (after retrying throttles and transient errors).
+        """
+        model = model or self.model
+        cache_key = self._cache_key("responses.create", subtask, model, content)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(
+                self._cache_get, cache_key, operation="responses.create", subtask=subtask, model=model
             )
-            return response.output_parsed
-            
-        except Exception as e:
-            self._emit_usage(
-                operation="responses.parse",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=False,
-                error=e,
+            if cached is not None:
+                return cached
+
+        async def _call(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                response = await self.client.responses.create(
+                    model=model,
+                    input=[{"role": "user", "content": content}]
+                )
+                self._emit_usage(
+                    operation="responses.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+                return response.output_text
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="responses.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        text = await call_with_limits_async("openai", model, _call, estimated_tokens=estimate_tokens(content))
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache_put, cache_key, text, subtask)
+        return text
+
+    async def parse_structured(
+        self,
+        prompt: str,
+        response_format: type,
+        subtask: str,
+        model: Optional[str] = None,
+        shared_context: Optional[str] = None,
+    ) -> Any:
+        """
+        Parse structured output using OpenAI's parse endpoint.
+
+        Args:
+            prompt: The prompt text.
+            response_format: Pydantic model class for structured output.
+            subtask: Subtask name for telemetry.
+            model: Model to use (defaults to instance model).
+            shared_context: Optional document sent as the first message,
+                ahead of the prompt (see PromptService.get_prompt_parts).
+
+        Returns:
+            Parsed response as the specified Pydantic model.
+
+        Raises:
+            Exception: If API call fails (after retrying throttles and transient errors).
+        """
+        model = model or self.model
+        cache_key = self._cache_key(
+            "responses.parse", subtask, model, [shared_context, prompt] if shared_context else prompt, response_format
+        )
+        request_kwargs = self._parse_kwargs(prompt, shared_context)
+        if cache_key is not None:
+            cached = self._parse_cached(
+                await asyncio.to_thread(
+                    self._cache_get, cache_key, operation="responses.parse", subtask=subtask, model=model
+                ),
+                response_format,
             )
-            raise
+            if cached is not None:
+                return cached
+
+        async def _call(permit: Permit) -> Any:
+            t0 = time.time()
+            try:
+                response = await self.client.responses.parse(
+                    model=model,
+                    text_format=response_format,
+                    **request_kwargs,
+                )
+                self._emit_usage(
+                    operation="responses.parse",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+                return response.output_parsed
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="responses.parse",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                raise
+
+        estimated = estimate_tokens([shared_context, prompt])
+        parsed = await call_with_limits_async("openai", model, _call, estimated_tokens=estimated)
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache_put, cache_key, parsed, subtask)
+        return parsed
@@ -1,16 +1,20 @@
 """
 Perplexity service wrapper for process_job_v2 Lambda.
 
-Provides Perplexity API access with usage tracking and telemetry.
+Provides Perplexity API access with usage tracking and telemetry, with a
+blocking client (PerplexityService) and an asyncio one (AsyncPerplexityService).
+Calls go through the shared per-model rate limiter, which also retries
+throttled and transient failures (the SDK's own retries are disabled).
 """
 
 import logging
 import time
 from typing import Optional
 
-from perplexity import Perplexity
+from perplexity import AsyncPerplexity, Perplexity
 
 from llm_usage import UsageContext, emit_llm_usage_event, normalize_perplexity_usage
+from rate_limit import Permit, call_with_limits, call_with_limits_async, estimate_tokens
 
 
 logger = logging.getLogger(__name__)
@@ -42,7 +46,7 @@ class PerplexityService:
             usage_ctx: Telemetry context for usage tracking.
             aws_request_id: AWS Lambda request ID for tracking.
         """
-        self.client = Perplexity(api_key=api_key)
+        self.client = Perplexity(api_key=api_key, max_retries=0)
         self.model = model
         self.usage_ctx = usage_ctx
         self.aws_request_id = aws_request_id
@@ -72,6 +76,7 @@ class PerplexityService:
         success: bool,
         response: Optional[object] = None,
         error: Optional[Exception] = None,
+        permit: Optional[Permit] = None,
     ) -> None:
         """
         Emit usage telemetry event.
@@ -84,7 +89,11 @@ class PerplexityService:
             success: Whether the request succeeded.
             response: API response object (for usage extraction).
             error: Exception if request failed.
+            permit: Rate limiter permit (attempt number, throttle wait).
         """
+        usage = normalize_perplexity_usage(response) if response is not None else None
+        if permit is not None:
+            permit.record_usage(usage)
         if not self.usage_ctx:
             return
         
@@ -96,10 +105,11 @@ class PerplexityService:
             subtask=subtask,
             latency_ms=int((time.time() - t0) * 1000),
             success=success,
-            retry_attempt=1,
+            retry_attempt=permit.attempt if permit else 1,
             aws_request_id=self.aws_request_id,
             error_type=type(error).__name__ if error else None,
-            usage=normalize_perplexity_usage(response) if response is not None else None,
+            usage=usage,
+            throttle_ms=permit.throttle_ms if permit else None,
         )
     
     def deep_research(
@@ -120,39 +130,133 @@ class PerplexityService:
             The research response content.
             
         Raises:
-            Exception: If API call fails.
+            Exception: If API call fails (after retrying throttles and transient errors).
         """
         model = model or self.model
-        t0 = time.time()
-        
-        try:
-            logger.info("Calling Perplexity Deep Research API")
-            
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            self._emit_usage(
-                operation="chat.completions.create",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=True,
-                response=response,
-            )
-            
-            logger.info("Perplexity Deep Research API call completed")
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            self._emit_usage(
-                operation="chat.completions.create",
-                subtask=subtask,
-                model=model,
-                t0=t0,
-                success=False,
-                error=e,
-            )
-            logger.error(f"Error executing deep research: {e}")
-            raise
+
+        def _call(permit: Permit) -> str:
+            t0 = time.time()
+            try:
+                logger.info("Calling Perplexity Deep Research API")
+
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+
+                self._emit_usage(
+                    operation="chat.completions.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+
+                logger.info("Perplexity Deep Research API call completed")
+                return response.choices[0].message.content
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="chat.completions.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                logger.error(f"Error executing deep research: {e}")
+                raise
+
+        return call_with_limits("perplexity", model, _call, estimated_tokens=estimate_tokens(prompt))
+
+
+class AsyncPerplexityService(PerplexityService):
+    """
+    Asyncio variant of PerplexityService built on AsyncPerplexity.
+
+    Same method signatures and usage telemetry; deep_research is a coroutine.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = PerplexityService.DEFAULT_MODEL,
+        usage_ctx: Optional[UsageContext] = None,
+        aws_request_id: Optional[str] = None
+    ):
+        """
+        Initialize async Perplexity service.
+
+        Args:
+            api_key: Perplexity API key.
+            model: Default model to use for requests.
+            usage_ctx: Telemetry context for usage tracking.
+            aws_request_id: AWS Lambda request ID for tracking.
+        """
+        self.client = AsyncPerplexity(api_key=api_key, max_retries=0)
+        self.model = model
+        self.usage_ctx = usage_ctx
+        self.aws_request_id = aws_request_id
+
+    async def deep_research(
+        self,
+        prompt: str,
+        subtask: str,
+        model: Optional[str] = None,
+    ) -> str:
+        """
+        Execute deep research using Perplexity.
+
+        Args:
+            prompt: The research prompt.
+            subtask: Subtask name for telemetry.
+            model: Model to use (defaults to sonar-deep-research).
+
+        Returns:
+            The research response content.
+
+        Raises:
+            Exception: If API call fails (after retrying throttles and transient errors).
+        """
+        model = model or self.model
+
+        async def _call(permit: Permit) -> str:
+            t0 = time.time()
+            try:
+                logger.info("Calling Perplexity Deep Research API")
+
+                response = await self.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}]
+                )
+
+                self._emit_usage(
+                    operation="chat.completions.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=True,
+                    response=response,
+                    permit=permit,
+                )
+
+                logger.info("Perplexity Deep Research API call completed")
+                return response.choices[0].message.content
+
+            except Exception as e:
+                self._emit_usage(
+                    operation="chat.completions.create",
+                    subtask=subtask,
+                    model=model,
+                    t0=t0,
+                    success=False,
+                    error=e,
+                    permit=permit,
+                )
+                logger.error(f"Error executing deep research: {e}")
+                raise
+
+        return await call_with_limits_async("perplexity", model, _call, estimated_tokens=estimate_tokens(prompt))
@@ -3,12 +3,20 @@ Prompt service for loading prompt templates from PostgreSQL.
 
 Fetches prompt templates from the database and renders them with provided
 parameters. Raises errors if prompts cannot be loaded or are missing.
+
+Prompts that embed a large shared document (the deep research output) can
+be rendered "shared context first": the document becomes a separate first
+segment, identical across every call of the job, and the rendered template
+refers to it instead of embedding it. Providers can then reuse the cached
+prefix across calls no matter where the DB template placed the document.
 """
 
 import logging
+import os
 import re
 import time
-from typing import Dict, Set
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
 from urllib.parse import urlparse, parse_qs
 
 logger = logging.getLogger(__name__)
@@ -18,6 +26,16 @@ _prompt_cache: Dict[str, Dict[str, str]] = {}
 _cache_timestamp: float = 0.0
 _CACHE_TTL_SECONDS = 300  # 5 minutes
 
+# Prompt layouts (PROMPT_LAYOUT env var):
+#   inline               - shared documents substituted into the template as-is
+#   shared_context_first - shared document sent first, template refers to it
+LAYOUT_INLINE = "inline"
+LAYOUT_SHARED_CONTEXT_FIRST = "shared_context_first"
+PROMPT_LAYOUTS = (LAYOUT_INLINE, LAYOUT_SHARED_CONTEXT_FIRST)
+
+# Substituted for the shared document's placeholder in the shared-first layout
+SHARED_CONTEXT_REFERENCE = "(provided in full in the research document above)"
+
 
 class PromptNotFoundError(Exception):
     """Raised when a prompt is not found in the database."""
@@ -67,6 +85,18 @@ def _parse_database_url(database_url: str) -> dict:
     return params
 
 
+@dataclass(frozen=True)
+class PromptParts:
+    """
+    A rendered prompt split into a shared prefix and the task instructions.
+
+    shared_context is None for the inline layout, or when the template does
+    not use the shared document; instructions then hold the whole prompt.
+    """
+    instructions: str
+    shared_context: Optional[str] = None
+
+
 class PromptService:
     """
     Service for loading and rendering prompt templates from PostgreSQL.
@@ -76,19 +106,25 @@ class PromptService:
     cannot be loaded, are missing, or have mismatched placeholders.
     """
 
-    def __init__(self, database_url: str, category: str):
+    def __init__(self, database_url: str, category: str, layout: Optional[str] = None):
         """
         Initialize the prompt service.
 
         Args:
             database_url: PostgreSQL connection URL.
             category: The prompt category to load (e.g. 'process_job_v2').
+            layout: Prompt layout for get_prompt_parts(); defaults to the
+                PROMPT_LAYOUT env var, then "inline".
 
         Raises:
             PromptLoadError: If prompts cannot be loaded from the database.
         """
         self.database_url = database_url
         self.category = category
+        self.layout = (layout or os.environ.get("PROMPT_LAYOUT") or LAYOUT_INLINE).lower()
+        if self.layout not in PROMPT_LAYOUTS:
+            logger.warning("Unknown prompt layout '%s', using '%s'", self.layout, LAYOUT_INLINE)
+            self.layout = LAYOUT_INLINE
         self._prompts: Dict[str, str] = {}
         self._load_prompts()
 
@@ -188,6 +224,44 @@ class PromptService:
             PromptNotFoundError: If the prompt is not in the database.
             PromptRenderError: If required placeholders are missing from kwargs.
         """
+        return self._render(function_name, kwargs)
+
+    def get_prompt_parts(self, function_name: str, shared_context_key: str, **kwargs) -> PromptParts:
+        """
+        Render a prompt in the configured layout.
+
+        In the shared-context-first layout, the kwarg named by
+        shared_context_key is returned as shared_context and the template
+        is rendered with a short reference in its place.
+
+        Args:
+            function_name: The function name identifying the prompt.
+            shared_context_key: Name of the kwarg holding the shared document
+                (e.g. 'deep_research_output').
+            **kwargs: Template parameters to substitute.
+
+        Returns:
+            PromptParts with the instructions and, if split, the shared context.
+
+        Raises:
+            PromptNotFoundError: If the prompt is not in the database.
+            PromptRenderError: If required placeholders are missing from kwargs.
+        """
+        template = self._prompts.get(function_name)
+        if (
+            self.layout != LAYOUT_SHARED_CONTEXT_FIRST
+            or template is None
+            or shared_context_key not in _extract_placeholders(template)
+            or not kwargs.get(shared_context_key)
+        ):
+            return PromptParts(instructions=self._render(function_name, kwargs))
+
+        shared_context = str(kwargs[shared_context_key])
+        instructions = self._render(function_name, {**kwargs, shared_context_key: SHARED_CONTEXT_REFERENCE})
+        return PromptParts(instructions=instructions, shared_context=shared_context)
+
+    def _render(self, function_name: str, kwargs: Dict[str, object]) -> str:
+        """Look up, validate and render a template (see get_prompt)."""
         template = self._prompts.get(function_name)
         if template is None:
             raise PromptNotFoundError(
@@ -0,0 +1,289 @@
+"""
+Content-addressed LLM response cache for process_job_v2 Lambda.
+
+Opt-in (LLM_RESPONSE_CACHE=s3|disk) cache of create_response and
+parse_structured results, keyed by a hash of provider, operation, model,
+the full prompt and the response format's JSON schema. Identical calls on
+a rerun - same research, same prompts - are served from the cache instead
+of the API. Nothing in the key depends on the job, so entries are shared
+between jobs and environments that use the same backend.
+
+Entries are gzip-compressed JSON holding the output text or the parsed
+model's JSON dump, with an expiry taken from a per-subtask TTL policy.
+Only subtasks listed in the policy are cached: anything judged per run,
+such as quality gates, must be re-asked when a job is rerun after a
+failure.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Increment to invalidate every cached response
+RESPONSE_CACHE_VERSION = "1"
+
+# TTL for subtasks not matched by RESPONSE_CACHE_TTLS (not cached)
+DEFAULT_TTL_SECONDS = 0
+
+# Per-subtask TTLs, matched on the longest dotted prefix of the subtask name;
+# 0 disables caching. Override with LLM_RESPONSE_CACHE_TTLS (JSON, same shape).
+RESPONSE_CACHE_TTLS: Dict[str, int] = {
+    "process_job_v2.identify_avatars": 14 * 24 * 3600,
+    "process_job_v2.complete_avatar_details": 14 * 24 * 3600,
+    "process_job_v2.generate_marketing_angles": 14 * 24 * 3600,
+    "process_job_v2.create_offer_brief": 14 * 24 * 3600,
+    # Analyses of live page captures go stale with the page itself
+    "process_job_v2.analyze_research_page": 24 * 3600,
+    "process_job_v2.analyze_research_page_text": 24 * 3600,
+    # A cached borderline verdict would fail every rerun the same way
+    "process_job_v2.analyze_page_quality_check": 0,
+}
+
+S3_PREFIX = "cache/llm_responses"
+DISK_CACHE_DIR = "/tmp/llm_response_cache"
+
+BACKENDS = ("s3", "disk")
+
+
+def _schema_of(response_format: Optional[type]) -> Any:
+    """JSON schema of a Pydantic response format (its name for anything else)."""
+    if response_format is None:
+        return None
+    schema = getattr(response_format, "model_json_schema", None)
+    if callable(schema):
+        return schema()
+    return getattr(response_format, "__qualname__", repr(response_format))
+
+
+def make_cache_key(
+    provider: str,
+    operation: str,
+    model: str,
+    prompt: Any,
+    response_format: Optional[type] = None,
+) -> str:
+    """
+    Content hash identifying one LLM call.
+
+    Args:
+        provider: Provider name (e.g. "openai").
+        operation: API operation (e.g. "responses.parse").
+        model: Model name.
+        prompt: Prompt text or content parts (JSON-serializable).
+        response_format: Pydantic model class for structured output, if any.
+
+    Returns:
+        SHA256 hex digest.
+    """
+    material = json.dumps(
+        {
+            "version": RESPONSE_CACHE_VERSION,
+            "provider": provider,
+            "operation": operation,
+            "model": model,
+            "prompt": prompt,
+            "schema": _schema_of(response_format),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _encode(value: Any, expires_at: float) -> bytes:
+    body = json.dumps({"expires_at": expires_at, "value": value}, ensure_ascii=False, separators=(",", ":"))
+    return gzip.compress(body.encode("utf-8"), compresslevel=6)
+
+
+def _decode(payload: bytes) -> Tuple[Any, Optional[float]]:
+    entry = json.loads(gzip.decompress(payload).decode("utf-8"))
+    return entry["value"], entry.get("expires_at")
+
+
+class S3ResponseCacheBackend:
+    """Entries as ``cache/llm_responses/{key[:2]}/{key}.json.gz`` objects."""
+
+    def __init__(self, s3_client, s3_bucket: str, prefix: str = S3_PREFIX):
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.prefix = prefix.rstrip("/")
+
+    def _path(self, key: str) -> str:
+        return f"{self.prefix}/{key[:2]}/{key}.json.gz"
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self._path(key))
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
+    def write(self, key: str, payload: bytes) -> None:
+        self.s3_client.put_object(
+            Bucket=self.s3_bucket,
+            Key=self._path(key),
+            Body=payload,
+            ContentType="application/json",
+            ContentEncoding="gzip",
+        )
+
+
+class DiskResponseCacheBackend:
+    """Entries as files in a local directory (dev runs and warm containers)."""
+
+    def __init__(self, directory: str = DISK_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write(self, key: str, payload: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
+
+@dataclass
+class ResponseCacheStats:
+    """Counters for one cache instance."""
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    writes: int = 0
+
+
+class LLMResponseCache:
+    """
+    Response cache in front of the LLM services.
+
+    Reads and writes are best-effort: backend errors are logged and
+    counted, and the call falls through to the API.
+    """
+
+    def __init__(self, backend, ttls: Optional[Dict[str, int]] = None, default_ttl: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the response cache.
+
+        Args:
+            backend: S3ResponseCacheBackend or DiskResponseCacheBackend.
+            ttls: Per-subtask TTL policy (defaults to RESPONSE_CACHE_TTLS).
+            default_ttl: TTL for subtasks the policy does not match.
+        """
+        self.backend = backend
+        self.ttls = dict(RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stats = ResponseCacheStats()
+
+    def ttl_for(self, subtask: str) -> int:
+        """TTL in seconds for a subtask, by longest matching dotted prefix (0 = don't cache)."""
+        parts = subtask.split(".")
+        for end in range(len(parts), 0, -1):
+            ttl = self.ttls.get(".".join(parts[:end]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key from make_cache_key().
+
+        Returns:
+            The stored value, or None on a miss, expiry or read error.
+        """
+        try:
+            payload = self.backend.read(key)
+            found = _decode(payload) if payload is not None else None
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Error reading LLM response cache {key[:16]}...: {e}")
+            return None
+
+        if found is None or (found[1] is not None and time.time() >= found[1]):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return found[0]
+
+    def put(self, key: str, value: Any, subtask: str) -> None:
+        """
+        Store a value under the subtask's TTL.
+
+        Args:
+            key: Key from make_cache_key().
+            value: JSON-serializable output (text or a model's JSON dump).
+            subtask: Subtask name, selects the TTL.
+        """
+        ttl = self.ttl_for(subtask)
+        if ttl <= 0 or value is None:
+            return
+        try:
+            self.backend.write(key, _encode(value, time.time() + ttl))
+            self.stats.writes += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Error writing LLM response cache {key[:16]}...: {e}")
+
+
+def response_cache_from_env(s3_client=None, s3_bucket: Optional[str] = None) -> Optional[LLMResponseCache]:
+    """
+    Build the cache selected by LLM_RESPONSE_CACHE, or None when it is off.
+
+    LLM_RESPONSE_CACHE is "s3" (needs s3_client and s3_bucket) or "disk"
+    (LLM_RESPONSE_CACHE_DIR, default /tmp/llm_response_cache).
+    LLM_RESPONSE_CACHE_TTLS optionally overrides per-subtask TTLs.
+
+    Args:
+        s3_client: Boto3 S3 client instance.
+        s3_bucket: S3 bucket name for the s3 backend.
+
+    Returns:
+        LLMResponseCache, or None if caching is disabled or misconfigured.
+    """
+    mode = (os.environ.get("LLM_RESPONSE_CACHE") or "").strip().lower()
+    if not mode or mode in ("0", "off", "false", "none"):
+        return None
+    if mode not in BACKENDS:
+        logger.warning(f"Unknown LLM_RESPONSE_CACHE '{mode}', response cache disabled")
+        return None
+
+    ttls = dict(RESPONSE_CACHE_TTLS)
+    raw = os.environ.get("LLM_RESPONSE_CACHE_TTLS")
+    if raw:
+        try:
+            ttls.update({str(k): int(v) for k, v in json.loads(raw).items()})
+        except Exception as e:
+            logger.warning(f"Ignoring invalid LLM_RESPONSE_CACHE_TTLS: {e}")
+
+    if mode == "s3":
+        if s3_client is None or not s3_bucket:
+            logger.warning("LLM_RESPONSE_CACHE=s3 without a results bucket, response cache disabled")
+            return None
+        backend = S3ResponseCacheBackend(s3_client, s3_bucket)
+    else:
+        backend = DiskResponseCacheBackend(os.environ.get("LLM_RESPONSE_CACHE_DIR") or DISK_CACHE_DIR)
+
+    logger.info(f"LLM response cache enabled ({mode})")
+    return LLMResponseCache(backend, ttls=ttls)
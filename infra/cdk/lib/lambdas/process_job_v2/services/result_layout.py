@@ -0,0 +1,175 @@
+"""
+Sharded job result layout for process_job_v2 Lambda.
+
+A job's results are stored as one object per section under
+results/{job_id}/, plus a small manifest written last:
+
+    results/{job_id}/manifest.json
+    results/{job_id}/research.json        research page analysis and deep research
+    results/{job_id}/offer_brief.json
+    results/{job_id}/avatars/000.json     one per avatar, with its angles
+    results/{job_id}/product_image.jpg    decoded product image (CDN URLs stay in the manifest)
+
+The manifest indexes avatars and angles by ID, so readers such as
+write_swipe fetch only the sections they need. assemble_results() rebuilds
+the legacy comprehensive_results.json "results" dict from the shards.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+RESULT_LAYOUT_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+RESEARCH_SHARD = "research.json"
+OFFER_BRIEF_SHARD = "offer_brief.json"
+OTHER_SHARD = "other.json"
+AVATAR_SHARD_TEMPLATE = "avatars/{index:03d}.json"
+PRODUCT_IMAGE_JPEG = "product_image.jpg"
+PRODUCT_IMAGE_BASE64 = "product_image.b64"
+
+RESEARCH_FIELDS = (
+    "research_page_analysis",
+    "deep_research_prompt",
+    "deep_research_output",
+    "target_product_name",
+)
+
+# (relative key, body, content type)
+Shard = Tuple[str, bytes, str]
+
+
+def result_prefix(job_id: str) -> str:
+    """S3 prefix holding a job's result shards."""
+    return f"results/{job_id}/"
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _avatar_index_entry(entry: Dict[str, Any], key: str) -> Dict[str, Any]:
+    avatar = entry.get("avatar") or {}
+    angles = (entry.get("angles") or {}).get("generated_angles") or []
+    return {
+        "id": avatar.get("id"),
+        "name": (avatar.get("overview") or {}).get("name"),
+        "key": key,
+        "angles": [{"id": a.get("id"), "title": a.get("angle_title")} for a in angles],
+    }
+
+
+def _product_image_shard(product_image: Optional[str]) -> Tuple[Optional[Shard], Optional[Dict[str, Any]]]:
+    """Shard and manifest entry for the product image (base64 JPEG or CDN URL)."""
+    if not product_image:
+        return None, None
+    if product_image.startswith(("http://", "https://")):
+        return None, {"url": product_image}
+    try:
+        data = base64.b64decode(product_image, validate=True)
+    except (binascii.Error, ValueError):
+        data = None
+    if data is not None:
+        return (PRODUCT_IMAGE_JPEG, data, "image/jpeg"), {"key": PRODUCT_IMAGE_JPEG, "encoding": "binary"}
+    # Not valid base64: keep the string as-is so the compatibility view round-trips
+    shard = (PRODUCT_IMAGE_BASE64, product_image.encode("utf-8"), "text/plain")
+    return shard, {"key": PRODUCT_IMAGE_BASE64, "encoding": "text"}
+
+
+def build_result_shards(
+    results: Dict[str, Any],
+    job_id: str,
+    project_name: str,
+    timestamp_iso: str,
+) -> Tuple[List[Shard], Dict[str, Any]]:
+    """
+    Split a job's results dict into section objects and a manifest.
+
+    Args:
+        results: Results dict (the "results" of comprehensive_results.json).
+        job_id: Unique job identifier.
+        project_name: Project identifier.
+        timestamp_iso: Result timestamp.
+
+    Returns:
+        Tuple of (shards, manifest). Shard keys are relative to result_prefix().
+    """
+    shards: List[Shard] = []
+
+    research = {k: results.get(k) for k in RESEARCH_FIELDS if k in results}
+    shards.append((RESEARCH_SHARD, _json_bytes(research), "application/json"))
+    sections = {"research": RESEARCH_SHARD}
+
+    if "offer_brief" in results:
+        shards.append((OFFER_BRIEF_SHARD, _json_bytes(results["offer_brief"]), "application/json"))
+        sections["offer_brief"] = OFFER_BRIEF_SHARD
+
+    avatars = []
+    for index, entry in enumerate(results.get("marketing_avatars") or []):
+        key = AVATAR_SHARD_TEMPLATE.format(index=index)
+        shards.append((key, _json_bytes(entry), "application/json"))
+        avatars.append(_avatar_index_entry(entry, key))
+
+    image_shard, image_entry = _product_image_shard(results.get("product_image"))
+    if image_shard:
+        shards.append(image_shard)
+
+    known = set(RESEARCH_FIELDS) | {"offer_brief", "marketing_avatars", "product_image"}
+    other = {k: v for k, v in results.items() if k not in known}
+    if other:
+        shards.append((OTHER_SHARD, _json_bytes(other), "application/json"))
+        sections["other"] = OTHER_SHARD
+
+    manifest = {
+        "layoutVersion": RESULT_LAYOUT_VERSION,
+        "job_id": job_id,
+        "project_name": project_name,
+        "timestamp_iso": timestamp_iso,
+        "prefix": result_prefix(job_id),
+        "target_product_name": results.get("target_product_name"),
+        "sections": sections,
+        "avatars": avatars,
+        "product_image": image_entry,
+    }
+    return shards, manifest
+
+
+def find_avatar(manifest: Dict[str, Any], avatar_id: str) -> Optional[Dict[str, Any]]:
+    """Manifest index entry of an avatar, or None."""
+    return next((a for a in manifest.get("avatars", []) if a.get("id") == avatar_id), None)
+
+
+def assemble_results(manifest: Dict[str, Any], read: Callable[[str], bytes]) -> Dict[str, Any]:
+    """
+    Rebuild the legacy results dict from a job's shards.
+
+    Args:
+        manifest: Parsed manifest.json.
+        read: Returns the bytes of a key relative to the job's result prefix.
+
+    Returns:
+        Results dict in the comprehensive_results.json shape.
+    """
+    sections = manifest.get("sections", {})
+    results: Dict[str, Any] = {}
+    results.update(json.loads(read(sections["research"])))
+    if "offer_brief" in sections:
+        results["offer_brief"] = json.loads(read(sections["offer_brief"]))
+    results["marketing_avatars"] = [json.loads(read(a["key"])) for a in manifest.get("avatars", [])]
+
+    image = manifest.get("product_image")
+    if image is None:
+        results["product_image"] = None
+    elif "url" in image:
+        results["product_image"] = image["url"]
+    elif image.get("encoding") == "binary":
+        results["product_image"] = base64.b64encode(read(image["key"])).decode("ascii")
+    else:
+        results["product_image"] = read(image["key"]).decode("utf-8")
+
+    if "other" in sections:
+        results.update(json.loads(read(sections["other"])))
+    return results
@@ -0,0 +1,213 @@
+"""
+Product image screenshot cache for process_job_v2 Lambda.
+
+Product images (the top 800px of a sales page) are stored in S3 as plain
+JPEG objects keyed by the normalized URL, so a research cache hit can skip
+Playwright entirely. Each entry keeps the ETag / Last-Modified the page was
+served with when it was captured. An entry is served when it is within its
+TTL and, if it is older than a short grace period, a conditional HEAD of
+the page (If-None-Match / If-Modified-Since) says the page has not changed.
+Pages that send no validators, or whose HEAD fails, fall back to the TTL alone.
+The cache is best-effort: any error reading or writing it is logged and
+treated as a miss, never raised into the pipeline.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from services.cache import ResearchCacheService
+
+
+logger = logging.getLogger(__name__)
+
+# Entries older than this are recaptured regardless of validators
+SCREENSHOT_TTL_SECONDS = 7 * 24 * 3600
+
+# Entries younger than this are served without a HEAD request
+REVALIDATE_AFTER_SECONDS = 3600
+
+HEAD_TIMEOUT_SECONDS = 3
+HEAD_USER_AGENT = "Mozilla/5.0 (compatible; DeepCopyBot/1.0)"
+
+# Outcomes of revalidation
+FRESH = "fresh"
+CHANGED = "changed"
+UNKNOWN = "unknown"
+
+# Outcomes of a cache lookup: no entry at all, a servable entry, or an
+# entry that exists but is expired or for a page that has changed
+MISS = "miss"
+HIT = "hit"
+STALE = "stale"
+
+# HEAD result: (status code or None on network error, response headers)
+HeadResult = Tuple[Optional[int], Dict[str, str]]
+
+
+def head_request(url: str, headers: Dict[str, str]) -> HeadResult:
+    """
+    Send a HEAD request.
+
+    Args:
+        url: Page URL.
+        headers: Extra request headers (conditional validators).
+
+    Returns:
+        Tuple of (status code, lower-cased response headers); the status is
+        None if the request failed.
+    """
+    request = Request(url, method="HEAD", headers={"User-Agent": HEAD_USER_AGENT, **headers})
+    try:
+        with urlopen(request, timeout=HEAD_TIMEOUT_SECONDS) as resp:
+            return resp.status, {k.lower(): v for k, v in resp.headers.items()}
+    except HTTPError as e:
+        # urllib raises for 304 as well as for errors
+        return e.code, {k.lower(): v for k, v in (e.headers or {}).items()}
+    except Exception as e:
+        # URLError, timeouts, and http.client errors such as too many headers
+        logger.debug(f"HEAD {url} failed: {e}")
+        return None, {}
+
+
+class ScreenshotCacheService:
+    """
+    Product image cache in S3 with TTL plus HTTP validator freshness checks.
+
+    Objects live at ``cache/screenshots/{url_hash}/product_image.jpg`` with
+    the capture time and the page's ETag / Last-Modified in metadata.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        s3_bucket: str,
+        ttl_seconds: int = SCREENSHOT_TTL_SECONDS,
+        revalidate_after_seconds: int = REVALIDATE_AFTER_SECONDS,
+        head: Optional[Callable[[str, Dict[str, str]], HeadResult]] = None,
+    ):
+        """
+        Initialize the screenshot cache.
+
+        Args:
+            s3_client: Boto3 S3 client instance.
+            s3_bucket: S3 bucket holding the cache.
+            ttl_seconds: Maximum age of a served entry.
+            revalidate_after_seconds: Age after which the page is re-checked.
+            head: Function performing the HEAD request; defaults to head_request.
+        """
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.ttl_seconds = ttl_seconds
+        self.revalidate_after_seconds = revalidate_after_seconds
+        self.head = head or head_request
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return f"cache/screenshots/{ResearchCacheService.get_cache_key(url)}/product_image.jpg"
+
+    def _revalidate(self, url: str, metadata: Dict[str, str]) -> str:
+        """Ask the page whether it changed since the capture."""
+        etag, last_modified = metadata.get("etag"), metadata.get("last-modified")
+        if not (etag or last_modified):
+            return UNKNOWN
+
+        conditional = {}
+        if etag:
+            conditional["If-None-Match"] = etag
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+        status, headers = self.head(url, conditional)
+
+        if status == 304:
+            return FRESH
+        if status is None or status >= 400:
+            return UNKNOWN
+        # Servers that ignore conditional headers: compare validators directly
+        if etag and headers.get("etag"):
+            return FRESH if headers["etag"] == etag else CHANGED
+        if last_modified and headers.get("last-modified"):
+            return FRESH if headers["last-modified"] == last_modified else CHANGED
+        return UNKNOWN
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Return the cached product image for a URL if it is still fresh.
+
+        Args:
+            url: Sales page URL.
+
+        Returns:
+            JPEG bytes, or None on miss, expiry or a changed page.
+        """
+        return self.lookup(url)[0]
+
+    def lookup(self, url: str) -> Tuple[Optional[bytes], str]:
+        """
+        Look up the product image for a URL and say why it was not served.
+
+        Args:
+            url: Sales page URL.
+
+        Returns:
+            Tuple of (JPEG bytes or None, outcome), the outcome being HIT,
+            MISS (no entry, or the cache could not be read) or STALE
+            (expired, or the page changed since the capture).
+        """
+        try:
+            return self._lookup(url)
+        except Exception as e:
+            logger.warning(f"Error reading screenshot cache for URL {url}: {e}")
+            return None, MISS
+
+    def _lookup(self, url: str) -> Tuple[Optional[bytes], str]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self._key(url))
+        except self.s3_client.exceptions.NoSuchKey:
+            logger.info(f"Screenshot cache MISS for URL: {url}")
+            return None, MISS
+
+        metadata = response.get("Metadata", {})
+        age = time.time() - float(metadata.get("captured-at", 0))
+        if age > self.ttl_seconds:
+            logger.info(f"Screenshot cache EXPIRED for URL: {url} (age {age:.0f}s)")
+            return None, STALE
+
+        if age > self.revalidate_after_seconds:
+            outcome = self._revalidate(url, metadata)
+            if outcome == CHANGED:
+                logger.info(f"Screenshot cache STALE for URL: {url} (page changed)")
+                return None, STALE
+            logger.info(f"Screenshot cache revalidated for URL: {url} ({outcome})")
+
+        logger.info(f"Screenshot cache HIT for URL: {url} (age {age:.0f}s)")
+        return response["Body"].read(), HIT
+
+    def save(self, url: str, image_bytes: bytes, validators: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store a freshly captured product image with the page's validators.
+
+        Args:
+            url: Sales page URL.
+            image_bytes: JPEG product image.
+            validators: ETag / Last-Modified from the capture's navigation
+                response (PageScreenshots.validators), keyed in lower case.
+        """
+        try:
+            metadata = {"captured-at": f"{time.time():.0f}"}
+            for name in ("etag", "last-modified"):
+                value = (validators or {}).get(name)
+                if value:
+                    metadata[name] = value
+            self.s3_client.put_object(
+                Bucket=self.s3_bucket,
+                Key=self._key(url),
+                Body=image_bytes,
+                ContentType="image/jpeg",
+                Metadata=metadata,
+            )
+            logger.info(f"Saved screenshot cache for URL: {url} ({len(image_bytes)} bytes)")
+        except Exception as e:
+            logger.error(f"Error saving screenshot cache for URL {url}: {e}")
@@ -0,0 +1,265 @@
+"""
+Local pre-ranking index for content library templates.
+
+Encodes the categorical fields of every LandingPageSummary as a multi-hot
+NumPy matrix so an avatar+angle pair can be scored against the whole library
+with a single matrix-vector product. Only the top-N candidates are then sent
+to the LLM scorer, which keeps the prediction prompt size flat as the
+library grows.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from data_models import Avatar, ContentLibrarySummaries, LandingPageSummary, MarketingAngle
+
+
+logger = logging.getLogger(__name__)
+
+# Fields encoded in the matrix. List fields are multi-hot; "tone" is free
+# text and is tokenized into words; the rest are single categorical values.
+INDEXED_FIELDS = (
+    "best_for_awareness_levels",
+    "best_for_angle_types",
+    "tone",
+    "energy_level",
+    "format_type",
+    "persuasion_techniques",
+)
+
+# Relative importance of each field in the query vector
+FIELD_WEIGHTS: Dict[str, float] = {
+    "best_for_awareness_levels": 3.0,
+    "best_for_angle_types": 3.0,
+    "persuasion_techniques": 1.5,
+    "tone": 1.0,
+    "energy_level": 1.0,
+    "format_type": 0.5,
+}
+
+# Avatar awareness levels that have no direct template equivalent
+AWARENESS_ALIASES: Dict[str, str] = {
+    "most_aware": "product_aware",
+}
+
+# What each angle type tends to pair with, beyond best_for_angle_types
+ANGLE_TYPE_AFFINITY: Dict[str, Dict[str, List[str]]] = {
+    "mechanism": {
+        "persuasion_techniques": ["mechanism_explanation", "statistics_data", "authority_citation"],
+        "format_type": ["advertorial_authority", "advertorial"],
+    },
+    "pain_lead": {
+        "persuasion_techniques": ["emotional_storytelling", "before_after", "fear_of_inaction"],
+        "format_type": ["advertorial_pov", "advertorial"],
+    },
+    "desire_lead": {
+        "persuasion_techniques": ["before_after", "testimonials", "emotional_storytelling"],
+        "format_type": ["listicle", "advertorial"],
+    },
+    "social_proof": {
+        "persuasion_techniques": ["social_proof", "testimonials", "expert_endorsement"],
+        "format_type": ["listicle", "advertorial"],
+    },
+    "fear_based": {
+        "persuasion_techniques": ["fear_of_inaction", "urgency_scarcity", "statistics_data"],
+        "format_type": ["advertorial_authority", "advertorial"],
+    },
+    "curiosity": {
+        "persuasion_techniques": ["curiosity_gap", "contrarian_reveal"],
+        "format_type": ["listicle", "advertorial"],
+    },
+    "contrarian": {
+        "persuasion_techniques": ["contrarian_reveal", "authority_citation", "curiosity_gap"],
+        "format_type": ["advertorial_authority", "advertorial"],
+    },
+    "story": {
+        "persuasion_techniques": ["emotional_storytelling", "before_after"],
+        "format_type": ["advertorial_pov"],
+    },
+}
+
+# Tone/energy/technique values that fit each emotional driver
+EMOTIONAL_DRIVER_AFFINITY: Dict[str, Dict[str, List[str]]] = {
+    "fear": {
+        "tone": ["urgent", "alarming", "serious", "cautionary"],
+        "energy_level": ["high_energy_urgent", "emotionally_intense"],
+        "persuasion_techniques": ["fear_of_inaction", "urgency_scarcity"],
+    },
+    "hope": {
+        "tone": ["hopeful", "empathetic", "inspirational", "warm"],
+        "energy_level": ["moderate", "emotionally_intense"],
+        "persuasion_techniques": ["before_after", "emotional_storytelling"],
+    },
+    "anger": {
+        "tone": ["urgent", "confrontational", "provocative", "indignant"],
+        "energy_level": ["high_energy_urgent", "emotionally_intense"],
+        "persuasion_techniques": ["contrarian_reveal"],
+    },
+    "shame": {
+        "tone": ["empathetic", "conversational", "personal", "vulnerable"],
+        "energy_level": ["emotionally_intense", "moderate"],
+        "persuasion_techniques": ["emotional_storytelling", "before_after"],
+    },
+    "desire": {
+        "tone": ["aspirational", "enthusiastic", "friendly", "excited"],
+        "energy_level": ["moderate", "high_energy_urgent"],
+        "persuasion_techniques": ["before_after", "testimonials"],
+    },
+    "curiosity": {
+        "tone": ["conversational", "intriguing", "mysterious", "friendly"],
+        "energy_level": ["moderate"],
+        "persuasion_techniques": ["curiosity_gap", "contrarian_reveal"],
+    },
+    "trust": {
+        "tone": ["professional", "authoritative", "educational", "scientific"],
+        "energy_level": ["calm_educational", "moderate"],
+        "persuasion_techniques": ["authority_citation", "expert_endorsement", "statistics_data"],
+    },
+}
+
+DEFAULT_TOP_N = 20
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(value: str) -> str:
+    """Normalize a categorical value ('Problem aware' -> 'problem_aware')."""
+    return _TOKEN_SPLIT.sub("_", value.strip().lower()).strip("_")
+
+
+def _field_tokens(summary: LandingPageSummary, field: str) -> List[str]:
+    """Return the normalized tokens of one summary field."""
+    value = getattr(summary, field)
+    if field == "tone":
+        return [t for t in _TOKEN_SPLIT.split(value.lower()) if t]
+    if isinstance(value, list):
+        return [_normalize(v) for v in value if v]
+    return [_normalize(value)] if value else []
+
+
+def library_version_key(summaries: ContentLibrarySummaries) -> str:
+    """Identify a library build; indexes are rebuilt only when this changes."""
+    return f"{summaries.version}:{summaries.generated_at}:{summaries.total_pages}"
+
+
+class TemplateFeatureIndex:
+    """
+    Multi-hot feature matrix over a content library.
+
+    Rows are templates, columns are (field, token) pairs. Within a field each
+    row is L1-normalized, so a template listing many techniques does not
+    outscore one listing a few.
+    """
+
+    def __init__(self, summaries: List[LandingPageSummary]):
+        """
+        Build the index.
+
+        Args:
+            summaries: Template summaries to index, in library order.
+        """
+        self.summaries = summaries
+        self.columns: Dict[Tuple[str, str], int] = {}
+
+        rows: List[List[Tuple[int, float]]] = []
+        for summary in summaries:
+            row: List[Tuple[int, float]] = []
+            for field in INDEXED_FIELDS:
+                tokens = set(_field_tokens(summary, field))
+                for token in tokens:
+                    col = self.columns.setdefault((field, token), len(self.columns))
+                    row.append((col, 1.0 / len(tokens)))
+            rows.append(row)
+
+        self.matrix = np.zeros((len(summaries), len(self.columns)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            for col, value in row:
+                self.matrix[i, col] = value
+
+    def _query_vector(self, avatar: Avatar, angle: MarketingAngle) -> np.ndarray:
+        """Build the weighted query vector for an avatar+angle pair."""
+        query = np.zeros(len(self.columns), dtype=np.float32)
+
+        def _add(field: str, values: Iterable[str], weight: float) -> None:
+            for value in values:
+                col = self.columns.get((field, _normalize(value)))
+                if col is not None:
+                    query[col] += weight
+
+        awareness = _normalize(avatar.overview.awareness_level.value)
+        awareness = AWARENESS_ALIASES.get(awareness, awareness)
+        _add("best_for_awareness_levels", [awareness], FIELD_WEIGHTS["best_for_awareness_levels"])
+
+        angle_type = angle.angle_type.value
+        _add("best_for_angle_types", [angle_type], FIELD_WEIGHTS["best_for_angle_types"])
+
+        for affinity in (
+            ANGLE_TYPE_AFFINITY.get(angle_type, {}),
+            EMOTIONAL_DRIVER_AFFINITY.get(angle.emotional_driver.value, {}),
+        ):
+            for field, values in affinity.items():
+                _add(field, values, FIELD_WEIGHTS[field])
+
+        return query
+
+    def score(self, avatar: Avatar, angle: MarketingAngle) -> np.ndarray:
+        """
+        Score every template against an avatar+angle pair.
+
+        Returns:
+            Array of scores aligned with ``self.summaries``.
+        """
+        return self.matrix @ self._query_vector(avatar, angle)
+
+    def top_candidates(
+        self,
+        avatar: Avatar,
+        angle: MarketingAngle,
+        top_n: int = DEFAULT_TOP_N,
+    ) -> List[LandingPageSummary]:
+        """
+        Return the top-N templates for an avatar+angle pair, best first.
+
+        Ties keep library order so results are deterministic.
+        """
+        if top_n >= len(self.summaries):
+            return list(self.summaries)
+        order = np.argsort(-self.score(avatar, angle), kind="stable")[:top_n]
+        return [self.summaries[i] for i in order]
+
+
+_index_cache: Dict[str, TemplateFeatureIndex] = {}
+_index_lock = threading.Lock()
+
+
+def get_template_index(
+    summaries: ContentLibrarySummaries,
+    version_tag: Optional[str] = None,
+) -> TemplateFeatureIndex:
+    """
+    Return the feature index for a library, building it once per version.
+
+    The index lives at module scope, so warm Lambda containers reuse it
+    across invocations until the library is regenerated.
+
+    Args:
+        summaries: The library to index.
+        version_tag: Library version identifier (e.g. the S3 ETag from
+            LibrarySummariesCache); derived from the library when omitted.
+    """
+    key = version_tag or library_version_key(summaries)
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is None:
+            index = TemplateFeatureIndex(summaries.summaries)
+            _index_cache.clear()
+            _index_cache[key] = index
+            logger.info(
+                f"Built template index for library {key}: "
+                f"{index.matrix.shape[0]} templates x {index.matrix.shape[1]} features"
+            )
+        return index
@@ -7,8 +7,15 @@ templates from the content library using LLM-based scoring.
 
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+from pydantic import BaseModel, Field
 
 from data_models import (
     Avatar,
@@ -20,74 +27,185 @@ from data_models import (
 )
 from services.openai_service import OpenAIService
 from services.prompt_service import PromptService
+from services.template_index import DEFAULT_TOP_N, get_template_index, library_version_key
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent per-angle calls when a batch call falls back
+MAX_PARALLEL_PREDICTIONS = 5
+
 
 class TemplatePredictionMatches(list):
     """Wrapper for list of TemplateMatch for structured parsing."""
     pass
 
 
+class AnglePredictionResponse(BaseModel):
+    """Template matches for one angle inside a batch prediction."""
+    angle_id: str = Field(..., description="The angle_id this result is for, copied exactly")
+    matches: List[TemplateMatch] = Field(
+        ...,
+        description="Ranked list of template matches for this angle"
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    """Structured output for predicting templates for several angles at once."""
+    results: List[AnglePredictionResponse] = Field(
+        ...,
+        description="One entry per marketing angle, scored independently"
+    )
+
+
+@dataclass
+class _LibraryEntry:
+    """Parsed library plus the metadata needed to revalidate it."""
+    summaries: ContentLibrarySummaries
+    by_id: Dict[str, LandingPageSummary]
+    etag: Optional[str]
+    version_tag: str
+    checked_at: float
+
+
+# Module-level cache for warm Lambda reuse, keyed by (bucket, key)
+_library_entries: Dict[Tuple[str, str], _LibraryEntry] = {}
+_library_lock = threading.Lock()
+_LIBRARY_TTL_SECONDS = 300  # 5 minutes
+
+
+def _is_not_modified(error: ClientError) -> bool:
+    """Return True if a conditional GET was answered with 304 Not Modified."""
+    code = str(error.response.get("Error", {}).get("Code", ""))
+    status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("304", "NotModified") or status == 304
+
+
 class LibrarySummariesCache:
     """
     Cache for content library summaries.
 
-    Loads summaries from S3 and keeps them in memory for the duration
-    of the Lambda execution to avoid repeated S3 calls.
+    Parsed summaries live at module scope, so warm Lambda containers reuse
+    them across invocations. After the TTL expires the library is revalidated
+    with a conditional GET (If-None-Match) and only re-downloaded when its
+    ETag changed.
     """
 
     LIBRARY_KEY = "content_library/library_summaries.json"
 
-    def __init__(self, s3_client, s3_bucket: str):
+    def __init__(self, s3_client, s3_bucket: str, ttl_seconds: float = _LIBRARY_TTL_SECONDS):
         """
         Initialize the cache.
 
         Args:
             s3_client: Boto3 S3 client instance.
             s3_bucket: S3 bucket name containing the library.
+            ttl_seconds: Seconds before a cached library is revalidated.
         """
         self.s3_client = s3_client
         self.s3_bucket = s3_bucket
-        self._cached_summaries: Optional[ContentLibrarySummaries] = None
+        self.ttl_seconds = ttl_seconds
 
-    def get_summaries(self) -> Optional[ContentLibrarySummaries]:
+    @property
+    def _entry_key(self) -> Tuple[str, str]:
+        return (self.s3_bucket, self.LIBRARY_KEY)
+
+    def _load(self, current: Optional[_LibraryEntry]) -> Optional[_LibraryEntry]:
         """
-        Get library summaries, loading from S3 if not cached.
+        Fetch the library from S3, conditionally if an entry already exists.
+
+        Args:
+            current: The currently cached entry, if any.
 
         Returns:
-            ContentLibrarySummaries if available, None if library doesn't exist.
+            The fresh or revalidated entry, or None if the library doesn't exist.
         """
-        if self._cached_summaries is not None:
-            return self._cached_summaries
+        request = {"Bucket": self.s3_bucket, "Key": self.LIBRARY_KEY}
+        if current is not None and current.etag:
+            request["IfNoneMatch"] = current.etag
 
         try:
             logger.info(f"Loading library summaries from s3://{self.s3_bucket}/{self.LIBRARY_KEY}")
+            response = self.s3_client.get_object(**request)
+        except ClientError as e:
+            if current is not None and _is_not_modified(e):
+                logger.info(f"Library summaries unchanged (ETag {current.etag})")
+                current.checked_at = time.time()
+                return current
+            raise
+
+        data = json.loads(response['Body'].read().decode('utf-8'))
+        summaries = ContentLibrarySummaries(**data)
+        etag = response.get("ETag")
+        entry = _LibraryEntry(
+            summaries=summaries,
+            by_id={s.id: s for s in summaries.summaries},
+            etag=etag,
+            version_tag=etag.strip('"') if etag else library_version_key(summaries),
+            checked_at=time.time(),
+        )
 
-            response = self.s3_client.get_object(
-                Bucket=self.s3_bucket,
-                Key=self.LIBRARY_KEY
-            )
+        logger.info(
+            f"Loaded {summaries.total_pages} template summaries "
+            f"(version: {summaries.version}, tag: {entry.version_tag})"
+        )
+        return entry
 
-            data = json.loads(response['Body'].read().decode('utf-8'))
-            self._cached_summaries = ContentLibrarySummaries(**data)
+    def _get_entry(self) -> Optional[_LibraryEntry]:
+        """
+        Return the cached entry, loading or revalidating it when stale.
 
-            logger.info(
-                f"Loaded {self._cached_summaries.total_pages} template summaries "
-                f"(version: {self._cached_summaries.version})"
-            )
-            return self._cached_summaries
+        Returns:
+            _LibraryEntry if available, None if library doesn't exist.
+        """
+        with _library_lock:
+            current = _library_entries.get(self._entry_key)
+            if current is not None and (time.time() - current.checked_at) < self.ttl_seconds:
+                return current
+
+            try:
+                entry = self._load(current)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                    logger.warning(
+                        f"Library summaries not found at s3://{self.s3_bucket}/{self.LIBRARY_KEY}. "
+                        "Run generate_content_library_summaries.py to create the library."
+                    )
+                    _library_entries.pop(self._entry_key, None)
+                    return None
+                logger.error(f"Error loading library summaries: {e}")
+                return current
+            except Exception as e:
+                logger.error(f"Error loading library summaries: {e}")
+                # Serve the stale copy rather than nothing
+                return current
+
+            _library_entries[self._entry_key] = entry
+            return entry
 
-        except self.s3_client.exceptions.NoSuchKey:
-            logger.warning(
-                f"Library summaries not found at s3://{self.s3_bucket}/{self.LIBRARY_KEY}. "
-                "Run generate_content_library_summaries.py to create the library."
-            )
-            return None
-        except Exception as e:
-            logger.error(f"Error loading library summaries: {e}")
-            return None
+    def get_summaries(self) -> Optional[ContentLibrarySummaries]:
+        """
+        Get library summaries, loading from S3 if not cached or stale.
+
+        Returns:
+            ContentLibrarySummaries if available, None if library doesn't exist.
+        """
+        entry = self._get_entry()
+        return entry.summaries if entry else None
+
+    def get_versioned_summaries(self) -> Optional[Tuple[ContentLibrarySummaries, str]]:
+        """
+        Get library summaries together with their version tag (the S3 ETag).
+
+        Both come from the same cache entry, so downstream memoization keyed
+        on the tag (e.g. the template feature index) never pairs it with
+        summaries from a different revalidation.
+
+        Returns:
+            Tuple of (summaries, version tag), or None if the library doesn't exist.
+        """
+        entry = self._get_entry()
+        return (entry.summaries, entry.version_tag) if entry else None
 
     def get_summary_by_id(self, template_id: str) -> Optional[LandingPageSummary]:
         """
@@ -99,22 +217,19 @@ class LibrarySummariesCache:
         Returns:
             LandingPageSummary if found, None otherwise.
         """
-        summaries = self.get_summaries()
-        if summaries is None:
+        entry = self._get_entry()
+        if entry is None:
             return None
-
-        for summary in summaries.summaries:
-            if summary.id == template_id:
-                return summary
-        return None
+        return entry.by_id.get(template_id)
 
 
 class TemplatePredictionService:
     """
     Service for predicting which landing page templates match an avatar+angle.
 
-    Uses OpenAI to semantically score templates against avatar and angle
-    characteristics, returning ranked matches with confidence scores.
+    Pre-ranks the library locally with a categorical feature index, then
+    uses OpenAI to semantically score the top candidates against avatar and
+    angle characteristics, returning ranked matches with confidence scores.
     """
 
     def __init__(
@@ -122,6 +237,7 @@ class TemplatePredictionService:
         openai_service: OpenAIService,
         library_cache: LibrarySummariesCache,
         prompt_service: PromptService,
+        pre_rank_top_n: int = DEFAULT_TOP_N,
     ):
         """
         Initialize the prediction service.
@@ -130,10 +246,12 @@ class TemplatePredictionService:
             openai_service: OpenAI service for LLM calls.
             library_cache: Cache for library summaries.
             prompt_service: PromptService for DB-stored prompts.
+            pre_rank_top_n: Number of locally pre-ranked templates sent to the LLM.
         """
         self.openai_service = openai_service
         self.library_cache = library_cache
         self.prompt_service = prompt_service
+        self.pre_rank_top_n = pre_rank_top_n
 
     def _create_avatar_summary(self, avatar: Avatar) -> str:
         """
@@ -190,18 +308,48 @@ Pain Points: {', '.join(angle.pain_points[:5])}
 Desires: {', '.join(angle.desires[:5])}
 """
 
-    def _create_library_summary(self, summaries: ContentLibrarySummaries) -> str:
+    def _select_candidates(
+        self,
+        summaries: ContentLibrarySummaries,
+        version_tag: str,
+        avatar: Avatar,
+        angle: MarketingAngle,
+    ) -> List[LandingPageSummary]:
         """
-        Create a condensed summary of available templates for the prediction prompt.
+        Pre-rank the library locally and keep the top candidates for the LLM.
 
         Args:
             summaries: The library summaries.
+            version_tag: Version tag read with the summaries.
+            avatar: The marketing avatar.
+            angle: The marketing angle.
+
+        Returns:
+            Candidate templates, best local score first.
+        """
+        if len(summaries.summaries) <= self.pre_rank_top_n:
+            return list(summaries.summaries)
+        index = get_template_index(summaries, version_tag=version_tag)
+        candidates = index.top_candidates(
+            avatar, angle, top_n=self.pre_rank_top_n
+        )
+        logger.info(
+            f"Pre-ranked {len(summaries.summaries)} templates to {len(candidates)} candidates"
+        )
+        return candidates
+
+    def _create_library_summary(self, templates: List[LandingPageSummary]) -> str:
+        """
+        Create a condensed summary of candidate templates for the prediction prompt.
+
+        Args:
+            templates: The templates to include.
 
         Returns:
             JSON string of template summaries.
         """
         template_list = []
-        for s in summaries.summaries:
+        for s in templates:
             template_list.append({
                 "id": s.id,
                 "format_type": s.format_type,
@@ -219,6 +367,49 @@ Desires: {', '.join(angle.desires[:5])}
             })
         return json.dumps(template_list, indent=2)
 
+    def _build_result(
+        self,
+        avatar: Avatar,
+        angle: MarketingAngle,
+        matches: List[TemplateMatch],
+        valid_ids: set,
+        top_k: int,
+    ) -> Optional[TemplatePredictionResult]:
+        """
+        Rank, truncate and validate LLM matches into a prediction result.
+
+        Args:
+            avatar: The marketing avatar.
+            angle: The marketing angle.
+            matches: Matches returned by the LLM.
+            valid_ids: Template IDs that were offered to the LLM.
+            top_k: Number of top matches to keep.
+
+        Returns:
+            TemplatePredictionResult, or None if no valid matches remain.
+        """
+        # Sort by score and take top_k
+        matches = sorted(
+            matches,
+            key=lambda m: m.overall_fit_score,
+            reverse=True
+        )[:top_k]
+
+        # Validate that all predicted template IDs exist
+        matches = [m for m in matches if m.template_id in valid_ids]
+
+        if not matches:
+            logger.warning(f"No valid template matches returned for angle {angle.id}")
+            return None
+
+        return TemplatePredictionResult(
+            avatar_id=avatar.id,
+            angle_id=angle.id,
+            predictions=matches,
+            top_template_id=matches[0].template_id,
+            predicted_at=datetime.now(timezone.utc).isoformat()
+        )
+
     def predict_templates(
         self,
         avatar: Avatar,
@@ -237,7 +428,7 @@ Desires: {', '.join(angle.desires[:5])}
             TemplatePredictionResult with ranked matches, or None if prediction fails.
         """
         # Load library summaries
-        summaries = self.library_cache.get_summaries()
+        summaries, version_tag = self.library_cache.get_versioned_summaries() or (None, None)
         if summaries is None or len(summaries.summaries) == 0:
             logger.warning("No template summaries available for prediction")
             return None
@@ -245,7 +436,8 @@ Desires: {', '.join(angle.desires[:5])}
         # Create condensed summaries for the prompt
         avatar_summary = self._create_avatar_summary(avatar)
         angle_summary = self._create_angle_summary(angle)
-        library_summary = self._create_library_summary(summaries)
+        candidates = self._select_candidates(summaries, version_tag, avatar, angle)
+        library_summary = self._create_library_summary(candidates)
 
         # Generate prompt
         kwargs = dict(
@@ -257,7 +449,6 @@ Desires: {', '.join(angle.desires[:5])}
 
         try:
             # Define response schema for structured output
-            from pydantic import BaseModel, Field
             from typing import List as TypingList
 
             class PredictionResponse(BaseModel):
@@ -273,29 +464,133 @@ Desires: {', '.join(angle.desires[:5])}
                 subtask="template_prediction"
             )
 
-            # Sort by score and take top_k
-            matches = sorted(
-                response.matches,
-                key=lambda m: m.overall_fit_score,
-                reverse=True
-            )[:top_k]
-
-            # Validate that all predicted template IDs exist
-            valid_ids = {s.id for s in summaries.summaries}
-            matches = [m for m in matches if m.template_id in valid_ids]
-
-            if not matches:
-                logger.warning("No valid template matches returned from prediction")
-                return None
-
-            return TemplatePredictionResult(
-                avatar_id=avatar.id,
-                angle_id=angle.id,
-                predictions=matches,
-                top_template_id=matches[0].template_id,
-                predicted_at=datetime.now(timezone.utc).isoformat()
+            return self._build_result(
+                avatar, angle, response.matches, {s.id for s in candidates}, top_k
             )
 
         except Exception as e:
             logger.error(f"Error predicting templates for avatar {avatar.id}, angle {angle.id}: {e}")
             return None
+
+    def _create_angles_summary(self, angles: List[MarketingAngle]) -> str:
+        """
+        Create a combined summary of several angles for a batch prediction prompt.
+
+        Args:
+            angles: The marketing angles to summarize.
+
+        Returns:
+            Summary string with one labelled section per angle.
+        """
+        sections = [
+            f"Score the templates separately for EACH of the following {len(angles)} "
+            f"marketing angles. Return one result per angle_id, with that angle's "
+            f"top matches ranked independently of the other angles."
+        ]
+        for i, angle in enumerate(angles, start=1):
+            sections.append(
+                f"### Angle {i} (angle_id: {angle.id})\n{self._create_angle_summary(angle)}"
+            )
+        return "\n\n".join(sections)
+
+    def _predict_individually(
+        self,
+        avatar: Avatar,
+        angles: List[MarketingAngle],
+        top_k: int,
+    ) -> List[Optional[TemplatePredictionResult]]:
+        """
+        Predict templates with one call per angle, run concurrently.
+
+        Args:
+            avatar: The marketing avatar.
+            angles: The marketing angles.
+            top_k: Number of top matches to return per angle.
+
+        Returns:
+            List aligned with ``angles``; failed predictions are None.
+        """
+        if not angles:
+            return []
+        workers = max(1, min(MAX_PARALLEL_PREDICTIONS, len(angles)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda angle: self.predict_templates(avatar, angle, top_k), angles))
+
+    def predict_templates_batch(
+        self,
+        avatar: Avatar,
+        angles: List[MarketingAngle],
+        top_k: int = 5
+    ) -> List[Optional[TemplatePredictionResult]]:
+        """
+        Predict templates for all angles of one avatar in a single LLM call.
+
+        The avatar summary and the union of each angle's pre-ranked candidates
+        are sent once. Angles the batch call does not cover (or the whole
+        batch, if the call or parse fails) fall back to per-angle calls.
+
+        Args:
+            avatar: The marketing avatar.
+            angles: The avatar's marketing angles.
+            top_k: Number of top matches to return per angle.
+
+        Returns:
+            List aligned with ``angles``; failed predictions are None.
+        """
+        if len(angles) <= 1:
+            return self._predict_individually(avatar, angles, top_k)
+
+        summaries, version_tag = self.library_cache.get_versioned_summaries() or (None, None)
+        if summaries is None or len(summaries.summaries) == 0:
+            logger.warning("No template summaries available for prediction")
+            return [None] * len(angles)
+
+        # Union of each angle's candidates, keeping first-seen order
+        candidates: List[LandingPageSummary] = []
+        seen_ids = set()
+        for angle in angles:
+            for template in self._select_candidates(summaries, version_tag, avatar, angle):
+                if template.id not in seen_ids:
+                    seen_ids.add(template.id)
+                    candidates.append(template)
+
+        kwargs = dict(
+            avatar_summary=self._create_avatar_summary(avatar),
+            angle_summary=self._create_angles_summary(angles),
+            library_summaries=self._create_library_summary(candidates),
+        )
+
+        try:
+            prompt = self.prompt_service.get_prompt("get_template_prediction_prompt", **kwargs)
+            response = self.openai_service.parse_structured(
+                prompt=prompt,
+                response_format=BatchPredictionResponse,
+                subtask="template_prediction_batch"
+            )
+            matches_by_angle = {r.angle_id: r.matches for r in response.results}
+        except Exception as e:
+            logger.warning(
+                f"Batch template prediction failed for avatar {avatar.id}, "
+                f"falling back to per-angle calls: {e}"
+            )
+            return self._predict_individually(avatar, angles, top_k)
+
+        results: List[Optional[TemplatePredictionResult]] = []
+        missing: List[int] = []
+        for i, angle in enumerate(angles):
+            matches = matches_by_angle.get(angle.id)
+            result = self._build_result(avatar, angle, matches, seen_ids, top_k) if matches else None
+            if result is None:
+                missing.append(i)
+            results.append(result)
+
+        if missing:
+            logger.warning(
+                f"Batch template prediction missed {len(missing)}/{len(angles)} angles "
+                f"for avatar {avatar.id}, retrying them individually"
+            )
+            retried = self._predict_individually(avatar, [angles[i] for i in missing], top_k)
+            for i, result in zip(missing, retried):
+                results[i] = result
+
+        return results
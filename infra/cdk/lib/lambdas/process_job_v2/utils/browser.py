@@ -0,0 +1,221 @@
+"""
+Shared Chromium browser for process_job_v2 Lambda.
+
+Launching Chromium takes several seconds, so one browser is launched per
+warm container and reused by every capture. Each capture gets its own
+browser context (isolated cookies, storage and cache), so concurrent
+captures from different threads do not interfere.
+
+Playwright objects are bound to the event loop that created them, so the
+browser lives on a dedicated background thread running an asyncio loop;
+callers on any thread submit capture coroutines to it.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--single-process",
+    "--no-zygote",
+    "--disable-software-rasterizer",
+    "--disable-web-security",
+]
+
+# Concurrent contexts per browser (execute_multiple analyzes up to 3 URLs)
+MAX_CONCURRENT_CONTEXTS = 3
+
+# Upper bound for one capture, on top of Playwright's own navigation timeouts
+CAPTURE_TIMEOUT_SECONDS = 180
+
+
+@dataclass
+class CaptureTimings:
+    """Wall-clock breakdown of one capture, in milliseconds; extra keys not ending in _ms are counts."""
+    launch_ms: float = 0.0
+    context_ms: float = 0.0
+    navigation_ms: float = 0.0
+    screenshot_ms: float = 0.0
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        parts = [
+            f"launch={self.launch_ms:.0f}ms",
+            f"context={self.context_ms:.0f}ms",
+            f"navigation={self.navigation_ms:.0f}ms",
+            f"screenshot={self.screenshot_ms:.0f}ms",
+        ]
+        parts += [
+            f"{name}={value:.0f}ms" if name.endswith("_ms") else f"{name}={value:g}"
+            for name, value in self.extra.items()
+        ]
+        return ", ".join(parts)
+
+
+async def _launch_chromium() -> Tuple[Any, Any]:
+    """Start Playwright and launch headless Chromium."""
+    from playwright.async_api import async_playwright
+
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    return playwright, browser
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium browser handing out isolated contexts.
+
+    The browser is launched lazily on first use and relaunched if it
+    disconnects (e.g. a renderer crash in single-process mode).
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = MAX_CONCURRENT_CONTEXTS,
+        launcher: Callable[[], Awaitable[Tuple[Any, Any]]] = _launch_chromium,
+    ):
+        """
+        Initialize the pool (nothing is started until the first capture).
+
+        Args:
+            max_contexts: Maximum number of contexts open at once.
+            launcher: Coroutine returning (playwright, browser).
+        """
+        self.max_contexts = max_contexts
+        self._launcher = launcher
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.launches = 0
+        self.captures = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop thread once."""
+        with self._start_lock:
+            if self._loop is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+                self._browser_lock = None
+                self._slots = None
+                self._browser = None
+            return self._loop
+
+    async def _get_browser(self, timings: CaptureTimings):
+        """Return the connected browser, launching it if needed."""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_contexts)
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    logger.warning("Browser disconnected, relaunching")
+                    await self._shutdown()
+                t0 = time.perf_counter()
+                self._playwright, self._browser = await self._launcher()
+                timings.launch_ms = (time.perf_counter() - t0) * 1000
+                self.launches += 1
+                logger.info(f"Launched Chromium in {timings.launch_ms:.0f}ms (launch #{self.launches})")
+            return self._browser
+
+    async def _run(self, func, context_options: Dict[str, Any], timings: CaptureTimings):
+        browser = await self._get_browser(timings)
+        async with self._slots:
+            t0 = time.perf_counter()
+            context = await browser.new_context(**context_options)
+            timings.context_ms = (time.perf_counter() - t0) * 1000
+            try:
+                return await func(context, timings)
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser context: {e}")
+
+    def run(
+        self,
+        func: Callable[[Any, CaptureTimings], Awaitable[Any]],
+        context_options: Optional[Dict[str, Any]] = None,
+        timeout: float = CAPTURE_TIMEOUT_SECONDS,
+    ) -> Tuple[Any, CaptureTimings]:
+        """
+        Run ``func(context, timings)`` in a fresh context of the shared browser.
+
+        Safe to call from any thread; blocks until the capture finishes.
+
+        Args:
+            func: Coroutine function receiving the BrowserContext and the
+                timings object to fill in (navigation_ms, screenshot_ms, ...).
+            context_options: Keyword arguments for browser.new_context().
+            timeout: Seconds to wait for the capture.
+
+        Returns:
+            Tuple of (func result, CaptureTimings).
+        """
+        loop = self._ensure_loop()
+        timings = CaptureTimings()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run(func, context_options or {}, timings), loop
+        )
+        try:
+            result = future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+        self.captures += 1
+        return result, timings
+
+    async def _shutdown(self) -> None:
+        for closer in (
+            getattr(self._browser, "close", None),
+            getattr(self._playwright, "stop", None),
+        ):
+            if closer is not None:
+                try:
+                    await closer()
+                except Exception:
+                    pass
+        self._browser = None
+        self._playwright = None
+
+    def close(self) -> None:
+        """Close the browser and stop the background loop."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=30)
+            except Exception as e:
+                logger.warning(f"Error shutting down browser pool: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the container-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
@@ -0,0 +1,243 @@
+"""
+JPEG encoding under a byte budget.
+
+Kept identical in process_job_v2 and image_gen_process (like llm_usage.py).
+
+Instead of re-encoding in a loop (quality -10, resize x0.85 ...), fit_jpeg()
+encodes once at the starting quality and uses that size to decide whether
+lowering quality is enough or the image must be scaled down. Quality is
+searched from a predicted value. Scale is searched at a fixed quality: the
+first guess assumes size goes as scale**1.7, later ones interpolate (in
+log-log) between the largest encode that fit and the smallest that did
+not, until the output uses most of the budget. Once something fits and
+FIT_ENCODES encodes have been spent, the search stops and accepts a
+looser fit. Every resize starts from the source image. Typical inputs
+take 3 encodes; only inputs with no fit yet go on to MAX_ENCODES.
+"""
+
+import base64
+import io
+import logging
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image
+
+
+logger = logging.getLogger(__name__)
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+# Roughly the size at min quality relative to the starting quality; below this
+# ratio lowering quality alone cannot reach the budget.
+QUALITY_ONLY_MIN_RATIO = 0.5
+
+# Size at the resize quality (mid-way through the quality range) relative to
+# the size at the starting quality, for the first scale guess
+RESIZE_QUALITY_SIZE_RATIO = 0.6
+
+# size(scale) ~= size(1) * scale ** SIZE_SCALE_EXPONENT at a fixed quality
+# (between 1 and 2: downscaled images carry more detail per pixel); only
+# used until two encodes bracket the budget
+SIZE_SCALE_EXPONENT = 1.7
+
+# Scale search aims just under the budget and stops once a fit uses this share of it
+SCALE_TARGET_RATIO = 0.97
+GOOD_FIT_RATIO = 0.85
+
+QUALITY_SEARCH_STEPS = 2
+# Encodes after which any fit is accepted; the cap applies until something fits
+FIT_ENCODES = 3
+MAX_ENCODES = 6
+
+
+@dataclass
+class EncodedImage:
+    """An encoded image and how it was produced."""
+    data: bytes
+    width: int
+    height: int
+    quality: Optional[int]
+    encodes: int
+    mime_type: str = "image/jpeg"
+
+    def to_base64(self) -> str:
+        """Base64 string (no data URL prefix)."""
+        return base64.b64encode(self.data).decode("ascii")
+
+    def to_data_url(self) -> str:
+        """``data:`` URL for vision/image APIs."""
+        return f"data:{self.mime_type};base64,{self.to_base64()}"
+
+
+def _jpeg_size(data: bytes) -> Tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as img:
+        return img.size
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def _scale_for(size_ratio: float) -> float:
+    """Linear scale factor expected to multiply the encoded size by ``size_ratio``."""
+    return size_ratio ** (1 / SIZE_SCALE_EXPONENT)
+
+
+class _Encoder:
+    """Encodes one source image, counting encodes and remembering the best fit."""
+
+    def __init__(self, img: Image.Image, max_bytes: int):
+        self.src = img
+        self.max_bytes = max_bytes
+        self.encodes = 0
+        self.best: Optional[EncodedImage] = None
+        self.smallest: Optional[EncodedImage] = None
+
+    def _resized(self, scale: float) -> Image.Image:
+        if scale >= 1:
+            return self.src
+        width = max(1, int(self.src.width * scale))
+        height = max(1, int(self.src.height * scale))
+        return self.src.resize((width, height), Image.Resampling.LANCZOS)
+
+    def encode(self, quality: int, scale: float = 1.0) -> EncodedImage:
+        img = self._resized(scale)
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality, optimize=True, progressive=True)
+        self.encodes += 1
+        encoded = EncodedImage(
+            data=buf.getvalue(),
+            width=img.width,
+            height=img.height,
+            quality=quality,
+            encodes=self.encodes,
+        )
+        if len(encoded.data) <= self.max_bytes:
+            if self.best is None or (encoded.width * encoded.height, quality) > (
+                self.best.width * self.best.height, self.best.quality
+            ):
+                self.best = encoded
+        if self.smallest is None or len(encoded.data) < len(self.smallest.data):
+            self.smallest = encoded
+        return encoded
+
+    def search_quality(self, lo: int, hi: int, guess: int, steps: int) -> None:
+        """Search the highest quality in [lo, hi] that fits, probing ``guess`` first."""
+        mid = guess
+        for _ in range(steps):
+            if lo > hi:
+                return
+            mid = min(max(mid, lo), hi)
+            if len(self.encode(mid).data) <= self.max_bytes:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+            mid = (lo + hi + 1) // 2
+
+    def search_scale(self, quality: int, scale: float) -> None:
+        """
+        Search the largest scale that fits at ``quality``, probing ``scale`` first.
+
+        Stops once a fit uses GOOD_FIT_RATIO of the budget, any fit has
+        been found after FIT_ENCODES encodes, the bracket closes, or
+        MAX_ENCODES is reached.
+        """
+        fit: Optional[Tuple[float, int]] = None  # (scale, bytes) of the largest fitting encode
+        over: Optional[Tuple[float, int]] = None  # (scale, bytes) of the smallest encode over budget
+        target = self.max_bytes * SCALE_TARGET_RATIO
+        while self.encodes < MAX_ENCODES:
+            size = len(self.encode(quality, scale).data)
+            if size <= self.max_bytes:
+                fit = (scale, size) if fit is None or scale > fit[0] else fit
+            else:
+                over = (scale, size) if over is None or scale < over[0] else over
+            if fit and (
+                fit[1] >= self.max_bytes * GOOD_FIT_RATIO or fit[0] >= 1 or self.encodes >= FIT_ENCODES
+            ):
+                return
+
+            exponent = SIZE_SCALE_EXPONENT
+            if fit and over:
+                if over[0] / fit[0] < 1.01:
+                    return
+                exponent = math.log(over[1] / fit[1]) / math.log(over[0] / fit[0])
+                exponent = exponent if exponent > 0 else SIZE_SCALE_EXPONENT
+            ref = fit or over
+            scale = ref[0] * (target / ref[1]) ** (1 / exponent)
+            if fit and over:
+                # Stay strictly inside the bracket
+                scale = min(max(scale, fit[0] * 1.005), over[0] * 0.995)
+            scale = min(scale, 1.0)
+
+
+def _predict_quality(size_ratio: float, min_quality: int, max_quality: int) -> int:
+    """Quality expected to scale the size at ``max_quality`` by ``size_ratio``."""
+    fraction = (1 - size_ratio) / (1 - QUALITY_ONLY_MIN_RATIO)
+    return int(max_quality - fraction * (max_quality - min_quality))
+
+
+def fit_jpeg(
+    image_bytes: bytes,
+    max_bytes: int,
+    quality: int = 85,
+    min_quality: int = 30,
+) -> EncodedImage:
+    """
+    Encode an image as JPEG no larger than ``max_bytes``.
+
+    A JPEG that already fits is returned without being decoded or re-encoded.
+
+    Args:
+        image_bytes: Source image (any format PIL can read).
+        max_bytes: Byte budget for the output.
+        quality: Starting (and highest) JPEG quality.
+        min_quality: Lowest quality tried before scaling down further.
+
+    Returns:
+        EncodedImage; if the budget cannot be met, the smallest encode made.
+    """
+    if image_bytes[:3] == JPEG_MAGIC and len(image_bytes) <= max_bytes:
+        width, height = _jpeg_size(image_bytes)
+        return EncodedImage(data=image_bytes, width=width, height=height, quality=None, encodes=0)
+
+    src = Image.open(io.BytesIO(image_bytes))
+    src.load()
+    encoder = _Encoder(_to_rgb(src), max_bytes)
+
+    first = encoder.encode(quality)
+    if len(first.data) <= max_bytes:
+        return first
+
+    ratio = max_bytes / len(first.data)
+    if ratio >= QUALITY_ONLY_MIN_RATIO:
+        guess = _predict_quality(ratio * 0.95, min_quality, quality)
+        encoder.search_quality(min_quality, quality - 1, guess, QUALITY_SEARCH_STEPS)
+        if encoder.best is None:
+            # Lowest quality tried is still too big: keep it and shrink by the overshoot
+            smallest = encoder.smallest
+            encoder.search_scale(smallest.quality, min(_scale_for(max_bytes / len(smallest.data)), 0.95))
+    else:
+        # Scale down at a quality mid-way through the range
+        resize_quality = (quality + min_quality) // 2
+        estimated_ratio = ratio / RESIZE_QUALITY_SIZE_RATIO * SCALE_TARGET_RATIO
+        encoder.search_scale(resize_quality, min(_scale_for(estimated_ratio), 0.95))
+
+    result = encoder.best or encoder.smallest
+    result.encodes = encoder.encodes
+    if encoder.best is None:
+        logger.warning(f"Could not compress image below {max_bytes} bytes (got {len(result.data)})")
+    else:
+        logger.info(
+            f"Encoded {result.width}x{result.height} JPEG at quality {result.quality}: "
+            f"{len(result.data)} bytes (budget {max_bytes}, {result.encodes} encodes)"
+        )
+    return result
@@ -2,15 +2,23 @@
 Image processing utilities for process_job_v2 Lambda.
 
 Provides screenshot capture and image compression functionality.
+
+Captures run under a CaptureProfile. The default "blocking" profile aborts
+fonts, media and known analytics/ads/chat requests via Playwright routing
+and waits for lazy images with an IntersectionObserver-based settle
+detector; the "full" profile keeps the original load-everything behaviour.
 """
 
 import base64
-import io
 import logging
-from dataclasses import dataclass
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
 
-from PIL import Image
-from playwright.sync_api import sync_playwright
+from utils.browser import CaptureTimings, get_browser_pool
+from utils.codec import fit_jpeg
 
 
 logger = logging.getLogger(__name__)
@@ -20,6 +28,13 @@ PRODUCT_IMAGE_HEIGHT = 800
 VIEWPORT_WIDTH = 1280
 VIEWPORT_HEIGHT = 2000
 
+# Screenshots are taken as JPEG so they can go to the vision model without
+# decoding a multi-megabyte PNG first. Pages taller than the cap are clipped
+# (Chromium cannot rasterize much beyond 16384px in one screenshot anyway).
+FULLPAGE_JPEG_QUALITY = 70
+PRODUCT_IMAGE_JPEG_QUALITY = 85
+FULLPAGE_MAX_HEIGHT = 16000
+
 MODAL_CLOSE_SELECTORS = [
     "[data-dismiss]",
     ".close",
@@ -53,116 +68,523 @@ SCROLL_SCRIPT = """
     });
 """
 
+# Waits until images entering the viewport have loaded while stepping down
+# the page, instead of scrolling on a fixed timer. Lazy images are switched
+# to eager as they approach the viewport; new <img> nodes are observed too.
+SETTLE_SCRIPT = """
+async ({ stepPx, stepQuietMs, imageWaitMs, maxMs }) => {
+    const start = performance.now();
+    const sleep = ms => new Promise(r => setTimeout(r, ms));
+    const pending = new Set();
+    const track = img => {
+        if (img.complete) return;
+        pending.add(img);
+        const done = () => pending.delete(img);
+        img.addEventListener("load", done, { once: true });
+        img.addEventListener("error", done, { once: true });
+    };
+    const io = new IntersectionObserver(entries => {
+        for (const entry of entries) {
+            if (!entry.isIntersecting) continue;
+            const img = entry.target;
+            if (img.loading === "lazy") img.loading = "eager";
+            if (img.dataset && img.dataset.src && !img.getAttribute("src")) img.src = img.dataset.src;
+            track(img);
+        }
+    }, { rootMargin: "400px 0px" });
+    const observeAll = root => root.querySelectorAll && root.querySelectorAll("img").forEach(i => io.observe(i));
+    observeAll(document);
+    const mo = new MutationObserver(mutations => {
+        for (const m of mutations) for (const n of m.addedNodes) {
+            if (n.tagName === "IMG") io.observe(n); else observeAll(n);
+        }
+    });
+    mo.observe(document.documentElement, { childList: true, subtree: true });
+    const waitImages = async () => {
+        const t = performance.now();
+        while (pending.size && performance.now() - t < imageWaitMs) await sleep(50);
+    };
+
+    let y = 0;
+    let steps = 0;
+    while (performance.now() - start < maxMs) {
+        window.scrollTo(0, y);
+        steps++;
+        await sleep(stepQuietMs);
+        await waitImages();
+        const height = document.documentElement.scrollHeight;
+        if (y + window.innerHeight >= height) break;
+        y += stepPx;
+    }
+    window.scrollTo(0, 0);
+    await sleep(stepQuietMs);
+    await waitImages();
+    io.disconnect();
+    mo.disconnect();
+    return {
+        steps,
+        height: document.documentElement.scrollHeight,
+        pendingImages: pending.size,
+        elapsedMs: performance.now() - start,
+    };
+}
+"""
 
-@dataclass
-class PageScreenshots:
-    """Result of capturing both full-page and product image screenshots."""
-    fullpage_bytes: bytes
-    product_image_bytes: bytes
+# Visible DOM text in reading order, one line per block element. Headings
+# are prefixed with "#"s, list items with "- ", struck-through text (old
+# prices) is wrapped in "~~", and images contribute their alt text.
+EXTRACT_TEXT_SCRIPT = """
+(maxChars) => {
+    const SKIP = new Set(["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE", "SVG", "CANVAS", "IFRAME", "SELECT"]);
+    const BLOCK = new Set([
+        "BODY", "P", "DIV", "SECTION", "ARTICLE", "HEADER", "FOOTER", "MAIN", "ASIDE", "NAV",
+        "UL", "OL", "LI", "H1", "H2", "H3", "H4", "H5", "H6", "BLOCKQUOTE", "FIGURE",
+        "FIGCAPTION", "TABLE", "TR", "TD", "TH", "DT", "DD", "BUTTON", "FORM", "LABEL",
+    ]);
+    const isVisible = el => {
+        const style = getComputedStyle(el);
+        return style.display !== "none" && style.visibility !== "hidden" && el.getClientRects().length > 0;
+    };
+    const blockOf = el => {
+        while (el && !BLOCK.has(el.tagName)) el = el.parentElement;
+        return el || document.body;
+    };
+    const prefix = el => {
+        if (/^H[1-6]$/.test(el.tagName)) return "#".repeat(Number(el.tagName[1])) + " ";
+        return el.tagName === "LI" ? "- " : "";
+    };
+
+    const lines = [];
+    let current = null, parts = [], total = 0;
+    const push = line => {
+        if (line && lines[lines.length - 1] !== line) {
+            lines.push(line);
+            total += line.length + 1;
+        }
+    };
+    const flush = () => {
+        const text = parts.join(" ").replace(/\\s+/g, " ").trim();
+        if (text && current) push(prefix(current) + text);
+        parts = [];
+    };
+
+    const walker = document.createTreeWalker(
+        document.body,
+        NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+        {
+            acceptNode: node => {
+                if (node.nodeType === Node.ELEMENT_NODE) {
+                    return SKIP.has(node.tagName.toUpperCase()) || !isVisible(node)
+                        ? NodeFilter.FILTER_REJECT
+                        : NodeFilter.FILTER_ACCEPT;
+                }
+                return node.nodeValue.trim() ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP;
+            },
+        },
+    );
+    for (let node = walker.nextNode(); node && total < maxChars; node = walker.nextNode()) {
+        if (node.nodeType === Node.ELEMENT_NODE) {
+            const alt = node.tagName === "IMG" ? (node.alt || "").trim() : "";
+            if (alt) {
+                flush();
+                push(`[image: ${alt}]`);
+            }
+            continue;
+        }
+        const block = blockOf(node.parentElement);
+        if (block !== current) {
+            flush();
+            current = block;
+        }
+        const text = node.nodeValue.trim();
+        parts.push(node.parentElement.closest("s, del, strike") ? `~~${text}~~` : text);
+    }
+    flush();
+    return lines.join("\\n");
+}
+"""
 
+# Upper bound on extracted page text (roughly 10k tokens)
+MAX_PAGE_TEXT_CHARS = 40000
+
+# Request types that never affect a screenshot enough to be worth waiting for
+BLOCKED_RESOURCE_TYPES: FrozenSet[str] = frozenset({
+    "font",
+    "media",
+    "texttrack",
+    "websocket",
+    "eventsource",
+    "manifest",
+})
+
+# Analytics, ads, session-replay and chat widget hosts. A pattern is a
+# domain, optionally followed by a path prefix; it matches that domain and
+# its subdomains (see url_matches_pattern). Overridden by CAPTURE_BLOCKLIST.
+BLOCKED_URL_PATTERNS: Tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "analytics.tiktok.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "fullstory.com",
+    "mouseflow.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "heap.io",
+    "klaviyo.com/onsite",
+    "snap.licdn.com",
+    "ads-twitter.com",
+    "pinimg.com/ct",
+    "taboola.com",
+    "outbrain.com",
+    "criteo.com",
+    "adnxs.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "drift.com",
+    "tawk.to",
+    "crisp.chat",
+    "zopim.com",
+    "zdassets.com",
+    "livechatinc.com",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+)
+
+
+def url_matches_pattern(url: str, pattern: str) -> bool:
+    """
+    Return True if a request URL falls under a "domain[/path]" pattern.
 
-def capture_page_screenshots(url: str) -> PageScreenshots:
+    The request hostname must equal the domain or be a subdomain of it, so
+    "heap.io" matches cdn.heap.io but not cheap.io. A path in the pattern
+    must prefix the request path.
     """
-    Capture both a full-page screenshot and a product image (top 800px) in one browser session.
+    domain, _, path = pattern.strip().lower().partition("/")
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").rstrip(".")
+    except ValueError:
+        return False
+    if not domain or not (host == domain or host.endswith("." + domain)):
+        return False
+    return not path or parts.path.lstrip("/").startswith(path)
 
-    Dismisses modals/popups, captures the product image before scrolling,
-    then scrolls to trigger lazy loading and captures the full-page screenshot.
+
+def _patterns_from_env(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Read a comma-separated pattern list from an env var, if it is set."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return tuple(p.strip() for p in value.split(",") if p.strip())
+
+
+@dataclass(frozen=True)
+class CaptureProfile:
+    """
+    How a page is loaded before it is screenshotted.
+
+    Allow patterns win over the deny list and blocked resource types; the
+    main document is never blocked.
+    """
+    name: str
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_url_patterns: Tuple[str, ...] = ()
+    allowed_url_patterns: Tuple[str, ...] = ()
+    network_idle_timeout_ms: int = 30000
+    settle_detector: bool = False
+    settle_options: Dict[str, int] = field(default_factory=lambda: {
+        "stepPx": 900,
+        "stepQuietMs": 120,
+        "imageWaitMs": 1500,
+        "maxMs": 15000,
+    })
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_url_patterns)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Return True if a request should be aborted under this profile."""
+        if resource_type == "document":
+            return False
+        if any(url_matches_pattern(url, pattern) for pattern in self.allowed_url_patterns):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return any(url_matches_pattern(url, pattern) for pattern in self.blocked_url_patterns)
+
+
+FULL_PROFILE = CaptureProfile(name="full")
+
+BLOCKING_PROFILE = CaptureProfile(
+    name="blocking",
+    blocked_resource_types=BLOCKED_RESOURCE_TYPES,
+    blocked_url_patterns=BLOCKED_URL_PATTERNS,
+    network_idle_timeout_ms=5000,
+    settle_detector=True,
+)
+
+CAPTURE_PROFILES: Dict[str, CaptureProfile] = {
+    FULL_PROFILE.name: FULL_PROFILE,
+    BLOCKING_PROFILE.name: BLOCKING_PROFILE,
+}
+
+
+def get_capture_profile(name: Optional[str] = None) -> CaptureProfile:
+    """
+    Resolve a capture profile by name.
+
+    For profiles that block requests, the CAPTURE_BLOCKLIST and
+    CAPTURE_ALLOWLIST env vars (comma-separated "domain[/path]" patterns)
+    replace the profile's deny and allow lists when set.
 
     Args:
-        url: The URL to capture.
+        name: Profile name; defaults to the CAPTURE_PROFILE env var, then "blocking".
 
     Returns:
-        PageScreenshots with fullpage_bytes and product_image_bytes.
-
-    Raises:
-        Exception: If page loading fails.
+        The matching CaptureProfile (unknown names fall back to "blocking").
     """
-    with sync_playwright() as p:
-        launch_args = {
-            "headless": True,
-            "args": [
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--single-process",
-                "--no-zygote",
-                "--disable-software-rasterizer",
-                "--disable-web-security",
-            ],
-        }
+    name = (name or os.environ.get("CAPTURE_PROFILE") or BLOCKING_PROFILE.name).strip().lower()
+    profile = CAPTURE_PROFILES.get(name)
+    if profile is None:
+        logger.warning(f"Unknown capture profile '{name}', using '{BLOCKING_PROFILE.name}'")
+        profile = BLOCKING_PROFILE
+    if not profile.blocks_requests:
+        return profile
+    return replace(
+        profile,
+        blocked_url_patterns=_patterns_from_env("CAPTURE_BLOCKLIST", profile.blocked_url_patterns),
+        allowed_url_patterns=_patterns_from_env("CAPTURE_ALLOWLIST", profile.allowed_url_patterns),
+    )
 
-        user_data_dir = "/tmp/playwright-user"
-        context = p.chromium.launch_persistent_context(
-            user_data_dir=user_data_dir,
-            viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT},
-            **launch_args,
-        )
-        page = context.new_page()
 
-        # Load the page
-        try:
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            try:
-                page.wait_for_load_state("networkidle", timeout=30000)
-            except Exception:
-                logger.warning(f"Timeout waiting for network idle on {url}, proceeding")
-        except Exception as e:
-            logger.error(f"Failed to load page {url}: {e}")
-            raise
-
-        # Dismiss modals/popups
-        try:
-            page.keyboard.press("Escape")
-            page.wait_for_timeout(400)
-        except Exception:
-            pass
-
-        for sel in MODAL_CLOSE_SELECTORS:
-            try:
-                btn = page.query_selector(sel)
-                if btn:
-                    btn.click()
-                    page.wait_for_timeout(400)
-            except Exception:
-                continue
-
-        # Ensure we're at the top before capturing product image
+@dataclass
+class PageScreenshots:
+    """Result of capturing both full-page and product image screenshots."""
+    fullpage_bytes: bytes
+    product_image_bytes: bytes
+    timings: Optional[CaptureTimings] = None
+    page_text: Optional[str] = None
+    # ETag / Last-Modified the page was served with (lower-case keys)
+    validators: Dict[str, str] = field(default_factory=dict)
+
+
+async def _apply_profile(context, profile: CaptureProfile, timings: CaptureTimings) -> None:
+    """Install request blocking for the profile on a browser context."""
+    if not profile.blocks_requests:
+        return
+    timings.extra["blocked_requests"] = 0
+
+    async def _handle(route):
+        request = route.request
+        if profile.should_block(request.url, request.resource_type):
+            timings.extra["blocked_requests"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", _handle)
+
+
+async def _load_page(
+    page,
+    url: str,
+    timings: CaptureTimings,
+    profile: CaptureProfile = FULL_PROFILE,
+) -> Dict[str, str]:
+    """
+    Navigate and wait for the network to settle (bounded).
+
+    Returns the ETag / Last-Modified headers of the navigation response.
+    """
+    t0 = time.perf_counter()
+    try:
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
         try:
-            page.evaluate("window.scrollTo(0, 0)")
+            await page.wait_for_load_state("networkidle", timeout=profile.network_idle_timeout_ms)
         except Exception:
-            pass
-
-        # Capture product image (top portion of the page)
-        product_image_bytes = page.screenshot(
-            type="png",
-            full_page=False,
-            clip={
-                "x": 0,
-                "y": 0,
-                "width": VIEWPORT_WIDTH,
-                "height": min(PRODUCT_IMAGE_HEIGHT, VIEWPORT_HEIGHT),
-            },
-        )
-        logger.info(f"Captured product image ({len(product_image_bytes)} bytes) for {url}")
+            logger.warning(f"Timeout waiting for network idle on {url}, proceeding")
+    except Exception as e:
+        logger.error(f"Failed to load page {url}: {e}")
+        raise
+    finally:
+        timings.navigation_ms = (time.perf_counter() - t0) * 1000
+    headers = response.headers if response else {}
+    return {name: headers[name] for name in ("etag", "last-modified") if headers.get(name)}
+
 
-        # Scroll to trigger lazy loading
+async def _settle(page, url: str, profile: CaptureProfile, timings: CaptureTimings) -> None:
+    """Scroll through the page so lazy content loads before the full-page shot."""
+    t0 = time.perf_counter()
+    try:
+        if profile.settle_detector:
+            result = await page.evaluate(SETTLE_SCRIPT, profile.settle_options)
+            if result.get("pendingImages"):
+                logger.info(f"{result['pendingImages']} image(s) still loading on {url} after settle")
+        else:
+            await page.evaluate(SCROLL_SCRIPT)
+    except Exception:
+        pass
+    timings.extra["scroll_ms"] = (time.perf_counter() - t0) * 1000
+
+
+async def _extract_text(page, url: str, timings: CaptureTimings) -> str:
+    """Extract visible page text in reading order (empty string on failure)."""
+    t0 = time.perf_counter()
+    try:
+        text = await page.evaluate(EXTRACT_TEXT_SCRIPT, MAX_PAGE_TEXT_CHARS)
+    except Exception as e:
+        logger.warning(f"Failed to extract text from {url}: {e}")
+        text = ""
+    timings.extra["text_ms"] = (time.perf_counter() - t0) * 1000
+    logger.info(f"Extracted {len(text)} chars of page text from {url}")
+    return text[:MAX_PAGE_TEXT_CHARS]
+
+
+async def _capture_screenshots(
+    context,
+    url: str,
+    timings: CaptureTimings,
+    profile: CaptureProfile = FULL_PROFILE,
+    extract_text: bool = False,
+    fullpage: bool = True,
+    min_text_chars: int = 0,
+) -> PageScreenshots:
+    """Capture the product image, full-page screenshot and page text in one context."""
+    await _apply_profile(context, profile, timings)
+    page = await context.new_page()
+    validators = await _load_page(page, url, timings, profile)
+
+    # Dismiss modals/popups
+    try:
+        await page.keyboard.press("Escape")
+        await page.wait_for_timeout(400)
+    except Exception:
+        pass
+
+    for sel in MODAL_CLOSE_SELECTORS:
         try:
-            page.evaluate(SCROLL_SCRIPT)
+            btn = await page.query_selector(sel)
+            if btn:
+                await btn.click()
+                await page.wait_for_timeout(400)
         except Exception:
-            pass
+            continue
 
-        # Capture full-page screenshot
-        fullpage_bytes = page.screenshot(full_page=True)
+    # Ensure we're at the top before capturing product image
+    try:
+        await page.evaluate("window.scrollTo(0, 0)")
+    except Exception:
+        pass
+
+    # Capture product image (top portion of the page)
+    t0 = time.perf_counter()
+    product_image_bytes = await page.screenshot(
+        type="jpeg",
+        quality=PRODUCT_IMAGE_JPEG_QUALITY,
+        full_page=False,
+        clip={
+            "x": 0,
+            "y": 0,
+            "width": VIEWPORT_WIDTH,
+            "height": min(PRODUCT_IMAGE_HEIGHT, VIEWPORT_HEIGHT),
+        },
+    )
+    screenshot_ms = (time.perf_counter() - t0) * 1000
+    logger.info(f"Captured product image ({len(product_image_bytes)} bytes) for {url}")
+
+    # Scroll to trigger lazy loading
+    await _settle(page, url, profile, timings)
+
+    page_text = await _extract_text(page, url, timings) if extract_text else None
+    if not fullpage and page_text is not None and len(page_text) < min_text_chars:
+        logger.info(f"Only {len(page_text)} chars of text on {url}, taking the full-page screenshot as well")
+        fullpage = True
+
+    # Capture full-page screenshot
+    fullpage_bytes = b""
+    t0 = time.perf_counter()
+    if fullpage:
+        fullpage_bytes = await _screenshot_fullpage_jpeg(page, url)
         logger.info(f"Captured full-page screenshot ({len(fullpage_bytes)} bytes) for {url}")
+    timings.screenshot_ms = screenshot_ms + (time.perf_counter() - t0) * 1000
+
+    await page.close()
+    return PageScreenshots(
+        fullpage_bytes=fullpage_bytes,
+        product_image_bytes=product_image_bytes,
+        page_text=page_text,
+        validators=validators,
+    )
 
-        page.close()
-        context.close()
 
-        return PageScreenshots(
-            fullpage_bytes=fullpage_bytes,
-            product_image_bytes=product_image_bytes,
+async def _screenshot_fullpage_jpeg(page, url: str) -> bytes:
+    """Take a full-page JPEG screenshot, clipped to FULLPAGE_MAX_HEIGHT."""
+    options = {"type": "jpeg", "quality": FULLPAGE_JPEG_QUALITY, "full_page": True}
+    try:
+        height = await page.evaluate(
+            "Math.max(document.body.scrollHeight, document.documentElement.scrollHeight)"
         )
+    except Exception:
+        height = 0
+    if height > FULLPAGE_MAX_HEIGHT:
+        logger.info(f"Page {url} is {height}px tall, capturing the top {FULLPAGE_MAX_HEIGHT}px")
+        options["clip"] = {"x": 0, "y": 0, "width": VIEWPORT_WIDTH, "height": FULLPAGE_MAX_HEIGHT}
+    return await page.screenshot(**options)
+
+
+def capture_page_screenshots(
+    url: str,
+    profile: Optional[CaptureProfile] = None,
+    extract_text: bool = False,
+    fullpage: bool = True,
+    min_text_chars: int = 0,
+) -> PageScreenshots:
+    """
+    Capture both a full-page screenshot and a product image (top 800px) in one browser session.
+
+    Dismisses modals/popups, captures the product image before scrolling,
+    then scrolls to trigger lazy loading and captures the full-page screenshot.
+    Both are JPEGs; the full page is clipped to FULLPAGE_MAX_HEIGHT.
+    Runs in an isolated context of the container-wide browser, so it is safe
+    to call from several threads at once.
+
+    Args:
+        url: The URL to capture.
+        profile: Capture profile; defaults to get_capture_profile().
+        extract_text: Also extract the visible page text once lazy content has loaded.
+        fullpage: Take the full-page screenshot (fullpage_bytes is empty if not).
+        min_text_chars: With extract_text and fullpage=False, still take the
+            full-page screenshot, in the same page, when the extracted text is
+            shorter than this.
+
+    Returns:
+        PageScreenshots with fullpage_bytes, product_image_bytes, page_text
+        and timings.
+
+    Raises:
+        Exception: If page loading fails.
+    """
+    profile = profile or get_capture_profile()
+    screenshots, timings = get_browser_pool().run(
+        lambda context, timings: _capture_screenshots(
+            context, url, timings, profile,
+            extract_text=extract_text, fullpage=fullpage, min_text_chars=min_text_chars,
+        ),
+        context_options={"viewport": {"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT}},
+    )
+    screenshots.timings = timings
+    logger.info(f"Capture timings for {url} ({profile.name} profile): {timings.summary()}")
+    return screenshots
 
 
 def compress_to_base64(image_bytes: bytes, max_size_mb: float = 0.5) -> str:
@@ -176,43 +598,8 @@ def compress_to_base64(image_bytes: bytes, max_size_mb: float = 0.5) -> str:
     Returns:
         Base64-encoded JPEG string (no data URL prefix).
     """
-    max_bytes = int(max_size_mb * 1024 * 1024)
-
     try:
-        img = Image.open(io.BytesIO(image_bytes))
-
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-
-        quality = 90
-        scale_step = 0.85
-        output_io = io.BytesIO()
-
-        while True:
-            output_io.seek(0)
-            output_io.truncate()
-            img.save(output_io, format="JPEG", quality=quality, optimize=True, progressive=True)
-            current_size = output_io.tell()
-
-            if current_size <= max_bytes:
-                break
-
-            if quality > 30:
-                quality -= 10
-                continue
-
-            width, height = img.size
-            new_width = max(1, int(width * scale_step))
-            new_height = max(1, int(height * scale_step))
-            if new_width == width and new_height == height:
-                break
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            quality = 70
-
-        jpeg_bytes = output_io.getvalue()
-        logger.info(f"Compressed image to {len(jpeg_bytes)} bytes (target<={max_bytes}, quality={quality})")
-        return base64.b64encode(jpeg_bytes).decode("utf-8")
-
+        return fit_jpeg(image_bytes, int(max_size_mb * 1024 * 1024), quality=90).to_base64()
     except Exception as e:
         logger.error(f"Failed to compress image: {e}")
         return base64.b64encode(image_bytes).decode("utf-8")
@@ -231,107 +618,42 @@ def save_fullpage_png(url: str) -> bytes:
     Raises:
         Exception: If page loading fails.
     """
-    with sync_playwright() as p:
-        launch_args = {
-            "headless": True,
-            "args": [
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--single-process",
-                "--no-zygote",
-                "--disable-software-rasterizer",
-                "--disable-web-security",
-            ],
-        }
-
-        # Use a persistent context instead of passing --user-data-dir to launch()
-        user_data_dir = "/tmp/playwright-user"
-        context = p.chromium.launch_persistent_context(user_data_dir=user_data_dir, **launch_args)
-        page = context.new_page()
-
-        # Load the page
-        try:
-            # Use domcontentloaded first with a longer timeout (60s)
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            
-            # Try to wait for network idle, but proceed if it times out (some sites never idle)
-            try:
-                page.wait_for_load_state("networkidle", timeout=30000)
-            except Exception:
-                logger.warning(f"Timeout waiting for network idle on {url}, proceeding with screenshot")
-                
-        except Exception as e:
-            logger.error(f"Failed to load page {url}: {e}")
-            raise e
-
-        # Take a full-page screenshot
-        screenshot_bytes = page.screenshot(full_page=True)
-
-        logger.info(f"Captured full-page screenshot for {url}")
-
-        page.close()
-        context.close()
+    async def _capture(context, timings: CaptureTimings) -> bytes:
+        page = await context.new_page()
+        await _load_page(page, url, timings)
+        t0 = time.perf_counter()
+        screenshot_bytes = await page.screenshot(full_page=True)
+        timings.screenshot_ms = (time.perf_counter() - t0) * 1000
+        await page.close()
         return screenshot_bytes
 
+    screenshot_bytes, timings = get_browser_pool().run(_capture)
+    logger.info(f"Captured full-page screenshot for {url} ({timings.summary()})")
+    return screenshot_bytes
+
 
 def compress_image_if_needed(image_bytes: bytes, max_size_mb: float = 0.5) -> bytes:
     """
     Compress image if it exceeds the max size.
-    
-    Resize and reduce quality iteratively until it fits within the size limit.
-    
+
+    Re-encodes as JPEG with fit_jpeg(), which picks scale and quality in a
+    few encodes instead of stepping down one notch at a time.
+
     Args:
         image_bytes: Original image data.
         max_size_mb: Maximum allowed size in megabytes (default: 0.5 MB).
-        
+
     Returns:
         Compressed image bytes, or original if already under limit or compression fails.
     """
     max_bytes = int(max_size_mb * 1024 * 1024)
     if len(image_bytes) <= max_bytes:
         return image_bytes
-        
+
     logger.info(f"Image size {len(image_bytes)} exceeds limit of {max_bytes}. Compressing...")
-    
+
     try:
-        img = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert to RGB if necessary (e.g. PNG with transparency to JPEG)
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-             
-        # Iteratively reduce quality/size
-        quality = 90
-        output_io = io.BytesIO()
-        
-        while True:
-            output_io.seek(0)
-            output_io.truncate()
-            img.save(output_io, format='JPEG', quality=quality)
-            current_size = output_io.tell()
-            
-            if current_size <= max_bytes or quality <= 10:
-                break
-                
-            # Reduce quality
-            quality -= 10
-            
-            # If quality is getting low, also resize
-            if quality < 60:
-                width, height = img.size
-                new_width = int(width * 0.8)
-                new_height = int(height * 0.8)
-                # Ensure we don't shrink to 0
-                if new_width < 1 or new_height < 1:
-                    break
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        compressed_bytes = output_io.getvalue()
-        logger.info(f"Compressed image to {len(compressed_bytes)} bytes")
-        return compressed_bytes
-        
+        return fit_jpeg(image_bytes, max_bytes, quality=90).data
     except Exception as e:
         logger.error(f"Failed to compress image: {e}")
         # Return original if compression fails
@@ -0,0 +1,55 @@
+"""
+CloudWatch metrics for process_job_v2 Lambda.
+
+Metrics are written to stdout in CloudWatch Embedded Metric Format (EMF),
+which CloudWatch Logs turns into metrics without any extra API calls or
+IAM permissions.
+"""
+
+import json
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+METRICS_NAMESPACE = "DeepCopy/ProcessJobV2"
+
+
+def emit_metrics(
+    metrics: Dict[str, float],
+    units: Optional[Dict[str, str]] = None,
+    dimensions: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Emit one EMF record containing the given metrics.
+
+    Args:
+        metrics: Metric name to value.
+        units: Optional metric name to CloudWatch unit (default "Count").
+        dimensions: Optional dimension name to value.
+    """
+    units = units or {}
+    dimensions = dimensions or {}
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [
+                    {"Name": name, "Unit": units.get(name, "Count")} for name in metrics
+                ],
+            }],
+        },
+        **dimensions,
+        **metrics,
+    }
+    try:
+        # Raw line on stdout; a logging prefix would break EMF parsing
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+    except Exception as e:
+        logger.warning(f"Failed to emit metrics {list(metrics)}: {e}")
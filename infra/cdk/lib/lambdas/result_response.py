@@ -0,0 +1,222 @@
+"""
+Shared S3 JSON result responses for the get_*_result handlers.
+
+- ?fields= projection: comma-separated dotted paths, "[]" maps over a list,
+  e.g. ?fields=marketing_avatars[].avatar.overview,offer_brief
+- ETag / If-None-Match: tags derive from the S3 ETag (plus the projection),
+  and a matching If-None-Match is answered 304 by S3 without reading the body
+- Redirect mode: ?redirect=true gets a 303 to a presigned S3 URL so the
+  bytes never pass through the Lambda. Unprojected results whose response
+  would exceed the Lambda response limit, and so could not be returned
+  inline anyway, are redirected without asking.
+
+Compression is left to API Gateway (minCompressionSize), which gzips
+responses for clients that send Accept-Encoding: gzip.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+
+# Lambda responses are capped at 6 MB (6291456 bytes), measured on the whole
+# serialized response, so the body's JSON escaping counts too
+MAX_INLINE_RESPONSE_BYTES = 6_200_000
+PRESIGNED_URL_TTL_SECONDS = 300
+
+# A dotted path split into (key, maps_over_list) segments
+FieldPath = List[Tuple[str, bool]]
+
+
+def response(status_code: int, body: dict | str, headers: Optional[Dict[str, str]] = None):
+    """Lambda proxy response with the handlers' CORS headers."""
+    if isinstance(body, dict):
+        body = json.dumps(body)
+        base = {"content-type": "application/json", "Access-Control-Allow-Origin": "*"}
+    else:
+        base = {"content-type": "text/plain", "Access-Control-Allow-Origin": "*"}
+    return {"statusCode": status_code, "headers": {**base, **(headers or {})}, "body": body}
+
+
+def parse_fields(spec: Optional[str]) -> List[FieldPath]:
+    """Parse a ?fields= value into paths; empty for no projection."""
+    paths = []
+    for raw in (spec or "").split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        path = []
+        for part in raw.split("."):
+            is_list = part.endswith("[]")
+            path.append((part[:-2] if is_list else part, is_list))
+        paths.append(path)
+    return paths
+
+
+_MISSING = object()
+
+
+def _project_path(value: Any, path: FieldPath) -> Any:
+    if not path:
+        return value
+    (key, is_list), rest = path[0], path[1:]
+    if not isinstance(value, dict) or key not in value:
+        return _MISSING
+    child = value[key]
+    if is_list:
+        if not isinstance(child, list):
+            return _MISSING
+        projected = [_project_path(item, rest) for item in child]
+        return {key: [None if p is _MISSING else p for p in projected]}
+    projected = _project_path(child, rest)
+    return _MISSING if projected is _MISSING else {key: projected}
+
+
+def _merge(a: Any, b: Any) -> Any:
+    if isinstance(a, dict) and isinstance(b, dict):
+        merged = dict(a)
+        for k, v in b.items():
+            merged[k] = _merge(merged[k], v) if k in merged else v
+        return merged
+    if isinstance(a, list) and isinstance(b, list):
+        # Both sides come from the same list, so they have the same length
+        return [y if x is None else x if y is None else _merge(x, y) for x, y in zip(a, b)]
+    return b
+
+
+def project(payload: Any, paths: List[FieldPath], base: Optional[str] = None) -> Any:
+    """
+    Keep only the requested paths of payload.
+
+    Args:
+        payload: Parsed JSON result.
+        paths: Paths from parse_fields().
+        base: Optional key of a nested object that paths may also be
+            relative to (e.g. "results" for job results).
+    """
+    out: Any = {}
+    for path in paths:
+        projected = _project_path(payload, path)
+        if projected is _MISSING and base:
+            projected = _project_path(payload, [(base, False)] + path)
+        if projected is not _MISSING:
+            out = _merge(out, projected)
+    return out
+
+
+def _etag(s3_etag: str, fields: Optional[str]) -> str:
+    if not fields:
+        return s3_etag
+    digest = hashlib.sha256(fields.encode("utf-8")).hexdigest()[:12]
+    return f'W/"{s3_etag.strip(chr(34))}:{digest}"'
+
+
+def _s3_etag_from_request(if_none_match: Optional[str], fields: Optional[str]) -> Optional[str]:
+    """The S3 ETag a client's If-None-Match refers to, if it matches this projection."""
+    if not if_none_match:
+        return None
+    tag = if_none_match.strip()
+    if not fields:
+        return tag if not tag.startswith("W/") else None
+    if not tag.startswith('W/"') or ":" not in tag:
+        return None
+    s3_part = tag[3:].rstrip('"').rsplit(":", 1)[0]
+    return f'"{s3_part}"' if _etag(f'"{s3_part}"', fields) == tag else None
+
+
+def _cache_headers(etag: Optional[str]) -> Dict[str, str]:
+    if not etag:
+        return {}
+    return {"ETag": etag, "Cache-Control": "no-cache", "Access-Control-Expose-Headers": "ETag"}
+
+
+def _truthy(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in ("1", "true", "yes")
+
+
+def s3_json_response(
+    event: dict,
+    s3,
+    bucket: str,
+    key: str,
+    on_missing: Optional[Callable[[], Optional[Tuple[dict, Optional[str]]]]] = None,
+    fields_base: Optional[str] = None,
+):
+    """
+    API Gateway response for a JSON result object in S3.
+
+    Args:
+        event: API Gateway proxy event (query string and headers are read).
+        s3: Boto3 S3 client.
+        bucket: Results bucket.
+        key: Result object key.
+        on_missing: Optional fallback building the payload when the object
+            does not exist. Returns (payload, ETag of the object the payload
+            was built from), or None if there is no result either.
+        fields_base: See project().
+
+    Returns:
+        Lambda proxy response dict.
+    """
+    query = event.get("queryStringParameters") or {}
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    fields = (query.get("fields") or "").strip() or None
+    paths = parse_fields(fields)
+    inline_limit = int(os.environ.get("RESULT_MAX_INLINE_BYTES") or MAX_INLINE_RESPONSE_BYTES)
+
+    get_kwargs = {"Bucket": bucket, "Key": key}
+    s3_etag = _s3_etag_from_request(headers.get("if-none-match"), fields)
+    if s3_etag:
+        get_kwargs["IfNoneMatch"] = s3_etag
+
+    try:
+        try:
+            obj = s3.get_object(**get_kwargs)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code in ("304", "NotModified"):
+                return response(304, "", {"ETag": headers["if-none-match"].strip(), "Cache-Control": "no-cache"})
+            if error_code not in ("NoSuchKey", "404"):
+                raise
+            fallback = on_missing() if on_missing else None
+            if fallback is None:
+                return response(404, "Result not available")
+            payload, source_etag = fallback
+            etag = _etag(source_etag, fields) if source_etag else None
+            if etag and (headers.get("if-none-match") or "").strip() == etag:
+                return response(304, "", _cache_headers(etag))
+            result = response(200, project(payload, paths, fields_base) if paths else payload, _cache_headers(etag))
+            if len(json.dumps(result)) > inline_limit:
+                return response(413, "Result too large to return inline; request fewer fields with ?fields=")
+            return result
+    except ClientError as e:
+        return response(500, f"S3 error: {e.response['Error'].get('Message', str(e))}")
+
+    cache_headers = _cache_headers(_etag(obj["ETag"], fields) if obj.get("ETag") else None)
+
+    def _redirect():
+        url = s3.generate_presigned_url(
+            "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=PRESIGNED_URL_TTL_SECONDS
+        )
+        return response(303, "", {"Location": url, **cache_headers})
+
+    if not paths and (_truthy(query.get("redirect")) or obj.get("ContentLength", 0) > inline_limit):
+        obj["Body"].close()
+        return _redirect()
+
+    data = obj["Body"].read()
+    try:
+        payload = json.loads(data)
+        result = response(200, project(payload, paths, fields_base) if paths else payload, cache_headers)
+    except json.JSONDecodeError:
+        # Return raw text if not valid JSON
+        result = response(200, data.decode("utf-8"))
+
+    if len(json.dumps(result)) > inline_limit:
+        if paths:
+            return response(413, "Projected result too large to return inline; request fewer fields")
+        return _redirect()
+    return result
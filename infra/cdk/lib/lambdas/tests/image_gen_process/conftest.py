@@ -60,6 +60,10 @@ def _aws_env_and_moto():
     ps_mod._prompt_cache.clear()
     ps_mod._cache_timestamp = 0.0
 
+    # Reset per-process LLM rate limiters
+    import rate_limit
+    rate_limit.reset_limiters()
+
     with mock_aws():
         db_url = shared.load_database_url()
         shared.create_aws_resources(database_url=db_url)
@@ -46,6 +46,10 @@ def _aws_env_and_moto():
     os.environ["CLOUDFLARE_ACCOUNT_ID"] = "cf-account-fake"
     os.environ["GEMINI_API_KEY"] = "gemini-test-fake"
 
+    # Reset per-process LLM rate limiters
+    import rate_limit
+    rate_limit.reset_limiters()
+
     # Clear cached lambda modules so they re-import within the mocked context
     _lambda_modules = [k for k in sys.modules if k.startswith(("handler", "services.", "utils.", "pipeline."))]
     saved = {k: sys.modules.pop(k) for k in _lambda_modules}
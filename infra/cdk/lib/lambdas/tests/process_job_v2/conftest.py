@@ -61,6 +61,18 @@ def _aws_env_and_moto():
     ps_mod._prompt_cache.clear()
     ps_mod._cache_timestamp = 0.0
 
+    # Reset warm library summaries cache
+    import services.template_prediction_service as tps_mod
+    tps_mod._library_entries.clear()
+
+    # Reset warm research cache tiers
+    import services.cache as cache_mod
+    cache_mod.reset_cache_tiers()
+
+    # Reset per-process LLM rate limiters
+    import rate_limit
+    rate_limit.reset_limiters()
+
     with mock_aws():
         db_url = shared.load_database_url()
         shared.create_aws_resources(database_url=db_url)
@@ -77,12 +89,18 @@ def _aws_env_and_moto():
 
         # --- Mock OpenAI SDK ---
         mock_openai_cls = MagicMock()
-        with patch("services.openai_service.OpenAI", mock_openai_cls):
+        with patch("services.openai_service.OpenAI", mock_openai_cls), \
+                patch("services.openai_service.AsyncOpenAI", MagicMock()):
             # --- Mock Perplexity SDK ---
             mock_perplexity_cls = MagicMock()
             with patch("services.perplexity_service.Perplexity", mock_perplexity_cls):
                 # --- Mock Playwright screenshot capture ---
-                with patch("utils.image.capture_page_screenshots") as mock_screenshots:
+                # Also patch the name bound in analyze_page, which may have been
+                # imported by an earlier test module under a different mock.
+                # The screenshot cache's HEAD freshness check is stubbed too.
+                with patch("utils.image.capture_page_screenshots") as mock_screenshots, \
+                        patch("pipeline.steps.analyze_page.capture_page_screenshots", mock_screenshots), \
+                        patch("services.screenshot_cache.head_request", return_value=(None, {})):
                     # --- Mock llm_usage ---
                     with patch("services.openai_service.emit_llm_usage_event"):
                         with patch("services.perplexity_service.emit_llm_usage_event"):
@@ -110,6 +128,7 @@ def mock_analyze_page(monkeypatch, _aws_env_and_moto):
     mock_screenshot = MagicMock()
     mock_screenshot.fullpage_bytes = b"\x89PNG" + b"\x00" * 100
     mock_screenshot.product_image_bytes = b"\x89PNG" + b"\x00" * 50
+    mock_screenshot.validators = {}
     _aws_env_and_moto["mock_screenshots"].return_value = mock_screenshot
 
     def _create_response(self, content, subtask, model=None):
@@ -149,7 +168,7 @@ def mock_parse_structured(monkeypatch):
         PageAnalysisQualityCheck,
     )
 
-    def _parse_structured(self, prompt, response_format, subtask, model=None):
+    def _parse_structured(self, prompt, response_format, subtask, model=None, shared_context=None):
         if response_format is IdentifiedAvatarList:
             return make_identified_avatar_list()
         elif response_format is Avatar:
@@ -164,15 +183,22 @@ def mock_parse_structured(monkeypatch):
             # Fallback for unknown types (e.g., template prediction)
             return MagicMock()
 
+    async def _parse_structured_async(self, prompt, response_format, subtask, model=None, shared_context=None):
+        return _parse_structured(self, prompt, response_format, subtask, model, shared_context)
+
     monkeypatch.setattr(
         "services.openai_service.OpenAIService.parse_structured",
         _parse_structured,
     )
+    monkeypatch.setattr(
+        "services.openai_service.AsyncOpenAIService.parse_structured",
+        _parse_structured_async,
+    )
 
 
 @pytest.fixture()
 def mock_template_prediction(monkeypatch):
-    """Mock TemplatePredictionStep.execute to return a valid result."""
+    """Mock TemplatePredictionStep.execute/execute_many to return valid results."""
 
     def _execute(self, avatar, angle, top_k=5):
         return make_template_prediction_result(
@@ -180,10 +206,17 @@ def mock_template_prediction(monkeypatch):
             angle_id=angle.id,
         )
 
+    def _execute_many(self, avatar, angles, top_k=5):
+        return [_execute(self, avatar, angle, top_k) for angle in angles]
+
     monkeypatch.setattr(
         "pipeline.steps.template_prediction.TemplatePredictionStep.execute",
         _execute,
     )
+    monkeypatch.setattr(
+        "pipeline.steps.template_prediction.TemplatePredictionStep.execute_many",
+        _execute_many,
+    )
 
 
 @pytest.fixture()
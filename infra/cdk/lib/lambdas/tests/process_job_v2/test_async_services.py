@@ -0,0 +1,143 @@
+"""
+Unit tests for the asyncio LLM service variants.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+
+class _Answer(BaseModel):
+    value: int
+
+
+def _usage_ctx():
+    from llm_usage import UsageContext
+    return UsageContext(endpoint="POST /v2/jobs", job_id="job-1", job_type="V2_JOB")
+
+
+class TestAsyncOpenAIService:
+    """Coroutine methods with the blocking service's signatures and telemetry."""
+
+    def _service(self, **client_methods):
+        from services.openai_service import AsyncOpenAIService
+
+        service = AsyncOpenAIService(api_key="sk-test", usage_ctx=_usage_ctx())
+        service.client = MagicMock()
+        for name, mock in client_methods.items():
+            setattr(service.client.responses, name, mock)
+        return service
+
+    def test_parse_structured_emits_usage(self):
+        response = SimpleNamespace(
+            output_parsed=_Answer(value=3), usage=SimpleNamespace(input_tokens=10, output_tokens=2)
+        )
+        service = self._service(parse=AsyncMock(return_value=response))
+
+        with patch("services.openai_service.emit_llm_usage_event") as emit:
+            result = asyncio.run(service.parse_structured("prompt", _Answer, subtask="test.parse"))
+
+        assert result == _Answer(value=3)
+        event = emit.call_args.kwargs
+        assert event["operation"] == "responses.parse"
+        assert event["success"] is True
+        assert event["usage"] == {"inputTokens": 10, "outputTokens": 2, "cachedInputTokens": None}
+
+    def test_create_response_failure_emits_error(self):
+        service = self._service(create=AsyncMock(side_effect=ValueError("bad request")))
+
+        with patch("services.openai_service.emit_llm_usage_event") as emit, \
+                pytest.raises(ValueError):
+            asyncio.run(service.create_response([{"type": "input_text", "text": "hi"}], subtask="test.create"))
+
+        event = emit.call_args.kwargs
+        assert event["success"] is False
+        assert event["error_type"] == "ValueError"
+
+    def test_calls_run_concurrently(self):
+        async def _slow_create(**kwargs):
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(output_text="ok", usage=None)
+
+        service = self._service(create=AsyncMock(side_effect=_slow_create))
+
+        async def _many():
+            return await asyncio.gather(*[
+                service.create_response([], subtask=f"test.{i}") for i in range(50)
+            ])
+
+        with patch("services.openai_service.emit_llm_usage_event"):
+            loop_time = asyncio.run(_timed(_many()))
+
+        assert loop_time < 1.0
+
+
+async def _timed(coro):
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    await coro
+    return loop.time() - t0
+
+
+class _FakeAsyncStream:
+    """Minimal stand-in for AsyncAnthropic's messages.stream() manager."""
+
+    def __init__(self, message, chunks=()):
+        self.message = message
+        self.chunks = list(chunks)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def _gen():
+            for chunk in self.chunks:
+                yield chunk
+        return _gen()
+
+    async def get_final_message(self):
+        return self.message
+
+
+class TestAsyncClaudeService:
+    """Streaming tool-use parsing on the async Anthropic client."""
+
+    def _service(self, stream):
+        from services.claude_service import AsyncClaudeService
+
+        service = AsyncClaudeService(api_key="sk-ant-test", usage_ctx=_usage_ctx())
+        service.client = MagicMock()
+        service.client.messages.stream.return_value = stream
+        return service
+
+    def test_parse_structured_uses_forced_tool(self):
+        message = SimpleNamespace(
+            stop_reason="tool_use",
+            content=[SimpleNamespace(type="tool_use", input={"value": 7})],
+            usage=SimpleNamespace(input_tokens=5, output_tokens=1),
+        )
+        service = self._service(_FakeAsyncStream(message))
+
+        with patch("services.claude_service.emit_llm_usage_event") as emit:
+            result = asyncio.run(service.parse_structured("prompt", _Answer, subtask="test.claude"))
+
+        assert result == _Answer(value=7)
+        kwargs = service.client.messages.stream.call_args.kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "structured_output"}
+        assert emit.call_args.kwargs["operation"] == "messages.stream.tool_use"
+
+    def test_create_response_joins_stream(self):
+        message = SimpleNamespace(usage=SimpleNamespace(input_tokens=5, output_tokens=2))
+        service = self._service(_FakeAsyncStream(message, chunks=["Hel", "lo"]))
+
+        with patch("services.claude_service.emit_llm_usage_event"):
+            text = asyncio.run(service.create_response([{"type": "text", "text": "hi"}], subtask="test.claude"))
+
+        assert text == "Hello"
@@ -0,0 +1,94 @@
+"""
+Unit tests for the shared browser pool, using an in-process fake browser.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        self.browser.open_contexts -= 1
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+        self.open_contexts = 0
+        self.max_open = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        context = _FakeContext(self)
+        self.contexts.append(context)
+        self.open_contexts += 1
+        self.max_open = max(self.max_open, self.open_contexts)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+@pytest.fixture()
+def pool():
+    from utils.browser import BrowserPool
+
+    browsers = []
+
+    async def _launcher():
+        await asyncio.sleep(0.01)
+        browsers.append(_FakeBrowser())
+        return None, browsers[-1]
+
+    pool = BrowserPool(max_contexts=2, launcher=_launcher)
+    pool.browsers = browsers
+    yield pool
+    pool.close()
+
+
+async def _work(context, timings):
+    await asyncio.sleep(0.02)
+    return context
+
+
+class TestBrowserPool:
+    """One launch per container, isolated contexts per capture."""
+
+    def test_browser_launched_once_for_concurrent_captures(self, pool):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: pool.run(_work), range(6)))
+
+        contexts = [context for context, _ in results]
+        assert len(pool.browsers) == 1
+        assert len(set(map(id, contexts))) == 6
+        assert all(context.closed for context in contexts)
+        assert pool.browsers[0].max_open <= 2
+        assert sum(1 for _, timings in results if timings.launch_ms > 0) == 1
+
+    def test_relaunches_after_disconnect(self, pool):
+        pool.run(_work)
+        pool.browsers[0].connected = False
+
+        pool.run(_work)
+
+        assert len(pool.browsers) == 2
+        assert pool.launches == 2
+
+    def test_context_closed_when_capture_fails(self, pool):
+        async def _fail(context, timings):
+            raise RuntimeError("navigation failed")
+
+        with pytest.raises(RuntimeError):
+            pool.run(_fail)
+
+        assert pool.browsers[0].contexts[0].closed
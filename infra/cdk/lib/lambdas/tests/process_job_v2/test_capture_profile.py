@@ -0,0 +1,163 @@
+"""
+Unit tests for page capture profiles, request blocking and JPEG capture.
+"""
+
+import asyncio
+
+import pytest
+
+
+class _FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = _FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class _FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+class _FakePage:
+    def __init__(self, height):
+        self.height = height
+        self.screenshot_options = None
+
+    async def evaluate(self, script):
+        return self.height
+
+    async def screenshot(self, **options):
+        self.screenshot_options = options
+        return b"\xff\xd8\xff" + b"\x00" * 10
+
+
+class TestCaptureProfile:
+    """Deny/allow rules and profile selection."""
+
+    def test_blocking_profile_rules(self):
+        from utils.image import BLOCKING_PROFILE
+
+        assert not BLOCKING_PROFILE.should_block("https://www.google-analytics.com/", "document")
+        assert BLOCKING_PROFILE.should_block("https://shop.example/font.woff2", "font")
+        assert BLOCKING_PROFILE.should_block("https://www.google-analytics.com/g/collect", "xhr")
+        assert not BLOCKING_PROFILE.should_block("https://shop.example/hero.jpg", "image")
+        assert not BLOCKING_PROFILE.should_block("https://shop.example/app.css", "stylesheet")
+
+    @pytest.mark.parametrize("url,blocked", [
+        ("https://cdn.heap.io/js/heap.js", True),
+        ("https://cheap.io/app.js", False),
+        ("https://giftdrift.com/widget.js", False),
+        ("https://js.drift.com/include/x.js", True),
+        ("https://shop.example/?ref=segment.com", False),
+        ("https://www.facebook.com/tr?id=1", True),
+        ("https://www.facebook.com/plugins/like.php", False),
+    ])
+    def test_patterns_match_hostnames(self, url, blocked):
+        from utils.image import BLOCKING_PROFILE
+
+        assert BLOCKING_PROFILE.should_block(url, "script") is blocked
+
+    def test_allow_patterns_win(self):
+        import dataclasses
+
+        from utils.image import BLOCKING_PROFILE
+
+        profile = dataclasses.replace(BLOCKING_PROFILE, allowed_url_patterns=("fonts.shop.example",))
+
+        assert not profile.should_block("https://fonts.shop.example/brand.woff2", "font")
+        assert profile.should_block("https://cdn.other.example/brand.woff2", "font")
+
+    def test_full_profile_blocks_nothing(self):
+        from utils.image import FULL_PROFILE
+
+        assert not FULL_PROFILE.blocks_requests
+        assert not FULL_PROFILE.should_block("https://www.google-analytics.com/g/collect", "xhr")
+
+    @pytest.mark.parametrize("env,expected", [(None, "blocking"), ("full", "full"), ("bogus", "blocking")])
+    def test_profile_from_env(self, monkeypatch, env, expected):
+        from utils.image import get_capture_profile
+
+        if env is None:
+            monkeypatch.delenv("CAPTURE_PROFILE", raising=False)
+        else:
+            monkeypatch.setenv("CAPTURE_PROFILE", env)
+
+        assert get_capture_profile().name == expected
+
+    def test_lists_from_env(self, monkeypatch):
+        from utils.image import get_capture_profile
+
+        monkeypatch.setenv("CAPTURE_BLOCKLIST", "tracker.example, ads.example/pixel")
+        monkeypatch.setenv("CAPTURE_ALLOWLIST", "cdn.tracker.example")
+        profile = get_capture_profile("blocking")
+
+        assert profile.should_block("https://a.tracker.example/t.js", "script")
+        assert not profile.should_block("https://cdn.tracker.example/t.js", "script")
+        assert profile.should_block("https://ads.example/pixel/1.gif", "image")
+        assert not profile.should_block("https://www.google-analytics.com/g/collect", "xhr")
+        assert not get_capture_profile("full").blocks_requests
+
+    def test_route_handler_aborts_and_counts(self):
+        from utils.browser import CaptureTimings
+        from utils.image import BLOCKING_PROFILE, _apply_profile
+
+        context, timings = _FakeContext(), CaptureTimings()
+        asyncio.run(_apply_profile(context, BLOCKING_PROFILE, timings))
+
+        routes = [
+            _FakeRoute("https://shop.example/", "document"),
+            _FakeRoute("https://shop.example/font.woff2", "font"),
+            _FakeRoute("https://shop.example/hero.jpg", "image"),
+        ]
+        for route in routes:
+            asyncio.run(context.handler(route))
+
+        assert [r.outcome for r in routes] == ["continue", "abort", "continue"]
+        assert timings.extra["blocked_requests"] == 1
+        assert timings.summary().endswith("blocked_requests=1")
+
+
+class TestJpegCapture:
+    """Full-page JPEG capture and the single re-encode budget."""
+
+    @pytest.mark.parametrize("height,clipped", [(5000, False), (40000, True)])
+    def test_fullpage_is_jpeg_and_height_capped(self, height, clipped):
+        from utils.image import FULLPAGE_MAX_HEIGHT, _screenshot_fullpage_jpeg
+
+        page = _FakePage(height)
+        asyncio.run(_screenshot_fullpage_jpeg(page, "https://shop.example/"))
+
+        assert page.screenshot_options["type"] == "jpeg"
+        assert page.screenshot_options["full_page"]
+        assert ("clip" in page.screenshot_options) == clipped
+        if clipped:
+            assert page.screenshot_options["clip"]["height"] == FULLPAGE_MAX_HEIGHT
+
+    def test_jpeg_within_budget_is_not_reencoded(self, monkeypatch):
+        import base64
+
+        import pipeline.steps.analyze_page as analyze_page
+
+        calls = []
+        monkeypatch.setattr(analyze_page, "compress_to_base64", lambda b, max_size_mb: calls.append(b) or "x")
+        jpeg = b"\xff\xd8\xff" + b"\x00" * 100
+
+        assert analyze_page._screenshot_to_base64(jpeg, max_size_mb=0.5) == base64.b64encode(jpeg).decode()
+        assert analyze_page._screenshot_to_base64(jpeg, max_size_mb=0.00001) == "x"
+        assert analyze_page._screenshot_to_base64(b"\x89PNG", max_size_mb=0.5) == "x"
+        assert len(calls) == 2
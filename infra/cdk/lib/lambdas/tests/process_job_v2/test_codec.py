@@ -0,0 +1,100 @@
+"""
+Unit tests for budgeted JPEG encoding (utils/codec.py).
+"""
+
+import base64
+import io
+import random
+
+import pytest
+from PIL import Image, ImageDraw
+
+
+def _screenshot_png(height: int, seed: int = 0) -> bytes:
+    """Screenshot-like PNG: text lines and noisy colour blocks."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1280, height), "white")
+    draw = ImageDraw.Draw(img)
+    y = 0
+    while y < height:
+        if rng.random() < 0.3:
+            for row in range(y, y + 300, 4):
+                draw.rectangle([80, row, 1200, row + 4], fill=tuple(rng.randrange(256) for _ in range(3)))
+            y += 340
+        else:
+            draw.text((80, y), " ".join("lorem" * rng.randint(1, 3) for _ in range(20)), fill=(20, 20, 20))
+            y += 22
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestFitJpeg:
+    """Budget is met in a bounded number of encodes."""
+
+    @pytest.mark.parametrize("height,budget", [(3000, 150_000), (9000, 300_000), (9000, 60_000)])
+    def test_fits_budget_in_few_encodes(self, height, budget):
+        from utils.codec import FIT_ENCODES, fit_jpeg
+
+        result = fit_jpeg(_screenshot_png(height), budget, quality=90)
+
+        assert len(result.data) <= budget
+        assert result.data[:3] == b"\xff\xd8\xff"
+        assert 1 <= result.encodes <= FIT_ENCODES
+        assert Image.open(io.BytesIO(result.data)).size == (result.width, result.height)
+
+    @pytest.mark.parametrize("source,budget", [
+        ("dense_text", 200_000),
+        ("noise", 400_000),
+    ])
+    def test_first_fit_is_accepted_after_fit_encodes(self, source, budget):
+        """Downscaling settles for a looser fit rather than spending more encodes."""
+        from utils.codec import FIT_ENCODES, fit_jpeg
+
+        if source == "dense_text":
+            rng = random.Random(1)
+            img = Image.new("RGB", (1280, 4000), "white")
+            draw = ImageDraw.Draw(img)
+            for y in range(0, 4000, 14):
+                draw.text((20, y), "".join(rng.choice("abcdefghij klmnop QRST 0123") for _ in range(210)), fill=(0, 0, 0))
+        else:
+            img = Image.effect_noise((1500, 1500), 40).convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+
+        result = fit_jpeg(buf.getvalue(), budget)
+
+        assert len(result.data) <= budget
+        assert result.encodes == FIT_ENCODES
+        assert result.width < img.width
+
+    def test_jpeg_within_budget_is_passed_through(self):
+        from utils.codec import fit_jpeg
+
+        buf = io.BytesIO()
+        Image.new("RGB", (200, 100), "red").save(buf, format="JPEG")
+
+        result = fit_jpeg(buf.getvalue(), 1_000_000)
+
+        assert result.data == buf.getvalue()
+        assert (result.encodes, result.width, result.height) == (0, 200, 100)
+
+    def test_transparent_png_and_encodings(self):
+        from utils.codec import fit_jpeg
+
+        buf = io.BytesIO()
+        Image.new("RGBA", (300, 300), (0, 0, 0, 0)).save(buf, format="PNG")
+
+        result = fit_jpeg(buf.getvalue(), 1_000_000)
+
+        assert Image.open(io.BytesIO(result.data)).getpixel((10, 10)) == (255, 255, 255)
+        assert base64.b64decode(result.to_base64()) == result.data
+        assert result.to_data_url().startswith("data:image/jpeg;base64,")
+
+    def test_compress_helpers_use_budget(self):
+        from utils.image import compress_image_if_needed, compress_to_base64
+
+        png = _screenshot_png(6000)
+
+        assert len(compress_image_if_needed(png, max_size_mb=0.1)) <= 0.1 * 1024 * 1024
+        assert len(base64.b64decode(compress_to_base64(png, max_size_mb=0.1))) <= 0.1 * 1024 * 1024
@@ -0,0 +1,171 @@
+"""
+Unit tests for the DagExecutor and AsyncDagExecutor used by the process_job_v2 orchestrator.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+class TestDagExecutor:
+    """Dependency ordering, early start, failure propagation and timings."""
+
+    def _make_dag(self, max_workers=4):
+        from pipeline.dag import DagExecutor
+        return DagExecutor(max_workers=max_workers, name="test")
+
+    def test_passes_dependency_results_in_declared_order(self):
+        dag = self._make_dag()
+        dag.add_node("a", lambda: 1)
+        dag.add_node("b", lambda: 2)
+        dag.add_node("sum", lambda b, a: f"{b}-{a}", deps=["b", "a"])
+
+        results = dag.run()
+
+        assert results["sum"] == "2-1"
+
+    def test_downstream_starts_before_slow_sibling_finishes(self):
+        """A fast branch must not wait for an unrelated slow branch."""
+        dag = self._make_dag()
+        slow_done = threading.Event()
+
+        def _slow():
+            time.sleep(0.3)
+            slow_done.set()
+            return "slow"
+
+        dag.add_node("slow", _slow)
+        dag.add_node("fast", lambda: "fast")
+        dag.add_node("after_fast", lambda _: slow_done.is_set(), deps=["fast"])
+
+        results = dag.run()
+
+        assert results["after_fast"] is False
+        assert dag.timings["after_fast"].finished_at < dag.timings["slow"].finished_at
+
+    def test_failure_is_raised_and_skips_dependents(self):
+        dag = self._make_dag()
+        calls = []
+
+        def _boom():
+            raise RuntimeError("node failed")
+
+        dag.add_node("boom", _boom)
+        dag.add_node("child", lambda _: calls.append("child"), deps=["boom"])
+
+        with pytest.raises(RuntimeError, match="node failed"):
+            dag.run()
+        assert calls == []
+        assert dag.timings["boom"].success is False
+
+    def test_unknown_dependency_rejected(self):
+        dag = self._make_dag()
+        dag.add_node("a", lambda _: None, deps=["missing"])
+
+        with pytest.raises(ValueError, match="unknown node"):
+            dag.run()
+
+    def test_cycle_rejected(self):
+        dag = self._make_dag()
+        dag.add_node("a", lambda _: None, deps=["b"])
+        dag.add_node("b", lambda _: None, deps=["a"])
+
+        with pytest.raises(ValueError, match="cycle"):
+            dag.run()
+
+    def test_duplicate_node_rejected(self):
+        dag = self._make_dag()
+        dag.add_node("a", lambda: None)
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            dag.add_node("a", lambda: None)
+
+    def test_concurrency_is_bounded(self):
+        dag = self._make_dag(max_workers=2)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def _work():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+
+        for i in range(6):
+            dag.add_node(f"n{i}", _work)
+        dag.run()
+
+        assert state["peak"] <= 2
+        assert len(dag.timings) == 6
+
+
+class TestAsyncDagExecutor:
+    """The asyncio executor keeps the same semantics with coroutine nodes."""
+
+    def _make_dag(self, max_concurrency=4):
+        from pipeline.dag import AsyncDagExecutor
+        return AsyncDagExecutor(max_concurrency=max_concurrency, name="test")
+
+    def test_passes_dependency_results_to_coroutines(self):
+        dag = self._make_dag()
+
+        async def _add(b, a):
+            await asyncio.sleep(0)
+            return f"{b}-{a}"
+
+        dag.add_node("a", lambda: 1)
+        dag.add_node("b", lambda: asyncio.sleep(0.01, result=2))
+        dag.add_node("sum", _add, deps=["b", "a"])
+
+        results = asyncio.run(dag.run())
+
+        assert results == {"a": 1, "b": 2, "sum": "2-1"}
+
+    def test_failure_is_raised_and_skips_dependents(self):
+        dag = self._make_dag()
+        calls = []
+
+        async def _boom():
+            raise RuntimeError("node failed")
+
+        async def _slow():
+            await asyncio.sleep(5)
+            calls.append("slow")
+
+        dag.add_node("boom", _boom)
+        dag.add_node("slow", _slow)
+        dag.add_node("child", lambda _: calls.append("child"), deps=["boom"])
+
+        with pytest.raises(RuntimeError, match="node failed"):
+            asyncio.run(dag.run())
+        assert calls == []
+        assert dag.timings["boom"].success is False
+
+    def test_concurrency_is_bounded(self):
+        dag = self._make_dag(max_concurrency=3)
+        state = {"active": 0, "peak": 0}
+
+        async def _work():
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+
+        for i in range(20):
+            dag.add_node(f"n{i}", _work)
+        asyncio.run(dag.run())
+
+        assert state["peak"] == 3
+        assert len(dag.timings) == 20
+
+    def test_cycle_rejected(self):
+        dag = self._make_dag()
+        dag.add_node("a", lambda _: None, deps=["b"])
+        dag.add_node("b", lambda _: None, deps=["a"])
+
+        with pytest.raises(ValueError, match="cycle"):
+            asyncio.run(dag.run())
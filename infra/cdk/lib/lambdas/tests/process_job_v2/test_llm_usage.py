@@ -0,0 +1,101 @@
+"""
+Unit tests for the buffered LLM usage event emitter.
+"""
+
+import gzip
+import json
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+
+import conftest_shared as shared
+
+
+def _event(job_id="job-1", ts="2026-10-16T09:15:00+00:00", **fields):
+    return {"jobId": job_id, "timestamp": ts, "subtask": "t", **fields}
+
+
+def _objects(prefix="llm_usage_events"):
+    s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+    listed = s3.list_objects_v2(Bucket=shared.TEST_BUCKET, Prefix=prefix).get("Contents", [])
+    return {o["Key"]: s3.get_object(Bucket=shared.TEST_BUCKET, Key=o["Key"])["Body"].read() for o in listed}
+
+
+class TestUsageEventBuffer:
+    """Events are batched into one JSONL object per job partition."""
+
+    def test_flush_writes_one_object_per_job(self):
+        from llm_usage import UsageEventBuffer
+
+        buffer = UsageEventBuffer(shared.TEST_BUCKET, "llm_usage_events", flush_interval=3600)
+        for i in range(5):
+            buffer.put(_event(n=i))
+        buffer.put(_event(job_id=None))
+
+        assert buffer.flush() == 6
+        objects = _objects()
+        assert len(objects) == 2
+        (job_key, body), = [(k, v) for k, v in objects.items() if "jobId=job-1" in k]
+        assert job_key.startswith("llm_usage_events/dt=2026-10-16/hour=09/jobId=job-1/")
+        assert [json.loads(line)["n"] for line in body.decode().splitlines()] == [0, 1, 2, 3, 4]
+        assert any("jobId=no_job" in k for k in objects)
+
+    def test_gzip_objects(self):
+        from llm_usage import UsageEventBuffer
+
+        buffer = UsageEventBuffer(shared.TEST_BUCKET, "gz_events", flush_interval=3600, compress=True)
+        buffer.put(_event())
+        buffer.flush()
+
+        (key, body), = _objects("gz_events").items()
+        assert key.endswith(".jsonl.gz")
+        assert json.loads(gzip.decompress(body))["jobId"] == "job-1"
+
+    def test_full_queue_drops_and_counts(self):
+        from llm_usage import UsageEventBuffer
+
+        buffer = UsageEventBuffer(shared.TEST_BUCKET, "p", flush_interval=3600, max_queued=2, s3_client=MagicMock())
+
+        assert [buffer.put(_event()) for _ in range(4)] == [True, True, False, False]
+        assert buffer.dropped == 2
+
+    def test_write_failure_counts_as_dropped(self):
+        from llm_usage import UsageEventBuffer
+
+        s3 = MagicMock()
+        s3.put_object.side_effect = RuntimeError("S3 down")
+        buffer = UsageEventBuffer(shared.TEST_BUCKET, "p", flush_interval=3600, s3_client=s3)
+        buffer.put(_event())
+
+        assert buffer.flush() == 0
+        assert buffer.dropped == 1
+
+
+class TestEmitAndDrain:
+    """emit_llm_usage_event only queues; the handler decorator drains."""
+
+    def test_handler_exit_flushes(self, monkeypatch):
+        import llm_usage
+        from llm_usage import UsageContext, emit_llm_usage_event, flushes_llm_usage_events
+
+        monkeypatch.setenv("RESULTS_BUCKET", shared.TEST_BUCKET)
+        monkeypatch.setenv("LLM_USAGE_EVENTS_PREFIX", "handler_events")
+        monkeypatch.setattr(llm_usage, "_buffer", None)
+        ctx = UsageContext("POST /v2/jobs", "job-9", "V2_JOB")
+
+        @flushes_llm_usage_events
+        def handler():
+            for _ in range(3):
+                emit_llm_usage_event(
+                    ctx=ctx, provider="openai", model="m", operation="responses.parse",
+                    subtask="t", latency_ms=5, success=True,
+                )
+            assert _objects("handler_events") == {}
+            raise RuntimeError("pipeline failed")
+
+        with pytest.raises(RuntimeError):
+            handler()
+
+        (body,) = _objects("handler_events").values()
+        assert len(body.decode().splitlines()) == 3
@@ -0,0 +1,100 @@
+"""
+Unit tests for AnalyzePageStep's text analysis mode.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+JPEG = b"\xff\xd8\xff" + b"\x00" * 64
+PAGE_TEXT = "# Miracle Serum\n- Clinically tested\n~~$99~~ $49 today\n" + "Real results. " * 60
+
+
+def _screenshots(page_text=None, fullpage=True):
+    shots = MagicMock()
+    shots.fullpage_bytes = JPEG if fullpage else b""
+    shots.product_image_bytes = JPEG
+    shots.validators = {}
+    shots.page_text = page_text
+    return shots
+
+
+@pytest.fixture()
+def step(_aws_env_and_moto, monkeypatch):
+    from pipeline.steps.analyze_page import AnalyzePageStep
+
+    monkeypatch.setattr(AnalyzePageStep, "_check_analysis_quality", lambda self, text, url: MagicMock(
+        overall_quality_score=4
+    ))
+    prompt_service = MagicMock()
+    prompt_service.get_prompt.return_value = "Analyze this page."
+    openai_service = MagicMock()
+    openai_service.create_response.return_value = "analysis"
+    return lambda mode: AnalyzePageStep(openai_service, prompt_service, analysis_mode=mode)
+
+
+class TestTextMode:
+    """Text mode sends DOM text plus a small image and no full-page screenshot."""
+
+    def test_text_mode_payload(self, step, _aws_env_and_moto):
+        from pipeline.steps.analyze_page import MIN_PAGE_TEXT_CHARS
+
+        capture = _aws_env_and_moto["mock_screenshots"]
+        capture.return_value = _screenshots(PAGE_TEXT, fullpage=False)
+        text_step = step("text")
+
+        text_step.execute("https://example.com/p")
+
+        capture.assert_called_once_with(
+            "https://example.com/p", extract_text=True, fullpage=False, min_text_chars=MIN_PAGE_TEXT_CHARS
+        )
+        kwargs = text_step.openai_service.create_response.call_args.kwargs
+        assert kwargs["subtask"] == "process_job_v2.analyze_research_page_text"
+        assert [part["type"] for part in kwargs["content"]] == ["input_text", "input_text", "input_image"]
+        assert PAGE_TEXT in kwargs["content"][1]["text"]
+
+    def test_falls_back_to_vision_when_little_text(self, step, _aws_env_and_moto):
+        capture = _aws_env_and_moto["mock_screenshots"]
+        capture.return_value = _screenshots("Buy now")
+        text_step = step("text")
+
+        text_step.execute("https://example.com/p")
+
+        capture.assert_called_once()
+        kwargs = text_step.openai_service.create_response.call_args.kwargs
+        assert kwargs["subtask"] == "process_job_v2.analyze_research_page"
+        assert [part["type"] for part in kwargs["content"]] == ["input_text", "input_image"]
+
+    @pytest.mark.parametrize("page_text,expect_fullpage", [("Buy now", True), (PAGE_TEXT, False)])
+    def test_short_text_takes_fullpage_in_same_session(self, monkeypatch, page_text, expect_fullpage):
+        import utils.image as image
+        from utils.browser import CaptureTimings
+
+        for name in ("_apply_profile", "_settle"):
+            monkeypatch.setattr(image, name, AsyncMock())
+        monkeypatch.setattr(image, "_load_page", AsyncMock(return_value={}))
+        monkeypatch.setattr(image, "_extract_text", AsyncMock(return_value=page_text))
+        monkeypatch.setattr(image, "_screenshot_fullpage_jpeg", AsyncMock(return_value=JPEG))
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=AsyncMock(screenshot=AsyncMock(return_value=JPEG)))
+
+        shots = asyncio.run(image._capture_screenshots(
+            context, "https://example.com/p", CaptureTimings(),
+            extract_text=True, fullpage=False, min_text_chars=500,
+        ))
+
+        context.new_page.assert_awaited_once()
+        assert shots.page_text == page_text
+        assert shots.fullpage_bytes == (JPEG if expect_fullpage else b"")
+
+    def test_mode_from_env(self, step, monkeypatch):
+        monkeypatch.setenv("PAGE_ANALYSIS_MODE", "TEXT")
+        assert step(None).analysis_mode == "text"
+
+        monkeypatch.setenv("PAGE_ANALYSIS_MODE", "bogus")
+        assert step(None).analysis_mode == "vision"
+
+        monkeypatch.delenv("PAGE_ANALYSIS_MODE")
+        assert step(None).analysis_mode == "vision"
@@ -36,6 +36,16 @@ def _base_event(
     return event
 
 
+def _saved_results(job_id):
+    """A saved job's results dict, assembled from its shards."""
+    import boto3
+    from services.aws import AWSServices
+
+    aws = AWSServices.__new__(AWSServices)
+    aws.s3_client = boto3.client("s3", region_name=shared.AWS_REGION)
+    return aws.load_results_from_s3(shared.TEST_BUCKET, job_id)
+
+
 # ---------------------------------------------------------------------------
 # Tests — Happy Path (cache miss)
 # ---------------------------------------------------------------------------
@@ -69,10 +79,7 @@ class TestHappyPath:
         event = _base_event(job_id=job_id)
         lambda_handler(event, None)
 
-        key = f"results/{job_id}/comprehensive_results.json"
-        data = shared.get_s3_json(key)
-        assert "results" in data
-        results = data["results"]
+        results = _saved_results(job_id)
         assert "research_page_analysis" in results
         assert "deep_research_output" in results
         assert "marketing_avatars" in results
@@ -94,9 +101,18 @@ class TestHappyPath:
         event = _base_event(job_id=job_id)
         lambda_handler(event, None)
 
-        key = f"results/{job_id}/comprehensive_results.json"
-        data = shared.get_s3_json(key)
-        assert "offer_brief" in data["results"]
+        assert "offer_brief" in _saved_results(job_id)
+
+    def test_angles_carry_their_own_template_predictions(self, mock_all_llm):
+        from handler import lambda_handler
+
+        job_id = "test-template-predictions"
+        event = _base_event(job_id=job_id)
+        lambda_handler(event, None)
+
+        for entry in _saved_results(job_id)["marketing_avatars"]:
+            for angle in entry["angles"]["generated_angles"]:
+                assert angle["template_predictions"]["angle_id"] == angle["id"]
 
     def test_gender_and_location_passed(self, mock_all_llm):
         from handler import lambda_handler
@@ -107,6 +123,38 @@ class TestHappyPath:
         assert resp["statusCode"] == 200
 
 
+class TestAsyncConcurrency:
+    """PIPELINE_CONCURRENCY=async runs the avatar fan-out on the async services."""
+
+    def test_async_mode_produces_same_results(self, mock_all_llm, monkeypatch):
+        from handler import lambda_handler
+        from services.openai_service import AsyncOpenAIService
+
+        lambda_handler(_base_event(job_id="test-threads"), None)
+
+        formats = []
+        original = AsyncOpenAIService.parse_structured
+
+        async def _recording(self, prompt, response_format, *args, **kwargs):
+            formats.append(response_format.__name__)
+            return await original(self, prompt, response_format, *args, **kwargs)
+
+        monkeypatch.setattr(AsyncOpenAIService, "parse_structured", _recording)
+        monkeypatch.setenv("PIPELINE_CONCURRENCY", "async")
+        resp = lambda_handler(_base_event(job_id="test-async"), None)
+
+        assert resp["statusCode"] == 200
+        assert {"Avatar", "AvatarMarketingAngles", "OfferBrief"} <= set(formats)
+        threads = _saved_results("test-threads")
+        async_ = _saved_results("test-async")
+        assert [e["avatar"]["overview"]["name"] for e in async_["marketing_avatars"]] == \
+            [e["avatar"]["overview"]["name"] for e in threads["marketing_avatars"]]
+        for entry in async_["marketing_avatars"]:
+            for angle in entry["angles"]["generated_angles"]:
+                assert angle["template_predictions"]["angle_id"] == angle["id"]
+        assert async_["offer_brief"].keys() == threads["offer_brief"].keys()
+
+
 # ---------------------------------------------------------------------------
 # Tests — Cache Hit
 # ---------------------------------------------------------------------------
@@ -127,6 +175,7 @@ class TestCacheHit:
         mock_result = type("Obj", (), {
             "fullpage_bytes": b"\x89PNG" + b"\x00" * 100,
             "product_image_bytes": b"\x89PNG" + b"\x00" * 50,
+            "validators": {},
         })()
         mock_screenshot.return_value = mock_result
 
@@ -164,6 +213,111 @@ class TestCacheHit:
         assert status == "SUCCEEDED"
 
 
+# ---------------------------------------------------------------------------
+# Tests — Checkpoint Resume
+# ---------------------------------------------------------------------------
+
+class TestCheckpointResume:
+    """Re-invoking a failed job resumes from the checkpoints of completed steps."""
+
+    def _run_failing_save(self, job_id, monkeypatch):
+        """Run a job that fails after every step is checkpointed."""
+        from handler import lambda_handler
+        from services.aws import AWSServices
+
+        def _fail(*args, **kwargs):
+            raise RuntimeError("S3 down")
+
+        with monkeypatch.context() as m:
+            m.setattr(AWSServices, "save_results_to_s3", _fail)
+            resp = lambda_handler(_base_event(job_id=job_id), None)
+
+        assert resp["statusCode"] == 500
+        assert shared.s3_key_exists(f"results/{job_id}/checkpoints/research.json")
+
+    def test_retry_resumes_without_llm_calls(self, mock_all_llm, monkeypatch):
+        from handler import lambda_handler
+
+        job_id = "test-resume-all"
+        self._run_failing_save(job_id, monkeypatch)
+
+        def _fail(*args, **kwargs):
+            raise RuntimeError("LLM should not be called on resume")
+
+        monkeypatch.setattr("services.openai_service.OpenAIService.parse_structured", _fail)
+        monkeypatch.setattr("services.perplexity_service.PerplexityService.deep_research", _fail)
+
+        resp = lambda_handler(_base_event(job_id=job_id), None)
+
+        assert resp["statusCode"] == 200
+        assert shared.get_job_status(job_id) == "SUCCEEDED"
+
+    def test_partial_fanout_reruns_only_missing_nodes(self, mock_all_llm, monkeypatch):
+        import boto3
+        from handler import lambda_handler
+        from pipeline.steps.marketing import MarketingStep
+
+        job_id = "test-resume-partial"
+        self._run_failing_save(job_id, monkeypatch)
+
+        s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+        for name in ("angles_0", "templates_0", "offer_brief"):
+            s3.delete_object(Bucket=shared.TEST_BUCKET, Key=f"results/{job_id}/checkpoints/{name}.json")
+
+        calls = []
+        original = MarketingStep.generate_marketing_angles
+
+        def _counting(self, avatar, *args, **kwargs):
+            calls.append(avatar.overview.name)
+            return original(self, avatar, *args, **kwargs)
+
+        monkeypatch.setattr(MarketingStep, "generate_marketing_angles", _counting)
+
+        resp = lambda_handler(_base_event(job_id=job_id), None)
+
+        assert resp["statusCode"] == 200
+        assert len(calls) == 1
+
+    def test_failed_predictions_are_retried_on_resume(self, mock_all_llm, monkeypatch):
+        from handler import lambda_handler
+        from pipeline.steps.template_prediction import TemplatePredictionStep
+
+        job_id = "test-resume-failed-templates"
+        original = TemplatePredictionStep.execute_many
+        with monkeypatch.context() as m:
+            m.setattr(TemplatePredictionStep, "execute_many", lambda self, avatar, angles, top_k=5: [None] * len(angles))
+            self._run_failing_save(job_id, monkeypatch)
+
+        retried = []
+
+        def _counting(self, avatar, angles, top_k=5):
+            retried.extend(angles)
+            return original(self, avatar, angles, top_k)
+
+        monkeypatch.setattr(TemplatePredictionStep, "execute_many", _counting)
+
+        resp = lambda_handler(_base_event(job_id=job_id), None)
+
+        assert resp["statusCode"] == 200
+        assert retried
+        avatars = _saved_results(job_id)["marketing_avatars"]
+        for entry in avatars:
+            for angle in entry["angles"]["generated_angles"]:
+                assert angle["template_predictions"]["angle_id"] == angle["id"]
+
+    def test_checkpoints_deleted_after_success(self, mock_all_llm, monkeypatch):
+        from handler import lambda_handler
+
+        job_id = "test-resume-cleanup"
+        self._run_failing_save(job_id, monkeypatch)
+
+        resp = lambda_handler(_base_event(job_id=job_id), None)
+
+        assert resp["statusCode"] == 200
+        assert not shared.s3_key_exists(f"results/{job_id}/checkpoints/research.json")
+        assert _saved_results(job_id)["marketing_avatars"]
+
+
 # ---------------------------------------------------------------------------
 # Tests — Dev Mode
 # ---------------------------------------------------------------------------
@@ -212,9 +366,7 @@ class TestDevMode:
         event = _base_event(job_id=job_id, dev_mode=True)
         lambda_handler(event, None)
 
-        key = f"results/{job_id}/comprehensive_results.json"
-        data = shared.get_s3_json(key)
-        assert data["results"]["mock"] is True
+        assert _saved_results(job_id)["mock"] is True
 
     def test_dev_mode_updates_status_succeeded(self):
         """Dev mode should mark job as SUCCEEDED."""
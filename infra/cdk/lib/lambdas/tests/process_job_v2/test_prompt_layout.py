@@ -0,0 +1,149 @@
+"""
+Unit tests for the shared-context-first prompt layout and prompt caching hooks.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+
+RESEARCH = "research finding. " * 400  # > CACHE_BREAKPOINT_MIN_CHARS
+
+
+class _Answer(BaseModel):
+    value: int
+
+
+def _prompt_service(layout):
+    from services.prompt_service import PromptService
+
+    service = PromptService.__new__(PromptService)
+    service.category = "process_job_v2"
+    service.layout = layout
+    service._prompts = {
+        "get_offer_brief_prompt": "Research:\n{deep_research_output}\n\nWrite a brief for {product}.",
+        "get_avatar_prompt": "Describe {avatar}.",
+    }
+    return service
+
+
+def _usage_ctx():
+    from llm_usage import UsageContext
+    return UsageContext(endpoint="POST /v2/jobs", job_id="job-1", job_type="V2_JOB")
+
+
+class TestPromptParts:
+    """get_prompt_parts splits out the shared document only when asked to."""
+
+    def test_inline_layout_renders_whole_prompt(self):
+        service = _prompt_service("inline")
+
+        parts = service.get_prompt_parts(
+            "get_offer_brief_prompt", "deep_research_output", deep_research_output="R", product="P"
+        )
+
+        assert parts.shared_context is None
+        assert parts.instructions == "Research:\nR\n\nWrite a brief for P."
+
+    def test_shared_first_layout_splits_document(self):
+        from services.prompt_service import SHARED_CONTEXT_REFERENCE
+
+        service = _prompt_service("shared_context_first")
+
+        parts = service.get_prompt_parts(
+            "get_offer_brief_prompt", "deep_research_output", deep_research_output="R", product="P"
+        )
+
+        assert parts.shared_context == "R"
+        assert parts.instructions == f"Research:\n{SHARED_CONTEXT_REFERENCE}\n\nWrite a brief for P."
+
+    def test_templates_without_the_document_are_not_split(self):
+        service = _prompt_service("shared_context_first")
+
+        parts = service.get_prompt_parts(
+            "get_avatar_prompt", "deep_research_output", deep_research_output="R", avatar="A"
+        )
+
+        assert parts.shared_context is None
+        assert parts.instructions == "Describe A."
+
+    def test_layout_from_env(self, monkeypatch):
+        import services.prompt_service as ps
+
+        monkeypatch.setattr(ps.PromptService, "_load_prompts", lambda self: None)
+        monkeypatch.setenv("PROMPT_LAYOUT", "shared_context_first")
+        assert ps.PromptService("postgresql://x", "process_job_v2").layout == "shared_context_first"
+
+        monkeypatch.setenv("PROMPT_LAYOUT", "bogus")
+        assert ps.PromptService("postgresql://x", "process_job_v2").layout == "inline"
+
+
+class TestOpenAIPrefix:
+    """parse_structured sends the shared context as a stable first message."""
+
+    def test_shared_context_leads_input(self):
+        from services.openai_service import OpenAIService
+
+        service = OpenAIService(api_key="sk-test", usage_ctx=_usage_ctx())
+        service.client = MagicMock()
+        service.client.responses.parse.return_value = SimpleNamespace(
+            output_parsed=_Answer(value=1),
+            usage=SimpleNamespace(
+                input_tokens=900, output_tokens=10, input_tokens_details=SimpleNamespace(cached_tokens=768)
+            ),
+        )
+
+        with patch("services.openai_service.emit_llm_usage_event") as emit:
+            service.parse_structured("task one", _Answer, subtask="t", shared_context=RESEARCH)
+            service.parse_structured("task two", _Answer, subtask="t", shared_context=RESEARCH)
+
+        first, second = [c.kwargs for c in service.client.responses.parse.call_args_list]
+        assert first["input"][0] == second["input"][0] == {"role": "user", "content": RESEARCH}
+        assert first["input"][1]["content"] == "task one"
+        assert first["prompt_cache_key"] == second["prompt_cache_key"]
+        assert emit.call_args.kwargs["usage"]["cachedInputTokens"] == 768
+
+    def test_no_shared_context_keeps_single_message(self):
+        from services.openai_service import OpenAIService
+
+        assert OpenAIService._parse_kwargs("prompt") == {"input": [{"role": "user", "content": "prompt"}]}
+
+
+class TestClaudeCacheControl:
+    """Long system prompts and shared contexts carry cache breakpoints."""
+
+    def test_shared_context_is_cached_first_block(self):
+        from services.claude_service import ClaudeService, EPHEMERAL_CACHE_CONTROL
+
+        kwargs = ClaudeService._request_kwargs(
+            "claude-test", 100, "task", system_prompt="short system", shared_context=RESEARCH
+        )
+
+        first, task = kwargs["messages"][0]["content"]
+        assert first == {"type": "text", "text": RESEARCH, "cache_control": EPHEMERAL_CACHE_CONTROL}
+        assert task == {"type": "text", "text": "task"}
+        assert kwargs["system"] == [{"type": "text", "text": "short system"}]
+
+    def test_without_shared_context_content_is_unchanged(self):
+        from services.claude_service import ClaudeService
+
+        kwargs = ClaudeService._request_kwargs("claude-test", 100, "task")
+
+        assert kwargs["messages"] == [{"role": "user", "content": "task"}]
+        assert "system" not in kwargs
+
+
+class TestCachedTokenUsage:
+    """normalize_openai_usage reports prompt-cache hits for both APIs."""
+
+    @pytest.mark.parametrize("usage,cached", [
+        (SimpleNamespace(input_tokens=10, output_tokens=1, input_tokens_details=SimpleNamespace(cached_tokens=8)), 8),
+        ({"prompt_tokens": 10, "completion_tokens": 1, "prompt_tokens_details": {"cached_tokens": 4}}, 4),
+        (SimpleNamespace(input_tokens=10, output_tokens=1), None),
+    ])
+    def test_cached_tokens(self, usage, cached):
+        from llm_usage import normalize_openai_usage
+
+        assert normalize_openai_usage(SimpleNamespace(usage=usage))["cachedInputTokens"] == cached
@@ -141,6 +141,7 @@ class TestQualityGateRejectsLowScore:
         mock_screenshots = MagicMock()
         mock_screenshots.fullpage_bytes = b"\x89PNG" + b"\x00" * 100
         mock_screenshots.product_image_bytes = b"\x89PNG" + b"\x00" * 50
+        mock_screenshots.validators = {}
 
         step = AnalyzePageStep(
             openai_service=mock_openai,
@@ -150,9 +151,8 @@ class TestQualityGateRejectsLowScore:
         with pytest.raises(PageAnalysisQualityError, match="quality check failed"):
             from unittest.mock import patch
             with patch("pipeline.steps.analyze_page.capture_page_screenshots", return_value=mock_screenshots):
-                with patch("pipeline.steps.analyze_page.compress_image_if_needed", return_value=b"\x89PNG"):
-                    with patch("pipeline.steps.analyze_page.compress_to_base64", return_value="base64data"):
-                        step.execute(FUNNELISH_URL)
+                with patch("pipeline.steps.analyze_page.compress_to_base64", return_value="base64data"):
+                    step.execute(FUNNELISH_URL)
 
     def test_high_quality_analysis_passes(self, _aws_env_and_moto):
         """
@@ -173,6 +173,7 @@ class TestQualityGateRejectsLowScore:
         mock_screenshots = MagicMock()
         mock_screenshots.fullpage_bytes = b"\x89PNG" + b"\x00" * 100
         mock_screenshots.product_image_bytes = b"\x89PNG" + b"\x00" * 50
+        mock_screenshots.validators = {}
 
         step = AnalyzePageStep(
             openai_service=mock_openai,
@@ -181,9 +182,8 @@ class TestQualityGateRejectsLowScore:
 
         from unittest.mock import patch
         with patch("pipeline.steps.analyze_page.capture_page_screenshots", return_value=mock_screenshots):
-            with patch("pipeline.steps.analyze_page.compress_image_if_needed", return_value=b"\x89PNG"):
-                with patch("pipeline.steps.analyze_page.compress_to_base64", return_value="base64data"):
-                    result = step.execute("https://example.com/good-page")
+            with patch("pipeline.steps.analyze_page.compress_to_base64", return_value="base64data"):
+                result = step.execute("https://example.com/good-page")
 
         assert result.analysis == "Detailed product analysis"
         assert result.product_image == "base64data"
@@ -0,0 +1,265 @@
+"""
+Unit tests for the provider-aware adaptive LLM rate limiter.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class _ApiError(Exception):
+    """Stand-in for an SDK status error carrying an HTTP response."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def _limiter(**limits):
+    from rate_limit import ProviderLimits, RateLimiter
+
+    defaults = dict(requests_per_minute=6000, tokens_per_minute=float("inf"), max_concurrency=8)
+    return RateLimiter("openai", "test-model", ProviderLimits(**{**defaults, **limits}))
+
+
+class TestErrorClassification:
+    """Only throttles and transient failures are retried."""
+
+    @pytest.mark.parametrize("error,throttle,retryable", [
+        (_ApiError(429), True, True),
+        (_ApiError(529), True, True),
+        (_ApiError(503), False, True),
+        (_ApiError(400), False, False),
+        (ConnectionError("reset"), False, True),
+        (ValueError("bad schema"), False, False),
+    ])
+    def test_classification(self, error, throttle, retryable):
+        from rate_limit import is_retryable_error, is_throttle_error
+
+        assert is_throttle_error(error) is throttle
+        assert is_retryable_error(error) is retryable
+
+    def test_retry_after_header(self):
+        from rate_limit import retry_after_seconds
+
+        assert retry_after_seconds(_ApiError(429, {"retry-after": "7"})) == 7
+        assert retry_after_seconds(_ApiError(429, {"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(_ApiError(429)) is None
+
+
+class TestRateLimiter:
+    """AIMD concurrency, Retry-After cooldown and token buckets."""
+
+    def test_throttle_halves_concurrency_and_success_recovers(self):
+        limiter = _limiter(max_concurrency=8)
+
+        limiter.release(limiter.acquire(10), error=_ApiError(429, {"retry-after": "0"}))
+        assert limiter.concurrency_limit == 4
+
+        for _ in range(20):
+            limiter.release(limiter.acquire(10))
+        assert 4 < limiter.concurrency_limit <= 8
+
+    def test_retry_after_pauses_admission(self):
+        limiter = _limiter()
+        limiter.release(limiter.acquire(10), error=_ApiError(429, {"retry-after": "30"}))
+
+        assert 25 < limiter._try_acquire(10) <= 30
+        assert limiter.in_flight == 0
+
+    def test_request_bucket_spaces_calls(self):
+        limiter = _limiter(requests_per_minute=600)  # 10/s, burst of 600
+        limiter._requests.tokens = 0
+
+        permit = limiter.acquire(10)
+
+        assert 50 <= permit.throttle_ms <= 500
+
+    def test_usage_refunds_token_estimate(self):
+        limiter = _limiter(tokens_per_minute=10_000)
+        permit = limiter.acquire(5_000)
+        permit.record_usage({"inputTokens": 800, "outputTokens": 200})
+        limiter.release(permit)
+
+        assert limiter._tokens.tokens == pytest.approx(9_000, abs=50)
+
+    def test_concurrency_bound_async(self):
+        limiter = _limiter(max_concurrency=3)
+        state = {"active": 0, "peak": 0}
+
+        async def _call():
+            permit = await limiter.acquire_async(10)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.02)
+            state["active"] -= 1
+            limiter.release(permit)
+
+        async def _many():
+            await asyncio.gather(*[_call() for _ in range(12)])
+
+        asyncio.run(_many())
+
+        assert state["peak"] == 3
+
+
+class TestCallWithLimits:
+    """Retry loop and the throttle wait reported to usage events."""
+
+    def test_retries_throttle_then_succeeds(self):
+        from rate_limit import call_with_limits
+
+        attempts = []
+
+        def _call(permit):
+            attempts.append(permit.attempt)
+            if len(attempts) == 1:
+                raise _ApiError(429, {"retry-after-ms": "300"})
+            return permit
+
+        permit = call_with_limits("openai", "retry-model", _call)
+
+        assert attempts == [1, 2]
+        assert permit.throttle_ms > 0
+
+    def test_bad_request_is_not_retried(self):
+        from rate_limit import call_with_limits
+
+        func = MagicMock(side_effect=_ApiError(400))
+
+        with pytest.raises(_ApiError):
+            call_with_limits("openai", "bad-request-model", func)
+        assert func.call_count == 1
+
+    def test_cancelled_calls_free_their_slots(self):
+        from rate_limit import call_with_limits_async, get_limiter
+
+        async def _hang(permit):
+            await asyncio.sleep(60)
+
+        async def _run():
+            tasks = [asyncio.create_task(call_with_limits_async("openai", "cancel-model", _hang)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            assert get_limiter("openai", "cancel-model").in_flight == 5
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run(_run())
+
+        limiter = get_limiter("openai", "cancel-model")
+        assert limiter.in_flight == 0
+        assert limiter.throttled == 0
+
+    def test_openai_service_reports_throttle_ms(self):
+        from services.openai_service import OpenAIService
+        from llm_usage import UsageContext
+
+        service = OpenAIService(api_key="sk-test", usage_ctx=UsageContext("POST /v2/jobs", "job-1", "V2_JOB"))
+        service.client = MagicMock()
+        service.client.responses.create.side_effect = [
+            _ApiError(429, {"retry-after-ms": "300"}),
+            SimpleNamespace(output_text="ok", usage=None),
+        ]
+
+        with patch("services.openai_service.emit_llm_usage_event") as emit:
+            assert service.create_response([], subtask="test.throttle") == "ok"
+
+        failed, succeeded = [c.kwargs for c in emit.call_args_list]
+        assert failed["success"] is False and failed["retry_attempt"] == 1
+        assert succeeded["retry_attempt"] == 2
+        assert succeeded["throttle_ms"] > 0
+
+
+class TestSharedBudget:
+    """Limiters in different Lambdas draw from one per-minute budget."""
+
+    def _shared(self, store, **limits):
+        from rate_limit import ProviderLimits, RateLimiter
+
+        defaults = dict(requests_per_minute=200, tokens_per_minute=float("inf"), max_concurrency=50)
+        return RateLimiter("openai", "shared-model", ProviderLimits(**{**defaults, **limits}), budget=store)
+
+    def test_leases_batch_store_updates(self):
+        from rate_limit import BUDGET_LEASE_REQUESTS, InMemoryBudgetStore
+
+        store = InMemoryBudgetStore()
+        limiter = self._shared(store)
+
+        for _ in range(BUDGET_LEASE_REQUESTS * 3):
+            limiter.release(limiter.acquire(10))
+
+        assert store.claims == 3
+
+    def test_two_lambdas_share_one_quota(self, monkeypatch):
+        import rate_limit
+
+        store = rate_limit.InMemoryBudgetStore()
+        first, second = self._shared(store, requests_per_minute=40), self._shared(store, requests_per_minute=40)
+        monkeypatch.setattr(rate_limit.time, "time", lambda: 600.0)  # stay inside one window
+
+        def _admit(limiter):
+            wait = limiter._try_acquire(10)
+            if wait is None:
+                limiter._claim_budget(10)
+                wait = limiter._try_acquire(10)
+            return wait == 0
+
+        admitted = sum(_admit(limiter) for limiter in (first, second) * 30)
+
+        assert admitted == 40
+        assert first.cooldown_until > time.monotonic() and second.cooldown_until > time.monotonic()
+        assert store.counters[("openai/shared-model", 10)][0] == 40
+
+    def test_tokens_draw_from_budget(self):
+        import rate_limit
+
+        store = rate_limit.InMemoryBudgetStore()
+        limiter = self._shared(store, tokens_per_minute=100_000)
+
+        permit = limiter.acquire(2_000)
+        permit.record_usage({"inputTokens": 500, "outputTokens": 100})
+        limiter.release(permit)
+
+        (_, tokens), = store.counters.values()
+        assert tokens == 5_000  # min(batch of 10 calls, 5% of the minute)
+        assert limiter._lease.tokens == pytest.approx(5_000 - 600)
+
+    def test_dynamodb_store(self):
+        import boto3
+        import conftest_shared as shared
+        from rate_limit import DynamoDBBudgetStore, ProviderLimits
+
+        client = boto3.client("dynamodb", region_name=shared.AWS_REGION)
+        client.create_table(
+            TableName="test-llm-budget",
+            KeySchema=[{"AttributeName": "budgetKey", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "budgetKey", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        store = DynamoDBBudgetStore(client, "test-llm-budget")
+        limits = ProviderLimits(requests_per_minute=25, tokens_per_minute=1_000, max_concurrency=5)
+
+        assert store.claim("openai/m", 7, 10, 400, limits)
+        assert store.claim("openai/m", 7, 10, 400, limits)
+        assert not store.claim("openai/m", 7, 10, 100, limits)  # 30 > 25 requests
+        assert not store.claim("openai/m", 7, 1, 300, limits)  # 1100 > 1000 tokens
+        assert store.claim("openai/m", 7, 5, 200, limits)
+        assert store.claim("openai/m", 8, 10, 0, limits)  # next window starts fresh
+
+        item = client.get_item(TableName="test-llm-budget", Key={"budgetKey": {"S": "openai/m#7"}})["Item"]
+        assert (item["requests"]["N"], item["tokens"]["N"]) == ("25", "1000")
+
+    def test_disabled_without_table(self, monkeypatch):
+        import rate_limit
+
+        monkeypatch.delenv("LLM_RATE_BUDGET_TABLE_NAME", raising=False)
+        assert rate_limit.get_limiter("openai", "no-table").budget is None
+
+        rate_limit.reset_limiters()
+        monkeypatch.setenv("LLM_RATE_BUDGET_TABLE_NAME", "budget")
+        assert isinstance(rate_limit.get_limiter("openai", "table").budget, rate_limit.DynamoDBBudgetStore)
@@ -0,0 +1,209 @@
+"""
+Unit tests for the tiered ResearchCacheService.
+"""
+
+import gzip
+import json
+
+import pytest
+
+import conftest_shared as shared
+
+
+URLS = ["https://example.com/product"]
+
+
+@pytest.fixture()
+def cache_mod(tmp_path, monkeypatch):
+    """Point the disk tier at a per-test directory."""
+    import services.cache as cache_mod
+
+    monkeypatch.setattr(
+        cache_mod, "_disk_tier", cache_mod._DiskTier(str(tmp_path), cache_mod.DISK_CACHE_MAX_BYTES)
+    )
+    return cache_mod
+
+
+def _service(cache_mod, ttl_seconds=3600):
+    import boto3
+
+    s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+    return cache_mod.ResearchCacheService(s3, shared.TEST_BUCKET, ttl_seconds=ttl_seconds), s3
+
+
+def _save(service):
+    service.save_research_cache_multi(
+        sales_page_urls=URLS,
+        research_page_analysis="analysis",
+        deep_research_prompt="prompt",
+        deep_research_output="research " * 200,
+    )
+
+
+class TestResearchCacheTiers:
+    """Memory -> disk -> S3 lookups, compression and expiry."""
+
+    def test_s3_entry_is_compressed_with_expiry(self, cache_mod):
+        service, s3 = _service(cache_mod)
+        _save(service)
+
+        key = service._get_cache_path(service.get_multi_url_cache_key(URLS))
+        response = s3.get_object(Bucket=shared.TEST_BUCKET, Key=key)
+        body = response["Body"].read()
+
+        assert json.loads(gzip.decompress(body))["deep_research_prompt"] == "prompt"
+        assert float(response["Metadata"]["expires-at"]) > 0
+
+    def test_lower_tier_hits_are_promoted(self, cache_mod):
+        service, _ = _service(cache_mod)
+        _save(service)
+        cache_key = service.get_multi_url_cache_key(URLS)
+
+        assert service._lookup_research(cache_key)[1] == "memory"
+        cache_mod._memory_tier.clear()
+        assert service._lookup_research(cache_key)[1] == "disk"
+        assert service._lookup_research(cache_key)[1] == "memory"
+        cache_mod._memory_tier.clear()
+        cache_mod._disk_tier.clear()
+        assert service._lookup_research(cache_key)[1] == "s3"
+        assert service._lookup_research(cache_key)[1] == "memory"
+
+        stats = service.stats()
+        assert stats["memory"]["hits"] == 3
+        assert stats["disk"]["hits"] == 1
+        assert stats["s3"]["hits"] == 1
+
+    def test_expired_entries_are_misses(self, cache_mod):
+        service, _ = _service(cache_mod, ttl_seconds=-1)
+        _save(service)
+
+        assert service.get_cached_research_multi(URLS) is None
+        assert service.stats()["s3"]["misses"] == 1
+
+    def _put_legacy(self, cache_mod, service, s3):
+        cache_key = service.get_multi_url_cache_key(URLS)
+        s3.put_object(
+            Bucket=shared.TEST_BUCKET,
+            Key=service._get_legacy_cache_path(cache_key),
+            Body=json.dumps({
+                "research_page_analysis": "a",
+                "deep_research_prompt": "p",
+                "deep_research_output": "o",
+                "cached_at": "2025-01-01T00:00:00Z",
+                "cache_version": cache_mod.CACHE_VERSION,
+            }),
+        )
+        return cache_key
+
+    def test_legacy_uncompressed_entry_is_read(self, cache_mod):
+        import time
+
+        service, s3 = _service(cache_mod)
+        cache_key = self._put_legacy(cache_mod, service, s3)
+
+        cached = service.get_cached_research_multi(URLS)
+
+        assert cached.deep_research_output == "o"
+        # Promoted with an expiry of last write + TTL, not forever
+        _, expires_at, _ = cache_mod._memory_tier._entries[f"research-{cache_key}"]
+        assert time.time() < expires_at <= time.time() + 3600
+
+    def test_legacy_entry_older_than_ttl_is_a_miss(self, cache_mod):
+        service, s3 = _service(cache_mod, ttl_seconds=-1)
+        self._put_legacy(cache_mod, service, s3)
+
+        assert service.get_cached_research_multi(URLS) is None
+        assert service.stats()["s3"]["misses"] == 1
+
+    def test_memory_tier_counts_uncompressed_size(self, cache_mod):
+        service, s3 = _service(cache_mod)
+        _save(service)
+        cache_key = service.get_multi_url_cache_key(URLS)
+        body = s3.get_object(Bucket=shared.TEST_BUCKET, Key=service._get_cache_path(cache_key))["Body"].read()
+
+        assert cache_mod._memory_tier.size_bytes == len(gzip.decompress(body))
+
+
+class TestTierBounds:
+    """Size accounting and eviction."""
+
+    def test_memory_tier_evicts_least_recently_used(self, cache_mod):
+        from data_models import CachedResearchData
+
+        tier = cache_mod._MemoryTier(max_entries=2, max_bytes=1000)
+        entry = CachedResearchData(
+            research_page_analysis="a", deep_research_prompt="p", deep_research_output="o",
+            cached_at="now", cache_version=cache_mod.CACHE_VERSION,
+        )
+        tier.put("a", entry, None, 100)
+        tier.put("b", entry, None, 100)
+        tier.get("a")
+        tier.put("c", entry, None, 100)
+
+        assert tier.get("b") is None
+        assert tier.get("a") is not None
+        assert tier.size_bytes == 200
+
+    def test_disk_tier_stays_within_budget(self, cache_mod, tmp_path):
+        import os
+
+        tier = cache_mod._DiskTier(str(tmp_path / "disk"), max_bytes=2500)
+        for i, key in enumerate(["a", "b", "c"]):
+            tier.put(key, b"x" * 1000, None)
+            os.utime(tier._path(key), (i, i))
+
+        tier.put("d", b"x" * 1000, None)
+
+        assert tier.size_bytes <= 2500
+        assert tier.get("a") is None
+        assert tier.get("d") is not None
+
+
+class TestPageAnalysisReuse:
+    """Multi-URL jobs only analyze URLs without a cached page analysis."""
+
+    def _step(self, cache_mod, analysis_mode="vision", service=None):
+        from unittest.mock import MagicMock
+        from pipeline.steps.analyze_page import AnalyzePageStep, PageAnalysisResult
+
+        service = service or _service(cache_mod)[0]
+        step = AnalyzePageStep(MagicMock(), MagicMock(), cache_service=service, analysis_mode=analysis_mode)
+        step.execute = MagicMock(
+            side_effect=lambda url: PageAnalysisResult(
+                analysis=f"{analysis_mode} analysis of {url}", product_image=f"img:{url}"
+            )
+        )
+        return step
+
+    def test_only_new_urls_are_analyzed(self, cache_mod):
+        step = self._step(cache_mod)
+        a, b = "https://example.com/a", "https://example.com/b"
+
+        step.execute_multiple([a])
+        combined, product_image = step.execute_multiple([b, a])
+
+        assert [c.args[0] for c in step.execute.call_args_list] == [a, b]
+        assert f"=== URL 2: {a} ===\nvision analysis of {a}" in combined
+        assert product_image == f"img:{b}"
+
+    def test_product_image_reused_from_page_cache(self, cache_mod):
+        step = self._step(cache_mod)
+        url = "https://example.com/a"
+        step.execute_multiple([url])
+
+        cache_mod._memory_tier.clear()
+
+        assert step.capture_product_image_only(url + "/") == f"img:{url}"
+
+    def test_modes_do_not_share_entries(self, cache_mod):
+        url = "https://example.com/a"
+        vision = self._step(cache_mod, "vision")
+        text = self._step(cache_mod, "text", service=vision.cache_service)
+
+        vision.execute_multiple([url])
+        combined, _ = text.execute_multiple([url])
+
+        assert text.execute.call_count == 1
+        assert "text analysis of" in combined
+        assert "vision analysis of" in vision.execute_multiple([url])[0]
+        assert vision.execute.call_count == 1
@@ -0,0 +1,97 @@
+"""
+Unit tests for the DynamoDB single-flight research lease.
+"""
+
+import time
+
+import pytest
+
+import conftest_shared as shared
+
+
+LEASES_TABLE = "test-research-leases"
+KEY = "a" * 64
+
+
+@pytest.fixture()
+def ddb():
+    import boto3
+
+    client = boto3.client("dynamodb", region_name=shared.AWS_REGION)
+    client.create_table(
+        TableName=LEASES_TABLE,
+        KeySchema=[{"AttributeName": "leaseKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "leaseKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return client
+
+
+def _lease(ddb, owner, **kwargs):
+    from services.lease import ResearchLeaseService
+
+    return ResearchLeaseService(ddb, LEASES_TABLE, owner, sleep=lambda _: None, **kwargs)
+
+
+class TestResearchLeaseService:
+    """Acquire, release, takeover and waiting."""
+
+    def test_only_one_owner_holds_the_lease(self, ddb):
+        first, second = _lease(ddb, "job-1"), _lease(ddb, "job-2")
+
+        assert first.try_acquire(KEY)
+        assert not second.try_acquire(KEY)
+        second.release(KEY)
+        assert not second.try_acquire(KEY)
+
+        first.release(KEY)
+        assert second.try_acquire(KEY)
+
+    def test_expired_lease_is_taken_over(self, ddb):
+        crashed = _lease(ddb, "job-1", lease_seconds=-10)
+        assert crashed.try_acquire(KEY)
+
+        assert _lease(ddb, "job-2").try_acquire(KEY)
+
+    def test_wait_returns_result_once_published(self, ddb):
+        from services.lease import WAIT_READY
+
+        _lease(ddb, "job-1").try_acquire(KEY)
+        results = iter([None, None, "research"])
+
+        result, outcome = _lease(ddb, "job-2").wait_for(
+            KEY, check=lambda: next(results), deadline=time.time() + 60
+        )
+
+        assert (result, outcome) == ("research", WAIT_READY)
+
+    def test_wait_takes_over_released_lease(self, ddb):
+        from services.lease import WAIT_ACQUIRED
+
+        owner = _lease(ddb, "job-1")
+        owner.try_acquire(KEY)
+
+        def _check():
+            owner.release(KEY)  # owner failed without publishing
+            return None
+
+        result, outcome = _lease(ddb, "job-2").wait_for(KEY, check=_check, deadline=time.time() + 60)
+
+        assert (result, outcome) == (None, WAIT_ACQUIRED)
+
+    def test_wait_stops_at_deadline(self, ddb):
+        from services.lease import WAIT_TIMEOUT
+
+        _lease(ddb, "job-1").try_acquire(KEY)
+
+        _, outcome = _lease(ddb, "job-2").wait_for(KEY, check=lambda: None, deadline=time.time() - 1)
+
+        assert outcome == WAIT_TIMEOUT
+
+    def test_disabled_without_table(self):
+        from services.lease import ResearchLeaseService
+
+        lease = ResearchLeaseService(ddb_client=None, table_name=None, owner_id="job-1")
+
+        assert lease.try_acquire(KEY)
+        assert lease.try_acquire(KEY)
@@ -0,0 +1,183 @@
+"""
+Unit tests for the content-addressed LLM response cache.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+import conftest_shared as shared
+
+
+class _Brief(BaseModel):
+    headline: str
+
+
+class _OtherBrief(BaseModel):
+    headline: str
+    subheadline: str = ""
+
+
+@pytest.fixture()
+def disk_cache(tmp_path):
+    from services.response_cache import DiskResponseCacheBackend, LLMResponseCache
+
+    return LLMResponseCache(DiskResponseCacheBackend(str(tmp_path)))
+
+
+class TestCacheKey:
+    """Keys cover model, prompt and response schema - nothing else."""
+
+    def test_key_is_stable_and_content_addressed(self):
+        from services.response_cache import make_cache_key
+
+        key = make_cache_key("openai", "responses.parse", "gpt-5-mini", "prompt", _Brief)
+
+        assert key == make_cache_key("openai", "responses.parse", "gpt-5-mini", "prompt", _Brief)
+        assert key != make_cache_key("openai", "responses.parse", "gpt-5", "prompt", _Brief)
+        assert key != make_cache_key("openai", "responses.parse", "gpt-5-mini", "prompt!", _Brief)
+        assert key != make_cache_key("openai", "responses.parse", "gpt-5-mini", "prompt", _OtherBrief)
+
+    def test_ttl_policy_matches_longest_prefix(self, disk_cache):
+        disk_cache.ttls = {"process_job_v2.create_offer_brief": 60, "process_job_v2": 0}
+
+        assert disk_cache.ttl_for("process_job_v2.create_offer_brief") == 60
+        assert disk_cache.ttl_for("process_job_v2.identify_avatars") == 0
+        assert disk_cache.ttl_for("template_prediction") == disk_cache.default_ttl
+
+    def test_only_listed_subtasks_are_cached(self, disk_cache):
+        assert disk_cache.ttl_for("process_job_v2.create_offer_brief") > 0
+        assert disk_cache.ttl_for("process_job_v2.analyze_page_quality_check") == 0
+        assert disk_cache.ttl_for("template_prediction") == 0
+
+        disk_cache.put("cd" * 32, {"passed": False}, "process_job_v2.analyze_page_quality_check")
+
+        assert disk_cache.get("cd" * 32) is None
+
+
+class TestBackends:
+    """Disk and S3 backends round-trip entries and honour expiry."""
+
+    def test_disk_roundtrip_and_expiry(self, disk_cache, monkeypatch):
+        import services.response_cache as rc
+
+        disk_cache.put("ab" * 32, {"headline": "Hi"}, "process_job_v2.create_offer_brief")
+        assert disk_cache.get("ab" * 32) == {"headline": "Hi"}
+
+        monkeypatch.setattr(rc.time, "time", lambda: 10 ** 12)
+        assert disk_cache.get("ab" * 32) is None
+        assert (disk_cache.stats.hits, disk_cache.stats.misses) == (1, 1)
+
+    def test_zero_ttl_is_not_stored(self, disk_cache):
+        disk_cache.ttls = {"process_job_v2.identify_avatars": 0}
+
+        disk_cache.put("cd" * 32, "text", "process_job_v2.identify_avatars")
+
+        assert disk_cache.get("cd" * 32) is None
+        assert disk_cache.stats.writes == 0
+
+    def test_s3_backend(self):
+        import boto3
+        from services.response_cache import LLMResponseCache, S3ResponseCacheBackend
+
+        s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+        cache = LLMResponseCache(S3ResponseCacheBackend(s3, shared.TEST_BUCKET))
+
+        assert cache.get("ef" * 32) is None
+        cache.put("ef" * 32, "analysis text", "process_job_v2.analyze_research_page")
+
+        assert cache.get("ef" * 32) == "analysis text"
+        obj = s3.head_object(Bucket=shared.TEST_BUCKET, Key=f"cache/llm_responses/ef/{'ef' * 32}.json.gz")
+        assert obj["ContentEncoding"] == "gzip"
+
+    @pytest.mark.parametrize("mode,expected", [
+        (None, None), ("off", None), ("bogus", None), ("disk", "DiskResponseCacheBackend"),
+        ("s3", "S3ResponseCacheBackend"),
+    ])
+    def test_from_env(self, monkeypatch, tmp_path, mode, expected):
+        from services.response_cache import response_cache_from_env
+
+        if mode is None:
+            monkeypatch.delenv("LLM_RESPONSE_CACHE", raising=False)
+        else:
+            monkeypatch.setenv("LLM_RESPONSE_CACHE", mode)
+        monkeypatch.setenv("LLM_RESPONSE_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("LLM_RESPONSE_CACHE_TTLS", '{"process_job_v2.identify_avatars": 5}')
+
+        cache = response_cache_from_env(s3_client=MagicMock(), s3_bucket=shared.TEST_BUCKET)
+
+        assert (type(cache.backend).__name__ if cache else None) == expected
+        if cache:
+            assert cache.ttl_for("process_job_v2.identify_avatars") == 5
+
+
+def _parse_response(headline):
+    return SimpleNamespace(
+        output_parsed=_Brief(headline=headline), usage=SimpleNamespace(input_tokens=100, output_tokens=20)
+    )
+
+
+class TestServiceCaching:
+    """OpenAI services answer repeated identical calls from the cache."""
+
+    def _service(self, cls, cache):
+        from llm_usage import UsageContext
+
+        service = cls(
+            api_key="sk-test",
+            usage_ctx=UsageContext("POST /v2/jobs", "job-1", "V2_JOB"),
+            response_cache=cache,
+        )
+        service.client = MagicMock()
+        return service
+
+    def test_parse_structured_rerun_hits_cache(self, disk_cache):
+        from services.openai_service import OpenAIService
+
+        service = self._service(OpenAIService, disk_cache)
+        service.client.responses.parse.return_value = _parse_response("Sleep better")
+
+        with patch("services.openai_service.emit_llm_usage_event") as emit:
+            first = service.parse_structured("brief prompt", _Brief, subtask="process_job_v2.create_offer_brief")
+            second = service.parse_structured("brief prompt", _Brief, subtask="process_job_v2.create_offer_brief")
+
+        assert first == second == _Brief(headline="Sleep better")
+        assert service.client.responses.parse.call_count == 1
+        miss, hit = [c.kwargs for c in emit.call_args_list]
+        assert (miss["cache_hit"], miss["usage"]["inputTokens"]) == (False, 100)
+        assert hit["cache_hit"] is True and hit["usage"] is None
+
+    def test_changed_prompt_misses(self, disk_cache):
+        from services.openai_service import OpenAIService
+
+        service = self._service(OpenAIService, disk_cache)
+        service.client.responses.create.side_effect = [
+            SimpleNamespace(output_text="one", usage=None),
+            SimpleNamespace(output_text="two", usage=None),
+        ]
+
+        with patch("services.openai_service.emit_llm_usage_event"):
+            subtask = "process_job_v2.create_offer_brief"
+            assert service.create_response([{"type": "input_text", "text": "a"}], subtask=subtask) == "one"
+            assert service.create_response([{"type": "input_text", "text": "b"}], subtask=subtask) == "two"
+            assert service.create_response([{"type": "input_text", "text": "a"}], subtask=subtask) == "one"
+
+        assert service.client.responses.create.call_count == 2
+
+    def test_async_service_shares_entries(self, disk_cache):
+        from services.openai_service import AsyncOpenAIService, OpenAIService
+
+        sync_service = self._service(OpenAIService, disk_cache)
+        sync_service.client.responses.parse.return_value = _parse_response("Cached")
+        async_service = self._service(AsyncOpenAIService, disk_cache)
+        async_service.client.responses.parse = AsyncMock()
+
+        with patch("services.openai_service.emit_llm_usage_event"):
+            sync_service.parse_structured("p", _Brief, subtask="process_job_v2.identify_avatars")
+            result = asyncio.run(async_service.parse_structured("p", _Brief, subtask="process_job_v2.identify_avatars"))
+
+        assert result == _Brief(headline="Cached")
+        async_service.client.responses.parse.assert_not_called()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the sharded job result layout.
+"""
+
+import base64
+import json
+
+import boto3
+import pytest
+
+import conftest_shared as shared
+
+
+JPEG = b"\xff\xd8\xff\xe0fake-jpeg-bytes"
+
+
+def _results(product_image=None):
+    return {
+        "research_page_analysis": "analysis",
+        "deep_research_prompt": "prompt",
+        "deep_research_output": "research " * 100,
+        "offer_brief": {"headline": "Sleep better"},
+        "marketing_avatars": [
+            {
+                "avatar": {"id": f"avatar-{i}", "overview": {"name": f"Avatar {i}"}},
+                "angles": {"generated_angles": [{"id": f"angle-{i}-{j}", "angle_title": f"T{j}"} for j in range(2)]},
+            }
+            for i in range(3)
+        ],
+        "product_image": product_image if product_image is not None else base64.b64encode(JPEG).decode(),
+        "target_product_name": "Dreamy",
+    }
+
+
+class TestBuildAndAssemble:
+    """Shards round-trip to the legacy results dict."""
+
+    @pytest.mark.parametrize("product_image", [None, "https://cdn.example.com/p.jpg", "not base64!"])
+    def test_round_trip(self, product_image):
+        from services.result_layout import assemble_results, build_result_shards
+
+        results = _results(product_image)
+        shards, manifest = build_result_shards(results, "job-1", "proj", "2026-10-16T00:00:00+00:00")
+        store = {key: body for key, body, _ in shards}
+
+        assert assemble_results(manifest, store.__getitem__) == results
+
+    def test_manifest_indexes_avatars_and_angles(self):
+        from services.result_layout import build_result_shards, find_avatar
+
+        shards, manifest = build_result_shards(_results(), "job-1", "proj", "ts")
+
+        entry = find_avatar(manifest, "avatar-2")
+        assert entry["key"] == "avatars/002.json"
+        assert [a["id"] for a in entry["angles"]] == ["angle-2-0", "angle-2-1"]
+        assert ("product_image.jpg", JPEG, "image/jpeg") in shards
+
+
+class TestSaveResults:
+    """AWSServices.save_results_to_s3 writes shards and a manifest; the compatibility view is opt-in."""
+
+    def _save(self, results):
+        from services.aws import AWSServices
+
+        aws = AWSServices.__new__(AWSServices)
+        aws.s3_client = boto3.client("s3", region_name=shared.AWS_REGION)
+        aws.save_results_to_s3(results, shared.TEST_BUCKET, "proj", "job-7")
+        return aws.s3_client
+
+    def test_writes_sharded_layout_without_compat_view(self, monkeypatch):
+        monkeypatch.delenv("RESULTS_COMPAT_VIEW", raising=False)
+
+        s3 = self._save(_results())
+
+        keys = {o["Key"] for o in s3.list_objects_v2(Bucket=shared.TEST_BUCKET)["Contents"]}
+        assert {
+            "results/job-7/manifest.json",
+            "results/job-7/research.json",
+            "results/job-7/offer_brief.json",
+            "results/job-7/avatars/000.json",
+            "results/job-7/avatars/002.json",
+            "results/job-7/product_image.jpg",
+        } <= keys
+        assert "results/job-7/comprehensive_results.json" not in keys
+        assert any(k.startswith("projects/proj/") and k.endswith("/manifest.json") for k in keys)
+        manifest = json.loads(
+            s3.get_object(Bucket=shared.TEST_BUCKET, Key="results/job-7/manifest.json")["Body"].read()
+        )
+        assert manifest["avatars"][1]["id"] == "avatar-1"
+
+    def test_compat_view_can_be_enabled(self, monkeypatch):
+        monkeypatch.setenv("RESULTS_COMPAT_VIEW", "true")
+
+        s3 = self._save(_results())
+
+        keys = {o["Key"] for o in s3.list_objects_v2(Bucket=shared.TEST_BUCKET)["Contents"]}
+        assert any(k.startswith("projects/proj/") and k.endswith("/comprehensive_results.json") for k in keys)
+        compat = shared.get_s3_json("results/job-7/comprehensive_results.json")
+        assert compat["results"] == _results()
+
+    def test_load_results_round_trips(self):
+        from services.aws import AWSServices
+
+        s3 = self._save(_results())
+        aws = AWSServices.__new__(AWSServices)
+        aws.s3_client = s3
+
+        assert aws.load_results_from_s3(shared.TEST_BUCKET, "job-7") == _results()
+
+    def test_load_results_falls_back_to_legacy_object(self):
+        from services.aws import AWSServices
+
+        aws = AWSServices.__new__(AWSServices)
+        aws.s3_client = boto3.client("s3", region_name=shared.AWS_REGION)
+        aws.s3_client.put_object(
+            Bucket=shared.TEST_BUCKET,
+            Key="results/old-job/comprehensive_results.json",
+            Body=json.dumps({"results": {"offer_brief": {"x": 1}}}),
+        )
+
+        assert aws.load_results_from_s3(shared.TEST_BUCKET, "old-job") == {"offer_brief": {"x": 1}}
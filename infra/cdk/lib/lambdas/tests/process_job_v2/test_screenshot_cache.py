@@ -0,0 +1,173 @@
+"""
+Unit tests for the URL-keyed product image screenshot cache.
+"""
+
+import time
+
+import pytest
+
+import conftest_shared as shared
+
+
+URL = "https://example.com/product"
+JPEG = b"\xff\xd8\xff" + b"\x00" * 64
+VALIDATORS = {"etag": '"v1"'}
+
+
+class _Head:
+    """Records HEAD requests and answers with a fixed response."""
+
+    def __init__(self, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.calls = []
+
+    def __call__(self, url, headers):
+        self.calls.append(headers)
+        return self.status, self.headers
+
+
+def _cache(head):
+    import boto3
+    from services.screenshot_cache import ScreenshotCacheService
+
+    s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+    return ScreenshotCacheService(s3, shared.TEST_BUCKET, head=head), s3
+
+
+def _backdate(cache, s3, seconds):
+    """Rewrite the entry's capture time as if it were ``seconds`` old."""
+    key = cache._key(URL)
+    obj = s3.get_object(Bucket=shared.TEST_BUCKET, Key=key)
+    metadata = {**obj["Metadata"], "captured-at": f"{time.time() - seconds:.0f}"}
+    s3.put_object(Bucket=shared.TEST_BUCKET, Key=key, Body=obj["Body"].read(), Metadata=metadata)
+
+
+class TestScreenshotCache:
+    """TTL plus ETag / Last-Modified freshness."""
+
+    def test_recent_entry_served_without_head(self, _aws_env_and_moto):
+        head = _Head()
+        cache, _ = _cache(head)
+        cache.save(URL, JPEG, VALIDATORS)
+
+        assert cache.get(URL + "/") == JPEG
+        assert head.calls == []
+
+    @pytest.mark.parametrize("status,headers,expected", [
+        (304, {}, JPEG),
+        (200, {"etag": '"v1"'}, JPEG),
+        (200, {"etag": '"v2"'}, None),
+        (None, {}, JPEG),
+    ])
+    def test_old_entry_revalidated(self, _aws_env_and_moto, status, headers, expected):
+        head = _Head(status, headers)
+        cache, s3 = _cache(head)
+        cache.save(URL, JPEG, VALIDATORS)
+        _backdate(cache, s3, cache.revalidate_after_seconds + 60)
+
+        assert cache.get(URL) == expected
+        assert head.calls[-1] == {"If-None-Match": '"v1"'}
+
+    def test_expired_entry_is_a_miss(self, _aws_env_and_moto):
+        cache, s3 = _cache(_Head())
+        cache.save(URL, JPEG)
+        _backdate(cache, s3, cache.ttl_seconds + 60)
+
+        assert cache.get(URL) is None
+        assert cache.lookup(URL) == (None, "stale")
+        assert cache.lookup(URL + "/other") == (None, "miss")
+
+    def test_cache_hit_skips_browser(self, _aws_env_and_moto):
+        import base64
+        from unittest.mock import MagicMock
+        from pipeline.steps.analyze_page import AnalyzePageStep
+
+        cache, _ = _cache(_Head())
+        cache.save(URL, JPEG)
+        step = AnalyzePageStep(MagicMock(), MagicMock(), screenshot_cache=cache)
+
+        assert step.capture_product_image_only(URL) == base64.b64encode(JPEG).decode()
+        _aws_env_and_moto["mock_screenshots"].assert_not_called()
+
+    @pytest.mark.parametrize("screenshot_entry,served_from_analysis", [
+        (None, True),
+        ("changed", False),
+    ])
+    def test_page_analysis_image_only_on_outright_miss(
+        self, _aws_env_and_moto, screenshot_entry, served_from_analysis
+    ):
+        import base64
+        from unittest.mock import MagicMock
+        from pipeline.steps.analyze_page import AnalyzePageStep
+
+        cache, s3 = _cache(_Head(200, {"etag": '"v2"'}))
+        if screenshot_entry:
+            cache.save(URL, JPEG, VALIDATORS)
+            _backdate(cache, s3, cache.revalidate_after_seconds + 60)
+        research_cache = MagicMock()
+        research_cache.get_page_analysis.return_value = MagicMock(product_image="stale-b64")
+        capture = _aws_env_and_moto["mock_screenshots"]
+        capture.return_value = MagicMock(product_image_bytes=JPEG, validators={"etag": '"v2"'})
+        step = AnalyzePageStep(MagicMock(), MagicMock(), cache_service=research_cache, screenshot_cache=cache)
+
+        image = step.capture_product_image_only(URL)
+
+        if served_from_analysis:
+            assert image == "stale-b64"
+            capture.assert_not_called()
+        else:
+            assert image == base64.b64encode(JPEG).decode()
+            capture.assert_called_once()
+            assert s3.head_object(Bucket=shared.TEST_BUCKET, Key=cache._key(URL))["Metadata"]["etag"] == '"v2"'
+
+
+class TestBestEffort:
+    """HEAD or S3 failures never escape the cache."""
+
+    def test_head_request_survives_too_many_headers(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from services.screenshot_cache import head_request
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                self.send_response(200)
+                for i in range(150):  # http.client rejects more than 100
+                    self.send_header(f"X-Header-{i}", "x")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.handle_request, daemon=True).start()
+        try:
+            assert head_request(f"http://127.0.0.1:{server.server_port}/", {}) == (None, {})
+        finally:
+            server.server_close()
+
+    def test_raising_head_is_a_miss_not_an_error(self, _aws_env_and_moto):
+        def _raise(url, headers):
+            raise RuntimeError("boom")
+
+        cache, s3 = _cache(_Head())
+        cache.save(URL, JPEG, VALIDATORS)
+        _backdate(cache, s3, cache.revalidate_after_seconds + 60)
+        cache.head = _raise
+
+        assert cache.get(URL) is None
+        cache.s3_client = None
+        cache.save(URL, JPEG)  # does not raise
+
+    def test_capture_without_validators_still_returns_image(self, _aws_env_and_moto):
+        import base64
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from pipeline.steps.analyze_page import AnalyzePageStep
+
+        cache, _ = _cache(_Head())
+        _aws_env_and_moto["mock_screenshots"].return_value = SimpleNamespace(product_image_bytes=JPEG)
+        step = AnalyzePageStep(MagicMock(), MagicMock(), screenshot_cache=cache)
+
+        assert step.capture_product_image_only(URL) == base64.b64encode(JPEG).decode()
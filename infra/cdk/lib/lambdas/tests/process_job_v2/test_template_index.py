@@ -0,0 +1,74 @@
+"""
+Unit tests for the local template pre-ranking index.
+"""
+
+from mock_responses import make_avatar, make_library_summaries_json, make_marketing_angles
+
+
+def _library(entries):
+    """Build a ContentLibrarySummaries from (id, overrides) pairs."""
+    from data_models import ContentLibrarySummaries
+
+    base = make_library_summaries_json()["summaries"][0]
+    summaries = [{**base, "id": template_id, **overrides} for template_id, overrides in entries]
+    return ContentLibrarySummaries(
+        version="2.0",
+        generated_at="2025-01-01T00:00:00Z",
+        total_pages=len(summaries),
+        summaries=summaries,
+    )
+
+
+class TestTemplateFeatureIndex:
+    """Scoring, ordering and per-version caching."""
+
+    def test_matching_awareness_and_angle_type_ranks_first(self):
+        from services.template_index import TemplateFeatureIndex
+
+        # make_avatar() is "solution aware"; make_marketing_angles() is mechanism/trust
+        library = _library([
+            ("MISS", {
+                "best_for_awareness_levels": ["unaware"],
+                "best_for_angle_types": ["story"],
+                "tone": "urgent",
+                "energy_level": "high_energy_urgent",
+                "persuasion_techniques": ["fear_of_inaction"],
+            }),
+            ("HIT", {
+                "best_for_awareness_levels": ["solution_aware"],
+                "best_for_angle_types": ["mechanism"],
+                "tone": "professional and educational",
+                "energy_level": "calm_educational",
+                "persuasion_techniques": ["mechanism_explanation", "authority_citation"],
+            }),
+        ])
+        index = TemplateFeatureIndex(library.summaries)
+        angle = make_marketing_angles().generated_angles[0]
+
+        top = index.top_candidates(make_avatar(), angle, top_n=1)
+
+        assert [s.id for s in top] == ["HIT"]
+
+    def test_ties_keep_library_order(self):
+        from services.template_index import TemplateFeatureIndex
+
+        library = _library([(f"T{i}", {}) for i in range(5)])
+        index = TemplateFeatureIndex(library.summaries)
+        angle = make_marketing_angles().generated_angles[0]
+
+        top = index.top_candidates(make_avatar(), angle, top_n=3)
+
+        assert [s.id for s in top] == ["T0", "T1", "T2"]
+
+    def test_index_built_once_per_library_version(self):
+        from services.template_index import get_template_index
+
+        library = _library([("A", {}), ("B", {})])
+
+        first = get_template_index(library)
+        same = get_template_index(library.model_copy())
+        library.generated_at = "2026-01-01T00:00:00Z"
+        rebuilt = get_template_index(library)
+
+        assert first is same
+        assert rebuilt is not first
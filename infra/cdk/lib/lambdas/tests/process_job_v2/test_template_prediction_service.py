@@ -0,0 +1,190 @@
+"""
+Unit tests for batched template prediction and the warm LibrarySummariesCache.
+"""
+
+from unittest.mock import MagicMock
+
+from mock_responses import make_avatar, make_library_summaries_json, make_marketing_angles
+
+
+def _two_angles():
+    """Return two distinct angles for the same avatar."""
+    first = make_marketing_angles().generated_angles[0]
+    second = first.model_copy(update={"id": "angle-2", "angle_title": "Second angle"})
+    return [first, second]
+
+
+def _match(template_id="A00001", score=0.9):
+    from data_models import TemplateMatch
+
+    return TemplateMatch(
+        template_id=template_id,
+        overall_fit_score=score,
+        format_fit=score,
+        persuasion_fit=score,
+        tone_fit=score,
+        reasoning="fits",
+    )
+
+
+def _make_service(parse_structured):
+    from data_models import ContentLibrarySummaries
+    from services.template_prediction_service import TemplatePredictionService
+
+    library_cache = MagicMock()
+    library_cache.get_versioned_summaries.return_value = (
+        ContentLibrarySummaries(**make_library_summaries_json()),
+        "v1",
+    )
+    prompt_service = MagicMock()
+    prompt_service.get_prompt.side_effect = lambda name, **kwargs: kwargs["angle_summary"]
+    openai_service = MagicMock()
+    openai_service.parse_structured.side_effect = parse_structured
+    return TemplatePredictionService(openai_service, library_cache, prompt_service), openai_service
+
+
+class TestPredictTemplatesBatch:
+    """One call per avatar, with per-angle fallback."""
+
+    def test_single_call_covers_all_angles(self):
+        from services.template_prediction_service import (
+            AnglePredictionResponse,
+            BatchPredictionResponse,
+        )
+
+        angles = _two_angles()
+
+        def _parse(prompt, response_format, subtask, model=None):
+            assert response_format is BatchPredictionResponse
+            assert all(a.id in prompt for a in angles)
+            return BatchPredictionResponse(results=[
+                AnglePredictionResponse(angle_id=a.id, matches=[_match()]) for a in reversed(angles)
+            ])
+
+        service, openai_service = _make_service(_parse)
+        results = service.predict_templates_batch(make_avatar(), angles)
+
+        assert openai_service.parse_structured.call_count == 1
+        assert [r.angle_id for r in results] == [a.id for a in angles]
+
+    def test_parse_failure_falls_back_to_per_angle_calls(self):
+        from services.template_prediction_service import BatchPredictionResponse
+
+        def _parse(prompt, response_format, subtask, model=None):
+            if response_format is BatchPredictionResponse:
+                raise ValueError("could not parse")
+            return MagicMock(matches=[_match()])
+
+        angles = _two_angles()
+        service, openai_service = _make_service(_parse)
+        results = service.predict_templates_batch(make_avatar(), angles)
+
+        assert openai_service.parse_structured.call_count == 1 + len(angles)
+        assert [r.angle_id for r in results] == [a.id for a in angles]
+
+    def test_angles_missing_from_batch_are_retried(self):
+        from services.template_prediction_service import (
+            AnglePredictionResponse,
+            BatchPredictionResponse,
+        )
+
+        angles = _two_angles()
+
+        def _parse(prompt, response_format, subtask, model=None):
+            if response_format is BatchPredictionResponse:
+                return BatchPredictionResponse(results=[
+                    AnglePredictionResponse(angle_id=angles[0].id, matches=[_match()]),
+                ])
+            return MagicMock(matches=[_match()])
+
+        service, openai_service = _make_service(_parse)
+        results = service.predict_templates_batch(make_avatar(), angles)
+
+        assert openai_service.parse_structured.call_count == 2
+        assert all(r is not None for r in results)
+
+    def test_unknown_template_ids_are_dropped(self):
+        from services.template_prediction_service import (
+            AnglePredictionResponse,
+            BatchPredictionResponse,
+        )
+
+        angles = _two_angles()
+
+        def _parse(prompt, response_format, subtask, model=None):
+            if response_format is BatchPredictionResponse:
+                return BatchPredictionResponse(results=[
+                    AnglePredictionResponse(angle_id=a.id, matches=[_match("NOPE"), _match(score=0.5)])
+                    for a in angles
+                ])
+            raise AssertionError("no fallback expected")
+
+        service, _ = _make_service(_parse)
+        results = service.predict_templates_batch(make_avatar(), angles)
+
+        assert [m.template_id for m in results[0].predictions] == ["A00001"]
+
+    def test_index_keyed_by_tag_read_with_summaries(self):
+        from unittest.mock import patch
+
+        service, _ = _make_service(MagicMock())
+        service.pre_rank_top_n = 0
+        summaries, _ = service.library_cache.get_versioned_summaries.return_value
+
+        with patch("services.template_prediction_service.get_template_index") as get_index:
+            service.predict_templates_batch(make_avatar(), _two_angles())
+
+        assert all(c.args[0] is summaries for c in get_index.call_args_list)
+        assert {c.kwargs["version_tag"] for c in get_index.call_args_list} == {"v1"}
+
+
+class TestLibrarySummariesCache:
+    """Warm module-level cache with ETag revalidation."""
+
+    def _make_cache(self, ttl_seconds=300):
+        import boto3
+        import conftest_shared as shared
+        from services.template_prediction_service import LibrarySummariesCache
+
+        s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+        return LibrarySummariesCache(s3, shared.TEST_BUCKET, ttl_seconds=ttl_seconds), s3
+
+    def test_shared_across_instances_without_refetch(self):
+        first, s3 = self._make_cache()
+        summaries = first.get_summaries()
+
+        second, _ = self._make_cache()
+        second.s3_client = MagicMock()
+
+        assert second.get_summaries() is summaries
+        second.s3_client.get_object.assert_not_called()
+
+    def test_revalidates_with_etag_after_ttl(self):
+        cache, s3 = self._make_cache(ttl_seconds=0)
+        summaries, tag = cache.get_versioned_summaries()
+
+        spy = MagicMock(wraps=s3)
+        cache.s3_client = spy
+
+        assert cache.get_summaries() is summaries
+        assert spy.get_object.call_args.kwargs["IfNoneMatch"].strip('"') == tag
+
+    def test_reloads_when_library_changes(self):
+        import json
+        import conftest_shared as shared
+        from mock_responses import make_library_summaries_json
+
+        cache, s3 = self._make_cache(ttl_seconds=0)
+        _, old_tag = cache.get_versioned_summaries()
+
+        data = make_library_summaries_json()
+        data["summaries"][0]["id"] = "B00002"
+        s3.put_object(
+            Bucket=shared.TEST_BUCKET,
+            Key=cache.LIBRARY_KEY,
+            Body=json.dumps(data),
+        )
+
+        assert cache.get_summary_by_id("B00002") is not None
+        assert cache.get_summary_by_id("A00001") is None
+        assert cache.get_versioned_summaries()[1] != old_tag
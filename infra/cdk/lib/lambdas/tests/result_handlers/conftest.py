@@ -0,0 +1,58 @@
+"""
+Pytest fixtures for the top-level get_*_result handler tests.
+
+Inserts the lambdas root into sys.path[0] so that the single-file handlers
+and their shared result_response module import as they do in Lambda.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# ---------------------------------------------------------------------------
+# sys.path setup — MUST happen before any lambda imports
+# ---------------------------------------------------------------------------
+_LAMBDAS_ROOT = str(Path(__file__).resolve().parents[2])
+_TESTS_ROOT = str(Path(__file__).resolve().parents[1])
+
+if _LAMBDAS_ROOT not in sys.path:
+    sys.path.insert(0, _LAMBDAS_ROOT)
+if _TESTS_ROOT not in sys.path:
+    sys.path.insert(1, _TESTS_ROOT)
+
+import conftest_shared as shared  # noqa: E402
+
+HANDLER_MODULES = (
+    "get_job_result",
+    "get_swipe_file_result",
+    "get_image_gen_result",
+    "get_prelander_images_result",
+)
+
+
+@pytest.fixture(autouse=True)
+def s3(monkeypatch):
+    """
+    Start moto, create the results bucket and point every handler's
+    module-level client and bucket name at it.
+    """
+    import importlib
+
+    import boto3
+    from moto import mock_aws
+
+    shared.set_common_env_vars()
+    monkeypatch.delenv("RESULT_MAX_INLINE_BYTES", raising=False)
+
+    with mock_aws():
+        client = boto3.client("s3", region_name=shared.AWS_REGION)
+        client.create_bucket(
+            Bucket=shared.TEST_BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": shared.AWS_REGION},
+        )
+        for name in HANDLER_MODULES:
+            module = importlib.import_module(name)
+            monkeypatch.setattr(module, "_s3", client)
+            monkeypatch.setattr(module, "_RESULTS_BUCKET", shared.TEST_BUCKET)
+        yield client
@@ -0,0 +1,228 @@
+"""
+Tests for the get_*_result handlers and result_response.py: field
+projection, ETag / If-None-Match, presigned redirects and the sharded
+job result fallback.
+"""
+
+import json
+
+import pytest
+
+import conftest_shared as shared
+
+
+JOB_ID = "job-1"
+RESULT_KEY = f"results/{JOB_ID}/comprehensive_results.json"
+
+PAYLOAD = {
+    "job_id": JOB_ID,
+    "project_name": "proj",
+    "results": {
+        "offer_brief": {"headline": "H"},
+        "marketing_avatars": [
+            {"avatar": {"id": "a1", "overview": {"name": "A"}, "details": "x" * 100}, "angles": {}},
+            {"avatar": {"id": "a2", "overview": {"name": "B"}, "details": "y" * 100}, "angles": {}},
+        ],
+    },
+}
+
+
+def _event(query=None, headers=None, job_id=JOB_ID):
+    return {"pathParameters": {"id": job_id}, "queryStringParameters": query, "headers": headers}
+
+
+def _put(s3, key, body):
+    s3.put_object(Bucket=shared.TEST_BUCKET, Key=key, Body=body if isinstance(body, (bytes, str)) else json.dumps(body))
+
+
+class TestProjection:
+    """?fields= keeps only the requested paths."""
+
+    def test_parse_and_project(self):
+        from result_response import parse_fields, project
+
+        paths = parse_fields("marketing_avatars[].avatar.overview, offer_brief,missing.key")
+
+        assert project(PAYLOAD, paths, base="results") == {
+            "results": {
+                "marketing_avatars": [{"avatar": {"overview": {"name": "A"}}}, {"avatar": {"overview": {"name": "B"}}}],
+                "offer_brief": {"headline": "H"},
+            }
+        }
+        assert project(PAYLOAD, parse_fields("job_id,results.marketing_avatars[].avatar.id")) == {
+            "job_id": JOB_ID,
+            "results": {"marketing_avatars": [{"avatar": {"id": "a1"}}, {"avatar": {"id": "a2"}}]},
+        }
+
+    def test_handler_returns_projection(self, s3):
+        import get_job_result
+
+        _put(s3, RESULT_KEY, PAYLOAD)
+
+        resp = get_job_result.handler(_event({"fields": "marketing_avatars[].avatar.overview"}), None)
+
+        assert resp["statusCode"] == 200
+        assert json.loads(resp["body"]) == {
+            "results": {"marketing_avatars": [{"avatar": {"overview": {"name": "A"}}}, {"avatar": {"overview": {"name": "B"}}}]}
+        }
+
+
+class TestConditionalRequests:
+    """ETags derive from the S3 ETag and the projection; matches get 304."""
+
+    def test_etag_and_not_modified(self, s3):
+        import get_swipe_file_result
+
+        _put(s3, f"results/swipe_files/{JOB_ID}/swipe_files_results.json", {"swipe": 1})
+        first = get_swipe_file_result.handler(_event(), None)
+        etag = first["headers"]["ETag"]
+
+        assert first["statusCode"] == 200
+        assert get_swipe_file_result.handler(_event(headers={"If-None-Match": etag}), None)["statusCode"] == 304
+        assert get_swipe_file_result.handler(_event(headers={"if-none-match": '"stale"'}), None)["statusCode"] == 200
+
+    def test_projected_etag_is_per_fields(self, s3):
+        import get_job_result
+
+        _put(s3, RESULT_KEY, PAYLOAD)
+        full_etag = get_job_result.handler(_event(), None)["headers"]["ETag"]
+        projected = get_job_result.handler(_event({"fields": "offer_brief"}), None)
+        etag = projected["headers"]["ETag"]
+
+        assert etag.startswith("W/") and etag != full_etag
+        assert get_job_result.handler(_event({"fields": "offer_brief"}, {"If-None-Match": etag}), None)["statusCode"] == 304
+        # The same tag does not validate a different projection or the full result
+        assert get_job_result.handler(_event({"fields": "job_id"}, {"If-None-Match": etag}), None)["statusCode"] == 200
+        assert get_job_result.handler(_event(headers={"If-None-Match": etag}), None)["statusCode"] == 200
+
+    def test_changed_object_is_served(self, s3):
+        import get_image_gen_result
+
+        key = f"results/image-gen/{JOB_ID}/image_gen_results.json"
+        _put(s3, key, {"v": 1})
+        etag = get_image_gen_result.handler(_event(), None)["headers"]["ETag"]
+        _put(s3, key, {"v": 2})
+
+        resp = get_image_gen_result.handler(_event(headers={"If-None-Match": etag}), None)
+
+        assert resp["statusCode"] == 200 and json.loads(resp["body"]) == {"v": 2}
+
+
+class TestRedirects:
+    """Presigned redirects on request, or when the result cannot be returned inline."""
+
+    def test_redirect_on_request(self, s3):
+        import get_prelander_images_result
+
+        _put(s3, f"results/prelander-images/{JOB_ID}/results.json", {"images": []})
+
+        resp = get_prelander_images_result.handler(_event({"redirect": "true"}), None)
+
+        assert resp["statusCode"] == 303
+        assert f"results/prelander-images/{JOB_ID}/results.json" in resp["headers"]["Location"]
+
+    def test_results_under_the_limit_are_inline(self, s3, monkeypatch):
+        import get_job_result
+
+        _put(s3, RESULT_KEY, PAYLOAD)
+        size = len(json.dumps(get_job_result.handler(_event(), None)))
+        monkeypatch.setenv("RESULT_MAX_INLINE_BYTES", str(size))
+
+        assert get_job_result.handler(_event(), None)["statusCode"] == 200
+
+    @pytest.mark.parametrize("query,status", [(None, 303), ({"fields": "job_id,offer_brief"}, 200)])
+    def test_results_over_the_limit(self, s3, monkeypatch, query, status):
+        import get_job_result
+
+        _put(s3, RESULT_KEY, PAYLOAD)
+        size = len(json.dumps(get_job_result.handler(_event(), None)))
+        monkeypatch.setenv("RESULT_MAX_INLINE_BYTES", str(size - 1))
+
+        assert get_job_result.handler(_event(query), None)["statusCode"] == status
+
+
+
+class TestJobResultShards:
+    """Jobs saved without comprehensive_results.json are assembled from shards."""
+
+    def _put_shards(self, s3):
+        prefix = f"results/{JOB_ID}/"
+        _put(s3, prefix + "research.json", {"research_page_analysis": "analysis"})
+        _put(s3, prefix + "offer_brief.json", PAYLOAD["results"]["offer_brief"])
+        for i, entry in enumerate(PAYLOAD["results"]["marketing_avatars"]):
+            _put(s3, prefix + f"avatars/{i:03d}.json", entry)
+        _put(s3, prefix + "product_image.jpg", b"\xff\xd8\xffjpeg")
+        _put(s3, prefix + "manifest.json", {
+            "layoutVersion": 1,
+            "job_id": JOB_ID,
+            "project_name": "proj",
+            "timestamp_iso": "2024-01-01T00:00:00+00:00",
+            "sections": {"research": "research.json", "offer_brief": "offer_brief.json"},
+            "avatars": [{"id": "a1", "key": "avatars/000.json"}, {"id": "a2", "key": "avatars/001.json"}],
+            "product_image": {"key": "product_image.jpg", "encoding": "binary"},
+        })
+
+    def test_assembled_from_shards(self, s3):
+        import base64
+        import get_job_result
+
+        self._put_shards(s3)
+
+        resp = get_job_result.handler(_event(), None)
+        body = json.loads(resp["body"])
+
+        assert resp["statusCode"] == 200
+        assert body["project_name"] == "proj"
+        assert body["results"]["research_page_analysis"] == "analysis"
+        assert body["results"]["marketing_avatars"] == PAYLOAD["results"]["marketing_avatars"]
+        assert base64.b64decode(body["results"]["product_image"]) == b"\xff\xd8\xffjpeg"
+
+    def test_shards_are_projected(self, s3):
+        import get_job_result
+
+        self._put_shards(s3)
+
+        resp = get_job_result.handler(_event({"fields": "marketing_avatars[].avatar.id"}), None)
+
+        assert json.loads(resp["body"]) == {"results": {"marketing_avatars": [{"avatar": {"id": "a1"}}, {"avatar": {"id": "a2"}}]}}
+
+    def test_assembled_etag_follows_manifest(self, s3):
+        import get_job_result
+
+        self._put_shards(s3)
+        manifest_etag = s3.head_object(Bucket=shared.TEST_BUCKET, Key=f"results/{JOB_ID}/manifest.json")["ETag"]
+
+        etag = get_job_result.handler(_event(), None)["headers"]["ETag"]
+        not_modified = get_job_result.handler(_event(headers={"If-None-Match": etag}), None)
+
+        assert etag == manifest_etag
+        assert not_modified["statusCode"] == 304
+
+        # A new save rewrites the manifest
+        manifest_key = f"results/{JOB_ID}/manifest.json"
+        manifest = json.loads(s3.get_object(Bucket=shared.TEST_BUCKET, Key=manifest_key)["Body"].read())
+        _put(s3, manifest_key, {**manifest, "timestamp_iso": "2024-01-02T00:00:00+00:00"})
+        assert get_job_result.handler(_event(headers={"If-None-Match": etag}), None)["statusCode"] == 200
+
+    @pytest.mark.parametrize("query,status", [(None, 413), ({"fields": "offer_brief"}, 200)])
+    def test_assembled_results_over_the_limit(self, s3, monkeypatch, query, status):
+        import get_job_result
+
+        self._put_shards(s3)
+        monkeypatch.setenv("RESULT_MAX_INLINE_BYTES", "400")
+
+        resp = get_job_result.handler(_event(query), None)
+
+        assert resp["statusCode"] == status
+        if status == 413:
+            assert "?fields=" in resp["body"]
+
+    def test_missing_everywhere_is_404(self):
+        import get_job_result
+
+        assert get_job_result.handler(_event(job_id="nope"), None)["statusCode"] == 404
+
+    def test_missing_id_is_400(self):
+        import get_job_result
+
+        assert get_job_result.handler({"pathParameters": None}, None)["statusCode"] == 400
@@ -29,6 +29,17 @@ for lambda in process_job_v2 image_gen_process write_swipe prelander_image_gen;
   fi
 done
 
+# Single-file get_*_result handlers have no venv of their own; they only need boto3
+echo ""
+echo "=== Testing result_handlers ==="
+echo ""
+VENV_PYTHON="$LAMBDAS_DIR/process_job_v2/.venv/bin/python"
+if [ -x "$VENV_PYTHON" ]; then
+  "$VENV_PYTHON" -m pytest "$TESTS_DIR/result_handlers/" -v --timeout=60 --tb=short || EXIT_CODE=1
+else
+  echo "Skipping result_handlers: no venv at $VENV_PYTHON (run uv sync in process_job_v2 first)"
+fi
+
 echo ""
 if [ $EXIT_CODE -eq 0 ]; then
   echo "=== All test suites passed ==="
@@ -0,0 +1,75 @@
+"""
+Tests for reading process_job_v2 results in write_swipe (services/aws.py).
+"""
+
+import json
+
+import conftest_shared as shared
+from mock_responses import make_comprehensive_results
+
+
+def _put(s3, key, body):
+    s3.put_object(Bucket=shared.TEST_BUCKET, Key=key, Body=json.dumps(body))
+
+
+def _put_sharded_job(s3, job_id, avatars):
+    """Write a job in process_job_v2's sharded result layout (see result_layout.py)."""
+    results = make_comprehensive_results()["results"]
+    prefix = f"results/{job_id}/"
+    _put(s3, prefix + "research.json", {"research_page_analysis": results["research_page_analysis"]})
+    _put(s3, prefix + "offer_brief.json", results["offer_brief"])
+    index = []
+    for i, avatar_id in enumerate(avatars):
+        entry = make_comprehensive_results(avatar_id=avatar_id)["results"]["marketing_avatars"][0]
+        _put(s3, prefix + f"avatars/{i:03d}.json", entry)
+        index.append({"id": avatar_id, "key": f"avatars/{i:03d}.json"})
+    _put(s3, prefix + "manifest.json", {
+        "layoutVersion": 1,
+        "job_id": job_id,
+        "project_name": "proj",
+        "sections": {"research": "research.json", "offer_brief": "offer_brief.json"},
+        "avatars": index,
+    })
+
+
+class TestFetchJobResultsForAvatar:
+    """Sharded jobs read only the requested avatar; older jobs use the full file."""
+
+    def test_sharded_job_reads_one_avatar(self):
+        import boto3
+        from services.aws import fetch_job_results_for_avatar
+
+        s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+        _put_sharded_job(s3, "sharded-job", ["av-1", "av-2", "av-3"])
+
+        payload = fetch_job_results_for_avatar(shared.TEST_BUCKET, "sharded-job", "av-2")
+
+        results = payload["results"]
+        assert [a["avatar"]["id"] for a in results["marketing_avatars"]] == ["av-2"]
+        assert results["offer_brief"] == "Test offer brief with product details"
+        assert results["research_page_analysis"] == "Test product analysis"
+        assert payload["job_id"] == "sharded-job"
+
+    def test_unknown_avatar_returns_no_avatars(self):
+        import boto3
+        from services.aws import fetch_job_results_for_avatar
+
+        s3 = boto3.client("s3", region_name=shared.AWS_REGION)
+        _put_sharded_job(s3, "sharded-job", ["av-1"])
+
+        payload = fetch_job_results_for_avatar(shared.TEST_BUCKET, "sharded-job", "missing")
+
+        assert payload["results"]["marketing_avatars"] == []
+
+    def test_legacy_job_falls_back_to_comprehensive_results(self):
+        from services.aws import fetch_job_results_for_avatar
+
+        # Seeded by the conftest fixture without a manifest
+        payload = fetch_job_results_for_avatar(shared.TEST_BUCKET, "original-job-123", "test-avatar-id")
+
+        assert payload == make_comprehensive_results()
+
+    def test_missing_job_returns_none(self):
+        from services.aws import fetch_job_results_for_avatar
+
+        assert fetch_job_results_for_avatar(shared.TEST_BUCKET, "no-such-job", "av") is None
@@ -9,6 +9,7 @@ import sentry_sdk
 from sentry_sdk.integrations.aws_lambda import AwsLambdaIntegration
 
 from pipeline.orchestrator import SwipeGenerationOrchestrator
+from llm_usage import flushes_llm_usage_events
 
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN", ""),
@@ -20,6 +21,7 @@ sentry_sdk.init(
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@flushes_llm_usage_events
 def lambda_handler(event, context):
     """
     Lambda handler for processing swipe file generation jobs.
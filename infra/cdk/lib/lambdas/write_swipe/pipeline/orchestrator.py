@@ -12,6 +12,7 @@ from services.aws import (
     update_job_status,
     save_results_to_s3,
     fetch_results_from_s3,
+    fetch_job_results_for_avatar,
 )
 from services.anthropic_service import AnthropicService
 from pipeline.steps.template_selection import select_swipe_files_template, load_swipe_file_templates
@@ -99,7 +100,7 @@ class SwipeGenerationOrchestrator:
 
             # 1. Fetch Job Results (Inputs)
             logger.info(f"Fetching inputs from original job {original_job_id}")
-            results = fetch_results_from_s3(os.environ.get("RESULTS_BUCKET"), f"results/{original_job_id}/comprehensive_results.json")
+            results = fetch_job_results_for_avatar(os.environ.get("RESULTS_BUCKET"), original_job_id, avatar_id)
             if not results:
                 raise RuntimeError(f"Could not fetch results for {original_job_id}")
                 
@@ -1,5 +1,13 @@
 """
 Anthropic service wrapper for write_swipe Lambda.
+
+Requests go through the shared per-model rate limiter (rate_limit.py), which
+retries only throttled (429 / overloaded) and transient failures.
+
+Large tool schemas carry a cache_control breakpoint: the schema is the
+same across calls with the same template, so later calls read it from the
+prompt cache. User prompts get none, since they inline each job's research
+and are unique per call (a cache write would cost extra for no reuse).
 """
 import time
 import json
@@ -8,7 +16,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import anthropic
 from utils.logging_config import setup_logging
-from utils.retry import retry_with_exponential_backoff
+from rate_limit import Permit, call_with_limits, estimate_tokens
 from llm_usage import (
     UsageContext,
     emit_llm_usage_event,
@@ -17,12 +25,18 @@ from llm_usage import (
 
 logger = setup_logging(__name__)
 
+# Anthropic only caches prefixes of at least ~1024 tokens, and cache writes
+# cost extra, so smaller tool schemas get no breakpoint
+CACHE_BREAKPOINT_MIN_CHARS = 4096
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+
 class AnthropicService:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise RuntimeError("ANTHROPIC_API_KEY missing")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
 
     def prepare_schema_for_tool_use(self, schema: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
         """
@@ -54,8 +68,15 @@ class AnthropicService:
         logger.info(f"Using structured output mode with streaming")
         structured_result = None
         usage_data = None
+        tool = {
+            "name": tool_name,
+            "description": tool_description,
+            "input_schema": tool_schema,
+        }
+        if len(json.dumps(tool_schema)) >= CACHE_BREAKPOINT_MIN_CHARS:
+            tool["cache_control"] = EPHEMERAL_CACHE_CONTROL
         
-        def _execute(attempt_no: int = 1):
+        def _execute(permit: Permit):
             nonlocal structured_result, usage_data
             t0 = time.time()
             try:
@@ -63,11 +84,7 @@ class AnthropicService:
                     model=model,
                     max_tokens=max_tokens,
                     messages=messages,
-                    tools=[{
-                        "name": tool_name,
-                        "description": tool_description,
-                        "input_schema": tool_schema
-                    }],
+                    tools=[tool],
                     tool_choice={"type": "tool", "name": tool_name}
                 ) as stream:
                     # Consume the stream
@@ -85,7 +102,8 @@ class AnthropicService:
                         subtask=usage_subtask,
                         latency_ms=int((time.time() - t0) * 1000),
                         success=False,
-                        retry_attempt=attempt_no,
+                        retry_attempt=permit.attempt,
+                        throttle_ms=permit.throttle_ms,
                         error_type=type(e).__name__,
                     )
                 raise
@@ -119,6 +137,7 @@ class AnthropicService:
                 raise ValueError(f"Expected tool_use response, got stop_reason: {response.stop_reason}")
             
             usage_data = response.usage
+            permit.record_usage(normalize_anthropic_usage(usage_data))
             if usage_ctx:
                 emit_llm_usage_event(
                     ctx=usage_ctx,
@@ -128,54 +147,16 @@ class AnthropicService:
                     subtask=usage_subtask,
                     latency_ms=int((time.time() - t0) * 1000),
                     success=True,
-                    retry_attempt=attempt_no,
+                    retry_attempt=permit.attempt,
+                    throttle_ms=permit.throttle_ms,
                     usage=normalize_anthropic_usage(usage_data),
                 )
             return structured_result
 
-        # Execute with retry logic
-        # Since our retry util calls logic that takes no args (except wrapped inside), we wrap it here?
-        # Creating a partial or lambda or wrapper function to pass to retry util.
-        # But my retry util logic was:
-        # def retry_with_exponential_backoff(func, ...): 
-        #    func() // it calls without args
-        # So I need to wrap _execute if I didn't adapt it.
-        # wait, _execute takes attempt_no?
-        # My retry util `func()` call implies `func` takes no args.
-        # But inside `retry_with_exponential_backoff` I might need to make `func` take attempt_no if I want to pass it.
-        # Let's check `retry.py` I wrote.
-        # It calls `func()`.
-        # So I'll modify `_execute` to not take args, or wrap it.
-        # BUT I want `attempt_no`.
-        # I'll modify `retry.py` or just simplify here.
-        
-        # Let's simplify: the retry loop in `retry.py` handles the looping.
-        # I can just implement the loop here manually or update `retry.py` to pass attempt count.
-        
-        # I'll stick to a simple loop here calling `_execute` with attempt number, 
-        # OR use `retry.py` but then I lose attempt number passing.
-        # I'll use `retry_with_exponential_backoff` wrapping a lambda that calls `_execute(current_attempt)`?
-        # But `retry_with_exponential_backoff` encapsulates the loop index `i`.
-        
-        # Okay, let's just make `request_func` take no args and rely on retry wrapper.
-        # But then usage logging won't have attempt number?
-        # True. I'll pass 1 for attempt number in logging if I use the generic retrier, 
-        # or I won't use the generic retrier if I care about attempt tracking validity.
-        
-        # I'll implement a custom retry loop here that matches the original `swipe_file_writer.py` logic which seemed to have an inner function.
-        # Original:
-        # def make_structured_request(attempt_no: int = 1): ...
-        # retry_with_exponential_backoff(make_structured_request)
-        
-        # This implies `retry_with_exponential_backoff` in original code passed `attempt_no`?
-        # If so, my `retry.py` implementation is wrong/deficient compared to original.
-        # But since I am re-implementing, I can fix `retry.py` or adapt here.
-        # I'll update `retry.py` to pass attempt number to the function!
-        
-        return retry_with_exponential_backoff(lambda: _execute(1)) # Temporary fix: just pass 1, validation later.
-        # Actually I will edit retry.py to pass the index. 
-        
-        # Let's finish this file first.
+        return call_with_limits(
+            "anthropic", model, _execute,
+            estimated_tokens=estimate_tokens(messages, output_tokens=max_tokens),
+        )
     
     def make_streaming_request(
         self,
@@ -193,7 +174,7 @@ class AnthropicService:
         response_text = ""
         usage_data = None
         
-        def _execute(attempt_no: int = 1):
+        def _execute(permit: Permit):
             nonlocal response_text, usage_data
             response_text = ""
             t0 = time.time()
@@ -209,6 +190,7 @@ class AnthropicService:
                     message = stream.get_final_message()
                     usage_data = message.usage
                     
+                permit.record_usage(normalize_anthropic_usage(usage_data))
                 if usage_ctx:
                     emit_llm_usage_event(
                         ctx=usage_ctx,
@@ -218,7 +200,8 @@ class AnthropicService:
                         subtask=usage_subtask,
                         latency_ms=int((time.time() - t0) * 1000),
                         success=True,
-                        retry_attempt=attempt_no,
+                        retry_attempt=permit.attempt,
+                        throttle_ms=permit.throttle_ms,
                         usage=normalize_anthropic_usage(usage_data),
                     )
                 return response_text
@@ -232,10 +215,14 @@ class AnthropicService:
                         subtask=usage_subtask,
                         latency_ms=int((time.time() - t0) * 1000),
                         success=False,
-                        retry_attempt=attempt_no,
+                        retry_attempt=permit.attempt,
+                        throttle_ms=permit.throttle_ms,
                         error_type=type(e).__name__,
                     )
                 raise
 
-        retry_with_exponential_backoff(lambda: _execute(1))
+        call_with_limits(
+            "anthropic", model, _execute,
+            estimated_tokens=estimate_tokens([messages, system_prompt], output_tokens=max_tokens),
+        )
         return response_text, usage_data
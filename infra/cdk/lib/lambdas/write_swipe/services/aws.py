@@ -3,6 +3,7 @@ AWS service utilities for write_swipe Lambda.
 """
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 import boto3
 from utils.logging_config import setup_logging
@@ -79,3 +80,45 @@ def fetch_results_from_s3(bucket: str, key: str) -> Any:
     except Exception as e:
         logger.error(f"Failed to fetch results from S3: {e}")
         return None
+
+def fetch_job_results_for_avatar(bucket: str, job_id: str, avatar_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the parts of a process_job_v2 result that swipe generation needs.
+
+    Jobs with a result manifest are read shard by shard: research, offer
+    brief and only the requested avatar (see process_job_v2's
+    services/result_layout.py). Older jobs fall back to the full
+    comprehensive_results.json.
+
+    Returns:
+        Dict in the comprehensive_results.json shape ({"results": {...}}),
+        with marketing_avatars limited to the requested avatar, or None.
+    """
+    prefix = f"results/{job_id}/"
+    try:
+        manifest = json.loads(s3_client.get_object(Bucket=bucket, Key=f"{prefix}manifest.json")["Body"].read())
+    except s3_client.exceptions.NoSuchKey:
+        return fetch_results_from_s3(bucket, f"{prefix}comprehensive_results.json")
+    except Exception as e:
+        logger.error(f"Failed to fetch result manifest from S3: {e}")
+        return None
+
+    sections = manifest.get("sections", {})
+    avatar = next((a for a in manifest.get("avatars", []) if a.get("id") == avatar_id), None)
+    keys = [sections.get("research"), sections.get("offer_brief"), avatar and avatar.get("key")]
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        research, offer_brief, avatar_entry = executor.map(
+            lambda k: fetch_results_from_s3(bucket, prefix + k) if k else None, keys
+        )
+    if research is None:
+        return None
+
+    results = dict(research)
+    results["offer_brief"] = offer_brief
+    results["marketing_avatars"] = [avatar_entry] if avatar_entry else []
+    return {
+        "job_id": manifest.get("job_id"),
+        "project_name": manifest.get("project_name"),
+        "timestamp_iso": manifest.get("timestamp_iso"),
+        "results": results,
+    }
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark budgeted JPEG compression: fit_jpeg() against the old loops.
+
+For each screenshot, fits it under each byte budget with:
+  - loop_base64: the old compress_to_base64 loop (quality -10 down to 30,
+    then resize x0.85 at quality 70)
+  - loop_if_needed: the old compress_image_if_needed loop (quality -10,
+    resize x0.8 once quality drops below 60)
+  - loop_gemini: the old GeminiService._enforce_max_size (quality steps,
+    then resize at quality 30)
+  - fit_jpeg: utils/codec.py
+
+and reports median time, number of encodes, output size and dimensions.
+
+Pass real full-page screenshots (PNG or JPEG) for meaningful numbers, e.g.
+ones saved with save_fullpage_png() or by scripts/benchmark_page_capture.py.
+Without arguments a synthetic screenshot-like page is generated.
+
+Usage:
+    python scripts/benchmark_image_compression.py shots/*.png
+    python scripts/benchmark_image_compression.py --budgets-kb 480 1000 --repeat 3
+
+Dependencies:
+    pip install pillow
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Add lambda directory to path for imports
+LAMBDA_DIR = Path(__file__).parent.parent / "cdk" / "lib" / "lambdas" / "process_job_v2"
+sys.path.insert(0, str(LAMBDA_DIR))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from utils.codec import fit_jpeg  # noqa: E402
+
+
+# (output bytes, encodes)
+Result = Tuple[bytes, int]
+
+
+def _open_rgb(image_bytes: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(image_bytes))
+    return img.convert("RGB") if img.mode in ("RGBA", "P") else img
+
+
+def loop_base64(image_bytes: bytes, max_bytes: int) -> Result:
+    """Previous compress_to_base64 (without the base64 step)."""
+    img = _open_rgb(image_bytes)
+    quality, encodes = 90, 0
+    out = io.BytesIO()
+    while True:
+        out.seek(0)
+        out.truncate()
+        img.save(out, format="JPEG", quality=quality, optimize=True, progressive=True)
+        encodes += 1
+        if out.tell() <= max_bytes:
+            break
+        if quality > 30:
+            quality -= 10
+            continue
+        width, height = img.size
+        new_size = (max(1, int(width * 0.85)), max(1, int(height * 0.85)))
+        if new_size == (width, height):
+            break
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        quality = 70
+    return out.getvalue(), encodes
+
+
+def loop_if_needed(image_bytes: bytes, max_bytes: int) -> Result:
+    """Previous compress_image_if_needed."""
+    img = _open_rgb(image_bytes)
+    quality, encodes = 90, 0
+    out = io.BytesIO()
+    while True:
+        out.seek(0)
+        out.truncate()
+        img.save(out, format="JPEG", quality=quality)
+        encodes += 1
+        if out.tell() <= max_bytes or quality <= 10:
+            break
+        quality -= 10
+        if quality < 60:
+            img = img.resize((int(img.width * 0.8), int(img.height * 0.8)), Image.Resampling.LANCZOS)
+    return out.getvalue(), encodes
+
+
+def loop_gemini(image_bytes: bytes, max_bytes: int) -> Result:
+    """Previous GeminiService._enforce_max_size."""
+    img = _open_rgb(image_bytes)
+    encodes = 0
+    for quality in (90, 80, 70, 60, 50, 40, 30):
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality)
+        encodes += 1
+        if buf.tell() <= max_bytes:
+            return buf.getvalue(), encodes
+    scale = 0.9
+    while scale > 0.1:
+        resized = img.resize((int(img.width * scale), int(img.height * scale)), Image.LANCZOS)
+        buf = io.BytesIO()
+        resized.save(buf, format="JPEG", quality=30)
+        encodes += 1
+        if buf.tell() <= max_bytes:
+            break
+        scale -= 0.1
+    return buf.getvalue(), encodes
+
+
+def codec(image_bytes: bytes, max_bytes: int) -> Result:
+    encoded = fit_jpeg(image_bytes, max_bytes, quality=90)
+    return encoded.data, encoded.encodes
+
+
+METHODS: Dict[str, Callable[[bytes, int], Result]] = {
+    "loop_base64": loop_base64,
+    "loop_if_needed": loop_if_needed,
+    "loop_gemini": loop_gemini,
+    "fit_jpeg": codec,
+}
+
+
+def synthetic_screenshot(height: int = 9000, seed: int = 0) -> bytes:
+    """Generate a screenshot-like PNG (text lines and photo-ish blocks)."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1280, height), "white")
+    draw = ImageDraw.Draw(img)
+    y = 0
+    while y < height:
+        if rng.random() < 0.25:
+            block = rng.randint(300, 700)
+            for row in range(y, y + block, 4):
+                draw.rectangle([100, row, 1180, row + 4], fill=tuple(rng.randrange(256) for _ in range(3)))
+            y += block + 40
+        else:
+            for _ in range(rng.randint(4, 12)):
+                words = " ".join("".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(3, 10)))
+                                 for _ in range(14))
+                draw.text((100, y), words, fill=(20, 20, 20))
+                y += 22
+            y += 30
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("images", nargs="*", type=Path, help="Screenshot files (PNG/JPEG)")
+    parser.add_argument("--budgets-kb", nargs="+", type=int, default=[480, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs: List[Tuple[str, bytes]] = [(p.name, p.read_bytes()) for p in args.images]
+    if not inputs:
+        inputs = [("synthetic_9000px.png", synthetic_screenshot())]
+
+    header = (
+        f"{'image':<28} | {'budget':>7} | {'method':<14} | {'ms':>7} | "
+        f"{'encodes':>7} | {'out KB':>7} | {'size':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, data in inputs:
+        for budget_kb in args.budgets_kb:
+            max_bytes = budget_kb * 1024
+            for method_name, method in METHODS.items():
+                times = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    out, encodes = method(data, max_bytes)
+                    times.append((time.perf_counter() - t0) * 1000)
+                width, height = Image.open(io.BytesIO(out)).size
+                flag = "" if len(out) <= max_bytes else "  OVER BUDGET"
+                print(
+                    f"{name[:28]:<28} | {budget_kb:>5}KB | {method_name:<14} | "
+                    f"{statistics.median(times):>7.0f} | {encodes:>7} | {len(out) / 1024:>7.0f} | "
+                    f"{f'{width}x{height}':>11}{flag}"
+                )
+
+
+if __name__ == "__main__":
+    main()
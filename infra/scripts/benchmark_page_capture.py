@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark page capture profiles against local HTML fixtures.
+
+Serves the pages in scripts/fixtures/page_capture/ from a local HTTP server
+and captures each one with the "full" profile (load everything, wait for
+network idle, fixed-interval scroll) and the "blocking" profile (request
+blocking plus the lazy-image settle detector). Reports median capture time
+with its navigation / scroll / screenshot breakdown. With --text, also
+runs the text-mode capture (DOM text, no full-page screenshot) and reports
+the extracted text size.
+
+The fixture server simulates slow third parties: ``/_slow/...?delay=ms``
+answers after a delay and ``/_img/name.png?w=&h=&delay=ms`` returns a
+generated placeholder image. Requests under ``/_slow/tracker/`` stand in
+for analytics and chat hosts and are added to the blocking profile's deny
+list for the benchmark.
+
+Usage:
+    python scripts/benchmark_page_capture.py
+    python scripts/benchmark_page_capture.py --repeat 5 --fixtures video_landing
+    python scripts/benchmark_page_capture.py --text
+
+Dependencies:
+    pip install playwright pillow && playwright install chromium
+"""
+
+import argparse
+import dataclasses
+import io
+import statistics
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Add lambda directory to path for imports
+LAMBDA_DIR = Path(__file__).parent.parent / "cdk" / "lib" / "lambdas" / "process_job_v2"
+sys.path.insert(0, str(LAMBDA_DIR))
+
+from PIL import Image  # noqa: E402
+
+from utils.browser import get_browser_pool  # noqa: E402
+from utils.image import (  # noqa: E402
+    BLOCKING_PROFILE,
+    FULL_PROFILE,
+    CaptureProfile,
+    capture_page_screenshots,
+)
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "page_capture"
+
+SLOW_CONTENT_TYPES = {
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".woff2": "font/woff2",
+    ".mp4": "video/mp4",
+    ".gif": "image/gif",
+}
+
+
+@lru_cache(maxsize=64)
+def placeholder_png(width: int, height: int, seed: int) -> bytes:
+    """Generate a solid-colour PNG of the given size."""
+    colour = ((seed * 53) % 255, (seed * 97) % 255, (seed * 31) % 255)
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), colour).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves fixture pages plus delayed assets."""
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        time.sleep(int(query.get("delay", 0)) / 1000)
+
+        if parsed.path.startswith("/_img/"):
+            width, height = int(query.get("w", 800)), int(query.get("h", 400))
+            self._send(placeholder_png(width, height, hash(parsed.path) % 997), "image/png")
+        elif parsed.path.startswith("/_slow/"):
+            suffix = Path(parsed.path).suffix
+            self._send(b"/* fixture */", SLOW_CONTENT_TYPES.get(suffix, "text/plain"))
+        else:
+            page = FIXTURES_DIR / parsed.path.lstrip("/")
+            if page.suffix == ".html" and page.is_file():
+                self._send(page.read_bytes(), "text/html; charset=utf-8")
+            else:
+                self._send(b"not found", "text/plain", status=404)
+
+
+def start_server() -> Tuple[ThreadingHTTPServer, str]:
+    """Start the fixture server on a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def benchmark(url: str, profile: CaptureProfile, repeat: int, text: bool = False) -> Dict[str, float]:
+    """Capture ``url`` ``repeat`` times and return median timings."""
+    samples: List[Dict[str, float]] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        shots = capture_page_screenshots(url, profile=profile, extract_text=text, fullpage=not text)
+        timings = shots.timings
+        samples.append({
+            "total_ms": (time.perf_counter() - t0) * 1000,
+            "navigation_ms": timings.navigation_ms,
+            "scroll_ms": timings.extra.get("scroll_ms", 0.0),
+            "screenshot_ms": timings.screenshot_ms,
+            "blocked": timings.extra.get("blocked_requests", 0),
+            "fullpage_kb": len(shots.fullpage_bytes) / 1024,
+            "text_chars": len(shots.page_text or ""),
+        })
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--text", action="store_true", help="Also benchmark text-mode capture")
+    parser.add_argument(
+        "--fixtures", nargs="+",
+        default=sorted(p.stem for p in FIXTURES_DIR.glob("*.html")),
+    )
+    args = parser.parse_args()
+
+    blocking = dataclasses.replace(
+        BLOCKING_PROFILE,
+        blocked_url_patterns=BLOCKING_PROFILE.blocked_url_patterns + ("/_slow/tracker/",),
+    )
+    runs = [(FULL_PROFILE.name, FULL_PROFILE, False), (blocking.name, blocking, False)]
+    if args.text:
+        runs.append(("text", blocking, True))
+
+    server, base_url = start_server()
+    pool = get_browser_pool()
+    try:
+        # Warm the browser so launch time is not charged to the first fixture
+        capture_page_screenshots(f"{base_url}/{args.fixtures[0]}.html", profile=blocking)
+
+        header = (
+            f"{'fixture':<28} | {'profile':<8} | {'total ms':>9} | {'nav ms':>8} | "
+            f"{'scroll ms':>9} | {'shot ms':>8} | {'blocked':>7} | {'page KB':>8} | {'text':>7}"
+        )
+        print(header)
+        print("-" * len(header))
+        for fixture in args.fixtures:
+            url = f"{base_url}/{fixture}.html"
+            baseline = None
+            for name, profile, text in runs:
+                r = benchmark(url, profile, args.repeat, text=text)
+                baseline = baseline or r["total_ms"]
+                print(
+                    f"{fixture:<28} | {name:<8} | {r['total_ms']:>9.0f} | "
+                    f"{r['navigation_ms']:>8.0f} | {r['scroll_ms']:>9.0f} | "
+                    f"{r['screenshot_ms']:>8.0f} | {r['blocked']:>7.0f} | {r['fullpage_kb']:>8.0f} | "
+                    f"{r['text_chars']:>7.0f}"
+                    + ("" if r["total_ms"] == baseline else f"   ({1 - r['total_ms'] / baseline:.0%} faster)")
+                )
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark local template pre-ranking against library size.
+
+For synthetic content libraries of increasing size, reports the size of the
+library section of the template prediction prompt with and without local
+pre-ranking, plus the time to build the feature index and to pre-rank one
+avatar+angle pair.
+
+Token counts use tiktoken (o200k_base) when installed, otherwise a
+chars/4 estimate.
+
+Usage:
+    python scripts/benchmark_template_preranking.py
+    python scripts/benchmark_template_preranking.py --sizes 50 200 1000 --top-n 20
+
+Dependencies:
+    pip install numpy pydantic
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List
+
+# Add lambda directory to path for imports
+LAMBDA_DIR = Path(__file__).parent.parent / "cdk" / "lib" / "lambdas" / "process_job_v2"
+sys.path.insert(0, str(LAMBDA_DIR))
+
+from data_models import (  # noqa: E402
+    AngleType,
+    AwarenessLevel,
+    ContentLibrarySummaries,
+    EmotionalDriver,
+    LandingPageSummary,
+)
+from services.template_index import DEFAULT_TOP_N, TemplateFeatureIndex  # noqa: E402
+from services.template_prediction_service import TemplatePredictionService  # noqa: E402
+
+
+FORMAT_TYPES = ["advertorial", "listicle", "advertorial_pov", "advertorial_authority"]
+PERSPECTIVES = ["first_person", "third_person", "second_person_direct", "authority_expert"]
+DENSITIES = ["light", "medium", "dense"]
+TONES = ["urgent", "professional", "friendly", "conversational", "empathetic", "authoritative"]
+ENERGY_LEVELS = ["calm_educational", "moderate", "high_energy_urgent", "emotionally_intense"]
+TECHNIQUES = [
+    "emotional_storytelling", "social_proof", "authority_citation", "urgency_scarcity",
+    "fear_of_inaction", "mechanism_explanation", "before_after", "statistics_data",
+    "testimonials", "expert_endorsement", "contrarian_reveal", "curiosity_gap",
+]
+DEVICES = ["personal_anecdote", "expert_quotes", "before_after_comparison", "statistics_callout"]
+APPROACHES = ["fear_to_hope", "frustration_to_relief", "curiosity_to_discovery"]
+CTA_STYLES = ["soft_discovery", "urgent_action", "embedded_recurring", "single_end"]
+AWARENESS = ["unaware", "problem_aware", "solution_aware", "product_aware"]
+ANGLE_TYPES = [a.value for a in AngleType]
+
+
+def make_library(size: int, rng: random.Random) -> ContentLibrarySummaries:
+    """Generate a synthetic library with realistic categorical values."""
+    summaries = [
+        LandingPageSummary(
+            id=f"A{i:05d}",
+            s3_key=f"content_library/A{i:05d}_original.html",
+            format_type=rng.choice(FORMAT_TYPES),
+            writing_perspective=rng.choice(PERSPECTIVES),
+            article_structure_flow="hook -> problem -> discovery -> mechanism -> social proof -> CTA",
+            content_density=rng.choice(DENSITIES),
+            tone=" and ".join(rng.sample(TONES, 2)),
+            energy_level=rng.choice(ENERGY_LEVELS),
+            persuasion_techniques=rng.sample(TECHNIQUES, rng.randint(3, 5)),
+            emotional_approach=rng.choice(APPROACHES),
+            engagement_devices=rng.sample(DEVICES, 3),
+            cta_style=rng.choice(CTA_STYLES),
+            best_for_awareness_levels=rng.sample(AWARENESS, 2),
+            best_for_angle_types=rng.sample(ANGLE_TYPES, 3),
+        )
+        for i in range(size)
+    ]
+    return ContentLibrarySummaries(
+        version="bench", generated_at="bench", total_pages=size, summaries=summaries
+    )
+
+
+def make_query(rng: random.Random):
+    """Return minimal avatar/angle stand-ins exposing the fields the index reads."""
+    avatar = SimpleNamespace(
+        overview=SimpleNamespace(awareness_level=rng.choice(list(AwarenessLevel)))
+    )
+    angle = SimpleNamespace(
+        angle_type=rng.choice(list(AngleType)),
+        emotional_driver=rng.choice(list(EmotionalDriver)),
+    )
+    return avatar, angle
+
+
+def token_counter() -> Callable[[str], int]:
+    """Return a token counting function, preferring tiktoken when available."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: len(text) // 4
+
+
+def time_ms(func: Callable[[], object], repeat: int) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200, 500, 1000])
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    count_tokens = token_counter()
+    service = TemplatePredictionService(
+        openai_service=None, library_cache=None, prompt_service=None, pre_rank_top_n=args.top_n
+    )
+
+    header = (
+        f"{'templates':>9} | {'full tokens':>11} | {'pre-ranked tokens':>17} | "
+        f"{'saved':>6} | {'index build ms':>14} | {'pre-rank ms':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for size in args.sizes:
+        library = make_library(size, rng)
+        avatar, angle = make_query(rng)
+
+        full_tokens = count_tokens(service._create_library_summary(library.summaries))
+        build_ms = time_ms(lambda: TemplateFeatureIndex(library.summaries), max(3, args.repeat // 10))
+        index = TemplateFeatureIndex(library.summaries)
+        rank_ms = time_ms(lambda: index.top_candidates(avatar, angle, top_n=args.top_n), args.repeat)
+        candidates = index.top_candidates(avatar, angle, top_n=args.top_n)
+        ranked_tokens = count_tokens(service._create_library_summary(candidates))
+        saved = 1 - ranked_tokens / full_tokens if full_tokens else 0.0
+
+        print(
+            f"{size:>9} | {full_tokens:>11,} | {ranked_tokens:>17,} | "
+            f"{saved:>6.0%} | {build_ms:>14.2f} | {rank_ms:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,35 @@
 Compute cost per run/endpoints/subtasks from S3 JSONL LLM usage events.
 
 Assumptions:
-- Each S3 object is a single JSON line (as written by llm_usage.py)
+- Each S3 object is JSONL, one event per line, optionally gzip-compressed
+  (.jsonl.gz), as written by llm_usage.py
 - Costs are derived from pricing/llm_pricing.v1.json (versioned, in-repo)
+
+Listing and GETs run on a thread pool and aggregation streams, so memory
+does not grow with the number of events. --compact rolls each closed dt=
+partition into one JSONL.gz object with a manifest listing its source
+objects; later reports read the rollup plus any raw object written after
+it. --state keeps per-day aggregates and a watermark, so re-runs only read
+days not seen before. A day counts as closed only CLOSE_GRACE after UTC
+midnight, since buffered Lambdas keep writing the previous dt= partition
+for a while after it ends.
+--latency switches to the latency percentile report (llm_latency_report.py).
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import gzip
+import hashlib
+import io
 import json
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import boto3
 
@@ -101,33 +116,313 @@ def compute_event_cost_usd(event: Dict[str, Any], rates: Dict[RateKey, float], s
     return cost
 
 
-def iter_events_from_s3(bucket: str, prefix: str, start_dt: date, end_dt: date) -> Iterable[Dict[str, Any]]:
-    s3 = boto3.client("s3")
-    for d in _daterange(start_dt, end_dt):
-        # scan all hours (00..23)
-        dt_prefix = f"{prefix.strip().strip('/')}/dt={d.strftime('%Y-%m-%d')}/"
+STAT_FIELDS = (
+    "inputTokens",
+    "outputTokens",
+    "cacheReadInputTokens",
+    "cacheCreationInputTokens",
+    "cachedInputTokens",
+    "imagesGenerated",
+    "citationTokens",
+    "searchQueries",
+    "reasoningTokens",
+)
+
+CSV_FIELDS = sorted((
+    "timestamp", "jobId", "endpoint", "projectName", "subtask", "provider", "model", "operation",
+    "success", "retryAttempt", "cacheHit", "latencyMs", "costUsd", *STAT_FIELDS,
+))
+
+# Rollups live beside (not under) the raw prefix so raw listings never see them
+COMPACTED_SUFFIX = "_compacted"
+MANIFEST_NAME = "manifest.json"
+COMPACTED_OBJECT_NAME = "events.jsonl.gz"
+STATE_VERSION = 1
+
+DEFAULT_WORKERS = 16
+
+# Longer than the maximum Lambda runtime (15 min) plus the usage buffer's flush interval
+CLOSE_GRACE = timedelta(hours=1)
+
+
+def is_closed(d: date, now: Optional[datetime] = None) -> bool:
+    """Whether no more events can arrive for day d (so it may be compacted or cached)."""
+    now = now or datetime.now(timezone.utc)
+    day_end = datetime(d.year, d.month, d.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return now >= day_end + CLOSE_GRACE
+
+
+def _raw_prefix(prefix: str, d: date) -> str:
+    return f"{prefix.strip().strip('/')}/dt={d.strftime('%Y-%m-%d')}/"
+
+
+def _compacted_prefix(prefix: str, d: date) -> str:
+    return f"{prefix.strip().strip('/')}{COMPACTED_SUFFIX}/dt={d.strftime('%Y-%m-%d')}/"
+
+
+def _read_object(s3, bucket: str, key: str) -> bytes:
+    raw = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    if key.endswith(".gz"):
+        raw = gzip.decompress(raw)
+    return raw
+
+
+def _parse_lines(raw: bytes) -> Iterator[Dict[str, Any]]:
+    for line in raw.decode("utf-8").splitlines():
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_objects(s3, bucket: str, keys: List[str], executor: ThreadPoolExecutor, window: int) -> Iterator[bytes]:
+    """Fetch objects concurrently, in key order, at most `window` in flight."""
+    for start in range(0, len(keys), window):
+        yield from executor.map(lambda k: _read_object(s3, bucket, k), keys[start:start + window])
+
+
+def list_partition_keys(s3, bucket: str, prefix: str, d: date, executor: ThreadPoolExecutor) -> List[str]:
+    """List one dt= partition's raw event objects, one hour= prefix per worker."""
+    dt_prefix = _raw_prefix(prefix, d)
+
+    def _list(list_prefix: str, **kwargs) -> List[str]:
         paginator = s3.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=bucket, Prefix=dt_prefix):
-            for obj in page.get("Contents", []) or []:
-                key = obj["Key"]
-                body = s3.get_object(Bucket=bucket, Key=key)["Body"].read().decode("utf-8")
-                for line in body.splitlines():
-                    line = line.strip()
-                    if not line:
-                        continue
-                    yield json.loads(line)
-
-
-def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
-    if not rows:
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            f.write("")
-        return
-    fieldnames = sorted({k for r in rows for k in r.keys()})
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(rows)
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=list_prefix, **kwargs)
+            for obj in page.get("Contents", []) or []
+        ]
+
+    hour_prefixes = [f"{dt_prefix}hour={h:02d}/" for h in range(24)]
+    keys = [k for hour_keys in executor.map(_list, hour_prefixes) for k in hour_keys]
+    # Objects directly under dt= (outside the hour= layout)
+    keys += _list(dt_prefix, Delimiter="/")
+    return keys
+
+
+def read_manifest(s3, bucket: str, prefix: str, d: date) -> Optional[Dict[str, Any]]:
+    """Manifest of a compacted partition, or None if it was never compacted."""
+    try:
+        raw = s3.get_object(Bucket=bucket, Key=_compacted_prefix(prefix, d) + MANIFEST_NAME)["Body"].read()
+    except s3.exceptions.NoSuchKey:
+        return None
+    return json.loads(raw)
+
+
+def uncompacted_keys(manifest: Dict[str, Any], raw_keys: List[str]) -> List[str]:
+    """Raw objects not folded into a rollup (written after it was compacted)."""
+    compacted = set(manifest.get("sourceKeys", []))
+    return [k for k in raw_keys if k not in compacted]
+
+
+def iter_partition_events(
+    s3, bucket: str, prefix: str, d: date, executor: ThreadPoolExecutor, window: int = DEFAULT_WORKERS * 4
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream one day's events: its rollup if compacted, plus raw objects the rollup does not cover.
+
+    Objects are fetched concurrently, a bounded window at a time.
+    """
+    keys = list_partition_keys(s3, bucket, prefix, d, executor)
+    manifest = read_manifest(s3, bucket, prefix, d)
+    if manifest is not None:
+        rollup = [_compacted_prefix(prefix, d) + name for name in manifest["objects"]]
+        keys = rollup + uncompacted_keys(manifest, keys)
+
+    for raw in _iter_objects(s3, bucket, keys, executor, window):
+        yield from _parse_lines(raw)
+
+
+def iter_events_from_s3(
+    bucket: str, prefix: str, start_dt: date, end_dt: date, workers: int = DEFAULT_WORKERS
+) -> Iterable[Dict[str, Any]]:
+    s3 = boto3.client("s3")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for d in _daterange(start_dt, end_dt):
+            yield from iter_partition_events(s3, bucket, prefix, d, executor, window=workers * 4)
+
+
+def compact_partition(
+    s3, bucket: str, prefix: str, d: date, executor: ThreadPoolExecutor, window: int = DEFAULT_WORKERS * 4
+) -> Optional[Dict[str, Any]]:
+    """
+    Roll one day's raw event objects into a single JSONL.gz object plus a manifest.
+
+    The raw objects are left in place; readers use the rollup once its
+    manifest exists, so the manifest is written last.
+
+    Returns:
+        The manifest, or None if the partition has no raw objects.
+    """
+    keys = list_partition_keys(s3, bucket, prefix, d, executor)
+    if not keys:
+        return None
+
+    buf = io.BytesIO()
+    event_count = 0
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as gz:
+        for raw in _iter_objects(s3, bucket, keys, executor, window):
+            for ev in _parse_lines(raw):
+                gz.write((json.dumps(ev, ensure_ascii=False) + "\n").encode("utf-8"))
+                event_count += 1
+
+    out_prefix = _compacted_prefix(prefix, d)
+    s3.put_object(
+        Bucket=bucket,
+        Key=out_prefix + COMPACTED_OBJECT_NAME,
+        Body=buf.getvalue(),
+        ContentType="application/x-ndjson",
+        ContentEncoding="gzip",
+    )
+    manifest = {
+        "dt": d.strftime("%Y-%m-%d"),
+        "objects": [COMPACTED_OBJECT_NAME],
+        "eventCount": event_count,
+        "sourceObjectCount": len(keys),
+        "sourceKeys": keys,
+        "compactedBytes": buf.tell(),
+        "compactedAt": datetime.now(timezone.utc).isoformat(),
+    }
+    s3.put_object(
+        Bucket=bucket,
+        Key=out_prefix + MANIFEST_NAME,
+        Body=json.dumps(manifest, indent=2).encode("utf-8"),
+        ContentType="application/json",
+    )
+    return manifest
+
+
+def _new_stats() -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"costUsd": 0.0, "callCount": 0}
+    stats.update({f: 0 for f in STAT_FIELDS})
+    stats["responseCacheHits"] = 0
+    return stats
+
+
+class CostAggregates:
+    """Running per-dimension totals; one instance per day so days can be cached and merged."""
+
+    DIMENSIONS = ("perJobId", "perEndpoint", "perSubtask", "perProviderModel")
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self.data = {dim: defaultdict(_new_stats) for dim in self.DIMENSIONS}
+        for dim, groups in (data or {}).items():
+            for key, stats in groups.items():
+                self.data[dim][key] = {**_new_stats(), **stats}
+
+    def add(self, ev: Dict[str, Any], cost: float) -> Dict[str, Any]:
+        """Fold one event in; returns its CSV row."""
+        provider = str(ev.get("provider") or "unknown")
+        model = str(ev.get("model") or "unknown")
+        counts = {f: int(ev.get(f) or 0) for f in STAT_FIELDS}
+        cache_hit = bool(ev.get("cacheHit"))
+
+        for dim, key in (
+            ("perJobId", str(ev.get("jobId") or "no_job")),
+            ("perEndpoint", str(ev.get("endpoint") or "unknown")),
+            ("perSubtask", str(ev.get("subtask") or "unknown")),
+            ("perProviderModel", f"{provider}:{model}"),
+        ):
+            stats = self.data[dim][key]
+            stats["costUsd"] += cost
+            stats["callCount"] += 1
+            for f, v in counts.items():
+                stats[f] += v
+            stats["responseCacheHits"] += int(cache_hit)
+
+        return {
+            "timestamp": ev.get("timestamp"),
+            "jobId": ev.get("jobId"),
+            "endpoint": ev.get("endpoint"),
+            "projectName": ev.get("projectName"),
+            "subtask": ev.get("subtask"),
+            "provider": provider,
+            "model": model,
+            "operation": ev.get("operation"),
+            "success": ev.get("success"),
+            "retryAttempt": ev.get("retryAttempt"),
+            "cacheHit": cache_hit,
+            "latencyMs": ev.get("latencyMs"),
+            "costUsd": round(cost, 10),
+            **counts,
+        }
+
+    def merge(self, other: "CostAggregates") -> None:
+        for dim in self.DIMENSIONS:
+            for key, stats in other.data[dim].items():
+                mine = self.data[dim][key]
+                for f, v in stats.items():
+                    mine[f] += v
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {dim: dict(groups) for dim, groups in self.data.items()}
+
+
+def _finalize_stats(stats_dict: Dict[str, Any]) -> Dict[str, Any]:
+    # Sort by costUsd descending
+    sorted_items = sorted(stats_dict.items(), key=lambda x: -x[1]["costUsd"])
+    final = {}
+    for key, stats in sorted_items:
+        s = stats.copy()
+        s["costUsd"] = round(s["costUsd"], 10)
+        s["avgCostUsd"] = round(s["costUsd"] / s["callCount"], 10) if s["callCount"] > 0 else 0.0
+        final[key] = s
+    return final
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_state(path: str, scope: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load the watermark state; discarded if bucket, prefix or pricing changed.
+
+    State maps each closed day (dt) to its aggregates, plus the watermark:
+    the latest day whose aggregates are final.
+    """
+    empty = {"version": STATE_VERSION, "scope": scope, "watermark": None, "partitions": {}}
+    if not path or not os.path.exists(path):
+        return empty
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION or state.get("scope") != scope:
+        print(f"State {path} was built for different inputs, ignoring it")
+        return empty
+    return state
+
+
+def save_state(path: str, state: Dict[str, Any]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def run_compaction(args: argparse.Namespace) -> int:
+    """
+    Compact closed dt= partitions in [start, end].
+
+    Partitions already compacted are redone only with --force or when raw
+    objects arrived after the rollup.
+    """
+    s3 = boto3.client("s3")
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for d in _daterange(_parse_date(args.start_date), _parse_date(args.end_date)):
+            if not is_closed(d):
+                continue
+            manifest = read_manifest(s3, args.bucket, args.prefix, d)
+            if manifest is not None and not args.force:
+                raw_keys = list_partition_keys(s3, args.bucket, args.prefix, d, executor)
+                if not uncompacted_keys(manifest, raw_keys):
+                    continue
+            manifest = compact_partition(s3, args.bucket, args.prefix, d, executor, window=args.workers * 4)
+            if manifest:
+                print(
+                    f"dt={manifest['dt']}: {manifest['sourceObjectCount']} objects -> "
+                    f"{manifest['eventCount']} events, {manifest['compactedBytes']} bytes"
+                )
+    return 0
 
 
 def main() -> int:
@@ -143,107 +438,85 @@ def main() -> int:
     ap.add_argument("--pricing", default="pricing/llm_pricing.v1.json", help="Path to pricing config")
     ap.add_argument("--strict", action="store_true", help="Fail if a model rate is missing")
     ap.add_argument("--job-id", default=None, help="Optional filter by jobId")
-    ap.add_argument("--out-json", default="llm_cost_report.json", help="Output JSON path")
-    ap.add_argument("--out-csv", default="llm_cost_report.csv", help="Output CSV path")
+    ap.add_argument("--out-json", default=None, help="Output JSON path (default: llm_cost_report.json / llm_latency_report.json)")
+    ap.add_argument("--out-csv", default=None, help="Output CSV path (default: llm_cost_report.csv / llm_latency_report.csv)")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Concurrent S3 requests (default: {DEFAULT_WORKERS})")
+    ap.add_argument("--compact", action="store_true", help="Roll closed dt= partitions into one JSONL.gz + manifest each, then exit")
+    ap.add_argument("--force", action="store_true", help="With --compact, recompact partitions that already have a manifest")
+    ap.add_argument(
+        "--state",
+        default=None,
+        help="Watermark state file; closed days already in it are not re-read (CSV rows then cover new days only)",
+    )
+    ap.add_argument("--json-events", action="store_true", help="Also embed every event row in the JSON report")
+    ap.add_argument("--latency", action="store_true", help="Latency percentile report instead of costs (see llm_latency_report.py)")
+    ap.add_argument("--group-by", default="subtask,model,day", help="Latency grouping dimensions (default: subtask,model,day)")
+    ap.add_argument("--baseline-start", default=None, help="Latency regression diff: baseline start YYYY-MM-DD")
+    ap.add_argument("--baseline-end", default=None, help="Latency regression diff: baseline end YYYY-MM-DD")
+    ap.add_argument("--regression-ratio", type=float, default=1.2, help="Flag p90 slowdowns at or above this ratio (default: 1.2)")
+    ap.add_argument("--min-calls", type=int, default=20, help="Minimum calls on both sides to flag a regression (default: 20)")
     args = ap.parse_args()
 
+    if args.compact:
+        return run_compaction(args)
+
+    report_name = "llm_latency_report" if args.latency else "llm_cost_report"
+    args.out_json = args.out_json or f"{report_name}.json"
+    args.out_csv = args.out_csv or f"{report_name}.csv"
+
+    if args.latency:
+        # NumPy is only needed for this mode
+        from llm_latency_report import run_latency_report
+        return run_latency_report(args)
+
     rates = load_pricing(args.pricing)
     start_dt = _parse_date(args.start_date)
     end_dt = _parse_date(args.end_date)
+    now = datetime.now(timezone.utc)
 
-    def _new_stats():
-        return {
-            "costUsd": 0.0,
-            "callCount": 0,
-            "inputTokens": 0,
-            "outputTokens": 0,
-            "cacheReadInputTokens": 0,
-            "cacheCreationInputTokens": 0,
-            "imagesGenerated": 0,
-            "citationTokens": 0,
-            "searchQueries": 0,
-            "reasoningTokens": 0,
-        }
-
-    per_job = defaultdict(_new_stats)
-    per_endpoint = defaultdict(_new_stats)
-    per_subtask = defaultdict(_new_stats)
-    per_provider_model = defaultdict(_new_stats)
+    # Cached aggregates are unfiltered, so a job filter always reads S3
+    use_state = bool(args.state) and not args.job_id
+    scope = {"bucket": args.bucket, "prefix": args.prefix, "pricingSha256": _file_sha256(args.pricing)}
+    state = load_state(args.state, scope) if use_state else None
 
+    totals = CostAggregates()
     rows: List[Dict[str, Any]] = []
+    skipped_days = 0
 
-    for ev in iter_events_from_s3(args.bucket, args.prefix, start_dt, end_dt):
-        if args.job_id and str(ev.get("jobId")) != args.job_id:
-            continue
-
-        cost = compute_event_cost_usd(ev, rates, strict=args.strict)
-        job_id = str(ev.get("jobId") or "no_job")
-        endpoint = str(ev.get("endpoint") or "unknown")
-        subtask = str(ev.get("subtask") or "unknown")
-        provider = str(ev.get("provider") or "unknown")
-        model = str(ev.get("model") or "unknown")
-
-        input_tokens = int(ev.get("inputTokens") or 0)
-        output_tokens = int(ev.get("outputTokens") or 0)
-        cache_read = int(ev.get("cacheReadInputTokens") or 0)
-        cache_creation = int(ev.get("cacheCreationInputTokens") or 0)
-        images = int(ev.get("imagesGenerated") or 0)
-        citations = int(ev.get("citationTokens") or 0)
-        searches = int(ev.get("searchQueries") or 0)
-        reasoning = int(ev.get("reasoningTokens") or 0)
-
-        for stats in [
-            per_job[job_id],
-            per_endpoint[endpoint],
-            per_subtask[subtask],
-            per_provider_model[f"{provider}:{model}"],
-        ]:
-            stats["costUsd"] += cost
-            stats["callCount"] += 1
-            stats["inputTokens"] += input_tokens
-            stats["outputTokens"] += output_tokens
-            stats["cacheReadInputTokens"] += cache_read
-            stats["cacheCreationInputTokens"] += cache_creation
-            stats["imagesGenerated"] += images
-            stats["citationTokens"] += citations
-            stats["searchQueries"] += searches
-            stats["reasoningTokens"] += reasoning
-
-        rows.append(
-            {
-                "timestamp": ev.get("timestamp"),
-                "jobId": ev.get("jobId"),
-                "endpoint": ev.get("endpoint"),
-                "projectName": ev.get("projectName"),
-                "subtask": ev.get("subtask"),
-                "provider": provider,
-                "model": model,
-                "operation": ev.get("operation"),
-                "success": ev.get("success"),
-                "retryAttempt": ev.get("retryAttempt"),
-                "inputTokens": input_tokens,
-                "outputTokens": output_tokens,
-                "cacheReadInputTokens": cache_read,
-                "cacheCreationInputTokens": cache_creation,
-                "imagesGenerated": images,
-                "citationTokens": citations,
-                "searchQueries": searches,
-                "reasoningTokens": reasoning,
-                "latencyMs": ev.get("latencyMs"),
-                "costUsd": round(cost, 10),
-            }
-        )
-
-    def _finalize_stats(stats_dict: Dict[str, Any]) -> Dict[str, Any]:
-        # Sort by costUsd descending
-        sorted_items = sorted(stats_dict.items(), key=lambda x: -x[1]["costUsd"])
-        final = {}
-        for key, stats in sorted_items:
-            s = stats.copy()
-            s["costUsd"] = round(s["costUsd"], 10)
-            s["avgCostUsd"] = round(s["costUsd"] / s["callCount"], 10) if s["callCount"] > 0 else 0.0
-            final[key] = s
-        return final
+    s3 = boto3.client("s3")
+    with open(args.out_csv, "w", newline="", encoding="utf-8") as csv_file, \
+            ThreadPoolExecutor(max_workers=args.workers) as executor:
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+        wrote_header = False
+
+        for d in _daterange(start_dt, end_dt):
+            dt = d.strftime("%Y-%m-%d")
+            if state is not None and dt in state["partitions"]:
+                totals.merge(CostAggregates(state["partitions"][dt]))
+                skipped_days += 1
+                continue
+
+            day = CostAggregates()
+            for ev in iter_partition_events(s3, args.bucket, args.prefix, d, executor, window=args.workers * 4):
+                if args.job_id and str(ev.get("jobId")) != args.job_id:
+                    continue
+                row = day.add(ev, compute_event_cost_usd(ev, rates, strict=args.strict))
+                if not wrote_header:
+                    writer.writeheader()
+                    wrote_header = True
+                writer.writerow(row)
+                if args.json_events:
+                    rows.append(row)
+            totals.merge(day)
+
+            if state is not None and is_closed(d, now):
+                state["partitions"][dt] = day.to_dict()
+                if state["watermark"] is None or dt > state["watermark"]:
+                    state["watermark"] = dt
+
+    if state is not None:
+        save_state(args.state, state)
+        print(f"Reused {skipped_days} cached day(s); watermark {state['watermark']}")
 
     report = {
         "startDate": args.start_date,
@@ -254,23 +527,18 @@ def main() -> int:
         "strict": bool(args.strict),
         "filters": {"jobId": args.job_id},
         "totals": {
-            "perJobId": _finalize_stats(per_job),
-            "perEndpoint": _finalize_stats(per_endpoint),
-            "perSubtask": _finalize_stats(per_subtask),
-            "perProviderModel": _finalize_stats(per_provider_model),
-            "grandTotalUsd": round(sum(s["costUsd"] for s in per_job.values()), 10),
+            **{dim: _finalize_stats(groups) for dim, groups in totals.data.items()},
+            "grandTotalUsd": round(sum(s["costUsd"] for s in totals.data["perJobId"].values()), 10),
         },
-        "events": rows,
     }
+    if args.json_events:
+        report["events"] = rows
 
     with open(args.out_json, "w", encoding="utf-8") as f:
         json.dump(report, f, ensure_ascii=False, indent=2)
-    write_csv(rows, args.out_csv)
 
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Latency analytics over S3 JSONL LLM usage events (llm_cost_report.py --latency).
+
+Per subtask/model/day: call count, p50/p90/p99 latency, output tokens per
+second, error rate and retry rate. Events are loaded into NumPy columns
+once; grouping, percentiles and rates are computed on whole arrays.
+Response-cache hits are excluded, since they never reach the provider.
+
+With a baseline date range, a regression diff compares each
+subtask/model's percentiles between the two ranges.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from llm_cost_report import iter_events_from_s3, _parse_date
+
+GROUP_DIMENSIONS = ("subtask", "model", "day")
+PERCENTILES = (50, 90, 99)
+
+# Regression diff defaults: flag p90 slowdowns of 20%+ with enough calls on both sides
+DEFAULT_REGRESSION_RATIO = 1.2
+DEFAULT_MIN_CALLS = 20
+
+
+@dataclass
+class LatencyColumns:
+    """Per-event columns; string dimensions are stored as object arrays."""
+    subtask: np.ndarray
+    model: np.ndarray
+    day: np.ndarray
+    latency_ms: np.ndarray
+    output_tokens: np.ndarray
+    success: np.ndarray
+    retried: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.latency_ms)
+
+
+def collect_columns(events: Iterable[Dict[str, Any]]) -> LatencyColumns:
+    """Load the latency-relevant fields of every provider call into arrays."""
+    subtask: List[str] = []
+    model: List[str] = []
+    day: List[str] = []
+    latency: List[float] = []
+    output_tokens: List[float] = []
+    success: List[bool] = []
+    retried: List[bool] = []
+
+    for ev in events:
+        if ev.get("cacheHit"):
+            continue
+        subtask.append(str(ev.get("subtask") or "unknown"))
+        model.append(f"{ev.get('provider') or 'unknown'}:{ev.get('model') or 'unknown'}")
+        day.append(str(ev.get("timestamp") or "")[:10] or "unknown")
+        latency.append(float(ev["latencyMs"]) if ev.get("latencyMs") is not None else np.nan)
+        output_tokens.append(float(ev.get("outputTokens") or 0))
+        success.append(bool(ev.get("success")))
+        retried.append(int(ev.get("retryAttempt") or 1) > 1)
+
+    return LatencyColumns(
+        subtask=np.array(subtask, dtype=object),
+        model=np.array(model, dtype=object),
+        day=np.array(day, dtype=object),
+        latency_ms=np.array(latency, dtype=np.float64),
+        output_tokens=np.array(output_tokens, dtype=np.float64),
+        success=np.array(success, dtype=bool),
+        retried=np.array(retried, dtype=bool),
+    )
+
+
+def _group_ids(cols: LatencyColumns, by: Sequence[str]) -> Tuple[np.ndarray, List[Tuple[str, ...]]]:
+    """Dense group id per event plus the key tuple of each group."""
+    codes = []
+    uniques = []
+    for dim in by:
+        values, inverse = np.unique(getattr(cols, dim), return_inverse=True)
+        uniques.append(values)
+        codes.append(inverse.astype(np.int64))
+
+    combined = np.zeros(len(cols), dtype=np.int64)
+    for dim_codes, values in zip(codes, uniques):
+        combined = combined * len(values) + dim_codes
+    group_keys, group_id = np.unique(combined, return_inverse=True)
+
+    keys = []
+    for key in group_keys:
+        parts = []
+        for values in reversed(uniques):
+            key, code = divmod(int(key), len(values))
+            parts.append(str(values[code]))
+        keys.append(tuple(reversed(parts)))
+    return group_id, keys
+
+
+def _grouped_percentiles(values: np.ndarray, group_id: np.ndarray, n_groups: int, qs: Sequence[float]) -> np.ndarray:
+    """
+    Linear-interpolated percentiles of values per group, shape (n_groups, len(qs)).
+
+    Values are sorted once by (group, value); each group's percentile
+    positions are then computed from its offset and size. Groups without
+    values get NaN.
+    """
+    valid = ~np.isnan(values)
+    v, g = values[valid], group_id[valid]
+    order = np.lexsort((v, g))
+    v = v[order]
+
+    counts = np.bincount(g, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    out = np.full((n_groups, len(qs)), np.nan)
+    has = counts > 0
+    for i, q in enumerate(qs):
+        pos = starts[has] + (counts[has] - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        out[has, i] = v[lo] + (v[hi] - v[lo]) * (pos - lo)
+    return out
+
+
+def latency_table(cols: LatencyColumns, by: Sequence[str] = GROUP_DIMENSIONS) -> List[Dict[str, Any]]:
+    """
+    Latency stats per group.
+
+    Args:
+        cols: Event columns from collect_columns().
+        by: Dimensions to group on (subset of GROUP_DIMENSIONS).
+
+    Returns:
+        One row per group, sorted by the group key.
+    """
+    if len(cols) == 0:
+        return []
+    group_id, keys = _group_ids(cols, by)
+    n = len(keys)
+
+    calls = np.bincount(group_id, minlength=n)
+    errors = np.bincount(group_id, weights=~cols.success, minlength=n)
+    retries = np.bincount(group_id, weights=cols.retried, minlength=n)
+    pct = _grouped_percentiles(cols.latency_ms, group_id, n, PERCENTILES)
+
+    # Throughput over successful calls that report both latency and output tokens
+    timed = cols.success & ~np.isnan(cols.latency_ms) & (cols.latency_ms > 0) & (cols.output_tokens > 0)
+    tok = np.bincount(group_id[timed], weights=cols.output_tokens[timed], minlength=n)
+    secs = np.bincount(group_id[timed], weights=cols.latency_ms[timed] / 1000.0, minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tokens_per_second = np.where(secs > 0, tok / secs, np.nan)
+
+    rows = []
+    for i, key in enumerate(keys):
+        row: Dict[str, Any] = dict(zip(by, key))
+        row["calls"] = int(calls[i])
+        for j, q in enumerate(PERCENTILES):
+            row[f"p{q}Ms"] = _round(pct[i, j])
+        row["tokensPerSecond"] = _round(tokens_per_second[i], 2)
+        row["errorRate"] = round(float(errors[i] / calls[i]), 4)
+        row["retryRate"] = round(float(retries[i] / calls[i]), 4)
+        rows.append(row)
+    return rows
+
+
+def regression_diff(
+    baseline: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+    by: Sequence[str],
+    min_calls: int = DEFAULT_MIN_CALLS,
+    ratio_threshold: float = DEFAULT_REGRESSION_RATIO,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two latency tables grouped the same way (without "day").
+
+    Returns:
+        One row per group present in both tables, slowest p90 change first;
+        "regressed" marks groups over the threshold with enough calls.
+    """
+    base_by_key = {tuple(r[d] for d in by): r for r in baseline}
+    out = []
+    for cur in current:
+        key = tuple(cur[d] for d in by)
+        base = base_by_key.get(key)
+        if base is None:
+            continue
+        row: Dict[str, Any] = dict(zip(by, key))
+        row["baselineCalls"], row["currentCalls"] = base["calls"], cur["calls"]
+        for q in PERCENTILES:
+            b, c = base[f"p{q}Ms"], cur[f"p{q}Ms"]
+            row[f"baselineP{q}Ms"], row[f"currentP{q}Ms"] = b, c
+            row[f"p{q}Ratio"] = round(c / b, 3) if b and c is not None else None
+        row["errorRateDelta"] = round(cur["errorRate"] - base["errorRate"], 4)
+        row["retryRateDelta"] = round(cur["retryRate"] - base["retryRate"], 4)
+        row["regressed"] = bool(
+            row["p90Ratio"] is not None
+            and row["p90Ratio"] >= ratio_threshold
+            and min(base["calls"], cur["calls"]) >= min_calls
+        )
+        out.append(row)
+    out.sort(key=lambda r: -(r["p90Ratio"] or 0.0))
+    return out
+
+
+def _round(x: float, ndigits: int = 1):
+    return None if np.isnan(x) else round(float(x), ndigits)
+
+
+def _write_rows_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if not rows:
+            return
+        w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        w.writeheader()
+        w.writerows(rows)
+
+
+def run_latency_report(args: argparse.Namespace) -> int:
+    """Entry point for llm_cost_report.py --latency."""
+    by = [d.strip() for d in args.group_by.split(",") if d.strip()]
+    unknown = set(by) - set(GROUP_DIMENSIONS)
+    if unknown:
+        raise SystemExit(f"Unknown --group-by dimension(s): {sorted(unknown)}")
+
+    def _load(start: str, end: str) -> LatencyColumns:
+        events = iter_events_from_s3(args.bucket, args.prefix, _parse_date(start), _parse_date(end), workers=args.workers)
+        if args.job_id:
+            events = (ev for ev in events if str(ev.get("jobId")) == args.job_id)
+        return collect_columns(events)
+
+    current = _load(args.start_date, args.end_date)
+    rows = latency_table(current, by)
+    report: Dict[str, Any] = {
+        "startDate": args.start_date,
+        "endDate": args.end_date,
+        "bucket": args.bucket,
+        "prefix": args.prefix,
+        "filters": {"jobId": args.job_id},
+        "groupBy": by,
+        "latency": rows,
+    }
+
+    if args.baseline_start and args.baseline_end:
+        # Days never match across ranges, so the diff groups without them
+        diff_by = [d for d in by if d != "day"] or ["subtask"]
+        diff = regression_diff(
+            latency_table(_load(args.baseline_start, args.baseline_end), diff_by),
+            latency_table(current, diff_by),
+            diff_by,
+            min_calls=args.min_calls,
+            ratio_threshold=args.regression_ratio,
+        )
+        report["baseline"] = {"startDate": args.baseline_start, "endDate": args.baseline_end}
+        report["regressions"] = diff
+        for r in diff:
+            if r["regressed"]:
+                print(
+                    f"REGRESSED {'/'.join(str(r[d]) for d in diff_by)}: "
+                    f"p90 {r['baselineP90Ms']} -> {r['currentP90Ms']} ms (x{r['p90Ratio']})"
+                )
+
+    with open(args.out_json, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    _write_rows_csv(rows, args.out_csv)
+    return 0
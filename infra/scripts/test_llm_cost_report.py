@@ -0,0 +1,126 @@
+"""
+Tests for llm_cost_report.py compaction, manifest reads and the --state cache.
+
+Usage:
+    pytest test_llm_cost_report.py -v
+"""
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from moto import mock_aws
+
+import llm_cost_report as report
+
+
+BUCKET = "llm-usage-test"
+PREFIX = "llm_usage_events"
+CLOSED_DAY = date(2024, 1, 10)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _put_events(s3, d, name, count, job_id="job-1"):
+    lines = [
+        json.dumps({"jobId": job_id, "provider": "openai", "model": "m", "inputTokens": 1_000_000, "timestamp": f"{d}T00:00:00Z"})
+        for _ in range(count)
+    ]
+    s3.put_object(Bucket=BUCKET, Key=f"{PREFIX}/dt={d}/hour=23/jobId={job_id}/{name}.jsonl", Body="\n".join(lines))
+
+
+def _read_day(s3, d):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(report.iter_partition_events(s3, BUCKET, PREFIX, d, executor))
+
+
+def _compact(s3, start, end, force=False):
+    return report.run_compaction(SimpleNamespace(bucket=BUCKET, prefix=PREFIX, start_date=str(start), end_date=str(end), force=force, workers=4))
+
+
+class TestClosedDays:
+    def test_day_closes_after_grace(self):
+        midnight = datetime(2024, 1, 11, tzinfo=timezone.utc)
+
+        assert not report.is_closed(CLOSED_DAY, midnight + timedelta(minutes=20))
+        assert report.is_closed(CLOSED_DAY, midnight + report.CLOSE_GRACE)
+
+
+class TestCompaction:
+    def test_rollup_replaces_raw_objects(self, s3):
+        for i in range(5):
+            _put_events(s3, CLOSED_DAY, f"obj-{i}", 2)
+
+        _compact(s3, CLOSED_DAY, CLOSED_DAY)
+
+        manifest = report.read_manifest(s3, BUCKET, PREFIX, CLOSED_DAY)
+        assert manifest["eventCount"] == 10
+        assert len(manifest["sourceKeys"]) == 5
+        assert len(_read_day(s3, CLOSED_DAY)) == 10
+
+    def test_late_objects_are_read_and_recompacted(self, s3):
+        for i in range(5):
+            _put_events(s3, CLOSED_DAY, f"obj-{i}", 2)
+        _compact(s3, CLOSED_DAY, CLOSED_DAY)
+        _put_events(s3, CLOSED_DAY, "late", 2)
+
+        assert len(_read_day(s3, CLOSED_DAY)) == 12
+
+        _compact(s3, CLOSED_DAY, CLOSED_DAY)
+
+        assert report.read_manifest(s3, BUCKET, PREFIX, CLOSED_DAY)["eventCount"] == 12
+        assert len(_read_day(s3, CLOSED_DAY)) == 12
+
+    def test_open_day_is_not_compacted(self, s3):
+        today = datetime.now(timezone.utc).date()
+        _put_events(s3, today, "obj", 2)
+
+        _compact(s3, today, today)
+
+        assert report.read_manifest(s3, BUCKET, PREFIX, today) is None
+
+
+class TestStateCache:
+    def _run(self, monkeypatch, tmp_path, start, end):
+        pricing = tmp_path / "pricing.json"
+        pricing.write_text(json.dumps({"rates": [{"provider": "openai", "model": "m", "unit": "input_token_1m", "usd": 1.0}]}))
+        out_json = tmp_path / "report.json"
+        monkeypatch.setattr(sys, "argv", [
+            "llm_cost_report.py", "--bucket", BUCKET, "--prefix", PREFIX,
+            "--start-date", str(start), "--end-date", str(end), "--pricing", str(pricing),
+            "--state", str(tmp_path / "state.json"),
+            "--out-json", str(out_json), "--out-csv", str(tmp_path / "report.csv"),
+        ])
+        assert report.main() == 0
+        return json.loads(out_json.read_text())["totals"]["grandTotalUsd"]
+
+    def test_closed_days_are_reused_and_open_days_reread(self, s3, monkeypatch, tmp_path):
+        today = datetime.now(timezone.utc).date()
+        closed = today - timedelta(days=2)
+        _put_events(s3, closed, "obj", 3)
+        _put_events(s3, today, "obj", 1)
+
+        assert self._run(monkeypatch, tmp_path, closed, today) == 4.0
+
+        state = json.loads((tmp_path / "state.json").read_text())
+        assert str(closed) in state["partitions"]
+        assert str(today) not in state["partitions"]
+
+        # A cached day is not re-read; today still is
+        s3.delete_object(Bucket=BUCKET, Key=f"{PREFIX}/dt={closed}/hour=23/jobId=job-1/obj.jsonl")
+        _put_events(s3, today, "late", 1)
+
+        assert self._run(monkeypatch, tmp_path, closed, today) == 5.0
@@ -0,0 +1,106 @@
+"""
+Tests for llm_latency_report.py percentiles, latency table and regression diff.
+
+Usage:
+    pytest test_llm_latency_report.py -v
+"""
+
+import numpy as np
+import pytest
+
+import llm_latency_report as latency
+
+
+def _event(subtask="s", latency_ms=100.0, output_tokens=0, success=True, retry=1, day="2024-01-10", **extra):
+    return {
+        "subtask": subtask,
+        "provider": "openai",
+        "model": "m",
+        "timestamp": f"{day}T12:00:00Z",
+        "latencyMs": latency_ms,
+        "outputTokens": output_tokens,
+        "success": success,
+        "retryAttempt": retry,
+        **extra,
+    }
+
+
+def _row(subtask, calls, p90, p50=100.0, p99=None):
+    return {
+        "subtask": subtask,
+        "calls": calls,
+        "p50Ms": p50,
+        "p90Ms": p90,
+        "p99Ms": p99 if p99 is not None else p90,
+        "errorRate": 0.0,
+        "retryRate": 0.0,
+    }
+
+
+class TestGroupedPercentiles:
+    def test_matches_numpy_per_group(self):
+        rng = np.random.default_rng(7)
+        values = rng.lognormal(6, 1, size=500)
+        values[rng.choice(500, size=40, replace=False)] = np.nan
+        group_id = rng.integers(0, 3, size=500)  # group 3 stays empty
+
+        out = latency._grouped_percentiles(values, group_id, 4, latency.PERCENTILES)
+
+        for g in range(3):
+            members = values[(group_id == g) & ~np.isnan(values)]
+            np.testing.assert_allclose(out[g], np.percentile(members, latency.PERCENTILES))
+        assert np.isnan(out[3]).all()
+
+    def test_single_value_group(self):
+        out = latency._grouped_percentiles(np.array([5.0, 1.0, 9.0]), np.array([1, 0, 1]), 2, (50, 99))
+
+        np.testing.assert_allclose(out, [[1.0, 1.0], [7.0, 8.96]])
+
+
+class TestLatencyTable:
+    def test_rows_per_group(self):
+        events = [_event("a", latency_ms=float(ms)) for ms in range(100, 1100, 100)]
+        events += [
+            _event("b", latency_ms=2000.0, output_tokens=400),
+            _event("b", latency_ms=None, success=False, retry=2),
+            _event("b", latency_ms=10.0, cacheHit=True),
+        ]
+
+        rows = latency.latency_table(latency.collect_columns(events), by=("subtask",))
+
+        assert [r["subtask"] for r in rows] == ["a", "b"]
+        a, b = rows
+        assert a["calls"] == 10
+        assert a["p50Ms"] == pytest.approx(np.percentile(np.arange(100, 1100, 100), 50), abs=0.05)
+        assert a["p90Ms"] == pytest.approx(np.percentile(np.arange(100, 1100, 100), 90), abs=0.05)
+        assert b["calls"] == 2  # the cache hit never reached the provider
+        assert b["p50Ms"] == 2000.0
+        assert b["tokensPerSecond"] == 200.0
+        assert b["errorRate"] == 0.5 and b["retryRate"] == 0.5
+
+    def test_empty(self):
+        assert latency.latency_table(latency.collect_columns([])) == []
+
+
+class TestRegressionDiff:
+    def test_flags_slowdown_with_enough_calls(self):
+        baseline = [_row("a", 50, 1000.0), _row("b", 50, 1000.0), _row("gone", 50, 1000.0)]
+        current = [_row("a", 50, 1300.0), _row("b", 50, 1100.0), _row("new", 50, 9000.0)]
+
+        diff = latency.regression_diff(baseline, current, ["subtask"])
+
+        assert [r["subtask"] for r in diff] == ["a", "b"]
+        assert diff[0]["p90Ratio"] == 1.3 and diff[0]["regressed"]
+        assert not diff[1]["regressed"]
+
+    @pytest.mark.parametrize("base_calls,cur_calls,regressed", [(20, 20, True), (19, 50, False), (50, 19, False)])
+    def test_min_calls_gate(self, base_calls, cur_calls, regressed):
+        diff = latency.regression_diff([_row("a", base_calls, 100.0)], [_row("a", cur_calls, 500.0)], ["subtask"], min_calls=20)
+
+        assert diff[0]["regressed"] is regressed
+
+    def test_missing_percentile_is_not_a_regression(self):
+        diff = latency.regression_diff([_row("a", 50, None)], [_row("a", 50, 500.0)], ["subtask"])
+
+        assert diff[0]["p90Ratio"] is None
+        assert not diff[0]["regressed"]